@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+import os
+import sys
+
+import django
+
+if __name__ == "__main__":
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.test_settings")
+    django.setup()
+    from tests.benchmarks.runner import main
+
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,107 @@
+import logging
+import sys
+
 from django.apps import AppConfig as DjangoAppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+
+logger = logging.getLogger(__name__)
 
 
 class AppConfig(DjangoAppConfig):
     name = "effect_form_validators"
     verbose_name = "Effect Form Validators"
+
+    def ready(self):
+        if getattr(settings, "EFFECT_FORM_VALIDATORS_REVALIDATE_ON_SCREENING_CHANGE", False):
+            self.connect_screening_revalidation()
+        if getattr(settings, "EFFECT_FORM_VALIDATORS_LOOKUP_CACHE", None):
+            self.connect_lookup_cache_invalidation()
+        if getattr(settings, "EFFECT_FORM_VALIDATORS_WARM_UP", False):
+            self.warm_up()
+
+    def warm_up(self):
+        """Warms up validators at startup rather than on the first
+        request in each worker.
+
+        List this app after the edc apps in INSTALLED_APPS so that their
+        registries (visit schedules, consents, randomizers) are loaded.
+        """
+        from .warm_up import warm_up  # noqa: PLC0415
+
+        timings = warm_up()
+        for name, seconds in timings.items():
+            logger.info("Warmed up %s in %.3fs", name, seconds)
+        sys.stdout.write(
+            f" * warmed up {self.verbose_name.lower()} in {sum(timings.values()):.3f}s\n"
+        )
+
+    @staticmethod
+    def connect_screening_revalidation():
+        from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+        from .signals import (  # noqa: PLC0415
+            subject_screening_post_save,
+            subject_screening_pre_save,
+        )
+
+        model_cls = get_subject_screening_model_cls()
+        pre_save.connect(
+            subject_screening_pre_save,
+            sender=model_cls,
+            dispatch_uid="effect_form_validators_subject_screening_pre_save",
+        )
+        post_save.connect(
+            subject_screening_post_save,
+            sender=model_cls,
+            dispatch_uid="effect_form_validators_subject_screening_post_save",
+        )
+
+    @staticmethod
+    def connect_lookup_cache_invalidation():
+        """Invalidates shared lookups when the source rows change.
+
+        Connects to the randomization list of each randomizer named by
+        a registered form validator. Randomizers not registered at this
+        point are skipped.
+        """
+        from edc_randomization.exceptions import NotRegistered  # noqa: PLC0415
+        from edc_randomization.site_randomizers import site_randomizers  # noqa: PLC0415
+        from edc_registration import get_registered_subject_model_cls  # noqa: PLC0415
+        from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+        from .registry import site_form_validators  # noqa: PLC0415
+        from .shared_lookups import (  # noqa: PLC0415
+            randomization_list_changed,
+            registered_subject_changed,
+            subject_screening_changed,
+        )
+
+        receivers = [
+            (subject_screening_changed, get_subject_screening_model_cls()),
+            (registered_subject_changed, get_registered_subject_model_cls()),
+        ]
+        randomizer_names = {
+            getattr(registration.form_validator_cls, "randomizer_name", None)
+            for registration in site_form_validators
+        }
+        for randomizer_name in sorted(filter(None, randomizer_names)):
+            try:
+                randomizer_cls = site_randomizers.get(randomizer_name)
+            except NotRegistered:
+                logger.warning(
+                    "Randomizer %r not registered. Assignments will expire by timeout.",
+                    randomizer_name,
+                )
+            else:
+                receivers.append((randomization_list_changed, randomizer_cls.model_cls()))
+        for receiver, model_cls in receivers:
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    receiver,
+                    sender=model_cls,
+                    dispatch_uid=(
+                        f"effect_form_validators_{receiver.__name__}_"
+                        f"{signal is post_save}_{model_cls._meta.label_lower}"
+                    ),
+                )
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+
+class AsyncFormValidatorMixin:
+    """Adds `aclean()` for validators used under ASGI.
+
+    Each name in `async_prefetch` is a cached attribute of the validator
+    (e.g. a `cached_property`) with a matching `aget_<name>` coroutine.
+    `aclean` runs the coroutines concurrently and stores the results
+    as the cached values, so the rules find the external data already
+    loaded.
+    """
+
+    async_prefetch: tuple[str, ...] = ()
+
+    async def aprefetch(self: Any) -> None:
+        names = [name for name in self.async_prefetch if name not in self.__dict__]
+        values = await asyncio.gather(*(getattr(self, f"aget_{name}")() for name in names))
+        self.__dict__.update(zip(names, values, strict=True))
+
+    async def aclean(self: Any) -> None:
+        """Prefetches external data, then validates.
+
+        The rules run in a worker thread since the edc base checks may
+        still use the sync ORM. The validator's own lookups are served
+        from the prefetched snapshot.
+        """
+        await self.aprefetch()
+        await sync_to_async(self.validate)()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched, chain
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connections
+
+from .outcome import validate
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from edc_form_validators import FormValidator
+
+    from .outcome import ValidationOutcome
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def is_free_threaded() -> bool:
+    """Returns True if running without the GIL (a free-threaded build
+    with the GIL disabled).
+    """
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def get_bulk_workers() -> int:
+    """Returns the thread pool size for bulk validation.
+
+    `EFFECT_FORM_VALIDATORS_BULK_WORKERS` if set, otherwise one thread
+    per CPU on a free-threaded build and a single thread with the GIL,
+    where threads do not speed up CPU-bound rules.
+    """
+    workers = getattr(settings, "EFFECT_FORM_VALIDATORS_BULK_WORKERS", None)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if is_free_threaded() else 1
+    return workers
+
+
+def run_chunk(func: Callable[[Any], Any], chunk: tuple) -> list:
+    """Returns `func` applied to each item of the chunk, closing any
+    database connections the worker thread opened.
+    """
+    try:
+        return [func(item) for item in chunk]
+    finally:
+        connections.close_all()
+
+
+def thread_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list:
+    """Returns `func` applied to each item, in order, using a pool of
+    `workers` threads (see `get_bulk_workers`).
+
+    Items are submitted in chunks to keep scheduling overhead low. With
+    one worker, items are processed in the calling thread.
+
+    `func` must not share mutable state between items. Validator
+    instances are per item; the caches validators read (`functools.cache`
+    getters, `subject_histories`, `consent_definition_index`,
+    `shared_lookups`) are safe to use from several threads.
+    """
+    workers = get_bulk_workers() if workers is None else workers
+    if workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(workers, thread_name_prefix="effect-bulk") as executor:
+        futures = [
+            executor.submit(run_chunk, func, chunk) for chunk in batched(items, chunk_size)
+        ]
+        return list(chain.from_iterable(future.result() for future in futures))
+
+
+def validate_rows(
+    form_validator_cls: type[FormValidator],
+    rows: Iterable[dict],
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    **kwargs: Any,
+) -> list[ValidationOutcome]:
+    """Returns a ValidationOutcome per cleaned_data dict in `rows`,
+    validated on a thread pool.
+
+    For example:
+
+        outcomes = validate_rows(VitalSignsFormValidator, rows, model=VitalSigns)
+    """
+    return thread_map(
+        lambda cleaned_data: validate(form_validator_cls, cleaned_data, **kwargs),
+        rows,
+        workers=workers,
+        chunk_size=chunk_size,
+    )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import cached_property
+
 from clinicedc_constants import CONFIRMED
 from edc_crf.crf_form_validator_mixins import BaseFormValidatorMixin
 from edc_form_validators import INVALID_ERROR, FormValidator
@@ -7,14 +9,26 @@ from edc_registration import get_registered_subject_model_cls
 from edc_screening.utils import get_subject_screening_model_cls
 from edc_sites.form_validator_mixin import SiteFormValidatorMixin
 
+from ..async_validation import AsyncFormValidatorMixin
+from ..prefetch import REGISTERED_SUBJECT_SCREENING
+from ..query_budget import QueryBudgetFormValidatorMixin
+from ..shared_lookups import shared_lookups
+
 SIX_MONTHS = 180
 
 
 class SerumCragDateNoteFormValidator(
+    QueryBudgetFormValidatorMixin,
+    AsyncFormValidatorMixin,
     BaseFormValidatorMixin,
     SiteFormValidatorMixin,
     FormValidator,
 ):
+    subject_screening_fields = ("eligibility_datetime",)
+    async_prefetch = ("subject_screening",)
+    query_budget = 2
+    data_requirements = {"subject_screening": REGISTERED_SUBJECT_SCREENING}  # noqa: RUF012
+
     def clean(self):
         self.validate_serum_crag_date()
 
@@ -28,8 +42,13 @@ class SerumCragDateNoteFormValidator(
     def eligibility_date(self):
         return self.subject_screening.eligibility_datetime.date()
 
-    @property
+    @cached_property
     def subject_screening(self):
+        return shared_lookups.get_or_load(
+            REGISTERED_SUBJECT_SCREENING, self.subject_identifier, self.load_subject_screening
+        )
+
+    def load_subject_screening(self):
         registered_subject = get_registered_subject_model_cls().objects.get(
             subject_identifier=self.subject_identifier
         )
@@ -37,6 +56,19 @@ class SerumCragDateNoteFormValidator(
             screening_identifier=registered_subject.screening_identifier
         )
 
+    async def aget_subject_screening(self):
+        return await shared_lookups.aget_or_load(
+            REGISTERED_SUBJECT_SCREENING, self.subject_identifier, self.aload_subject_screening
+        )
+
+    async def aload_subject_screening(self):
+        registered_subject = await get_registered_subject_model_cls().objects.aget(
+            subject_identifier=self.subject_identifier
+        )
+        return await get_subject_screening_model_cls().objects.aget(
+            screening_identifier=registered_subject.screening_identifier
+        )
+
     def validate_serum_crag_date(self):
         if self.cleaned_data.get("serum_crag_date"):
             if self.cleaned_data.get("serum_crag_date") > self.eligibility_date:
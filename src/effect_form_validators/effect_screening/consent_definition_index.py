@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import pairwise
+from threading import RLock
+from typing import TYPE_CHECKING
+
+from edc_consent.site_consents import site_consents
+from edc_utils import ceil_secs, floor_secs
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from edc_consent.consent_definition import ConsentDefinition
+
+
+class ConsentDefinitionIndex:
+    """Interval index of consent definitions by screening model.
+
+    `get` resolves as `site_consents.get_consent_definition(
+    screening_model=..., report_datetime=...)`: the definitions whose
+    start/end (to the minute) cover `report_datetime`, by version,
+    where one updating another resolves to the update. Returns None
+    if there is none or the definitions cannot be resolved (let the
+    registry decide).
+    """
+
+    def __init__(self, consent_definitions: list[ConsentDefinition]):
+        by_model: dict[str, list[ConsentDefinition]] = defaultdict(list)
+        for cdef in consent_definitions:
+            screening_models = cdef.screening_model
+            if isinstance(screening_models, str):
+                screening_models = [screening_models]
+            for screening_model in dict.fromkeys(screening_models):
+                by_model[screening_model].append(cdef)
+        self.cdefs: dict[str, list[ConsentDefinition]] = {}
+        self.starts: dict[str, list[datetime]] = {}
+        self.ends: dict[str, list[datetime]] = {}
+        for screening_model, cdefs in by_model.items():
+            cdefs.sort(key=lambda cdef: floor_secs(cdef.start))
+            self.cdefs[screening_model] = cdefs
+            self.starts[screening_model] = [floor_secs(cdef.start) for cdef in cdefs]
+            self.ends[screening_model] = [ceil_secs(cdef.end) for cdef in cdefs]
+
+    def get(self, report_datetime: datetime, screening_model: str) -> ConsentDefinition | None:
+        if not (starts := self.starts.get(screening_model)):
+            return None
+        ends = self.ends[screening_model]
+        cdefs = sorted(
+            (
+                cdef
+                for i, cdef in enumerate(
+                    self.cdefs[screening_model][: bisect_right(starts, report_datetime)]
+                )
+                if report_datetime <= ends[i]
+            ),
+            key=lambda cdef: cdef.version,
+        )
+        if len(cdefs) <= 1:
+            return cdefs[0] if cdefs else None
+        cdef = None
+        for previous_cdef, next_cdef in pairwise(cdefs):
+            if next_cdef.updates == previous_cdef:
+                cdef = next_cdef
+        return cdef
+
+
+class ConsentDefinitionIndexCache:
+    """Holds the index, rebuilding it if the consent definitions
+    registered with `site_consents` change.
+    """
+
+    def __init__(self):
+        self._index: ConsentDefinitionIndex | None = None
+        self._registered: tuple[str, ...] = ()
+        self._lock = RLock()
+
+    @property
+    def index(self) -> ConsentDefinitionIndex:
+        registered = tuple(site_consents.registry)
+        if self._index is None or registered != self._registered:
+            with self._lock:
+                if self._index is None or registered != self._registered:
+                    self._index = ConsentDefinitionIndex(list(site_consents.registry.values()))
+                    self._registered = registered
+        return self._index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._registered = ()
+
+
+consent_definition_index = ConsentDefinitionIndexCache()
+
+
+def get_consent_definition(
+    report_datetime: datetime, screening_model: str
+) -> ConsentDefinition | None:
+    """Returns the consent definition for the screening datetime and
+    screening model from the index, or None if the registry must be
+    consulted.
+    """
+    return consent_definition_index.index.get(report_datetime, screening_model)
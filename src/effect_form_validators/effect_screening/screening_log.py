@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from clinicedc_constants import (
+    FEMALE,
+    MALE,
+    NO,
+    NOT_APPLICABLE,
+    OTHER,
+    PENDING,
+    POS,
+    YES,
+)
+from edc_utils.text import formatted_date
+
+from .subject_screening_form_validator import MAX_AGE, MIN_AGE, THREE_DAYS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+DATE_FIELDS = (
+    "report_datetime",
+    "hiv_confirmed_date",
+    "cd4_date",
+    "serum_crag_date",
+    "lp_date",
+    "cm_in_csf_date",
+    "preg_test_date",
+)
+
+REQUIRED_MSG = "This field is required."
+NOT_REQUIRED_MSG = "This field is not required."
+APPLICABLE_MSG = "This field is applicable."
+NOT_APPLICABLE_MSG = "This field is not applicable."
+# as the form fields
+INVALID_DATE_MSG = "Enter a valid date."
+INVALID_NUMBER_MSG = "Enter a whole number."
+
+
+class ScreeningLogResult(NamedTuple):
+    valid: Any
+    errors: list[dict[str, str]]
+
+
+def as_date(value: date | datetime | str | None) -> date | None:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10]) if value else None
+    return value
+
+
+def as_number(value: Any) -> float | None:
+    return None if value in (None, "") else float(value)
+
+
+def get_columns(
+    rows: Iterable[dict], errors: list[dict[str, str]] | None = None
+) -> dict[str, Any]:
+    """Returns NumPy columns for a screening log given as rows.
+
+    Dates become datetime64[D] (NaT if missing), `age_in_years` float
+    (NaN if missing) and everything else an object array.
+
+    A malformed date or age is treated as missing and, if `errors` (a
+    dict per row) is given, reported as an error of its row.
+    """
+    rows = list(rows)
+    fields = {fld for row in rows for fld in row}
+    columns = {}
+    for fld in fields:
+        values = [row.get(fld) for row in rows]
+        if fld in DATE_FIELDS:
+            parse, dtype, msg = as_date, "datetime64[D]", INVALID_DATE_MSG
+        elif fld == "age_in_years":
+            parse, dtype, msg = as_number, float, INVALID_NUMBER_MSG
+        else:
+            columns[fld] = np.array(values, dtype=object)
+            continue
+        parsed = []
+        for i, value in enumerate(values):
+            try:
+                parsed.append(parse(value))
+            except (TypeError, ValueError):
+                parsed.append(None)
+                if errors is not None:
+                    errors[i].setdefault(fld, msg)
+        # None as NaT or NaN
+        columns[fld] = np.array(parsed, dtype=dtype)
+    return columns
+
+
+class ScreeningLogEvaluator:
+    """Evaluates the SubjectScreeningFormValidator rules column-wise
+    over a screening log.
+
+    Unlike the form, which stops at the first error, every field with
+    an error is reported (the first error per field, in the order the
+    form validates).
+    """
+
+    def __init__(self, columns: dict[str, Any], errors: list[dict[str, str]] | None = None):
+        self.columns = columns
+        self.size = len(next(iter(columns.values()))) if columns else 0
+        self.errors: list[dict[str, str]] = (
+            [{} for _ in range(self.size)] if errors is None else errors
+        )
+
+    def evaluate(self) -> ScreeningLogResult:
+        if self.size:
+            self.validate_age()
+            self.validate_hiv()
+            self.validate_cd4()
+            self.validate_serum_crag()
+            self.validate_lp_and_csf_crag()
+            self.validate_cm_in_csf()
+            self.validate_pregnancy()
+        valid = np.array([not row_errors for row_errors in self.errors], dtype=bool)
+        return ScreeningLogResult(valid=valid, errors=self.errors)
+
+    def add_errors(self, field: str, mask: Any, msg: str | Callable[[int], str]) -> None:
+        for i in np.flatnonzero(mask):
+            self.errors[i].setdefault(field, msg(i) if callable(msg) else msg)
+
+    def get(self, field: str) -> Any:
+        return self.columns.get(field)
+
+    def provided(self, field: str) -> Any:
+        value = self.columns[field]
+        if value.dtype.kind == "M":
+            return ~np.isnat(value)
+        return np.array([v not in (None, "") for v in value], dtype=bool)
+
+    def required_if(self, response: str, field: str, field_required: str) -> None:
+        if field not in self.columns or field_required not in self.columns:
+            return
+        condition = self.columns[field] == response
+        provided = self.provided(field_required)
+        self.add_errors(field_required, condition & ~provided, REQUIRED_MSG)
+        self.add_errors(field_required, ~condition & provided, NOT_REQUIRED_MSG)
+
+    def applicable_if_true(self, condition: Any, field_applicable: str) -> None:
+        if field_applicable not in self.columns:
+            return
+        not_applicable = self.columns[field_applicable] == NOT_APPLICABLE
+        self.add_errors(field_applicable, condition & not_applicable, APPLICABLE_MSG)
+        self.add_errors(field_applicable, ~condition & ~not_applicable, NOT_APPLICABLE_MSG)
+
+    def applicable_if(self, response: str, field: str, field_applicable: str) -> None:
+        if field in self.columns:
+            self.applicable_if_true(self.columns[field] == response, field_applicable)
+
+    def date_before_report_datetime(self, field: str) -> None:
+        self.compare_report_date(field, after=False)
+
+    def date_after_report_datetime(self, field: str) -> None:
+        self.compare_report_date(field, after=True)
+
+    def compare_report_date(self, field: str, *, after: bool) -> None:
+        if field not in self.columns or "report_datetime" not in self.columns:
+            return
+        value, report_date = self.columns[field], self.columns["report_datetime"]
+        mask = value < report_date if after else value > report_date
+        word = "after" if after else "before"
+        self.add_errors(
+            field,
+            mask,
+            lambda i: (
+                f"Invalid. Must be on or {word} report date/time. "
+                f"Got {formatted_date(value[i].item())}"
+            ),
+        )
+
+    def validate_age(self) -> None:
+        age = self.get("age_in_years")
+        if age is None:
+            return
+        with np.errstate(invalid="ignore"):
+            self.add_errors(
+                "age_in_years",
+                ~np.isnan(age) & ~((age >= 0) & (age < MAX_AGE)),
+                "Invalid. Please enter a valid age in years.",
+            )
+            is_minor = age < MIN_AGE
+        self.applicable_if_true(is_minor, field_applicable="parent_guardian_consent")
+        if (consent := self.get("parent_guardian_consent")) is not None:
+            self.add_errors(
+                "parent_guardian_consent",
+                is_minor & (consent != YES),
+                "STOP. You must have consent from parent or "
+                "legal guardian to store patient information.",
+            )
+
+    def validate_hiv(self) -> None:
+        self.required_if(YES, field="hiv_pos", field_required="hiv_confirmed_date")
+        self.date_before_report_datetime("hiv_confirmed_date")
+        self.applicable_if(YES, field="hiv_pos", field_applicable="hiv_confirmed_method")
+
+    def validate_cd4(self) -> None:
+        self.date_before_report_datetime("cd4_date")
+
+    def validate_serum_crag(self) -> None:
+        if (serum_crag_value := self.get("serum_crag_value")) is not None:
+            self.add_errors(
+                "serum_crag_value",
+                serum_crag_value != POS,
+                "Invalid. Subject must have positive serum/plasma CrAg test result.",
+            )
+        self.date_before_report_datetime("serum_crag_date")
+
+    def validate_lp_and_csf_crag(self) -> None:
+        self.required_if(YES, field="lp_done", field_required="lp_date")
+        lp_date, serum_crag_date = self.get("lp_date"), self.get("serum_crag_date")
+        if lp_date is not None and serum_crag_date is not None:
+            self.add_errors(
+                "lp_date",
+                (serum_crag_date - lp_date) > np.timedelta64(THREE_DAYS, "D"),
+                "Invalid. LP cannot be more than 3 days before serum/plasma CrAg date",
+            )
+        self.date_before_report_datetime("lp_date")
+        self.applicable_if(NO, field="lp_done", field_applicable="lp_declined")
+        self.applicable_if(YES, field="lp_done", field_applicable="csf_crag_value")
+
+    def validate_cm_in_csf(self) -> None:
+        self.applicable_if(YES, field="lp_done", field_applicable="cm_in_csf")
+        self.required_if(PENDING, field="cm_in_csf", field_required="cm_in_csf_date")
+        self.applicable_if(YES, field="cm_in_csf", field_applicable="cm_in_csf_method")
+        self.required_if(
+            OTHER, field="cm_in_csf_method", field_required="cm_in_csf_method_other"
+        )
+        cm_in_csf_date, lp_date = self.get("cm_in_csf_date"), self.get("lp_date")
+        if cm_in_csf_date is not None and lp_date is not None:
+            self.add_errors(
+                "cm_in_csf_date", lp_date > cm_in_csf_date, "Invalid. Cannot be before LP date"
+            )
+        self.date_after_report_datetime("cm_in_csf_date")
+
+    def validate_pregnancy(self) -> None:
+        if (gender := self.get("gender")) is None:
+            return
+        is_male = gender == MALE
+        if (pregnant := self.get("pregnant")) is not None:
+            self.add_errors(
+                "pregnant", is_male & (pregnant != NOT_APPLICABLE), "Invalid. Subject is male"
+            )
+        if "preg_test_date" in self.columns:
+            self.add_errors(
+                "preg_test_date",
+                is_male & self.provided("preg_test_date"),
+                "Invalid. Subject is male",
+            )
+        self.date_before_report_datetime("preg_test_date")
+        self.applicable_if(FEMALE, field="gender", field_applicable="breast_feeding")
+
+
+def evaluate_screening_log(rows: Iterable[dict]) -> ScreeningLogResult:
+    """Returns per-row validity and field errors for a screening log,
+    e.g. the rows of a clinic CSV read with `csv.DictReader`.
+    """
+    if np is None:
+        raise ImportError(
+            "NumPy is required to evaluate screening logs. "
+            "Install effect-form-validators[numpy]."
+        )
+    rows = list(rows)
+    errors: list[dict[str, str]] = [{} for _ in rows]
+    return ScreeningLogEvaluator(get_columns(rows, errors), errors).evaluate()
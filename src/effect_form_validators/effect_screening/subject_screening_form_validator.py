@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from clinicedc_constants import FEMALE, MALE, NO, NOT_APPLICABLE, OTHER, PENDING, POS, YES
 from django import forms
 from edc_form_validators import INVALID_ERROR, FormValidator
 from edc_prn.modelform_mixins import PrnFormValidatorMixin
 from edc_screening.form_validator_mixins import SubjectScreeningFormValidatorMixin
 
+from .consent_definition_index import get_consent_definition
+
+if TYPE_CHECKING:
+    from edc_consent.consent_definition import ConsentDefinition
+
 THREE_DAYS = 3
 MAX_AGE = 120
 MIN_AGE = 18
@@ -28,6 +35,18 @@ class SubjectScreeningFormValidator(
         self.validate_pregnancy()
         self.validate_suitability_for_study()
 
+    def get_consent_definition_or_raise(self) -> ConsentDefinition:
+        """Returns the consent definition from the interval index,
+        falling back to the registry (and its errors) on a miss.
+        """
+        if self.report_datetime and (
+            cdef := get_consent_definition(
+                self.report_datetime, self.instance._meta.label_lower
+            )
+        ):
+            return cdef
+        return super().get_consent_definition_or_raise()
+
     @property
     def age_in_years(self) -> int | None:
         return self.cleaned_data.get("age_in_years")
@@ -14,6 +14,7 @@ from .chest_xray_form_validator import ChestXrayFormValidator
 from .clinical_note_form_validator import ClinicalNoteFormValidator
 from .diagnosis_form_validator import DiagnosesFormValidator
 from .histopathology_form_validator import HistopathologyFormValidator
+from .lightweight_crf_form_validator import LightweightCrfFormValidator
 from .lp_csf_form_validator import LpCsfFormValidator
 from .medication_adherence_form_validator import MedicationAdherenceFormValidator
 from .mental_status_form_validator import MentalStatusFormValidator
@@ -39,6 +40,7 @@ __all__ = [
     "FluconMissedDosesFormValidator",
     "FlucytMissedDosesFormValidator",
     "HistopathologyFormValidator",
+    "LightweightCrfFormValidator",
     "LpCsfFormValidator",
     "MedicationAdherenceFormValidator",
     "MentalStatusFormValidator",
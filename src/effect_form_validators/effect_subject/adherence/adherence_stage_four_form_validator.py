@@ -1,5 +1,5 @@
-from edc_crf.crf_form_validator import CrfFormValidator
+from ..lightweight_crf_form_validator import LightweightCrfFormValidator
 
 
-class AdherenceStageFourFormValidator(CrfFormValidator):
+class AdherenceStageFourFormValidator(LightweightCrfFormValidator):
     pass
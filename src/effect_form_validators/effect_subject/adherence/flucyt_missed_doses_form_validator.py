@@ -1,3 +1,6 @@
+from functools import cached_property
+
+from asgiref.sync import sync_to_async
 from clinicedc_constants import CONTROL
 from edc_form_validators import FormValidator
 from edc_randomization.utils import (
@@ -5,14 +8,30 @@ from edc_randomization.utils import (
     get_assignment_for_subject,
 )
 
+from ...async_validation import AsyncFormValidatorMixin
+from ...prefetch import ASSIGNMENT, ASSIGNMENT_DESCRIPTION
+from ...query_budget import QueryBudgetFormValidatorMixin
+from ...shared_lookups import shared_lookups
 from .missed_doses_form_validator_mixin import MissedDosesFormValidatorMixin
 
 
-class FlucytMissedDosesFormValidator(MissedDosesFormValidatorMixin, FormValidator):
+class FlucytMissedDosesFormValidator(
+    QueryBudgetFormValidatorMixin,
+    AsyncFormValidatorMixin,
+    MissedDosesFormValidatorMixin,
+    FormValidator,
+):
     field = "day_missed"
     reason_field = "missed_reason"
     reason_other_field = "missed_reason_other"
     day_range = range(1, 16)
+    randomizer_name = "default"
+    async_prefetch = ("assignment", "assignment_description")
+    query_budget = 2
+    data_requirements = {  # noqa: RUF012
+        "assignment": ASSIGNMENT,
+        "assignment_description": ASSIGNMENT_DESCRIPTION,
+    }
 
     def clean(self) -> None:
         self.validate_against_study_arm()
@@ -24,18 +43,55 @@ class FlucytMissedDosesFormValidator(MissedDosesFormValidatorMixin, FormValidato
 
         self.validate_missed_days()
 
-    def validate_against_study_arm(self):
-        assignment = get_assignment_for_subject(
-            subject_identifier=self.cleaned_data.get("adherence").subject_identifier,
-            randomizer_name="default",
+    @property
+    def subject_identifier(self) -> str:
+        return self.cleaned_data.get("adherence").subject_identifier
+
+    @cached_property
+    def assignment(self) -> str:
+        return shared_lookups.get_or_load(
+            ASSIGNMENT,
+            self.subject_identifier,
+            lambda: get_assignment_for_subject(
+                subject_identifier=self.subject_identifier,
+                randomizer_name=self.randomizer_name,
+            ),
         )
-        assignment_description = get_assignment_description_for_subject(
-            subject_identifier=self.cleaned_data.get("adherence").subject_identifier,
-            randomizer_name="default",
+
+    @cached_property
+    def assignment_description(self) -> str:
+        return shared_lookups.get_or_load(
+            ASSIGNMENT_DESCRIPTION,
+            self.subject_identifier,
+            lambda: get_assignment_description_for_subject(
+                subject_identifier=self.subject_identifier,
+                randomizer_name=self.randomizer_name,
+            ),
         )
 
+    async def aget_assignment(self) -> str:
+        return await shared_lookups.aget_or_load(
+            ASSIGNMENT,
+            self.subject_identifier,
+            lambda: sync_to_async(get_assignment_for_subject)(
+                subject_identifier=self.subject_identifier,
+                randomizer_name=self.randomizer_name,
+            ),
+        )
+
+    async def aget_assignment_description(self) -> str:
+        return await shared_lookups.aget_or_load(
+            ASSIGNMENT_DESCRIPTION,
+            self.subject_identifier,
+            lambda: sync_to_async(get_assignment_description_for_subject)(
+                subject_identifier=self.subject_identifier,
+                randomizer_name=self.randomizer_name,
+            ),
+        )
+
+    def validate_against_study_arm(self):
         self.not_required_if_true(
-            assignment == CONTROL,
+            self.assignment == CONTROL,
             field=self.field,
-            msg=f"Participant is on {CONTROL} arm ({assignment_description}).",
+            msg=f"Participant is on {CONTROL} arm ({self.assignment_description}).",
         )
@@ -1,14 +1,41 @@
+from functools import cached_property
+
 from clinicedc_constants import DEFAULTED, LT, NO, NOT_APPLICABLE, YES
 from edc_crf.crf_form_validator import CrfFormValidator
 from edc_form_validators import INVALID_ERROR
 from edc_screening.utils import get_subject_screening_model_cls
 
+from ..async_validation import AsyncFormValidatorMixin
+from ..prefetch import SUBJECT_SCREENING
+from ..query_budget import QueryBudgetFormValidatorMixin
+from ..shared_lookups import shared_lookups
+
+
+class ArvHistoryFormValidator(
+    QueryBudgetFormValidatorMixin, AsyncFormValidatorMixin, CrfFormValidator
+):
+    subject_screening_fields = ("cd4_date", "cd4_value")
+    async_prefetch = ("subject_screening",)
+    query_budget = 1
+    data_requirements = {"subject_screening": SUBJECT_SCREENING}  # noqa: RUF012
 
-class ArvHistoryFormValidator(CrfFormValidator):
-    @property
+    @cached_property
     def subject_screening(self):
-        return get_subject_screening_model_cls().objects.get(
-            subject_identifier=self.subject_identifier
+        return shared_lookups.get_or_load(
+            SUBJECT_SCREENING,
+            self.subject_identifier,
+            lambda: get_subject_screening_model_cls().objects.get(
+                subject_identifier=self.subject_identifier
+            ),
+        )
+
+    async def aget_subject_screening(self):
+        return await shared_lookups.aget_or_load(
+            SUBJECT_SCREENING,
+            self.subject_identifier,
+            lambda: get_subject_screening_model_cls().objects.aget(
+                subject_identifier=self.subject_identifier
+            ),
         )
 
     def clean(self) -> None:
@@ -1,4 +1,5 @@
 from datetime import date
+from functools import cached_property
 
 from clinicedc_constants import NO, NORMAL, OTHER, YES
 from dateutil.relativedelta import relativedelta
@@ -7,8 +8,25 @@ from edc_form_validators import INVALID_ERROR
 from edc_utils.date import to_local
 from edc_utils.text import formatted_date
 
+from ..async_validation import AsyncFormValidatorMixin
+from ..prefetch import SUBJECT_HISTORY
+from ..query_budget import QueryBudgetFormValidatorMixin
+from ..slow_validation import SlowValidationLogMixin
+from ..subject_history import SubjectHistory, aload_subject_history, subject_histories
+
+
+class ChestXrayFormValidator(
+    SlowValidationLogMixin,
+    QueryBudgetFormValidatorMixin,
+    AsyncFormValidatorMixin,
+    CrfFormValidator,
+):
+    async_prefetch = ("subject_history",)
+    # signs and symptoms, consent and chest x-ray history
+    query_budget = 3
+    data_requirements = {"subject_history": SUBJECT_HISTORY}  # noqa: RUF012
+    subject_history_fields = ("chest_xray_date",)
 
-class ChestXrayFormValidator(CrfFormValidator):
     def clean(self):
         self.validate_against_ssx()
 
@@ -86,31 +104,34 @@ class ChestXrayFormValidator(CrfFormValidator):
                     INVALID_ERROR,
                 )
 
+    @cached_property
+    def subject_history(self) -> SubjectHistory:
+        """Returns this subject's chest x-ray history, shared by saves
+        for the subject until a chest x-ray is saved or deleted.
+        """
+        return subject_histories.get(
+            self.instance.__class__,
+            self.related_visit.subject_identifier,
+            fields=self.subject_history_fields,
+            related_visit_model_attr=self.related_visit_model_attr,
+        )
+
+    async def aget_subject_history(self) -> SubjectHistory:
+        return await aload_subject_history(
+            self.instance.__class__,
+            self.related_visit.subject_identifier,
+            fields=self.subject_history_fields,
+            related_visit_model_attr=self.related_visit_model_attr,
+        )
+
     @property
     def previous_chest_xray_date(self) -> date | None:
-        """Returns the date of a previous chest xray, if it exists."""
-        try:
-            exclude_opts = dict(id=self.instance.id)
-        except AttributeError:
-            exclude_opts = {}
-        exclude_opts.update(
-            {
-                f"{self.related_visit_model_attr}__appointment__timepoint__lt": (
-                    self.related_visit.appointment.timepoint
-                )
-            }
-        )
-        qs = (
-            self.instance.__class__.objects.filter(
-                **{f"{self.related_visit_model_attr}": self.related_visit}
-            )
-            .exclude(**exclude_opts)
-            .order_by(
-                f"{self.related_visit_model_attr}__visit_code",
-                f"{self.related_visit_model_attr}__visit_code_sequence",
-            )
+        """Returns the date of a previous chest xray, if it exists.
+
+        That is, the date last saved for this visit.
+        """
+        return self.subject_history.at(
+            "chest_xray_date",
+            timepoint=self.related_visit.appointment.timepoint,
+            visit_code_sequence=self.related_visit.visit_code_sequence,
         )
-        try:
-            return qs.last().chest_xray_date
-        except AttributeError:
-            return None
@@ -1,7 +1,8 @@
 from clinicedc_constants import YES
-from edc_crf.crf_form_validator import CrfFormValidator
 
+from .lightweight_crf_form_validator import LightweightCrfFormValidator
 
-class ClinicalNoteFormValidator(CrfFormValidator):
+
+class ClinicalNoteFormValidator(LightweightCrfFormValidator):
     def clean(self):
         self.required_if(YES, field="has_comment", field_required="comments")
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from clinicedc_constants import YES
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from edc_form_validators import INVALID_ERROR
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from numpy.typing import ArrayLike
+
+FLUCYT_DOSE_SLOTS = ("0400", "1000", "1600", "2200")
+FLUCYT_DOSE_FIELDS = tuple(f"flucyt_dose_{slot}" for slot in FLUCYT_DOSE_SLOTS)
+NEXT_DOSE_CUTOFF_HOUR = 13
+NEXT_DOSE_ERRORS = {
+    "1000": "Invalid. Expected 'at 10:00' if first dose before 13:00.",
+    "1600": "Invalid. Expected 'at 16:00' if first dose on or after 13:00.",
+}
+
+# ((lower weight bound in kg, daily dose in mg/d, dose per slot in mg), ...)
+# from the protocol dosing table, e.g. ((40.0, 4000, (1000, 1000, 1000, 1000)), ...).
+# The last band applies to all heavier participants; below the first band
+# no expected dose is derived. The expected dose is not checked if not set.
+FLUCYT_DOSE_BANDS_SETTING = "EFFECT_FORM_VALIDATORS_FLUCYT_DOSE_BANDS"
+
+
+class FlucytDoseBand(NamedTuple):
+    lower_weight: float
+    dose: int
+    slots: tuple[int, int, int, int]
+
+
+class FlucytDoseTable:
+    """Weight-band lookup of the expected daily flucytosine dose and
+    its split across the dose slots.
+    """
+
+    def __init__(self, bands):
+        self.bands = tuple(
+            sorted(
+                (FlucytDoseBand(float(w), dose, tuple(slots)) for w, dose, slots in bands),
+                key=lambda band: band.lower_weight,
+            )
+        )
+        self.lower_weights = [band.lower_weight for band in self.bands]
+        for band in self.bands:
+            if len(band.slots) != len(FLUCYT_DOSE_SLOTS) or sum(band.slots) != band.dose:
+                raise ValueError(f"Invalid flucytosine dose band. Got {band}.")
+
+    def get_band(self, weight: float | None) -> FlucytDoseBand | None:
+        if weight is None:
+            return None
+        index = bisect_right(self.lower_weights, weight)
+        return self.bands[index - 1] if index else None
+
+    def get_doses(self, weights: ArrayLike) -> Any:
+        """Returns expected daily doses for an array of weights (NaN
+        where the weight is missing or below the first band).
+        """
+        weights = np.asarray(weights, dtype=float)
+        doses = np.array([np.nan, *(band.dose for band in self.bands)], dtype=float)
+        indexes = np.searchsorted(self.lower_weights, weights, side="right")
+        indexes[np.isnan(weights)] = 0
+        return doses[indexes]
+
+
+@cache
+def get_flucyt_dose_table() -> FlucytDoseTable | None:
+    """Returns the dose table from settings, or None if not set."""
+    bands = getattr(settings, FLUCYT_DOSE_BANDS_SETTING, None)
+    return FlucytDoseTable(bands) if bands else None
+
+
+@receiver(setting_changed, dispatch_uid="effect_form_validators_flucyt_dose_table")
+def reset_flucyt_dose_table(setting: str, **kwargs) -> None:
+    if setting == FLUCYT_DOSE_BANDS_SETTING:
+        get_flucyt_dose_table.cache_clear()
+
+
+class FlucytDoses(NamedTuple):
+    """The prescribed daily flucytosine dose and its split across the
+    four dose slots, parsed once from cleaned_data.
+    """
+
+    total: int | None
+    slots: tuple[int | None, int | None, int | None, int | None]
+
+    @classmethod
+    def from_cleaned_data(cls, cleaned_data: dict) -> FlucytDoses:
+        return cls(
+            total=cleaned_data.get("flucyt_dose"),
+            slots=tuple(cleaned_data.get(fld) for fld in FLUCYT_DOSE_FIELDS),
+        )
+
+    @property
+    def slots_total(self) -> int:
+        return sum(dose for dose in self.slots if dose is not None)
+
+    @property
+    def slots_match_total(self) -> bool:
+        return self.total is None or self.slots_total == self.total
+
+    def get_required_candidates(self, required: bool) -> list[str]:
+        """Returns the dose fields that may fail `required_if`, that is,
+        missing when required or provided when not required.
+        """
+        return [
+            fld
+            for fld, dose in zip(FLUCYT_DOSE_FIELDS, self.slots, strict=True)
+            if (dose is None) == required
+        ]
+
+
+def get_expected_next_flucyt_dose(first_dose_datetime: datetime) -> str:
+    """Returns the next dose slot expected after the first dose."""
+    return "1000" if first_dose_datetime.hour < NEXT_DOSE_CUTOFF_HOUR else "1600"
+
+
+def check_flucyt_doses(
+    totals: ArrayLike, slots: ArrayLike, required: ArrayLike | None = None
+) -> tuple[Any, Any]:
+    """Returns (sum_mismatch, missing_slot) boolean arrays for a batch of
+    prescriptions.
+
+    `totals` has shape (n,) and `slots` shape (n, 4), with NaN for
+    missing doses. `required`, if given, is a boolean array of shape (n,)
+    (e.g. flucyt_initiated == YES).
+    """
+    totals = np.asarray(totals, dtype=float)
+    slots = np.asarray(slots, dtype=float).reshape(-1, len(FLUCYT_DOSE_SLOTS))
+    sum_mismatch = ~np.isnan(totals) & (np.nansum(slots, axis=1) != totals)
+    missing_slot = np.isnan(slots).any(axis=1)
+    if required is not None:
+        missing_slot &= np.asarray(required, dtype=bool)
+    return sum_mismatch, missing_slot
+
+
+class FlucytDosesFormValidatorMixin:
+    """Validates the flucytosine dose split for forms with the
+    `flucyt_dose` and `flucyt_dose_<slot>` fields.
+    """
+
+    vital_signs_model = "effect_subject.vitalsigns"
+
+    @cached_property
+    def vital_signs_weight(self: Any) -> float | None:
+        """Returns the weight (kg) recorded on the vital signs CRF of
+        this visit, or None.
+        """
+        try:
+            model_cls = django_apps.get_model(self.vital_signs_model)
+        except LookupError:
+            return None
+        return (
+            model_cls.objects.filter(**{self.related_visit_model_attr: self.related_visit})
+            .values_list("weight", flat=True)
+            .first()
+        )
+
+    def validate_flucyt_dose_expected(self: Any) -> None:
+        """Validates `flucyt_dose_expected` against the weight band of
+        the visit's vital signs weight, if available.
+
+        Not checked, and the weight not queried, unless the dose bands
+        are set in settings.
+        """
+        dose_table = get_flucyt_dose_table()
+        dose_expected = self.cleaned_data.get("flucyt_dose_expected")
+        if dose_table is None or dose_expected is None or self.vital_signs_weight is None:
+            return
+        band = dose_table.get_band(self.vital_signs_weight)
+        if band and band.dose != dose_expected:
+            self.raise_validation_error(
+                {
+                    "flucyt_dose_expected": (
+                        f"Invalid. Expected {band.dose} mg/d for weight "
+                        f"{self.vital_signs_weight} kg (see Vital Signs)."
+                    )
+                },
+                INVALID_ERROR,
+            )
+
+    def validate_flucyt_doses(self: Any, field: str) -> FlucytDoses:
+        """Validates the slot doses are required if `field` is YES and
+        sum to `flucyt_dose`.
+
+        Only the dose fields that can fail are passed to `required_if`
+        so the common (valid) case is a single pass over the slots.
+        """
+        doses = FlucytDoses.from_cleaned_data(self.cleaned_data)
+        required = self.cleaned_data.get(field) == YES
+        for fld in doses.get_required_candidates(required):
+            self.required_if(
+                YES,
+                field=field,
+                field_required=fld,
+                field_required_evaluate_as_int=True,
+            )
+
+        if not doses.slots_match_total:
+            error_msg = (
+                "Invalid. "
+                "Expected sum of individual doses to match prescribed flucytosine "
+                f"dose ({doses.total} mg/d)."
+            )
+            self.raise_validation_error(
+                {fld: error_msg for fld in FLUCYT_DOSE_FIELDS}, INVALID_ERROR
+            )
+        return doses
+
+    def validate_flucyt_next_dose(self: Any) -> None:
+        """Validates `flucyt_next_dose` is the slot after the first dose."""
+        if dose_datetime := self.cleaned_data.get("flucyt_dose_datetime"):
+            expected = get_expected_next_flucyt_dose(dose_datetime)
+            if self.cleaned_data.get("flucyt_next_dose") != expected:
+                self.raise_validation_error(
+                    {"flucyt_next_dose": NEXT_DOSE_ERRORS[expected]}, INVALID_ERROR
+                )
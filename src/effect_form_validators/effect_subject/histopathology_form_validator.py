@@ -1,7 +1,8 @@
 from typing import Any
 
 from clinicedc_constants import POS, YES
-from edc_crf.crf_form_validator import CrfFormValidator
+
+from .lightweight_crf_form_validator import LightweightCrfFormValidator
 
 
 class HistopathologyFormValidatorMixin:
@@ -26,7 +27,7 @@ class HistopathologyFormValidatorMixin:
 
 class HistopathologyFormValidator(
     HistopathologyFormValidatorMixin,
-    CrfFormValidator,
+    LightweightCrfFormValidator,
 ):
     def clean(self):
         self.validate_histopathology()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from edc_crf.crf_form_validator import CrfFormValidator
+
+from ..query_budget import QueryBudgetFormValidatorMixin
+
+
+class LightweightCrfFormValidator(QueryBudgetFormValidatorMixin, CrfFormValidator):
+    """Fast-path base for CRF form validators whose rules only read
+    their own cleaned_data.
+
+    Unlike CrfFormValidator, it does not look up the subject's consent
+    on each save to check the report datetime is not before the
+    consent datetime. The CRF model form already runs that check (see
+    RequiresConsentModelFormMixin). The window period check on the
+    report datetime still runs. Do not use it for rules that need the
+    consent, registered subject or any other model.
+    """
+
+    query_budget = 0
+
+    def validate_crf_report_datetime(self) -> None:
+        if self.report_datetime:
+            self.validate_crf_datetime_in_window_period()
@@ -4,11 +4,16 @@ from edc_form_validators import INVALID_ERROR
 from edc_visit_schedule.constants import WEEK10, WEEK24
 from edc_visit_schedule.utils import is_baseline
 
-GLASGOW_COMA_SCORE = 15
+from ..visit_applicability import VisitApplicabilityFormValidatorMixin
+from .mental_status_symptoms import GLASGOW_COMA_SCORE, get_symptom_summary
 
 
-class MentalStatusFormValidator(CrfFormValidator):
+class MentalStatusFormValidator(VisitApplicabilityFormValidatorMixin, CrfFormValidator):
     reportable_fields = ("reportable_as_ae", "patient_admitted")
+    visit_applicable_fields = {  # noqa: RUF012
+        "require_help": (WEEK10, WEEK24),
+        "any_other_problems": (WEEK10, WEEK24),
+    }
 
     def clean(self) -> None:
         self.validate_if_baseline()
@@ -53,26 +58,17 @@ class MentalStatusFormValidator(CrfFormValidator):
 
     def validate_if_scheduled_w10_or_w24(self):
         """Validate criteria that only holds in w10 or w24 visits."""
-        scheduled_w10_or_w24 = (
-            self.related_visit.visit_code in [WEEK10, WEEK24]
-            and self.related_visit.visit_code_sequence == 0
-        )
-        self.applicable_if_true(
-            condition=scheduled_w10_or_w24,
-            field_applicable="require_help",
-            not_applicable_msg=(
-                "This field is only applicable at scheduled Week 10 and Month 6 visits."
-            ),
-        )
-        self.applicable_if_true(
-            condition=scheduled_w10_or_w24,
-            field_applicable="any_other_problems",
-            not_applicable_msg=(
-                "This field is only applicable at scheduled Week 10 and Month 6 visits."
-            ),
-        )
+        visit_applicable = self.visit_applicable
+        for fld in ["require_help", "any_other_problems"]:
+            self.applicable_if_true(
+                condition=fld in visit_applicable,
+                field_applicable=fld,
+                not_applicable_msg=(
+                    "This field is only applicable at scheduled Week 10 and Month 6 visits."
+                ),
+            )
 
-        if scheduled_w10_or_w24:
+        if visit_applicable:
             require_help_response = self.cleaned_data.get("require_help")
             any_other_problems_response = self.cleaned_data.get("any_other_problems")
             modified_rankin_score_response = self.cleaned_data.get("modified_rankin_score")
@@ -102,42 +98,14 @@ class MentalStatusFormValidator(CrfFormValidator):
             if error_msg:
                 self.raise_validation_error(error_msg, INVALID_ERROR)
 
-    def validate_reporting_fieldset(self):  # noqa: C901
+    def validate_reporting_fieldset(self):
+        summary = get_symptom_summary(self.cleaned_data)
         for fld in self.reportable_fields:
             if self.cleaned_data.get(fld) in [YES, NO]:
                 # ae and hospitalization NOT reportable if no symptoms
-                if (
-                    self.cleaned_data.get("recent_seizure") == NO
-                    and self.cleaned_data.get("behaviour_change") == NO
-                    and self.cleaned_data.get("confusion") == NO
-                    and self.cleaned_data.get("require_help") in [NOT_APPLICABLE, NO]
-                    and self.cleaned_data.get("any_other_problems") in [NOT_APPLICABLE, NO]
-                    and self.cleaned_data.get("modified_rankin_score") == "0"
-                    and self.cleaned_data.get("ecog_score") == "0"
-                    and self.cleaned_data.get("glasgow_coma_score") == GLASGOW_COMA_SCORE
-                ):
+                if summary.no_symptoms:
                     self.raise_not_applicable(field=fld, msg="No symptoms were reported.")
 
-            elif self.cleaned_data.get(fld) == NOT_APPLICABLE:
+            elif self.cleaned_data.get(fld) == NOT_APPLICABLE and summary.finding:
                 # ae and hospitalization ARE reportable if any symptoms
-                if self.cleaned_data.get("recent_seizure") == YES:
-                    self.raise_applicable(field=fld, msg="A recent seizure was reported.")
-                elif self.cleaned_data.get("behaviour_change") == YES:
-                    self.raise_applicable(field=fld, msg="Behaviour change was reported.")
-                elif self.cleaned_data.get("confusion") == YES:
-                    self.raise_applicable(field=fld, msg="Confusion reported.")
-                elif self.cleaned_data.get("require_help") == YES:
-                    self.raise_applicable(
-                        field=fld, msg="Reported help required for activities."
-                    )
-                elif self.cleaned_data.get("any_other_problems") == YES:
-                    self.raise_applicable(field=fld, msg="Other problems reported.")
-                elif self.cleaned_data.get("modified_rankin_score") != "0":
-                    self.raise_applicable(field=fld, msg="Modified Rankin Score > 0.")
-                elif self.cleaned_data.get("ecog_score") != "0":
-                    self.raise_applicable(field=fld, msg="ECOG score > 0.")
-                elif (
-                    self.cleaned_data.get("glasgow_coma_score")
-                    and self.cleaned_data.get("glasgow_coma_score") < GLASGOW_COMA_SCORE
-                ):
-                    self.raise_applicable(field=fld, msg="GCS < 15.")
+                self.raise_applicable(field=fld, msg=summary.finding)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from clinicedc_constants import NO, NOT_APPLICABLE, YES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+GLASGOW_COMA_SCORE = 15
+
+EQ = "eq"
+NE = "ne"
+IN = "in"
+LT = "lt"
+
+
+class SymptomCondition(NamedTuple):
+    field: str
+    op: str
+    value: Any
+    message: str = ""
+
+    def matches(self, value: Any) -> bool:
+        if self.op == EQ:
+            return value == self.value
+        if self.op == NE:
+            return value != self.value
+        if self.op == IN:
+            return value in self.value
+        return bool(value) and value < self.value
+
+    def matches_array(self, values: ArrayLike) -> Any:
+        values = np.asarray(values)
+        if self.op == EQ:
+            return values == self.value
+        if self.op == NE:
+            return values != self.value
+        if self.op == IN:
+            return np.logical_or.reduce([values == value for value in self.value])
+        values = values.astype(float)
+        with np.errstate(invalid="ignore"):
+            return (values > 0) & (values < self.value)
+
+
+# all must hold for "no symptoms"; AE and hospitalization are then
+# NOT reportable
+NO_SYMPTOM_CONDITIONS = (
+    SymptomCondition("recent_seizure", EQ, NO),
+    SymptomCondition("behaviour_change", EQ, NO),
+    SymptomCondition("confusion", EQ, NO),
+    SymptomCondition("require_help", IN, (NOT_APPLICABLE, NO)),
+    SymptomCondition("any_other_problems", IN, (NOT_APPLICABLE, NO)),
+    SymptomCondition("modified_rankin_score", EQ, "0"),
+    SymptomCondition("ecog_score", EQ, "0"),
+    SymptomCondition("glasgow_coma_score", EQ, GLASGOW_COMA_SCORE),
+)
+
+# in order, the first that holds makes AE and hospitalization reportable
+SYMPTOM_FINDINGS = (
+    SymptomCondition("recent_seizure", EQ, YES, "A recent seizure was reported."),
+    SymptomCondition("behaviour_change", EQ, YES, "Behaviour change was reported."),
+    SymptomCondition("confusion", EQ, YES, "Confusion reported."),
+    SymptomCondition("require_help", EQ, YES, "Reported help required for activities."),
+    SymptomCondition("any_other_problems", EQ, YES, "Other problems reported."),
+    SymptomCondition("modified_rankin_score", NE, "0", "Modified Rankin Score > 0."),
+    SymptomCondition("ecog_score", NE, "0", "ECOG score > 0."),
+    SymptomCondition("glasgow_coma_score", LT, GLASGOW_COMA_SCORE, "GCS < 15."),
+)
+
+
+class SymptomSummary(NamedTuple):
+    no_symptoms: bool
+    finding: str | None
+
+
+def get_symptom_summary(cleaned_data: dict) -> SymptomSummary:
+    """Returns the no-symptom flag and the message of the first
+    positive finding, if any.
+    """
+    return SymptomSummary(
+        no_symptoms=all(
+            cond.matches(cleaned_data.get(cond.field)) for cond in NO_SYMPTOM_CONDITIONS
+        ),
+        finding=next(
+            (
+                cond.message
+                for cond in SYMPTOM_FINDINGS
+                if cond.matches(cleaned_data.get(cond.field))
+            ),
+            None,
+        ),
+    )
+
+
+def get_symptom_summaries(columns: dict[str, ArrayLike]) -> tuple[Any, Any]:
+    """Returns (no_symptoms, finding) arrays for exported mental
+    status data given as {field: column}.
+
+    `finding` holds the message of the first positive finding per row,
+    or None.
+    """
+    size = len(next(iter(columns.values())))
+    no_symptoms = np.ones(size, dtype=bool)
+    for cond in NO_SYMPTOM_CONDITIONS:
+        no_symptoms &= cond.matches_array(columns[cond.field])
+    finding = np.full(size, None, dtype=object)
+    for cond in reversed(SYMPTOM_FINDINGS):
+        finding[cond.matches_array(columns[cond.field])] = cond.message
+    return no_symptoms, finding
+
+
+def check_reporting_fieldset(
+    columns: dict[str, ArrayLike], reportable_fields: tuple[str, ...]
+) -> dict[str, Any]:
+    """Returns {field: errors} for the reportable fields, where errors
+    is an object array holding the form's message per row, or None.
+    """
+    no_symptoms, finding = get_symptom_summaries(columns)
+    errors = {}
+    for fld in reportable_fields:
+        values = np.asarray(columns[fld])
+        errors[fld] = np.full(len(values), None, dtype=object)
+        errors[fld][((values == YES) | (values == NO)) & no_symptoms] = (
+            "This field is not applicable. No symptoms were reported."
+        )
+        reportable = (values == NOT_APPLICABLE) & (finding != None)  # noqa: E711
+        errors[fld][reportable] = [
+            f"This field is applicable. {msg}" for msg in finding[reportable]
+        ]
+    return errors
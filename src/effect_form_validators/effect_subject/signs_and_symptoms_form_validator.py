@@ -14,13 +14,14 @@ from clinicedc_constants import (
     VISUAL_LOSS,
     YES,
 )
-from clinicedc_utils import get_display_from_choices
 from django import forms
 from edc_crf.crf_form_validator import CrfFormValidator
 from edc_form_validators import INVALID_ERROR
 from edc_model.utils import timedelta_from_duration_dh_field
 from edc_visit_tracking.choices import ASSESSMENT_TYPES, ASSESSMENT_WHO_CHOICES
 
+from ..utils import get_display
+
 
 class SignsAndSymptomsFormValidator(CrfFormValidator):
     reportable_fields = ("reportable_as_ae", "patient_admitted")
@@ -61,12 +62,12 @@ class SignsAndSymptomsFormValidator(CrfFormValidator):
             if self.in_person_visit():
                 error_msg = (
                     "Invalid. Cannot be 'Unknown' if this is an "
-                    f"'{get_display_from_choices(ASSESSMENT_TYPES, IN_PERSON)}' visit."
+                    f"'{get_display(ASSESSMENT_TYPES, IN_PERSON)}' visit."
                 )
             elif self.related_visit.assessment_who == PATIENT:
                 error_msg = (
                     "Invalid. Cannot be 'Unknown' if spoke to "
-                    f"'{get_display_from_choices(ASSESSMENT_WHO_CHOICES, PATIENT)}'."
+                    f"'{get_display(ASSESSMENT_WHO_CHOICES, PATIENT)}'."
                 )
 
             if error_msg:
@@ -167,7 +168,7 @@ class SignsAndSymptomsFormValidator(CrfFormValidator):
                 field_applicable=fld,
                 not_applicable_msg=(
                     "Invalid. This field is not applicable if this is not "
-                    f"an '{get_display_from_choices(ASSESSMENT_TYPES, IN_PERSON)}' visit."
+                    f"an '{get_display(ASSESSMENT_TYPES, IN_PERSON)}' visit."
                 ),
             )
 
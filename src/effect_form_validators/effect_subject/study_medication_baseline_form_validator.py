@@ -4,8 +4,18 @@ from edc_form_validators import INVALID_ERROR
 from edc_utils.text import formatted_date
 from edc_visit_schedule.utils import is_baseline
 
+from ..prefetch import VITAL_SIGNS_WEIGHT
+from ..query_budget import QueryBudgetFormValidatorMixin
+from .flucytosine_dosing import FlucytDosesFormValidatorMixin
+
+
+class StudyMedicationBaselineFormValidator(
+    QueryBudgetFormValidatorMixin, FlucytDosesFormValidatorMixin, CrfFormValidator
+):
+    # vital signs weight
+    query_budget = 1
+    data_requirements = {"vital_signs_weight": VITAL_SIGNS_WEIGHT}  # noqa: RUF012
 
-class StudyMedicationBaselineFormValidator(CrfFormValidator):
     def clean(self) -> None:
         if not is_baseline(instance=self.related_visit):
             self.raise_validation_error(
@@ -90,7 +100,7 @@ class StudyMedicationBaselineFormValidator(CrfFormValidator):
                 {"flucyt_dose_datetime": f"Expected {dte_as_str}"}, INVALID_ERROR
             )
 
-        # TODO: 'flucyt_dose_expected' to be calculated or validated against vital signs weight
+        self.validate_flucyt_dose_expected()
 
         self.required_if(
             YES,
@@ -99,59 +109,11 @@ class StudyMedicationBaselineFormValidator(CrfFormValidator):
             field_required_evaluate_as_int=True,
         )
 
-        dose_fields = [f"flucyt_dose_{hr}" for hr in ["0400", "1000", "1600", "2200"]]
-        for dose_field in dose_fields:
-            self.required_if(
-                YES,
-                field="flucyt_initiated",
-                field_required=dose_field,
-                field_required_evaluate_as_int=True,
-            )
-
-        if self.cleaned_data.get("flucyt_dose") is not None and sum(
-            self.cleaned_data.get(fld)
-            for fld in dose_fields
-            if self.cleaned_data.get(fld) is not None
-        ) != self.cleaned_data.get("flucyt_dose"):
-            error_msg = (
-                "Invalid. "
-                "Expected sum of individual doses to match prescribed flucytosine "
-                f"dose ({self.cleaned_data.get('flucyt_dose')} mg/d)."
-            )
-            self.raise_validation_error({fld: error_msg for fld in dose_fields}, INVALID_ERROR)
+        self.validate_flucyt_doses(field="flucyt_initiated")
 
         self.applicable_if(YES, field="flucyt_initiated", field_applicable="flucyt_next_dose")
 
-        if self.cleaned_data.get("flucyt_dose_datetime"):
-            if (
-                self.cleaned_data.get("flucyt_dose_datetime")
-                < self.cleaned_data.get("flucyt_dose_datetime").replace(
-                    hour=13, minute=0, second=0, microsecond=0
-                )
-                and self.cleaned_data.get("flucyt_next_dose") != "1000"
-            ):
-                self.raise_validation_error(
-                    {
-                        "flucyt_next_dose": (
-                            "Invalid. Expected 'at 10:00' if first dose before 13:00."
-                        ),
-                    },
-                    INVALID_ERROR,
-                )
-            elif (
-                self.cleaned_data.get("flucyt_dose_datetime")
-                >= self.cleaned_data.get("flucyt_dose_datetime").replace(
-                    hour=13, minute=0, second=0, microsecond=0
-                )
-            ) and self.cleaned_data.get("flucyt_next_dose") != "1600":
-                self.raise_validation_error(
-                    {
-                        "flucyt_next_dose": (
-                            "Invalid. Expected 'at 16:00' if first dose on or after 13:00."
-                        ),
-                    },
-                    INVALID_ERROR,
-                )
+        self.validate_flucyt_next_dose()
 
         self.not_required_if(
             NOT_APPLICABLE,
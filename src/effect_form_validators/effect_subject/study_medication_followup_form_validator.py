@@ -1,11 +1,26 @@
-from clinicedc_constants import NO, NOT_APPLICABLE, OTHER, PER_PROTOCOL, YES
+from clinicedc_constants import CONTROL, NO, NOT_APPLICABLE, OTHER, PER_PROTOCOL, YES
 from edc_crf.crf_form_validator import CrfFormValidator
 from edc_form_validators import INVALID_ERROR
 from edc_utils.text import formatted_date
 from edc_visit_schedule.utils import is_baseline
 
+from ..query_budget import QueryBudgetFormValidatorMixin
+from .flucytosine_dosing import FlucytDosesFormValidatorMixin
+from .study_medication_schedule import (
+    StudyMedicationScheduleFormValidatorMixin,
+    get_flucyt_last_day,
+)
+
+
+class StudyMedicationFollowupFormValidator(
+    QueryBudgetFormValidatorMixin,
+    StudyMedicationScheduleFormValidatorMixin,
+    FlucytDosesFormValidatorMixin,
+    CrfFormValidator,
+):
+    # randomization assignment
+    query_budget = 1
 
-class StudyMedicationFollowupFormValidator(CrfFormValidator):
     def clean(self) -> None:
         if is_baseline(instance=self.related_visit):
             self.raise_validation_error(
@@ -67,8 +82,17 @@ class StudyMedicationFollowupFormValidator(CrfFormValidator):
             field_required="flucon_dose",
             field_required_evaluate_as_int=True,
         )
-        # TODO: Validate dose against visit/protocol, if differs, require flucon_notes
-        #   - differs could be not modified, or modified to value not expected
+        expected_dose = self.schedule_entry.flucon_dose if self.schedule_entry else None
+        self.required_if_true(
+            condition=(
+                expected_dose is not None
+                and self.cleaned_data.get("flucon_dose") is not None
+                and self.cleaned_data.get("flucon_dose") != expected_dose
+            ),
+            field_required="flucon_notes",
+            required_msg=f"Fluconazole dose not {expected_dose} mg/d.",
+            inverse=False,
+        )
 
         self.applicable_if(YES, field="flucon_modified", field_applicable="flucon_next_dose")
 
@@ -80,8 +104,6 @@ class StudyMedicationFollowupFormValidator(CrfFormValidator):
         )
 
     def validate_flucyt(self):
-        # TODO: 'flucyt_modified' should be NA if on control arm
-        # TODO: 'flucyt_modified' should be NA > 15 days if on intervention arm
         self.not_applicable_if(
             NO,
             field="modifications",
@@ -89,6 +111,21 @@ class StudyMedicationFollowupFormValidator(CrfFormValidator):
             inverse=False,
         )
 
+        if (
+            self.schedule_entry
+            and not self.schedule_entry.flucyt_applicable
+            and self.cleaned_data.get("flucyt_modified")
+            and self.cleaned_data.get("flucyt_modified") != NOT_APPLICABLE
+        ):
+            if self.assignment == CONTROL:
+                error_msg = f"This field is not applicable. Participant is on {CONTROL} arm."
+            else:
+                error_msg = (
+                    "This field is not applicable. "
+                    f"Flucytosine is not given after day {get_flucyt_last_day()}."
+                )
+            self.raise_validation_error({"flucyt_modified": error_msg}, INVALID_ERROR)
+
         self.required_if(YES, field="flucyt_modified", field_required="flucyt_dose_datetime")
         # TODO: what are we trying to check/prevent here? Is this right?
         if (
@@ -111,26 +148,7 @@ class StudyMedicationFollowupFormValidator(CrfFormValidator):
             field_required_evaluate_as_int=True,
         )
 
-        dose_fields = [f"flucyt_dose_{hr}" for hr in ["0400", "1000", "1600", "2200"]]
-        for dose_field in dose_fields:
-            self.required_if(
-                YES,
-                field="flucyt_modified",
-                field_required=dose_field,
-                field_required_evaluate_as_int=True,
-            )
-
-        if self.cleaned_data.get("flucyt_dose") is not None and sum(
-            self.cleaned_data.get(fld)
-            for fld in dose_fields
-            if self.cleaned_data.get(fld) is not None
-        ) != self.cleaned_data.get("flucyt_dose"):
-            error_msg = (
-                "Invalid. "
-                "Expected sum of individual doses to match prescribed flucytosine "
-                f"dose ({self.cleaned_data.get('flucyt_dose')} mg/d)."
-            )
-            self.raise_validation_error({fld: error_msg for fld in dose_fields}, INVALID_ERROR)
+        self.validate_flucyt_doses(field="flucyt_modified")
 
         # TODO: Validate dose against visit/protocol, if differs, require flucyt_notes
         #   - differs could be not modified, or modified to value not expected
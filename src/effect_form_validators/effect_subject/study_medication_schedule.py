@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from functools import cached_property
+from threading import RLock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from clinicedc_constants import CONTROL, INTERVENTION
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from edc_randomization.exceptions import NotRegistered
+from edc_randomization.site_randomizers import site_randomizers
+from edc_randomization.utils import get_assignment_for_subject
+from edc_visit_schedule.site_visit_schedules import site_visit_schedules
+
+from ..prefetch import ASSIGNMENT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+ARMS = (CONTROL, INTERVENTION)
+
+# ((from study day, fluconazole mg/d), ...) as prescribed at the visit,
+# e.g. ((1, 1200), (14, 800), (70, 200)). The switch visits prescribe
+# the dose for the next phase. Not checked if not set.
+FLUCON_DOSE_SCHEDULE_SETTING = "EFFECT_FORM_VALIDATORS_FLUCON_DOSE_SCHEDULE"
+# last study day flucytosine is given on the intervention arm, e.g. 15.
+# Not checked if not set.
+FLUCYT_LAST_DAY_SETTING = "EFFECT_FORM_VALIDATORS_FLUCYT_LAST_DAY"
+
+
+class StudyMedicationScheduleEntry(NamedTuple):
+    study_day: int
+    flucon_dose: int | None
+    flucyt_applicable: bool
+
+
+def get_flucon_dose_schedule() -> tuple[tuple[int, int], ...]:
+    return tuple(sorted(getattr(settings, FLUCON_DOSE_SCHEDULE_SETTING, None) or ()))
+
+
+def get_flucyt_last_day() -> int | None:
+    return getattr(settings, FLUCYT_LAST_DAY_SETTING, None)
+
+
+def get_flucon_dose(
+    study_day: int, flucon_dose_schedule: tuple[tuple[int, int], ...]
+) -> int | None:
+    index = bisect_right([day for day, _ in flucon_dose_schedule], study_day)
+    return flucon_dose_schedule[index - 1][1] if index else None
+
+
+def get_visit_days() -> dict[str, int]:
+    """Returns {visit_code: study day} for all registered visits.
+
+    Day 1 is the baseline visit (rbase of zero days).
+    """
+    visit_days = {}
+    for visit_schedule in site_visit_schedules.visit_schedules.values():
+        for schedule in visit_schedule.schedules.values():
+            for visit in schedule.visits.values():
+                visit_days[visit.code] = visit.rbase.days + 1
+    return visit_days
+
+
+def build_schedule_index(
+    visit_days: dict[str, int],
+    flucon_dose_schedule: Iterable[tuple[int, int]] = (),
+    flucyt_last_day: int | None = None,
+) -> dict[tuple[str, str], StudyMedicationScheduleEntry]:
+    """Returns the protocol schedule keyed by (arm, visit_code).
+
+    Flucytosine is given on the intervention arm only.
+    """
+    flucon_dose_schedule = tuple(sorted(flucon_dose_schedule))
+    index = {}
+    for visit_code, study_day in visit_days.items():
+        flucon_dose = get_flucon_dose(study_day, flucon_dose_schedule)
+        for arm in ARMS:
+            index[(arm, visit_code)] = StudyMedicationScheduleEntry(
+                study_day=study_day,
+                flucon_dose=flucon_dose,
+                flucyt_applicable=arm == INTERVENTION
+                and (flucyt_last_day is None or study_day <= flucyt_last_day),
+            )
+    return index
+
+
+class StudyMedicationScheduleCache:
+    """Holds the schedule index, rebuilding it if the registered visit
+    schedules change.
+
+    Nothing is kept until the visit schedule registry is loaded.
+    """
+
+    def __init__(self):
+        self._index: dict[tuple[str, str], StudyMedicationScheduleEntry] | None = None
+        self._registered: tuple[str, ...] = ()
+        self._lock = RLock()
+
+    @property
+    def index(self) -> dict[tuple[str, str], StudyMedicationScheduleEntry]:
+        if not site_visit_schedules.loaded:
+            return {}
+        registered = tuple(site_visit_schedules.visit_schedules)
+        if self._index is None or registered != self._registered:
+            with self._lock:
+                if self._index is None or registered != self._registered:
+                    self._index = build_schedule_index(
+                        get_visit_days(), get_flucon_dose_schedule(), get_flucyt_last_day()
+                    )
+                    self._registered = registered
+        return self._index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._registered = ()
+
+
+study_medication_schedule = StudyMedicationScheduleCache()
+
+
+@receiver(setting_changed, dispatch_uid="effect_form_validators_study_medication_schedule")
+def reset_study_medication_schedule(setting: str, **kwargs) -> None:
+    if setting in [FLUCON_DOSE_SCHEDULE_SETTING, FLUCYT_LAST_DAY_SETTING]:
+        study_medication_schedule.clear()
+
+
+def get_study_medication_schedule() -> dict[tuple[str, str], StudyMedicationScheduleEntry]:
+    """Returns the protocol schedule index (empty until the visit
+    schedule registry is loaded).
+    """
+    return study_medication_schedule.index
+
+
+class StudyMedicationScheduleFormValidatorMixin:
+    """Looks up the protocol schedule entry for the participant's arm
+    and the current visit.
+
+    Protocol checks are skipped if the randomizer is not registered
+    or the visit is not in the schedule index.
+    """
+
+    randomizer_name = "default"
+    data_requirements = {"assignment": ASSIGNMENT}  # noqa: RUF012
+
+    @cached_property
+    def assignment(self: Any) -> str | None:
+        try:
+            site_randomizers.get(self.randomizer_name)
+        except NotRegistered:
+            return None
+        return get_assignment_for_subject(
+            subject_identifier=self.related_visit.subject_identifier,
+            randomizer_name=self.randomizer_name,
+        )
+
+    @cached_property
+    def schedule_entry(self: Any) -> StudyMedicationScheduleEntry | None:
+        if not self.assignment:
+            return None
+        return get_study_medication_schedule().get(
+            (self.assignment, self.related_visit.visit_code)
+        )
@@ -12,7 +12,6 @@ from clinicedc_constants import (
     UNKNOWN,
     YES,
 )
-from clinicedc_utils import get_display_from_choices
 from django import forms
 from edc_appointment.constants import MISSED_APPT
 from edc_constants.choices import ALIVE_DEAD_UNKNOWN_NA_MISSED
@@ -26,8 +25,11 @@ from edc_visit_tracking.choices import (
 from edc_visit_tracking.constants import MISSED_VISIT
 from edc_visit_tracking.form_validators import VisitFormValidator
 
+from ..slow_validation import SlowValidationLogMixin
+from ..utils import get_display
 
-class SubjectVisitFormValidator(VisitFormValidator):
+
+class SubjectVisitFormValidator(SlowValidationLogMixin, VisitFormValidator):
     validate_missed_visit_reason = False
 
     def clean(self):
@@ -157,10 +159,10 @@ class SubjectVisitFormValidator(VisitFormValidator):
     ) -> str:
         return (
             "Invalid. Did not expect information source: "
-            f"'{get_display_from_choices(VISIT_INFO_SOURCE2, info_source)}' for "
-            f"'{get_display_from_choices(ASSESSMENT_TYPES, assessment_type)}' "
+            f"'{get_display(VISIT_INFO_SOURCE2, info_source)}' for "
+            f"'{get_display(ASSESSMENT_TYPES, assessment_type)}' "
             "assessment with "
-            f"'{get_display_from_choices(ASSESSMENT_WHO_CHOICES, assessment_who)}.'"
+            f"'{get_display(ASSESSMENT_WHO_CHOICES, assessment_who)}.'"
         )
 
     def validate_info_source_against_assessment_type_who(self):
@@ -182,9 +184,7 @@ class SubjectVisitFormValidator(VisitFormValidator):
 
             if is_baseline(instance=self.cleaned_data.get("appointment")):
                 survival_status = self.cleaned_data.get("survival_status")
-                choice = get_display_from_choices(
-                    ALIVE_DEAD_UNKNOWN_NA_MISSED, survival_status
-                )
+                choice = get_display(ALIVE_DEAD_UNKNOWN_NA_MISSED, survival_status)
                 error_msg = f"Invalid: Cannot be '{choice}' at baseline"
 
             elif self.cleaned_data.get("assessment_type") == IN_PERSON:
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from edc_vitals.utils import get_dia_upper, get_g3_fever_lower, get_sys_upper
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike
+
+
+@dataclass(frozen=True)
+class VitalSignThresholds:
+    """Snapshot of the edc_vitals AE grading thresholds."""
+
+    sys_upper: Any
+    dia_upper: Any
+    g3_fever_lower: Any
+
+    @classmethod
+    def from_settings(cls) -> VitalSignThresholds:
+        return cls(
+            sys_upper=get_sys_upper(),
+            dia_upper=get_dia_upper(),
+            g3_fever_lower=get_g3_fever_lower(),
+        )
+
+
+class VitalSignsGrade(NamedTuple):
+    severe_htn: Any
+    gte_g3_fever: Any
+
+
+@cache
+def get_vital_sign_thresholds() -> VitalSignThresholds:
+    """Returns the threshold snapshot, building it on first use."""
+    return VitalSignThresholds.from_settings()
+
+
+@receiver(setting_changed, dispatch_uid="effect_form_validators_vital_sign_thresholds")
+def reset_vital_sign_thresholds(**kwargs) -> None:
+    get_vital_sign_thresholds.cache_clear()
+
+
+def grade_vital_signs(
+    sys: ArrayLike | None = None,
+    dia: ArrayLike | None = None,
+    temperature: ArrayLike | None = None,
+    thresholds: VitalSignThresholds | None = None,
+) -> VitalSignsGrade:
+    """Returns (severe_htn, gte_g3_fever) in one pass.
+
+    Grades as `edc_vitals.has_severe_htn` (both `sys` and `dia`
+    required) and `has_g3_fever or has_g4_fever`. Accepts scalars, or
+    NumPy arrays (missing values as NaN) to grade a whole export in one
+    vectorized call.
+    """
+    thresholds = thresholds or get_vital_sign_thresholds()
+    if np is not None and any(
+        isinstance(value, np.ndarray) for value in (sys, dia, temperature)
+    ):
+        sys, dia, temperature = (
+            np.asarray(np.nan if value is None else value, dtype=float)
+            for value in (sys, dia, temperature)
+        )
+        with np.errstate(invalid="ignore"):
+            return VitalSignsGrade(
+                severe_htn=~np.isnan(sys)
+                & ~np.isnan(dia)
+                & ((sys >= thresholds.sys_upper) | (dia >= thresholds.dia_upper)),
+                gte_g3_fever=temperature >= thresholds.g3_fever_lower,
+            )
+    return VitalSignsGrade(
+        severe_htn=bool(
+            sys is not None
+            and dia is not None
+            and (sys >= thresholds.sys_upper or dia >= thresholds.dia_upper)
+        ),
+        gte_g3_fever=bool(temperature and temperature >= thresholds.g3_fever_lower),
+    )
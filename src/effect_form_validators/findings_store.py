@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .revalidation_store import Finding
+
+# row, subject, validator, field, code
+KEY_COLUMNS = ("row", "subject", "validator", "field", "code")
+# the message is stored with each issue but is not part of its key, so
+# an issue whose message is reworded is unchanged, not resolved and new
+COLUMNS = (*KEY_COLUMNS, "message")
+WIDTH = len(COLUMNS)
+RUN_NAME = re.compile(r"^[\w.-]+$")
+
+# an issue of a finding as its big-endian ids, one per key column, so
+# keys sort as the tuples of ids
+Key = bytes
+KEY = struct.Struct(f">{len(KEY_COLUMNS)}I")
+
+
+class StoredIssue(NamedTuple):
+    """A single issue of a finding, as stored per run."""
+
+    label_lower: str
+    pk: str
+    subject_identifier: str | None
+    validator: str
+    field: str
+    code: str | None
+    message: str
+
+
+class FindingsDiff(NamedTuple):
+    new: list[Key]
+    resolved: list[Key]
+    unchanged: list[Key]
+
+
+def merge_diff(old: list[Key], new: list[Key]) -> FindingsDiff:
+    """Returns the diff of two sorted lists of unique keys in one pass
+    over both.
+    """
+    diff = FindingsDiff([], [], [])
+    i = j = 0
+    while i < len(old) and j < len(new):
+        if old[i] == new[j]:
+            diff.unchanged.append(old[i])
+            i += 1
+            j += 1
+        elif old[i] < new[j]:
+            diff.resolved.append(old[i])
+            i += 1
+        else:
+            diff.new.append(new[j])
+            j += 1
+    diff.resolved.extend(old[i:])
+    diff.new.extend(new[j:])
+    return diff
+
+
+class Dictionary:
+    """An append-only file of interned values, one JSON value per
+    line; a value's id is its line number.
+
+    A last line torn by an interrupted flush is ignored and overwritten
+    by the next flush. Its values were not yet referred to by any
+    record (see `FindingsStore.append`).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: list[Any] = []
+        self.ids: dict[Any, int] = {}
+        self.pending: list[Any] = []
+        # bytes up to the end of the last complete line
+        self.size = 0
+        if path.exists():
+            data = path.read_bytes()
+            self.size = data.rfind(b"\n") + 1
+            for line in data[: self.size].splitlines():
+                self.add(self.from_json(json.loads(line)))
+        self.pending.clear()
+
+    @staticmethod
+    def from_json(value: Any) -> Any:
+        return tuple(value) if isinstance(value, list) else value
+
+    def add(self, value: Any) -> int:
+        if (value_id := self.ids.get(value)) is None:
+            value_id = self.ids[value] = len(self.values)
+            self.values.append(value)
+            self.pending.append(value)
+        return value_id
+
+    def flush(self) -> None:
+        if self.pending:
+            with self.path.open("ab") as f:
+                f.truncate(self.size)
+                f.writelines(f"{json.dumps(value)}\n".encode() for value in self.pending)
+                self.size = f.tell()
+            self.pending.clear()
+
+
+class FindingsStore:
+    """Stores the findings of bulk validation runs in a directory, one
+    append-only file of fixed-width, little-endian records per run.
+
+    Each issue of a finding is a record of unsigned 32-bit ids into
+    append-only dictionaries of rows (`label_lower`, `pk`), subject
+    identifiers, validators, fields, codes and messages, shared by all
+    runs. Runs compare as sorted arrays of packed ids of all but the
+    message (see `diff`). The message of a key is the one last read,
+    e.g. that of the new run of a diff.
+
+    For example:
+
+        store = FindingsStore("findings")
+        store.write_run("2026-10-19", revalidate_sharded(revalidation_store))
+        diff = store.diff("2026-10-12", "2026-10-19")
+
+    Not safe for concurrent writers.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        (self.path / "runs").mkdir(parents=True, exist_ok=True)
+        self.dictionaries = {
+            column: Dictionary(self.path / f"{column}.dict") for column in COLUMNS
+        }
+        # {key: message id} of the keys read
+        self.messages: dict[Key, int] = {}
+
+    def get_run_path(self, run: str) -> Path:
+        if not RUN_NAME.match(run):
+            raise ValueError(f"Invalid run name. Got {run!r}.")
+        return self.path / "runs" / f"{run}.bin"
+
+    @property
+    def runs(self) -> list[str]:
+        return sorted(path.stem for path in (self.path / "runs").glob("*.bin"))
+
+    def append(self, run: str, findings: Iterable[Finding]) -> int:
+        """Appends the findings' issues to the run and returns the
+        number of records written.
+        """
+        d = [self.dictionaries[column] for column in COLUMNS]
+        records = array("I")
+        for finding in findings:
+            row = d[0].add((finding.label_lower, str(finding.pk)))
+            subject = d[1].add(finding.subject_identifier)
+            validator = d[2].add(finding.validator)
+            for field, code, message in finding.issues:
+                records.extend((row, subject, validator))
+                records.extend((d[3].add(field), d[4].add(code), d[5].add(message)))
+        # dictionaries first, so records never refer to unwritten ids
+        for dictionary in d:
+            dictionary.flush()
+        if sys.byteorder == "big":
+            records.byteswap()
+        with self.get_run_path(run).open("ab") as f:
+            records.tofile(f)
+        return len(records) // WIDTH
+
+    def write_run(self, run: str, findings: Iterable[Finding]) -> int:
+        """Writes the findings as a new run, replacing any existing run
+        of the same name.
+        """
+        self.get_run_path(run).unlink(missing_ok=True)
+        return self.append(run, findings)
+
+    def read_keys(self, run: str) -> list[Key]:
+        """Returns the sorted, unique keys of the run's records.
+
+        The messages of the keys are kept for `decode`; a later record
+        of a key replaces the message of an earlier one.
+        """
+        path = self.get_run_path(run)
+        if not path.exists():
+            raise FileNotFoundError(f"Unknown findings run. Got {run!r}.")
+        records = array("I")
+        with path.open("rb") as f:
+            data = f.read()
+        # ignore a record torn by an interrupted append
+        record_size = WIDTH * records.itemsize
+        records.frombytes(data[: len(data) - len(data) % record_size])
+        message_ids = records[WIDTH - 1 :: WIDTH]
+        # stored little-endian, keys are big-endian
+        if sys.byteorder == "little":
+            records.byteswap()
+        data = records.tobytes()
+        messages = dict(
+            zip(
+                (data[i : i + KEY.size] for i in range(0, len(data), record_size)),
+                message_ids,
+                strict=True,
+            )
+        )
+        self.messages.update(messages)
+        return sorted(messages)
+
+    def decode(self, key: Key) -> StoredIssue:
+        """Returns the issue of a key read by `read_keys`."""
+        row, subject, validator, field, code = (
+            self.dictionaries[column].values[value_id]
+            for column, value_id in zip(KEY_COLUMNS, KEY.unpack(key), strict=True)
+        )
+        message = self.dictionaries["message"].values[self.messages[key]]
+        return StoredIssue(*row, subject, validator, field, code, message)
+
+    def get_sort_key(self, key: Key) -> tuple[str, str, str, str]:
+        """Returns (model, subject, pk, field) of a key without decoding
+        the rest of the issue.
+        """
+        row, subject, _, field, _ = KEY.unpack(key)
+        label_lower, pk = self.dictionaries["row"].values[row]
+        subject_identifier = self.dictionaries["subject"].values[subject]
+        return (
+            label_lower,
+            subject_identifier or "",
+            pk,
+            self.dictionaries["field"].values[field],
+        )
+
+    def iter_issues(
+        self, keys: Iterable[Key], limit: int | None = None
+    ) -> Iterator[StoredIssue]:
+        """Yields the decoded issues, ordered by model, subject, pk and
+        field, the first `limit` only if given.
+
+        Only the issues yielded are decoded.
+        """
+        if limit is None:
+            keys = sorted(keys, key=self.get_sort_key)
+        else:
+            keys = heapq.nsmallest(limit, keys, key=self.get_sort_key)
+        yield from map(self.decode, keys)
+
+    def diff(self, old_run: str, new_run: str) -> FindingsDiff:
+        """Returns the keys of findings new in, resolved by and
+        unchanged in `new_run` compared with `old_run`.
+        """
+        return merge_diff(self.read_keys(old_run), self.read_keys(new_run))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from effect_form_validators.findings_store import FindingsStore
+
+
+class Command(BaseCommand):
+    help = "Reports findings new in, resolved by and unchanged in a bulk validation run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="findings store directory")
+        parser.add_argument("old_run")
+        parser.add_argument("new_run")
+        parser.add_argument(
+            "--show",
+            action="append",
+            choices=["new", "resolved", "unchanged"],
+            default=[],
+            help="list findings of this kind (repeatable)",
+        )
+        parser.add_argument("--limit", type=int, default=100, help="findings listed per kind")
+
+    def handle(self, *args, **options):  # noqa: ARG002
+        start = time.perf_counter()
+        store = FindingsStore(options["path"])
+        try:
+            diff = store.diff(options["old_run"], options["new_run"])
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(e) from e
+        self.stdout.write(
+            f"{options['old_run']} -> {options['new_run']}: {len(diff.new)} new, "
+            f"{len(diff.resolved)} resolved, {len(diff.unchanged)} unchanged "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+        for kind in options["show"]:
+            keys = getattr(diff, kind)
+            self.stdout.write(f"\n{kind.capitalize()} ({len(keys)})")
+            for issue in store.iter_issues(keys, limit=options["limit"]):
+                self.stdout.write(
+                    f"  {issue.label_lower} {issue.pk} {issue.subject_identifier or ''} "
+                    f"{issue.validator} {issue.field} {issue.code or ''}: {issue.message}"
+                )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any
+
+from django import forms
+from django.core.exceptions import NON_FIELD_ERRORS
+
+if TYPE_CHECKING:
+    from edc_form_validators import FormValidator
+
+
+class ValidationIssue:
+    """A single validation finding.
+
+    `message` is the (interned) message text and doubles as the message
+    key when comparing findings across runs.
+    """
+
+    __slots__ = ("code", "field", "message")
+
+    def __init__(self, field: str, code: str | None, message: str):
+        self.field = sys.intern(field)
+        self.code = sys.intern(code) if code else None
+        self.message = sys.intern(message)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.field!r}, {self.code!r}, {self.message!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return (self.field, self.code, self.message) == (
+            other.field,
+            other.code,
+            other.message,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.field, self.code, self.message))
+
+    def as_tuple(self) -> tuple[str, str | None, str]:
+        return self.field, self.code, self.message
+
+
+class ValidationOutcome:
+    """The result of running a form validator without raising.
+
+    Validators stop at the first rule that fails, so `issues` holds the
+    finding(s) of that rule.
+    """
+
+    __slots__ = ("issues", "validator")
+
+    def __init__(self, validator: str, issues: tuple[ValidationIssue, ...] = ()):
+        self.validator = validator
+        self.issues = issues
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.validator!r}, {self.issues!r})"
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def raise_if_invalid(self) -> None:
+        """Raises a ValidationError equivalent to the form path."""
+        if self.issues:
+            raise forms.ValidationError(
+                {issue.field: issue.message for issue in self.issues},
+                code=self.issues[0].code,
+            )
+
+    @classmethod
+    def from_validation_error(
+        cls,
+        validator: str,
+        error: forms.ValidationError,
+        default_code: str | None = None,
+    ) -> ValidationOutcome:
+        if hasattr(error, "error_dict"):
+            items = error.error_dict.items()
+        else:
+            items = [(NON_FIELD_ERRORS, error.error_list)]
+        issues = []
+        for field, errors in items:
+            issues.extend(
+                ValidationIssue(field, err.code or default_code, err.messages[0])
+                for err in errors
+            )
+        return cls(validator, tuple(issues))
+
+
+def validate(
+    form_validator_cls: type[FormValidator],
+    cleaned_data: dict,
+    **kwargs: Any,
+) -> ValidationOutcome:
+    """Returns a ValidationOutcome for `cleaned_data` instead of raising.
+
+    Runs the same `clean()` as the Django form path. The rules still
+    raise, so an invalid row costs the same as on the form path; the
+    first ValidationError is converted to compact `ValidationIssue`
+    records at this boundary and is not kept by the caller.
+
+    For example:
+
+        outcome = validate(VitalSignsFormValidator, cleaned_data, model=VitalSigns)
+        if not outcome:
+            ...
+    """
+    form_validator = form_validator_cls(cleaned_data=cleaned_data, **kwargs)
+    return validate_instance(form_validator)
+
+
+def validate_instance(form_validator: FormValidator) -> ValidationOutcome:
+    """Returns a ValidationOutcome for an instantiated form validator."""
+    name = form_validator.__class__.__name__
+    try:
+        form_validator.validate()
+    except forms.ValidationError as e:
+        error_codes = getattr(form_validator, "_error_codes", None)
+        return ValidationOutcome.from_validation_error(
+            name, e, default_code=error_codes[-1] if error_codes else None
+        )
+    return ValidationOutcome(name)
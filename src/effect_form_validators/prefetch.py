@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps as django_apps
+
+from .subject_history import SubjectHistory, iter_subject_histories
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db import models
+    from edc_form_validators import FormValidator
+
+SUBJECT_SCREENING = "subject_screening"
+REGISTERED_SUBJECT_SCREENING = "registered_subject_screening"
+ASSIGNMENT = "assignment"
+ASSIGNMENT_DESCRIPTION = "assignment_description"
+SUBJECT_HISTORY = "subject_history"
+VITAL_SIGNS_WEIGHT = "vital_signs_weight"
+
+# {attribute name: {subject_identifier: value}}
+Snapshot = dict[str, dict[str, Any]]
+
+Loader = Callable[[list[str], type, "type[models.Model] | None"], dict[str, Any]]
+
+loaders: dict[str, Loader] = {}
+
+# loaders reading the reference snapshot instead of the database,
+# used by `prefetch` for bulk runs
+snapshot_loaders: dict[str, Loader] = {}
+
+
+def register_loader(name: str):
+    """Decorator to register a batch loader.
+
+    A loader takes (subject_identifiers, form_validator_cls, model_cls)
+    and returns {subject_identifier: value} using a fixed number of
+    queries regardless of the number of subjects. Subjects without
+    data are left out.
+    """
+
+    def wrapper(func: Loader) -> Loader:
+        loaders[name] = func
+        return func
+
+    return wrapper
+
+
+def register_snapshot_loader(name: str):
+    """Decorator to register a loader reading the reference snapshot
+    (see `reference_snapshot`) in place of the loader `name`.
+
+    Returns values for the subjects in the snapshot only, or {} if no
+    snapshot is configured.
+    """
+
+    def wrapper(func: Loader) -> Loader:
+        snapshot_loaders[name] = func
+        return func
+
+    return wrapper
+
+
+def get_data_requirements(form_validator_cls: type) -> dict[str, str]:
+    """Returns {attribute name: loader name} declared by the validator
+    in `data_requirements`.
+    """
+    return dict(getattr(form_validator_cls, "data_requirements", {}))
+
+
+@register_loader(SUBJECT_SCREENING)
+def load_subject_screenings(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+    return {
+        obj.subject_identifier: obj
+        for obj in get_subject_screening_model_cls().objects.filter(
+            subject_identifier__in=subject_identifiers
+        )
+    }
+
+
+@register_loader(REGISTERED_SUBJECT_SCREENING)
+def load_registered_subject_screenings(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    """Returns screening instances found via the registered subject's
+    screening identifier.
+    """
+    from edc_registration import get_registered_subject_model_cls  # noqa: PLC0415
+    from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+    screening_identifiers = dict(
+        get_registered_subject_model_cls()
+        .objects.filter(subject_identifier__in=subject_identifiers)
+        .values_list("screening_identifier", "subject_identifier")
+    )
+    return {
+        screening_identifiers[obj.screening_identifier]: obj
+        for obj in get_subject_screening_model_cls().objects.filter(
+            screening_identifier__in=list(screening_identifiers)
+        )
+    }
+
+
+def get_assignments(subject_identifiers: list[str], randomizer_name: str) -> dict[str, str]:
+    from edc_randomization.exceptions import NotRegistered  # noqa: PLC0415
+    from edc_randomization.site_randomizers import site_randomizers  # noqa: PLC0415
+
+    try:
+        randomizer_cls = site_randomizers.get(randomizer_name)
+    except NotRegistered:
+        return {}
+    return dict(
+        randomizer_cls.model_cls()
+        .objects.filter(subject_identifier__in=subject_identifiers)
+        .values_list("subject_identifier", "assignment")
+    )
+
+
+@register_loader(ASSIGNMENT)
+def load_assignments(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    return get_assignments(subject_identifiers, form_validator_cls.randomizer_name)
+
+
+@register_loader(ASSIGNMENT_DESCRIPTION)
+def load_assignment_descriptions(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    from edc_randomization.site_randomizers import site_randomizers  # noqa: PLC0415
+
+    assignments = get_assignments(subject_identifiers, form_validator_cls.randomizer_name)
+    if not assignments:
+        return {}
+    descriptions = site_randomizers.get(
+        form_validator_cls.randomizer_name
+    ).assignment_description_map
+    return {
+        subject_identifier: descriptions.get(assignment)
+        for subject_identifier, assignment in assignments.items()
+    }
+
+
+@register_loader(SUBJECT_HISTORY)
+def load_subject_histories(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    """Returns a SubjectHistory of the validator's
+    `subject_history_fields` per subject, empty if the subject has no
+    rows.
+    """
+    fields = form_validator_cls.subject_history_fields
+    related_visit_model_attr = model_cls.related_visit_model_attr()
+    histories = {
+        subject_history.subject_identifier: subject_history
+        for subject_history in iter_subject_histories(
+            model_cls,
+            fields,
+            related_visit_model_attr=related_visit_model_attr,
+            subject_identifiers=subject_identifiers,
+        )
+    }
+    for subject_identifier in subject_identifiers:
+        histories.setdefault(
+            subject_identifier, SubjectHistory(subject_identifier, fields, [])
+        )
+    return histories
+
+
+@register_loader(VITAL_SIGNS_WEIGHT)
+def load_vital_signs_weights(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    """Returns the weight recorded on the vital signs CRF of the visit
+    of each subject's `model_cls` row, None if not recorded.
+
+    For CRFs completed once per subject, e.g. at baseline.
+    """
+    try:
+        vital_signs_model_cls = django_apps.get_model(form_validator_cls.vital_signs_model)
+    except LookupError:
+        return {}
+    attr = model_cls.related_visit_model_attr()
+    related_visits = model_cls.objects.filter(
+        **{f"{attr}__subject_identifier__in": subject_identifiers}
+    ).values(attr)
+    weights = dict(
+        vital_signs_model_cls.objects.filter(**{f"{attr}__in": related_visits}).values_list(
+            f"{attr}__subject_identifier", "weight"
+        )
+    )
+    return {
+        subject_identifier: weights.get(subject_identifier)
+        for subject_identifier in subject_identifiers
+    }
+
+
+def get_snapshot_rows(subject_identifiers: list[str]) -> dict[str, Any]:
+    from .reference_snapshot import get_reference_snapshot  # noqa: PLC0415
+
+    reference_snapshot = get_reference_snapshot()
+    if reference_snapshot is None:
+        return {}
+    return reference_snapshot.get_rows(subject_identifiers)
+
+
+@register_snapshot_loader(SUBJECT_SCREENING)
+@register_snapshot_loader(REGISTERED_SUBJECT_SCREENING)
+def load_snapshot_screenings(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    """Returns the subject's ReferenceRow in place of the screening
+    instance.
+
+    Only the screening fields held by the snapshot (`cd4_date`,
+    `cd4_value`, `eligibility_datetime`) are available.
+    """
+    return get_snapshot_rows(subject_identifiers)
+
+
+@register_snapshot_loader(ASSIGNMENT)
+def load_snapshot_assignments(
+    subject_identifiers: list[str],
+    form_validator_cls: type,
+    model_cls: type[models.Model] | None,
+) -> dict[str, Any]:
+    """Returns the assignments held by the snapshot, those of
+    `REFERENCE_RANDOMIZER_NAME`, for validators using that randomizer.
+
+    Subjects not randomized when the snapshot was written are left out,
+    so they are loaded from the database.
+    """
+    from .reference_snapshot import REFERENCE_RANDOMIZER_NAME  # noqa: PLC0415
+
+    if form_validator_cls.randomizer_name != REFERENCE_RANDOMIZER_NAME:
+        return {}
+    return {
+        subject_identifier: row.assignment
+        for subject_identifier, row in get_snapshot_rows(subject_identifiers).items()
+        if row.assignment
+    }
+
+
+def prefetch(
+    form_validator_cls: type,
+    subject_identifiers: Iterable[str],
+    model_cls: type[models.Model] | None = None,
+    use_reference_snapshot: bool = False,
+) -> Snapshot:
+    """Returns a snapshot of the validator's declared data
+    requirements for a batch of subjects.
+
+    Runs each loader once for the batch, so bulk runs issue a handful
+    of `__in` queries per batch instead of queries per row.
+
+    With `use_reference_snapshot`, values are read from the reference
+    snapshot where a snapshot loader is registered and the database is
+    only queried for subjects not in it. The snapshot is as old as its
+    last write, so this is for bulk runs only.
+    """
+    subject_identifiers = sorted({s for s in subject_identifiers if s})
+    if not subject_identifiers:
+        return {}
+    snapshot = {}
+    for name, loader_name in get_data_requirements(form_validator_cls).items():
+        values = {}
+        if use_reference_snapshot and loader_name in snapshot_loaders:
+            values = snapshot_loaders[loader_name](
+                subject_identifiers, form_validator_cls, model_cls
+            )
+        if missing := [s for s in subject_identifiers if s not in values]:
+            values.update(loaders[loader_name](missing, form_validator_cls, model_cls))
+        snapshot[name] = values
+    return snapshot
+
+
+def apply_snapshot(
+    form_validator: FormValidator, snapshot: Snapshot, subject_identifier: str
+) -> FormValidator:
+    """Stores the subject's prefetched values as the validator's
+    cached attributes.
+
+    Values missing from the snapshot are left to the validator's own
+    (lazy) lookup.
+    """
+    for name, values in snapshot.items():
+        if subject_identifier in values:
+            form_validator.__dict__[name] = values[subject_identifier]
+    return form_validator
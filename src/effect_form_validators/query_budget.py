@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connection
+
+from .slow_validation import QueryCounter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from contextlib import AbstractContextManager
+
+logger = logging.getLogger(__name__)
+
+
+def get_query_budget(form_validator_cls: type) -> int | None:
+    """Returns the number of queries a validation may run, or None
+    if the validator declares no budget.
+    """
+    return getattr(form_validator_cls, "query_budget", None)
+
+
+@contextmanager
+def wrapping_rules(
+    form_validator: Any, wrapper: Callable[[], AbstractContextManager]
+) -> Iterator[None]:
+    """Runs the validator's own rules, `clean()`, inside `wrapper()`.
+
+    The base checks of the edc form validator classes, e.g. the
+    consent and window period lookups of CrfFormValidator, run
+    outside of it.
+    """
+    clean = form_validator.clean
+    wrapped = form_validator.__dict__.get("clean")
+
+    def wrapped_clean() -> None:
+        with wrapper():
+            clean()
+
+    form_validator.clean = wrapped_clean
+    try:
+        yield
+    finally:
+        if wrapped is None:
+            del form_validator.clean
+        else:
+            form_validator.clean = wrapped
+
+
+class QueryBudgetFormValidatorMixin:
+    """Declares the number of DB queries the validator's own rules,
+    `clean()`, may run in one validation.
+
+    Set `query_budget` to the queries the validator's own lookups need;
+    the base checks of the edc form validator classes are not counted.
+    With `EFFECT_FORM_VALIDATORS_QUERY_BUDGET_WARN`, a validation that
+    runs more logs a warning. See also `QueryBudgetTestMixin`.
+    """
+
+    query_budget: int | None = None
+
+    def validate(self: Any) -> None:
+        if self.query_budget is None or not getattr(
+            settings, "EFFECT_FORM_VALIDATORS_QUERY_BUDGET_WARN", False
+        ):
+            return super().validate()
+        query_counter = QueryCounter()
+        try:
+            with wrapping_rules(self, lambda: connection.execute_wrapper(query_counter)):
+                return super().validate()
+        finally:
+            if query_counter.count > self.query_budget:
+                logger.warning(
+                    "Query budget exceeded by %s. Ran %s queries, budget is %s.",
+                    self.__class__.__name__,
+                    query_counter.count,
+                    self.query_budget,
+                    extra={
+                        "form_validator": self.__class__.__name__,
+                        "queries": query_counter.count,
+                        "query_budget": self.query_budget,
+                    },
+                )
+
+
+class QueryBudgetTestMixin:
+    """Test mixin for a form validator that fails any validation
+    whose rules run more queries than the validator's `query_budget`.
+
+    For example:
+
+        class ArvHistoryFormValidator(QueryBudgetTestMixin, FormValidatorTestMixin, Base):
+            ...
+    """
+
+    def validate(self: Any) -> None:
+        query_budget = get_query_budget(self.__class__)
+        if query_budget is None:
+            return super().validate()
+        queries: list[str] = []
+
+        def capture(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with wrapping_rules(self, lambda: connection.execute_wrapper(capture)):
+            try:
+                return super().validate()
+            finally:
+                if len(queries) > query_budget:
+                    sql = "\n".join(queries)
+                    raise AssertionError(
+                        f"{self.__class__.__name__} ran {len(queries)} queries, "
+                        f"budget is {query_budget}.\n{sql}"
+                    )
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import os
+from datetime import UTC, date, datetime
+from pathlib import Path
+from tempfile import mkstemp
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from .prefetch import get_assignments
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# the randomizer whose assignments snapshots hold
+REFERENCE_RANDOMIZER_NAME = "default"
+
+SUBJECT_IDENTIFIER_LENGTH = 24
+ASSIGNMENT_LENGTH = 16
+
+# missing integers are stored as -1, missing dates/datetimes as NaT
+MISSING_INT = -1
+
+REFERENCE_DTYPE = [
+    ("subject_identifier", f"S{SUBJECT_IDENTIFIER_LENGTH}"),
+    ("cd4_date", "datetime64[D]"),
+    ("cd4_value", "int32"),
+    ("eligibility_datetime", "datetime64[s]"),
+    ("consent_datetime", "datetime64[s]"),
+    ("assignment", f"S{ASSIGNMENT_LENGTH}"),
+]
+
+
+class ReferenceRow(NamedTuple):
+    subject_identifier: str
+    cd4_date: date | None
+    cd4_value: int | None
+    eligibility_datetime: datetime | None
+    consent_datetime: datetime | None
+    assignment: str | None
+
+
+def as_utc_datetime64(value: datetime | None) -> Any:
+    if value is None:
+        return np.datetime64("NaT", "s")
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return np.datetime64(value, "s")
+
+
+def get_reference_rows(
+    subject_identifiers: Iterable[str] | None = None,
+    randomizer_name: str = REFERENCE_RANDOMIZER_NAME,
+) -> list[ReferenceRow]:
+    """Returns a ReferenceRow per consented subject from the screening,
+    registered subject and randomization list tables.
+    """
+    from edc_registration import get_registered_subject_model_cls  # noqa: PLC0415
+    from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+    filter_opts = {"subject_identifier__isnull": False}
+    if subject_identifiers is not None:
+        filter_opts["subject_identifier__in"] = list(subject_identifiers)
+    screening = {
+        row[0]: row[1:]
+        for row in get_subject_screening_model_cls()
+        .objects.filter(**filter_opts)
+        .values_list("subject_identifier", "cd4_date", "cd4_value", "eligibility_datetime")
+    }
+    consent_datetimes = dict(
+        get_registered_subject_model_cls()
+        .objects.filter(**filter_opts)
+        .values_list("subject_identifier", "consent_datetime")
+    )
+    assignments = get_assignments(list(screening), randomizer_name)
+    return [
+        ReferenceRow(
+            subject_identifier,
+            *values,
+            consent_datetimes.get(subject_identifier),
+            assignments.get(subject_identifier),
+        )
+        for subject_identifier, values in screening.items()
+    ]
+
+
+def encode(value: str, length: int, field: str) -> bytes:
+    """Returns the value as bytes, raising rather than letting NumPy
+    truncate a value longer than the column.
+    """
+    encoded = value.encode()
+    if len(encoded) > length:
+        raise ValueError(
+            f"Value too long for reference snapshot column `{field}`. "
+            f"Expected at most {length} bytes. Got {value!r}."
+        )
+    return encoded
+
+
+def build_reference_array(rows: Iterable[ReferenceRow]) -> Any:
+    """Returns a structured array of the rows sorted by subject
+    identifier.
+
+    Datetimes are stored as naive UTC. Raises ValueError if a subject
+    identifier or assignment does not fit its column.
+    """
+    rows = sorted(rows, key=lambda row: row.subject_identifier)
+    data = np.zeros(len(rows), dtype=REFERENCE_DTYPE)
+    data["subject_identifier"] = [
+        encode(row.subject_identifier, SUBJECT_IDENTIFIER_LENGTH, "subject_identifier")
+        for row in rows
+    ]
+    data["cd4_date"] = [row.cd4_date or np.datetime64("NaT") for row in rows]
+    data["cd4_value"] = [
+        MISSING_INT if row.cd4_value is None else row.cd4_value for row in rows
+    ]
+    data["eligibility_datetime"] = [
+        as_utc_datetime64(row.eligibility_datetime) for row in rows
+    ]
+    data["consent_datetime"] = [as_utc_datetime64(row.consent_datetime) for row in rows]
+    data["assignment"] = [
+        encode(row.assignment or "", ASSIGNMENT_LENGTH, "assignment") for row in rows
+    ]
+    return data
+
+
+def write_reference_snapshot(path: str | Path, rows: Iterable[ReferenceRow]) -> Path:
+    """Writes the reference rows to a `.npy` file.
+
+    The file is written to a uniquely named temporary file next to
+    `path` and then moved into place, so workers that have the previous
+    snapshot mapped keep a valid copy and concurrent writers do not
+    write to the same file.
+    """
+    if np is None:
+        raise ImportError(
+            "NumPy is required to write a reference snapshot. "
+            "Install effect-form-validators[numpy]."
+        )
+    path = Path(path)
+    data = build_reference_array(rows)
+    fd, tmp_name = mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, data, allow_pickle=False)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class ReferenceSnapshot:
+    """Read-only, memory-mapped reference data by subject.
+
+    All processes mapping the same file share one copy in the page
+    cache. Lookups bisect the sorted subject identifier column and
+    return views into the mapping.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.data = np.load(self.path, mmap_mode="r", allow_pickle=False)
+        self.subject_identifiers = self.data["subject_identifier"]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, subject_identifier: str) -> bool:
+        return self.get_index(subject_identifier) is not None
+
+    def get_index(self, subject_identifier: str) -> int | None:
+        key = subject_identifier.encode()
+        index = int(np.searchsorted(self.subject_identifiers, key))
+        if index < len(self) and self.subject_identifiers[index] == key:
+            return index
+        return None
+
+    def get_indices(self, subject_identifiers: Iterable[str]) -> Any:
+        """Returns the row index per subject, -1 if not in the snapshot."""
+        encoded = [s.encode() for s in subject_identifiers]
+        # too long to be stored; not cast, which would truncate them
+        fits = np.array([len(key) <= SUBJECT_IDENTIFIER_LENGTH for key in encoded], dtype=bool)
+        keys = np.array(
+            [key if key_fits else b"" for key, key_fits in zip(encoded, fits, strict=True)],
+            dtype=self.subject_identifiers.dtype,
+        )
+        indices = np.searchsorted(self.subject_identifiers, keys)
+        found = fits & (indices < len(self))
+        found[found] = self.subject_identifiers[indices[found]] == keys[found]
+        return np.where(found, indices, MISSING_INT)
+
+    def get(self, subject_identifier: str) -> ReferenceRow | None:
+        """Returns the subject's row as python values, or None."""
+        index = self.get_index(subject_identifier)
+        if index is None:
+            return None
+        return self.get_row(index, subject_identifier)
+
+    def get_rows(self, subject_identifiers: Iterable[str]) -> dict[str, ReferenceRow]:
+        """Returns {subject_identifier: row} for the subjects in the
+        snapshot.
+        """
+        subject_identifiers = list(subject_identifiers)
+        return {
+            subject_identifier: self.get_row(int(index), subject_identifier)
+            for subject_identifier, index in zip(
+                subject_identifiers, self.get_indices(subject_identifiers), strict=True
+            )
+            if index != MISSING_INT
+        }
+
+    def get_row(self, index: int, subject_identifier: str) -> ReferenceRow:
+        record = self.data[index]
+        return ReferenceRow(
+            subject_identifier=subject_identifier,
+            cd4_date=None if np.isnat(record["cd4_date"]) else record["cd4_date"].item(),
+            cd4_value=(
+                None if record["cd4_value"] == MISSING_INT else int(record["cd4_value"])
+            ),
+            eligibility_datetime=self.as_datetime(record["eligibility_datetime"]),
+            consent_datetime=self.as_datetime(record["consent_datetime"]),
+            assignment=record["assignment"].decode() or None,
+        )
+
+    @staticmethod
+    def as_datetime(value: Any) -> datetime | None:
+        if np.isnat(value):
+            return None
+        return value.item().replace(tzinfo=UTC)
+
+
+class ReferenceSnapshotCache:
+    """This process's mapping of the snapshot file set in
+    `EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT`.
+
+    The file is stat'ed on each `get` and mapped again once it has been
+    replaced, e.g. by `write_reference_snapshot` in another process.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._key: tuple | None = None
+        self._snapshot: ReferenceSnapshot | None = None
+
+    def get(self) -> ReferenceSnapshot | None:
+        path = getattr(settings, "EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT", None)
+        if not path or np is None:
+            return None
+        stat = Path(path).stat()
+        key = (str(path), stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            if key != self._key:
+                self._snapshot = ReferenceSnapshot(path)
+                self._key = key
+            return self._snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._key = None
+            self._snapshot = None
+
+
+reference_snapshots = ReferenceSnapshotCache()
+
+
+def get_reference_snapshot() -> ReferenceSnapshot | None:
+    """Returns this process's mapping of the snapshot file set in
+    `EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT`, or None.
+    """
+    return reference_snapshots.get()
+
+
+@receiver(setting_changed, dispatch_uid="effect_form_validators_reference_snapshot")
+def reset_reference_snapshot(setting: str, **kwargs) -> None:
+    if setting == "EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT":
+        reference_snapshots.clear()
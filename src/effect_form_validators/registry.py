@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from django.apps import apps as django_apps
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db import models
+    from edc_form_validators import FormValidator
+
+CRF_LOOKUP = "subject_visit__subject_identifier"
+INLINE_LOOKUP = "adherence__subject_visit__subject_identifier"
+SUBJECT_LOOKUP = "subject_identifier"
+
+
+class AlreadyRegistered(Exception):  # noqa: N818
+    pass
+
+
+class NotRegistered(Exception):  # noqa: N818
+    pass
+
+
+@dataclass(frozen=True)
+class FormValidatorRegistration:
+    """Links a form validator to the model it validates.
+
+    `subject_identifier_lookup` is the ORM lookup used to select a
+    subject's rows from the model.
+    """
+
+    label_lower: str
+    form_validator_path: str
+    subject_identifier_lookup: str = CRF_LOOKUP
+
+    @property
+    def form_validator_cls(self) -> type[FormValidator]:
+        module_name, class_name = self.form_validator_path.rsplit(".", 1)
+        return getattr(import_module(module_name), class_name)
+
+    @property
+    def model_cls(self) -> type[models.Model]:
+        return django_apps.get_model(self.label_lower)
+
+
+class FormValidatorRegistry:
+    """A registry of form validators by model `label_lower`.
+
+    The EDC may register additional or replacement validators with
+    `register` (set `replace=True` to override a default).
+    """
+
+    def __init__(self):
+        self._registry: dict[str, FormValidatorRegistration] = {}
+
+    def __iter__(self) -> Iterator[FormValidatorRegistration]:
+        return iter(self._registry.values())
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+    def __contains__(self, label_lower: str) -> bool:
+        return label_lower in self._registry
+
+    def register(
+        self,
+        label_lower: str,
+        form_validator_path: str,
+        subject_identifier_lookup: str = CRF_LOOKUP,
+        replace: bool | None = None,
+    ) -> FormValidatorRegistration:
+        if label_lower in self._registry and not replace:
+            raise AlreadyRegistered(f"Form validator already registered. Got {label_lower}.")
+        registration = FormValidatorRegistration(
+            label_lower=label_lower,
+            form_validator_path=form_validator_path,
+            subject_identifier_lookup=subject_identifier_lookup,
+        )
+        self._registry[label_lower] = registration
+        return registration
+
+    def unregister(self, label_lower: str) -> None:
+        self._registry.pop(label_lower, None)
+
+    def get(self, label_lower: str) -> FormValidatorRegistration:
+        try:
+            return self._registry[label_lower]
+        except KeyError as e:
+            raise NotRegistered(f"Form validator not registered. Got {label_lower}.") from e
+
+    def filter(
+        self, form_validator_cls: type[FormValidator]
+    ) -> list[FormValidatorRegistration]:
+        """Returns registrations whose validator is, or subclasses,
+        `form_validator_cls`.
+        """
+        return [
+            registration
+            for registration in self
+            if issubclass(registration.form_validator_cls, form_validator_cls)
+        ]
+
+
+# (label_lower, form_validator_path, subject_identifier_lookup)
+default_registrations: list[tuple[str, str, str]] = [
+    (
+        "effect_subject.adherencestagefour",
+        "effect_form_validators.effect_subject.AdherenceStageFourFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.adherencestageone",
+        "effect_form_validators.effect_subject.AdherenceStageOneFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.adherencestagethree",
+        "effect_form_validators.effect_subject.AdherenceStageThreeFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.adherencestagetwo",
+        "effect_form_validators.effect_subject.AdherenceStageTwoFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.arvhistory",
+        "effect_form_validators.effect_subject.ArvHistoryFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.arvtreatment",
+        "effect_form_validators.effect_subject.ArvTreatmentFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.bloodculture",
+        "effect_form_validators.effect_subject.BloodCultureFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.chestxray",
+        "effect_form_validators.effect_subject.ChestXrayFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.clinicalnote",
+        "effect_form_validators.effect_subject.ClinicalNoteFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.diagnoses",
+        "effect_form_validators.effect_subject.DiagnosesFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.histopathology",
+        "effect_form_validators.effect_subject.HistopathologyFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.lpcsf",
+        "effect_form_validators.effect_subject.LpCsfFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.medicationadherence",
+        "effect_form_validators.effect_subject.MedicationAdherenceFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.mentalstatus",
+        "effect_form_validators.effect_subject.MentalStatusFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.participanthistory",
+        "effect_form_validators.effect_subject.ParticipantHistoryFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.participanttreatment",
+        "effect_form_validators.effect_subject.ParticipantTreatmentFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.signsandsymptoms",
+        "effect_form_validators.effect_subject.SignsAndSymptomsFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.studymedicationbaseline",
+        "effect_form_validators.effect_subject.StudyMedicationBaselineFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.studymedicationfollowup",
+        "effect_form_validators.effect_subject.StudyMedicationFollowupFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.vitalsigns",
+        "effect_form_validators.effect_subject.VitalSignsFormValidator",
+        CRF_LOOKUP,
+    ),
+    (
+        "effect_subject.subjectvisit",
+        "effect_form_validators.effect_subject.SubjectVisitFormValidator",
+        SUBJECT_LOOKUP,
+    ),
+    (
+        "effect_subject.fluconmisseddoses",
+        "effect_form_validators.effect_subject.FluconMissedDosesFormValidator",
+        INLINE_LOOKUP,
+    ),
+    (
+        "effect_subject.flucytmisseddoses",
+        "effect_form_validators.effect_subject.FlucytMissedDosesFormValidator",
+        INLINE_LOOKUP,
+    ),
+    (
+        "effect_prn.hospitalization",
+        "effect_form_validators.effect_prn.HospitalizationFormValidator",
+        SUBJECT_LOOKUP,
+    ),
+    (
+        "effect_ae.deathreport",
+        "effect_form_validators.effect_ae.DeathReportFormValidator",
+        SUBJECT_LOOKUP,
+    ),
+    (
+        "effect_screening.subjectscreening",
+        "effect_form_validators.effect_screening.SubjectScreeningFormValidator",
+        SUBJECT_LOOKUP,
+    ),
+    (
+        "effect_reports.serumcragdatenote",
+        "effect_form_validators.effect_reports.SerumCragDateNoteFormValidator",
+        SUBJECT_LOOKUP,
+    ),
+]
+
+site_form_validators = FormValidatorRegistry()
+for registration_opts in default_registrations:
+    site_form_validators.register(*registration_opts)
@@ -0,0 +1,416 @@
+from __future__ import annotations
+
+import logging
+from functools import reduce
+from itertools import batched
+from operator import attrgetter, or_
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .bulk_validation import thread_map
+from .outcome import ValidationOutcome, validate_instance
+from .prefetch import Snapshot, apply_snapshot, prefetch
+from .registry import FormValidatorRegistration, site_form_validators
+from .revalidation_store import Finding, Shard, get_outcome_hash
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from datetime import datetime
+
+    from django.db import models
+
+    from .registry import FormValidatorRegistry
+    from .revalidation_store import RevalidationStore
+
+logger = logging.getLogger(__name__)
+
+
+class RevalidationResult(NamedTuple):
+    label_lower: str
+    pk: object
+    subject_identifier: str
+    outcome: ValidationOutcome
+
+
+def get_screening_dependency_index(
+    registry: FormValidatorRegistry | None = None,
+) -> dict[str, list[FormValidatorRegistration]]:
+    """Returns a reverse-dependency index of subject screening field
+    name -> registrations whose validator reads that field.
+
+    Validators declare the screening fields they read in
+    `subject_screening_fields`.
+    """
+    index: dict[str, list[FormValidatorRegistration]] = {}
+    for registration in site_form_validators if registry is None else registry:
+        for field_name in getattr(
+            registration.form_validator_cls, "subject_screening_fields", ()
+        ):
+            index.setdefault(field_name, []).append(registration)
+    return index
+
+
+def get_cleaned_data_from_instance(instance: models.Model) -> dict:
+    """Returns a `cleaned_data`-like dict for a saved model instance.
+
+    Foreign keys are model instances and m2m fields are querysets, as in
+    a bound ModelForm.
+    """
+    cleaned_data = {
+        field.name: getattr(instance, field.name) for field in instance._meta.concrete_fields
+    }
+    cleaned_data.update(
+        {
+            field.name: getattr(instance, field.name).all()
+            for field in instance._meta.many_to_many
+        }
+    )
+    return cleaned_data
+
+
+def revalidate_instance(
+    registration: FormValidatorRegistration,
+    instance: models.Model,
+    snapshot: Snapshot | None = None,
+    subject_identifier: str | None = None,
+) -> ValidationOutcome:
+    """Returns the ValidationOutcome of re-running the registered
+    validator on a saved instance.
+
+    If given, the subject's values in the prefetched `snapshot` are
+    used instead of the validator's own lookups.
+    """
+    form_validator = registration.form_validator_cls(
+        cleaned_data=get_cleaned_data_from_instance(instance),
+        instance=instance,
+        model=instance.__class__,
+    )
+    if snapshot:
+        apply_snapshot(form_validator, snapshot, subject_identifier)
+    return validate_instance(form_validator)
+
+
+def revalidate_batch(
+    registration: FormValidatorRegistration,
+    instances: Iterable[models.Model],
+    workers: int | None = 1,
+) -> list[RevalidationResult]:
+    """Returns a RevalidationResult per instance, prefetching the
+    validator's data requirements for the batch's subjects at once,
+    from the reference snapshot where one is configured.
+
+    With more than one worker, or `workers=None` for
+    `EFFECT_FORM_VALIDATORS_BULK_WORKERS`, the instances are validated
+    on a thread pool (see `bulk_validation.thread_map`).
+    """
+    rows = [
+        (instance, get_subject_identifier(registration, instance)) for instance in instances
+    ]
+    snapshot = prefetch(
+        registration.form_validator_cls,
+        [subject_identifier for _, subject_identifier in rows],
+        registration.model_cls,
+        use_reference_snapshot=True,
+    )
+
+    def revalidate(row: tuple[models.Model, str | None]) -> RevalidationResult:
+        instance, subject_identifier = row
+        return RevalidationResult(
+            label_lower=registration.label_lower,
+            pk=instance.pk,
+            subject_identifier=subject_identifier,
+            outcome=revalidate_instance(registration, instance, snapshot, subject_identifier),
+        )
+
+    return thread_map(revalidate, rows, workers=workers)
+
+
+def revalidate_subject(
+    subject_identifier: str,
+    registrations: Iterable[FormValidatorRegistration],
+) -> Iterator[RevalidationResult]:
+    """Yields a RevalidationResult for each of the subject's saved rows
+    of each registered model.
+    """
+    for registration in registrations:
+        qs = registration.model_cls.objects.filter(
+            **{registration.subject_identifier_lookup: subject_identifier}
+        )
+        snapshot = prefetch(
+            registration.form_validator_cls, [subject_identifier], registration.model_cls
+        )
+        for instance in qs:
+            yield RevalidationResult(
+                label_lower=registration.label_lower,
+                pk=instance.pk,
+                subject_identifier=subject_identifier,
+                outcome=revalidate_instance(
+                    registration, instance, snapshot, subject_identifier
+                ),
+            )
+
+
+def revalidate_for_screening_change(
+    subject_identifier: str,
+    changed_fields: Iterable[str],
+    registry: FormValidatorRegistry | None = None,
+) -> list[RevalidationResult]:
+    """Rechecks only the subject's CRFs whose validators read any of
+    the changed subject screening fields.
+    """
+    index = get_screening_dependency_index(registry)
+    registrations: dict[str, FormValidatorRegistration] = {}
+    for field_name in changed_fields:
+        for registration in index.get(field_name, []):
+            registrations[registration.label_lower] = registration
+    results = list(revalidate_subject(subject_identifier, registrations.values()))
+    for result in results:
+        if not result.outcome.ok:
+            logger.warning(
+                "Screening change invalidated %s %s for subject %s. Got %s.",
+                result.label_lower,
+                result.pk,
+                result.subject_identifier,
+                [issue.as_tuple() for issue in result.outcome.issues],
+                extra={
+                    "label_lower": result.label_lower,
+                    "pk": result.pk,
+                    "subject_identifier": result.subject_identifier,
+                },
+            )
+    return results
+
+
+def get_subject_identifier(
+    registration: FormValidatorRegistration, instance: models.Model
+) -> str | None:
+    try:
+        return attrgetter(registration.subject_identifier_lookup.replace("__", "."))(instance)
+    except AttributeError:
+        return None
+
+
+def get_modified_lookups(registration: FormValidatorRegistration) -> list[str]:
+    """Returns `modified` lookups for the model and each related model
+    on the path to the subject identifier.
+
+    For example, "adherence__subject_visit__subject_identifier" gives
+    ["modified", "adherence__modified", "adherence__subject_visit__modified"].
+    """
+    path = registration.subject_identifier_lookup.split("__")[:-1]
+    return ["modified"] + ["__".join([*path[:i], "modified"]) for i in range(1, len(path) + 1)]
+
+
+def get_changed_subjects(form_validator_cls: type, since: datetime) -> set[str]:
+    """Returns subjects whose screening or randomization data, read by
+    the validator, changed since `since`.
+    """
+    subject_identifiers: set[str] = set()
+    if getattr(form_validator_cls, "subject_screening_fields", None):
+        from edc_screening.utils import get_subject_screening_model_cls  # noqa: PLC0415
+
+        subject_identifiers.update(
+            get_subject_screening_model_cls()
+            .objects.filter(modified__gt=since, subject_identifier__isnull=False)
+            .values_list("subject_identifier", flat=True)
+        )
+    if randomizer_name := getattr(form_validator_cls, "randomizer_name", None):
+        from edc_randomization.site_randomizers import site_randomizers  # noqa: PLC0415
+
+        subject_identifiers.update(
+            site_randomizers.get(randomizer_name)
+            .model_cls()
+            .objects.filter(modified__gt=since, subject_identifier__isnull=False)
+            .values_list("subject_identifier", flat=True)
+        )
+    return subject_identifiers
+
+
+def get_incremental_queryset(
+    registration: FormValidatorRegistration, since: datetime | None
+) -> models.QuerySet:
+    """Returns the rows of the registered model that may have a
+    different outcome since `since` (all rows if `since` is None).
+    """
+    qs = registration.model_cls.objects.all()
+    if related_path := registration.subject_identifier_lookup.rpartition("__")[0]:
+        qs = qs.select_related(related_path)
+    if since is None:
+        return qs
+    conditions = [
+        Q(**{f"{lookup}__gt": since}) for lookup in get_modified_lookups(registration)
+    ]
+    if subject_identifiers := get_changed_subjects(registration.form_validator_cls, since):
+        conditions.append(
+            Q(**{f"{registration.subject_identifier_lookup}__in": subject_identifiers})
+        )
+    return qs.filter(reduce(or_, conditions))
+
+
+def revalidate_incremental(
+    store: RevalidationStore,
+    registry: FormValidatorRegistry | None = None,
+    label_lowers: Iterable[str] | None = None,
+    chunk_size: int = 500,
+    workers: int | None = 1,
+) -> Iterator[RevalidationResult]:
+    """Revalidates rows changed since each validator's last checkpoint.
+
+    Yields only results whose outcome differs from the stored outcome
+    hash (new, changed or resolved findings). The checkpoint is moved
+    to the start of this run once a validator's rows are exhausted.
+
+    Each chunk of rows is revalidated as a batch (see `revalidate_batch`),
+    on a thread pool of `workers` threads if more than one.
+    """
+    label_lowers = set(label_lowers) if label_lowers is not None else None
+    for registration in site_form_validators if registry is None else registry:
+        if label_lowers is not None and registration.label_lower not in label_lowers:
+            continue
+        run_started = timezone.now()
+        qs = get_incremental_queryset(
+            registration, store.get_checkpoint(registration.label_lower)
+        )
+        for instances in batched(qs.iterator(chunk_size=chunk_size), chunk_size):
+            yield from store_changed_results(
+                store,
+                registration.label_lower,
+                revalidate_batch(registration, instances, workers=workers),
+            )
+        store.set_checkpoint(registration.label_lower, run_started)
+
+
+def store_changed_results(
+    store: RevalidationStore, label_lower: str, results: list[RevalidationResult]
+) -> list[RevalidationResult]:
+    """Stores outcome hashes and returns results whose hash changed."""
+    hashes = {str(result.pk): get_outcome_hash(result.outcome) for result in results}
+    stored = store.get_outcome_hashes(label_lower, list(hashes))
+    changed = {pk: h for pk, h in hashes.items() if stored.get(pk, "") != h}
+    store.set_outcome_hashes(label_lower, changed)
+    return [result for result in results if str(result.pk) in changed]
+
+
+def get_shards(
+    registration: FormValidatorRegistration, subjects_per_shard: int = 500
+) -> list[Shard]:
+    """Returns shards of the registered model of `subjects_per_shard`
+    subjects each.
+
+    Together the shards cover all subject identifiers, so subjects
+    enrolled after planning fall into an existing shard.
+    """
+    lookup = registration.subject_identifier_lookup
+    subject_identifiers = (
+        registration.model_cls.objects.filter(**{f"{lookup}__isnull": False})
+        .order_by(lookup)
+        .values_list(lookup, flat=True)
+        .distinct()
+    )
+    starts = [chunk[0] for chunk in batched(subject_identifiers, subjects_per_shard)]
+    starts[:1] = [""]
+    return [
+        Shard(registration.label_lower, start, stop)
+        for start, stop in zip(starts, [*starts[1:], None], strict=True)
+    ]
+
+
+def plan_shards(
+    store: RevalidationStore,
+    registry: FormValidatorRegistry | None = None,
+    label_lowers: Iterable[str] | None = None,
+    subjects_per_shard: int = 500,
+) -> list[Shard]:
+    """Returns the shard plan of each registered model, planning and
+    storing it if not already in the store.
+    """
+    label_lowers = set(label_lowers) if label_lowers is not None else None
+    shards = []
+    for registration in site_form_validators if registry is None else registry:
+        if label_lowers is not None and registration.label_lower not in label_lowers:
+            continue
+        if not (planned := store.get_shards(registration.label_lower)):
+            store.set_shards(get_shards(registration, subjects_per_shard))
+            planned = store.get_shards(registration.label_lower)
+        shards.extend(planned)
+    return shards
+
+
+def revalidate_shard(
+    store: RevalidationStore,
+    shard: Shard,
+    registry: FormValidatorRegistry | None = None,
+    *,
+    chunk_size: int = 500,
+    workers: int | None = 1,
+) -> list[Finding]:
+    """Revalidates the rows of a shard, replacing its stored findings
+    and marking it completed.
+
+    Shards may be rerun at any time, in any order and on any machine.
+    """
+    registration = (site_form_validators if registry is None else registry).get(
+        shard.label_lower
+    )
+    lookup = registration.subject_identifier_lookup
+    qs = registration.model_cls.objects.filter(**{f"{lookup}__gte": shard.first_subject})
+    if shard.stop_subject is not None:
+        qs = qs.filter(**{f"{lookup}__lt": shard.stop_subject})
+    if related_path := lookup.rpartition("__")[0]:
+        qs = qs.select_related(related_path)
+    findings = []
+    for instances in batched(qs.iterator(chunk_size=chunk_size), chunk_size):
+        findings.extend(
+            Finding(
+                label_lower=result.label_lower,
+                pk=str(result.pk),
+                subject_identifier=result.subject_identifier,
+                validator=result.outcome.validator,
+                issues=[issue.as_tuple() for issue in result.outcome.issues],
+            )
+            for result in revalidate_batch(registration, instances, workers=workers)
+            if not result.outcome.ok
+        )
+    store.set_shard_findings(shard, findings, timezone.now())
+    return findings
+
+
+def revalidate_sharded(
+    store: RevalidationStore,
+    registry: FormValidatorRegistry | None = None,
+    label_lowers: Iterable[str] | None = None,
+    *,
+    subjects_per_shard: int = 500,
+    chunk_size: int = 500,
+    workers: int | None = 1,
+    part: int = 0,
+    parts: int = 1,
+) -> Iterator[Finding]:
+    """Revalidates all rows shard by shard, resuming after the last
+    completed shard, then yields the merged findings of all shards.
+
+    To spread a sweep across machines, give each machine a copy of
+    the store with the plan (see `plan_shards`) and a different `part`
+    of `parts`; shards are dealt round-robin. Merge the stores with
+    `RevalidationStore.merge` on one machine and call again to yield
+    the findings. Start a new sweep with `RevalidationStore.reset_shards`.
+
+    Rows without a subject identifier are not revalidated.
+    """
+    label_lowers = list(label_lowers) if label_lowers is not None else None
+    shards = plan_shards(store, registry, label_lowers, subjects_per_shard)
+    for shard in shards[part::parts]:
+        if store.get_shard_completed(shard) is None:
+            findings = revalidate_shard(
+                store, shard, registry, chunk_size=chunk_size, workers=workers
+            )
+            logger.info(
+                "Revalidated shard %s %s-%s. Got %s findings.",
+                shard.label_lower,
+                shard.first_subject,
+                shard.stop_subject or "",
+                len(findings),
+            )
+    yield from store.iter_findings(label_lowers)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from .outcome import ValidationOutcome
+
+
+class Shard(NamedTuple):
+    """The rows of a registered model for subjects from `first_subject`
+    up to, not including, `stop_subject` (None for no upper bound).
+    """
+
+    label_lower: str
+    first_subject: str
+    stop_subject: str | None
+
+
+class Finding(NamedTuple):
+    """A stored invalid outcome of a sharded revalidation run."""
+
+    label_lower: str
+    pk: str
+    subject_identifier: str | None
+    validator: str
+    issues: list[tuple[str, str | None, str]]
+
+
+def get_outcome_hash(outcome: ValidationOutcome) -> str:
+    """Returns a stable hash of an outcome's issues ("" if ok)."""
+    if outcome.ok:
+        return ""
+    digest = hashlib.blake2b(digest_size=16)
+    for issue in sorted(outcome.issues, key=lambda x: (x.field, x.code or "", x.message)):
+        digest.update("\x1f".join((issue.field, issue.code or "", issue.message)).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+class RevalidationStore:
+    """Persists revalidation checkpoints and per-row outcome hashes in
+    a SQLite file.
+
+    `checkpoint` is the start datetime of the last completed run per
+    `label_lower`; `outcome` is the hash of each row's last outcome.
+
+    `shard` is the plan of a sharded run, with the datetime each shard
+    completed, and `finding` the invalid outcomes of completed shards.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self.connect()) as connection, connection:
+            connection.executescript(
+                """
+                create table if not exists checkpoint (
+                    label_lower text primary key,
+                    last_run text not null
+                );
+                create table if not exists outcome (
+                    label_lower text not null,
+                    pk text not null,
+                    outcome_hash text not null,
+                    primary key (label_lower, pk)
+                );
+                create table if not exists shard (
+                    label_lower text not null,
+                    first_subject text not null,
+                    stop_subject text,
+                    completed text,
+                    primary key (label_lower, first_subject)
+                );
+                create table if not exists finding (
+                    label_lower text not null,
+                    pk text not null,
+                    subject_identifier text,
+                    validator text not null,
+                    issues text not null,
+                    primary key (label_lower, pk)
+                );
+                """
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def get_checkpoint(self, label_lower: str) -> datetime | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "select last_run from checkpoint where label_lower=?", (label_lower,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set_checkpoint(self, label_lower: str, last_run: datetime) -> None:
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "insert into checkpoint (label_lower, last_run) values (?, ?) "
+                "on conflict (label_lower) do update set last_run=excluded.last_run",
+                (label_lower, last_run.isoformat()),
+            )
+
+    def get_outcome_hashes(self, label_lower: str, pks: list[str]) -> dict[str, str]:
+        hashes = {}
+        with closing(self.connect()) as connection:
+            for i in range(0, len(pks), 500):
+                chunk = pks[i : i + 500]
+                hashes.update(
+                    connection.execute(
+                        "select pk, outcome_hash from outcome "  # noqa: S608
+                        f"where label_lower=? and pk in ({','.join('?' * len(chunk))})",
+                        (label_lower, *chunk),
+                    ).fetchall()
+                )
+        return hashes
+
+    def set_outcome_hashes(self, label_lower: str, hashes: dict[str, str]) -> None:
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "insert into outcome (label_lower, pk, outcome_hash) values (?, ?, ?) "
+                "on conflict (label_lower, pk) "
+                "do update set outcome_hash=excluded.outcome_hash",
+                [(label_lower, pk, outcome_hash) for pk, outcome_hash in hashes.items()],
+            )
+
+    def get_shards(self, label_lower: str) -> list[Shard]:
+        with closing(self.connect()) as connection:
+            return [
+                Shard(*row)
+                for row in connection.execute(
+                    "select label_lower, first_subject, stop_subject from shard "
+                    "where label_lower=? order by first_subject",
+                    (label_lower,),
+                )
+            ]
+
+    def set_shards(self, shards: Iterable[Shard]) -> None:
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "insert or ignore into shard (label_lower, first_subject, stop_subject) "
+                "values (?, ?, ?)",
+                shards,
+            )
+
+    def get_shard_completed(self, shard: Shard) -> datetime | None:
+        with closing(self.connect()) as connection:
+            row = connection.execute(
+                "select completed from shard where label_lower=? and first_subject=?",
+                (shard.label_lower, shard.first_subject),
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def set_shard_findings(
+        self, shard: Shard, findings: Iterable[Finding], completed: datetime
+    ) -> None:
+        """Replaces the shard's findings and marks it completed, in one
+        transaction.
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "delete from finding where label_lower=? and subject_identifier>=? "
+                "and (? is null or subject_identifier<?)",
+                (*shard, shard.stop_subject),
+            )
+            connection.executemany(
+                "insert or replace into finding "
+                "(label_lower, pk, subject_identifier, validator, issues) "
+                "values (?, ?, ?, ?, ?)",
+                [
+                    (*finding[:4], json.dumps(finding.issues, separators=(",", ":")))
+                    for finding in findings
+                ],
+            )
+            connection.execute(
+                "insert into shard (label_lower, first_subject, stop_subject, completed) "
+                "values (?, ?, ?, ?) on conflict (label_lower, first_subject) "
+                "do update set stop_subject=excluded.stop_subject, "
+                "completed=excluded.completed",
+                (*shard, completed.isoformat()),
+            )
+
+    def iter_findings(self, label_lowers: Iterable[str] | None = None) -> Iterator[Finding]:
+        """Yields findings of completed shards, ordered by model and
+        subject.
+        """
+        sql = "select label_lower, pk, subject_identifier, validator, issues from finding"
+        params: tuple[str, ...] = ()
+        if label_lowers is not None:
+            params = tuple(label_lowers)
+            sql += f" where label_lower in ({','.join('?' * len(params))})"
+        with closing(self.connect()) as connection:
+            for row in connection.execute(
+                f"{sql} order by label_lower, subject_identifier, pk", params
+            ):
+                yield Finding(*row[:4], [tuple(issue) for issue in json.loads(row[4])])
+
+    def reset_shards(self, label_lower: str | None = None) -> None:
+        """Removes the shard plan and findings to start a new sweep."""
+        with closing(self.connect()) as connection, connection:
+            if label_lower:
+                connection.execute("delete from shard where label_lower=?", (label_lower,))
+                connection.execute("delete from finding where label_lower=?", (label_lower,))
+            else:
+                connection.execute("delete from shard")
+                connection.execute("delete from finding")
+
+    def merge(self, path: str | Path) -> None:
+        """Copies shards from another store, e.g. one written on another
+        machine from the same shard plan, where they completed later
+        than in this store.
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute("attach database ? as other", (str(path),))
+            connection.executescript(
+                """
+                begin;
+                create temp table merged as
+                    select s.* from other.shard s left join shard l
+                    on s.label_lower=l.label_lower and s.first_subject=l.first_subject
+                    where s.completed is not null
+                    and (l.completed is null or s.completed > l.completed);
+                delete from finding where exists (
+                    select 1 from merged m where m.label_lower=finding.label_lower
+                    and finding.subject_identifier>=m.first_subject
+                    and (m.stop_subject is null or finding.subject_identifier<m.stop_subject)
+                );
+                insert or replace into finding select f.* from other.finding f
+                    join merged m on f.label_lower=m.label_lower
+                    and f.subject_identifier>=m.first_subject
+                    and (m.stop_subject is null or f.subject_identifier<m.stop_subject);
+                insert or replace into shard select * from merged;
+                commit;
+                """
+            )
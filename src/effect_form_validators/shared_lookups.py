@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .prefetch import (
+    ASSIGNMENT,
+    ASSIGNMENT_DESCRIPTION,
+    REGISTERED_SUBJECT_SCREENING,
+    SUBJECT_SCREENING,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from django.core.cache.backends.base import BaseCache
+
+KEY_PREFIX = "effect_form_validators"
+
+# bump if the shape of a cached value changes
+KEY_VERSION = 1
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_LOCK_TIMEOUT = 5
+
+MISSING = object()
+
+
+class SharedLookupCache:
+    """Caches lookups shared by validators, such as a subject's
+    screening or randomization assignment, in a Django cache so that
+    all workers can reuse them.
+
+    Opt in by setting `EFFECT_FORM_VALIDATORS_LOOKUP_CACHE` to a cache
+    alias. Entries expire after `EFFECT_FORM_VALIDATORS_LOOKUP_CACHE_TIMEOUT`
+    seconds and are invalidated by bumping a per-subject generation
+    that is part of the key (see `invalidate`).
+
+    Only one worker loads a missing entry at a time; the others wait
+    up to `lock_timeout` seconds for it before loading it themselves.
+    """
+
+    def __init__(self, lock_timeout: int = DEFAULT_LOCK_TIMEOUT, wait: float = 0.05):
+        self.lock_timeout = lock_timeout
+        self.wait = wait
+
+    @property
+    def alias(self) -> str | None:
+        return getattr(settings, "EFFECT_FORM_VALIDATORS_LOOKUP_CACHE", None)
+
+    @property
+    def timeout(self) -> int:
+        return getattr(
+            settings, "EFFECT_FORM_VALIDATORS_LOOKUP_CACHE_TIMEOUT", DEFAULT_TIMEOUT
+        )
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    @staticmethod
+    def get_generation_key(name: str, subject_identifier: str) -> str:
+        return f"{KEY_PREFIX}:{name}:{subject_identifier}:generation"
+
+    def get_key(self, name: str, subject_identifier: str) -> str:
+        generation = self.cache.get(
+            self.get_generation_key(name, subject_identifier), 0, version=KEY_VERSION
+        )
+        return f"{KEY_PREFIX}:{name}:{subject_identifier}:{generation}"
+
+    def get_or_load(self, name: str, subject_identifier: str | None, loader: Callable) -> Any:
+        """Returns the cached value of lookup `name` for the subject,
+        calling `loader()` on a miss.
+
+        Exceptions raised by the loader are not cached.
+        """
+        if not self.alias or not subject_identifier:
+            return loader()
+        cache = self.cache
+        key = self.get_key(name, subject_identifier)
+        value = cache.get(key, MISSING, version=KEY_VERSION)
+        if value is not MISSING:
+            return value
+        lock_key = f"{key}:lock"
+        if cache.add(lock_key, 1, self.lock_timeout, version=KEY_VERSION):
+            try:
+                value = loader()
+                cache.set(key, value, self.timeout, version=KEY_VERSION)
+            finally:
+                cache.delete(lock_key, version=KEY_VERSION)
+            return value
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(self.wait)
+            value = cache.get(key, MISSING, version=KEY_VERSION)
+            if value is not MISSING:
+                return value
+        return loader()
+
+    async def aget_key(self, name: str, subject_identifier: str) -> str:
+        generation = await self.cache.aget(
+            self.get_generation_key(name, subject_identifier), 0, version=KEY_VERSION
+        )
+        return f"{KEY_PREFIX}:{name}:{subject_identifier}:{generation}"
+
+    async def aget_or_load(
+        self,
+        name: str,
+        subject_identifier: str | None,
+        aloader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Async version of `get_or_load` for `aget_<name>` coroutines
+        (see AsyncFormValidatorMixin).
+        """
+        if not self.alias or not subject_identifier:
+            return await aloader()
+        cache = self.cache
+        key = await self.aget_key(name, subject_identifier)
+        value = await cache.aget(key, MISSING, version=KEY_VERSION)
+        if value is not MISSING:
+            return value
+        lock_key = f"{key}:lock"
+        if await cache.aadd(lock_key, 1, self.lock_timeout, version=KEY_VERSION):
+            try:
+                value = await aloader()
+                await cache.aset(key, value, self.timeout, version=KEY_VERSION)
+            finally:
+                await cache.adelete(lock_key, version=KEY_VERSION)
+            return value
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.wait)
+            value = await cache.aget(key, MISSING, version=KEY_VERSION)
+            if value is not MISSING:
+                return value
+        return await aloader()
+
+    def invalidate(self, name: str, subject_identifier: str | None) -> None:
+        """Moves the subject's entries for `name` to a new key.
+
+        A load in flight in another worker writes to the old key, so a
+        stale value is never served after invalidation.
+        """
+        if not self.alias or not subject_identifier:
+            return
+        generation_key = self.get_generation_key(name, subject_identifier)
+        self.cache.add(generation_key, 0, None, version=KEY_VERSION)
+        try:
+            self.cache.incr(generation_key, version=KEY_VERSION)
+        except ValueError:
+            self.cache.set(generation_key, 1, None, version=KEY_VERSION)
+
+
+shared_lookups = SharedLookupCache()
+
+
+def invalidate_on_commit(names: list[str], subject_identifier: str | None) -> None:
+    """Invalidates the subject's entries for `names` once the current
+    transaction commits.
+
+    Invalidating earlier lets another worker cache the value it reads
+    before the commit under the new key.
+    """
+
+    def invalidate():
+        for name in names:
+            shared_lookups.invalidate(name, subject_identifier)
+
+    transaction.on_commit(invalidate)
+
+
+def subject_screening_changed(sender, instance, **kwargs):
+    invalidate_on_commit(
+        [SUBJECT_SCREENING, REGISTERED_SUBJECT_SCREENING], instance.subject_identifier
+    )
+
+
+def registered_subject_changed(sender, instance, **kwargs):
+    invalidate_on_commit([REGISTERED_SUBJECT_SCREENING], instance.subject_identifier)
+
+
+def randomization_list_changed(sender, instance, **kwargs):
+    invalidate_on_commit([ASSIGNMENT, ASSIGNMENT_DESCRIPTION], instance.subject_identifier)
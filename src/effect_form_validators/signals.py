@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.db import transaction
+from django.dispatch import Signal
+
+from .revalidation import get_screening_dependency_index, revalidate_for_screening_change
+
+# sent with `subject_identifier` and `results`, a list of
+# RevalidationResult, once a screening change is committed and the
+# dependent CRFs are revalidated. Connect to store or notify.
+screening_change_revalidated = Signal()
+
+
+def subject_screening_pre_save(sender, instance, raw, **kwargs):
+    """Records which dependent screening fields are about to change."""
+    instance._effect_changed_screening_fields = []
+    if raw or not instance.pk:
+        return
+    field_names = list(get_screening_dependency_index())
+    saved = sender.objects.filter(pk=instance.pk).values(*field_names).first()
+    if saved:
+        instance._effect_changed_screening_fields = [
+            field_name
+            for field_name in field_names
+            if saved.get(field_name) != getattr(instance, field_name)
+        ]
+
+
+def subject_screening_post_save(sender, instance, raw, created, **kwargs):
+    """Schedules revalidation of the subject's dependent CRFs, if a
+    screening field they read was changed, for after the save commits.
+    """
+    changed_fields = getattr(instance, "_effect_changed_screening_fields", None)
+    if not raw and not created and changed_fields and instance.subject_identifier:
+        transaction.on_commit(
+            partial(
+                revalidate_dependents, sender, instance.subject_identifier, changed_fields
+            ),
+            robust=True,
+        )
+
+
+def revalidate_dependents(sender, subject_identifier: str, changed_fields: list[str]) -> None:
+    results = revalidate_for_screening_change(subject_identifier, changed_fields)
+    screening_change_revalidated.send(
+        sender=sender, subject_identifier=subject_identifier, results=results
+    )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connection
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import CodeType
+
+logger = logging.getLogger(__name__)
+
+TOOL_NAME = "effect_form_validators"
+# modules of the validators and their rule mixins. Not the package's
+# infrastructure mixins, e.g. QueryBudgetFormValidatorMixin,
+# AsyncFormValidatorMixin or VisitApplicabilityFormValidatorMixin.
+RULE_MODULES = (
+    "effect_form_validators.effect_",
+    "effect_form_validators.form_validator_mixins",
+)
+
+monitoring = getattr(sys, "monitoring", None)
+
+
+class ValidationTrace:
+    """Rules run and, if sampled, a profile of one validation.
+
+    The profile is {folded stack: self time in microseconds}, the
+    "collapsed stack" input of flame graph tools.
+    """
+
+    def __init__(self, profile: bool = False):
+        self.rules: list[str] = []
+        self.profile: dict[str, int] | None = defaultdict(int) if profile else None
+        self.stack: list[list] = []
+
+    def push(self, code: CodeType) -> None:
+        label = f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+        path = f"{self.stack[-1][0]};{label}" if self.stack else label
+        self.stack.append([path, time.perf_counter_ns(), 0])
+
+    def pop(self) -> None:
+        if not self.stack:
+            return
+        path, start, children = self.stack.pop()
+        elapsed = time.perf_counter_ns() - start
+        self.profile[path] += (elapsed - children) // 1000
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def finish(self) -> None:
+        while self.stack:
+            self.pop()
+
+
+class ValidationMonitor:
+    """Traces validations with `sys.monitoring` (Python 3.12+).
+
+    Rules are the methods of classes declared in RULE_MODULES; PY_START
+    is enabled locally on their code objects only, so untraced code
+    runs at full speed.
+    Sampled validations also enable call events globally for as long
+    as the validation runs, one validation at a time.
+    """
+
+    tool_id = getattr(monitoring, "PROFILER_ID", None)
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()
+        self._registered: bool | None = None
+        self._rule_codes: dict[CodeType, str] = {}
+        self._watched: set[type] = set()
+
+    @property
+    def available(self) -> bool:
+        if self._registered is None:
+            with self._lock:
+                if self._registered is None:
+                    self._registered = self._register()
+        return self._registered
+
+    def _register(self) -> bool:
+        if monitoring is None:
+            return False
+        try:
+            monitoring.use_tool_id(self.tool_id, TOOL_NAME)
+        except ValueError:
+            logger.warning(
+                "sys.monitoring tool %s in use. Slow validations are not traced.",
+                self.tool_id,
+            )
+            return False
+        events = monitoring.events
+        for event, callback in [
+            (events.PY_START, self.on_start),
+            (events.PY_RESUME, self.on_start),
+            (events.PY_RETURN, self.on_return),
+            (events.PY_YIELD, self.on_return),
+            (events.PY_UNWIND, self.on_return),
+        ]:
+            monitoring.register_callback(self.tool_id, event, callback)
+        return True
+
+    def watch(self, form_validator_cls: type) -> None:
+        """Enables local PY_START events on the validator's rules."""
+        if form_validator_cls in self._watched:
+            return
+        with self._lock:
+            for klass in form_validator_cls.__mro__:
+                if not klass.__module__.startswith(RULE_MODULES):
+                    continue
+                for name, func in vars(klass).items():
+                    if inspect.isfunction(func) and func.__code__ not in self._rule_codes:
+                        self._rule_codes[func.__code__] = name
+                        monitoring.set_local_events(
+                            self.tool_id, func.__code__, monitoring.events.PY_START
+                        )
+            self._watched.add(form_validator_cls)
+
+    @contextmanager
+    def trace(
+        self, form_validator_cls: type, profile: bool = False
+    ) -> Iterator[ValidationTrace]:
+        if not self.available:
+            yield ValidationTrace()
+            return
+        self.watch(form_validator_cls)
+        profile = profile and self._profiling.acquire(blocking=False)
+        trace = ValidationTrace(profile=profile)
+        self._local.trace = trace
+        if profile:
+            events = monitoring.events
+            monitoring.set_events(
+                self.tool_id,
+                events.PY_START
+                | events.PY_RESUME
+                | events.PY_RETURN
+                | events.PY_YIELD
+                | events.PY_UNWIND,
+            )
+        try:
+            yield trace
+        finally:
+            self._local.trace = None
+            if profile:
+                monitoring.set_events(self.tool_id, monitoring.events.NO_EVENTS)
+                trace.finish()
+                self._profiling.release()
+
+    def on_start(self, code: CodeType, offset: int) -> None:  # noqa: ARG002
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return
+        if rule := self._rule_codes.get(code):
+            trace.rules.append(rule)
+        if trace.profile is not None:
+            trace.push(code)
+
+    def on_return(self, code: CodeType, offset: int, arg: Any) -> None:  # noqa: ARG002
+        trace = getattr(self._local, "trace", None)
+        if trace is not None and trace.profile is not None:
+            trace.pop()
+
+
+validation_monitor = ValidationMonitor()
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def write_profile(form_validator_cls: type, profile: dict[str, int]) -> Path:
+    """Writes a profile as folded stacks, e.g. for flamegraph.pl or
+    speedscope, and returns the path.
+    """
+    profile_dir = Path(
+        getattr(settings, "EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_DIR", ".")
+    )
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    path = profile_dir / (
+        f"{form_validator_cls.__name__}-{time.time_ns()}-"
+        f"{os.getpid()}-{threading.get_ident()}.folded"
+    )
+    path.write_text("".join(f"{stack} {us}\n" for stack, us in profile.items() if us))
+    return path
+
+
+class SlowValidationLogMixin:
+    """Logs validations slower than
+    `EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS` with the validator
+    class, query count and the rules run.
+
+    Opt-in; off if the setting is not set. A fraction
+    (`EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_RATE`) of
+    validations is profiled and the profile of those that turn out
+    slow is written to `EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_DIR`.
+
+    Declare before the FormValidator base class.
+    """
+
+    def validate(self: Any) -> None:
+        threshold_ms = getattr(settings, "EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS", None)
+        if threshold_ms is None:
+            return super().validate()
+        profile_rate = getattr(
+            settings, "EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_RATE", 0.0
+        )
+        profile = random.random() < profile_rate  # noqa: S311
+        query_counter = QueryCounter()
+        trace = ValidationTrace()
+        start = time.perf_counter()
+        try:
+            with (
+                connection.execute_wrapper(query_counter),
+                validation_monitor.trace(self.__class__, profile=profile) as trace,
+            ):
+                return super().validate()
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if elapsed_ms >= threshold_ms:
+                self.log_slow_validation(elapsed_ms, query_counter.count, trace)
+
+    def log_slow_validation(
+        self: Any, elapsed_ms: float, queries: int, trace: ValidationTrace
+    ) -> None:
+        profile_path = None
+        if trace.profile is not None:
+            profile_path = write_profile(self.__class__, trace.profile)
+        logger.warning(
+            "Slow validation %s took %.0fms, %s queries. Ran %s.",
+            self.__class__.__name__,
+            elapsed_ms,
+            queries,
+            trace.rules,
+            extra={
+                "form_validator": self.__class__.__name__,
+                "elapsed_ms": round(elapsed_ms, 1),
+                "queries": queries,
+                "rules": trace.rules,
+                "profile": str(profile_path) if profile_path else None,
+            },
+        )
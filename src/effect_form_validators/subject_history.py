@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from decimal import Decimal
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from threading import Lock, RLock
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django.db import models
+
+HistoryKey = tuple[Decimal, int]
+CacheKey = tuple[str, str, tuple[str, ...], str]
+
+DEFAULT_CACHE_SIZE = 1000
+DEFAULT_CACHE_TIMEOUT = 60
+
+
+class SubjectHistory:
+    """An in-memory index of one subject's CRF values ordered by
+    appointment timepoint and visit code sequence.
+
+    Answers "previous/next value of field F before/after timepoint T"
+    with a bisect instead of a query.
+    """
+
+    def __init__(
+        self,
+        subject_identifier: str,
+        fields: Iterable[str],
+        rows: Iterable[tuple],
+    ):
+        """`rows` are tuples of (pk, timepoint, visit_code_sequence, *values)
+        where values are in the same order as `fields`.
+        """
+        self.subject_identifier = subject_identifier
+        self.fields = tuple(fields)
+        rows = sorted(rows, key=itemgetter(1, 2))
+        self.keys: list[HistoryKey] = [(row[1], row[2]) for row in rows]
+        self.pks: list[Any] = [row[0] for row in rows]
+        self.values: dict[str, list[Any]] = {
+            field: [row[i] for row in rows] for i, field in enumerate(self.fields, start=3)
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.subject_identifier!r}, rows={len(self)})"
+
+    def previous(
+        self,
+        field: str,
+        timepoint: Decimal,
+        visit_code_sequence: int = 0,
+        exclude_pk: Any = None,
+    ) -> Any:
+        """Returns the last non-null value of `field` reported before
+        (timepoint, visit_code_sequence), or None.
+        """
+        values = self.values[field]
+        index = bisect_left(self.keys, (timepoint, visit_code_sequence))
+        for i in range(index - 1, -1, -1):
+            if values[i] is not None and (exclude_pk is None or self.pks[i] != exclude_pk):
+                return values[i]
+        return None
+
+    def at(self, field: str, timepoint: Decimal, visit_code_sequence: int = 0) -> Any:
+        """Returns the value of `field` of the last row reported at
+        (timepoint, visit_code_sequence), or None.
+        """
+        key = (timepoint, visit_code_sequence)
+        index = bisect_right(self.keys, key)
+        if index and self.keys[index - 1] == key:
+            return self.values[field][index - 1]
+        return None
+
+    def next(
+        self,
+        field: str,
+        timepoint: Decimal,
+        visit_code_sequence: int = 0,
+        exclude_pk: Any = None,
+    ) -> Any:
+        """Returns the first non-null value of `field` reported after
+        (timepoint, visit_code_sequence), or None.
+        """
+        values = self.values[field]
+        index = bisect_right(self.keys, (timepoint, visit_code_sequence))
+        for i in range(index, len(self.keys)):
+            if values[i] is not None and (exclude_pk is None or self.pks[i] != exclude_pk):
+                return values[i]
+        return None
+
+
+def get_history_queryset(
+    model_cls: type[models.Model],
+    fields: Iterable[str],
+    related_visit_model_attr: str = "subject_visit",
+    **filter_opts,
+) -> models.QuerySet:
+    """Returns a `values_list()` queryset of CRF rows ordered by subject
+    and timepoint.
+
+    Each row is (subject_identifier, pk, timepoint, visit_code_sequence, *fields).
+    """
+    attr = related_visit_model_attr
+    return (
+        model_cls.objects.filter(**filter_opts)
+        .order_by(
+            f"{attr}__subject_identifier",
+            f"{attr}__appointment__timepoint",
+            f"{attr}__visit_code_sequence",
+        )
+        .values_list(
+            f"{attr}__subject_identifier",
+            "pk",
+            f"{attr}__appointment__timepoint",
+            f"{attr}__visit_code_sequence",
+            *fields,
+        )
+    )
+
+
+def load_subject_history(
+    model_cls: type[models.Model],
+    subject_identifier: str,
+    fields: Iterable[str],
+    related_visit_model_attr: str = "subject_visit",
+) -> SubjectHistory:
+    """Returns a SubjectHistory for one subject in a single query."""
+    fields = tuple(fields)
+    qs = get_history_queryset(
+        model_cls,
+        fields,
+        related_visit_model_attr,
+        **{f"{related_visit_model_attr}__subject_identifier": subject_identifier},
+    )
+    return SubjectHistory(subject_identifier, fields, (row[1:] for row in qs))
+
+
+async def aload_subject_history(
+    model_cls: type[models.Model],
+    subject_identifier: str,
+    fields: Iterable[str],
+    related_visit_model_attr: str = "subject_visit",
+) -> SubjectHistory:
+    """Async version of `load_subject_history` using the async ORM."""
+    fields = tuple(fields)
+    qs = get_history_queryset(
+        model_cls,
+        fields,
+        related_visit_model_attr,
+        **{f"{related_visit_model_attr}__subject_identifier": subject_identifier},
+    )
+    return SubjectHistory(subject_identifier, fields, [row[1:] async for row in qs])
+
+
+def iter_subject_histories(
+    model_cls: type[models.Model],
+    fields: Iterable[str],
+    related_visit_model_attr: str = "subject_visit",
+    subject_identifiers: Iterable[str] | None = None,
+    chunk_size: int = 2000,
+) -> Iterator[SubjectHistory]:
+    """Yields a SubjectHistory per subject from one streamed query.
+
+    For bulk sweeps; only one subject's rows are held in memory at a time.
+    """
+    fields = tuple(fields)
+    filter_opts = {}
+    if subject_identifiers is not None:
+        filter_opts[f"{related_visit_model_attr}__subject_identifier__in"] = list(
+            subject_identifiers
+        )
+    qs = get_history_queryset(model_cls, fields, related_visit_model_attr, **filter_opts)
+    for subject_identifier, rows in groupby(
+        qs.iterator(chunk_size=chunk_size), key=itemgetter(0)
+    ):
+        yield SubjectHistory(subject_identifier, fields, (row[1:] for row in rows))
+
+
+class SubjectHistoryCache:
+    """Per-subject cache of SubjectHistory for interactive saves.
+
+    Entries for a subject are dropped whenever a row of the CRF model is
+    saved or deleted in this process, and again when that transaction
+    commits. Other processes do not see the signal, so entries also
+    expire after `timeout` seconds, and only the `size` most recently
+    used entries are kept.
+
+    Thread-safe. Histories are loaded outside the cache lock, one load
+    per key at a time, so loads for different subjects run concurrently.
+    """
+
+    def __init__(self):
+        self._histories: OrderedDict[CacheKey, tuple[float, SubjectHistory]] = OrderedDict()
+        self._loading: dict[CacheKey, Lock] = {}
+        self._connected: set[str] = set()
+        self._lock = RLock()
+        # bumped by `clear` so a load in flight is not cached stale
+        self._generation = 0
+
+    @property
+    def size(self) -> int:
+        return getattr(
+            settings, "EFFECT_FORM_VALIDATORS_SUBJECT_HISTORY_CACHE_SIZE", DEFAULT_CACHE_SIZE
+        )
+
+    @property
+    def timeout(self) -> float:
+        return getattr(
+            settings,
+            "EFFECT_FORM_VALIDATORS_SUBJECT_HISTORY_CACHE_TIMEOUT",
+            DEFAULT_CACHE_TIMEOUT,
+        )
+
+    def get(
+        self,
+        model_cls: type[models.Model],
+        subject_identifier: str,
+        fields: Iterable[str],
+        related_visit_model_attr: str = "subject_visit",
+    ) -> SubjectHistory:
+        fields = tuple(fields)
+        label_lower = model_cls._meta.label_lower
+        key = (label_lower, subject_identifier, fields, related_visit_model_attr)
+        with self._lock:
+            if (subject_history := self._get_cached(key)) is not None:
+                return subject_history
+            self._connect(model_cls, related_visit_model_attr)
+            loading = self._loading.setdefault(key, Lock())
+        with loading:
+            with self._lock:
+                if (subject_history := self._get_cached(key)) is not None:
+                    return subject_history
+                generation = self._generation
+            subject_history = load_subject_history(
+                model_cls, subject_identifier, fields, related_visit_model_attr
+            )
+            with self._lock:
+                if generation == self._generation:
+                    self._histories[key] = (time.monotonic() + self.timeout, subject_history)
+                    while len(self._histories) > self.size:
+                        self._histories.popitem(last=False)
+                self._loading.pop(key, None)
+            return subject_history
+
+    def _get_cached(self, key: CacheKey) -> SubjectHistory | None:
+        """Returns the cached history for `key` if not expired, marking
+        it as most recently used. Call with the lock held.
+        """
+        try:
+            expires, subject_history = self._histories[key]
+        except KeyError:
+            return None
+        if expires <= time.monotonic():
+            del self._histories[key]
+            return None
+        self._histories.move_to_end(key)
+        return subject_history
+
+    def clear(self, label_lower: str | None = None, subject_identifier: str | None = None):
+        with self._lock:
+            self._generation += 1
+            for key in list(self._histories):
+                if (label_lower is None or key[0] == label_lower) and (
+                    subject_identifier is None or key[1] == subject_identifier
+                ):
+                    del self._histories[key]
+
+    def _connect(self, model_cls: type[models.Model], related_visit_model_attr: str):
+        label_lower = model_cls._meta.label_lower
+        if label_lower in self._connected:
+            return
+
+        def receiver(sender, instance, **kwargs):
+            try:
+                subject_identifier = getattr(
+                    instance, related_visit_model_attr
+                ).subject_identifier
+            except AttributeError:
+                subject_identifier = None
+            clear = partial(
+                self.clear, label_lower=label_lower, subject_identifier=subject_identifier
+            )
+            # now, for this connection, and again once the change is
+            # visible to others, dropping anything loaded in between
+            clear()
+            transaction.on_commit(clear)
+
+        for signal in (post_save, post_delete):
+            signal.connect(
+                receiver,
+                sender=model_cls,
+                weak=False,
+                dispatch_uid=f"subject_history_cache_{signal is post_save}_{label_lower}",
+            )
+        self._connected.add(label_lower)
+
+
+subject_histories = SubjectHistoryCache()
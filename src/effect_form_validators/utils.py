@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any
+
+from clinicedc_utils import get_display_from_choices
+
+# {id(choices): (choices, index)}, see `get_choices_index`
+choices_indexes: dict[int, tuple[tuple, dict[Any, Any]]] = {}
+
+
+def get_choices_index(choices: tuple) -> dict[Any, Any]:
+    """Returns a {stored value: display value} index of a choices tuple.
+
+    Indexes are kept by the identity of the tuple, choices being module
+    level constants, so the tuple is not rehashed on each call. Other
+    sequences are indexed on each call.
+    """
+    try:
+        indexed_choices, index = choices_indexes[id(choices)]
+    except KeyError:
+        pass
+    else:
+        if indexed_choices is choices:
+            return index
+    index = {choice[0]: choice[1] for choice in choices}
+    if isinstance(choices, tuple):
+        # the reference kept stops the id being reused
+        choices_indexes[id(choices)] = (choices, index)
+    return index
+
+
+def get_display(choices: tuple, value: Any) -> Any:
+    """Returns the display value for `value` using a cached index.
+
+    Falls back to `get_display_from_choices` for unhashable choices or
+    values not in the index.
+    """
+    try:
+        return get_choices_index(choices)[value]
+    except (KeyError, TypeError):
+        return get_display_from_choices(choices, value)
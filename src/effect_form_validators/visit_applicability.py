@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from functools import cache
+from typing import Any, ClassVar
+
+from django.db.models import Q
+
+EMPTY = frozenset()
+
+
+@cache
+def get_visit_applicability(form_validator_cls: type) -> dict[tuple[str, int], frozenset]:
+    """Returns {(visit_code, visit_code_sequence): applicable fields}
+    built from the validator's `visit_applicable_fields` declaration.
+
+    Only scheduled visits (visit_code_sequence=0) are declared.
+    """
+    applicability = defaultdict(set)
+    declarations = getattr(form_validator_cls, "visit_applicable_fields", {})
+    for field, visit_codes in declarations.items():
+        for visit_code in visit_codes:
+            applicability[(visit_code, 0)].add(field)
+    return {key: frozenset(fields) for key, fields in applicability.items()}
+
+
+def get_visit_filter(
+    form_validator_cls: type, field: str, prefix: str = "subject_visit__"
+) -> Q:
+    """Returns a Q selecting the visits at which `field` is applicable,
+    to prefilter rows in bulk sweeps.
+    """
+    q = Q(pk__in=[])
+    for (visit_code, visit_code_sequence), fields in get_visit_applicability(
+        form_validator_cls
+    ).items():
+        if field in fields:
+            q |= Q(
+                **{
+                    f"{prefix}visit_code": visit_code,
+                    f"{prefix}visit_code_sequence": visit_code_sequence,
+                }
+            )
+    return q
+
+
+class VisitApplicabilityFormValidatorMixin:
+    """Declares fields only applicable at given scheduled visits.
+
+    For example:
+
+        visit_applicable_fields = {"require_help": (WEEK10, WEEK24)}
+    """
+
+    visit_applicable_fields: ClassVar[dict[str, tuple[str, ...]]] = {}
+
+    @property
+    def visit_applicable(self: Any) -> frozenset:
+        """Returns the declared fields applicable at this visit."""
+        return get_visit_applicability(type(self)).get(
+            (self.related_visit.visit_code, self.related_visit.visit_code_sequence), EMPTY
+        )
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from .registry import site_form_validators
+from .utils import get_choices_index
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+warmers: dict[str, Callable[[], object]] = {}
+
+
+def register_warmer(name: str):
+    """Decorator to register a function run by `warm_up`.
+
+    Warmers import, build or snapshot anything a validator would
+    otherwise do lazily on the first request in a new worker.
+    """
+
+    def wrapper(func: Callable[[], object]) -> Callable[[], object]:
+        warmers[name] = func
+        return func
+
+    return wrapper
+
+
+@register_warmer("form validators")
+def import_form_validators() -> None:
+    for registration in site_form_validators:
+        _ = registration.form_validator_cls
+
+
+@register_warmer("choice display indexes")
+def index_choices() -> None:
+    from edc_constants.choices import ALIVE_DEAD_UNKNOWN_NA_MISSED  # noqa: PLC0415
+    from edc_visit_tracking.choices import (  # noqa: PLC0415
+        ASSESSMENT_TYPES,
+        ASSESSMENT_WHO_CHOICES,
+        VISIT_INFO_SOURCE2,
+    )
+
+    for choices in [
+        ALIVE_DEAD_UNKNOWN_NA_MISSED,
+        ASSESSMENT_TYPES,
+        ASSESSMENT_WHO_CHOICES,
+        VISIT_INFO_SOURCE2,
+    ]:
+        get_choices_index(choices)
+
+
+@register_warmer("vital sign thresholds")
+def snapshot_vital_sign_thresholds() -> None:
+    from .effect_subject.vital_signs_grading import (  # noqa: PLC0415
+        get_vital_sign_thresholds,
+    )
+
+    get_vital_sign_thresholds()
+
+
+@register_warmer("study medication schedule")
+def index_study_medication_schedule() -> None:
+    from .effect_subject.study_medication_schedule import (  # noqa: PLC0415
+        get_study_medication_schedule,
+    )
+
+    get_study_medication_schedule()
+
+
+@register_warmer("consent definition index")
+def index_consent_definitions() -> None:
+    from .effect_screening.consent_definition_index import (  # noqa: PLC0415
+        consent_definition_index,
+    )
+
+    _ = consent_definition_index.index
+
+
+@register_warmer("reference snapshot")
+def map_reference_snapshot() -> None:
+    from .reference_snapshot import get_reference_snapshot  # noqa: PLC0415
+
+    get_reference_snapshot()
+
+
+def warm_up() -> dict[str, float]:
+    """Runs all registered warmers and returns the time, in seconds,
+    taken by each.
+
+    A warmer that raises is logged and left out; the validators then
+    do that work lazily as before.
+    """
+    timings = {}
+    for name, func in warmers.items():
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception:
+            logger.exception("Warm up of %s failed. Skipping.", name)
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
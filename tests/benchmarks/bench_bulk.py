@@ -0,0 +1,100 @@
+"""Compares the thread pool bulk backend (`bulk_validation.thread_map`)
+with a process pool on synthetic payloads (see `payloads.py`).
+
+Run on both a free-threaded (e.g. python3.14t) and a GIL build. On a
+free-threaded build, `PYTHON_GIL=1` re-enables the GIL for a like for
+like comparison. Process pool times include worker start-up and
+pickling of payloads and results.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from effect_form_validators.bulk_validation import is_free_threaded, thread_map
+
+from .bench_payloads import FormCase, get_form_cases, validate_payload
+from .payloads import Payload, stream
+
+# set in process pool workers by `init_worker`
+worker_cases: dict[str, FormCase] = {}
+
+
+def init_worker() -> None:
+    import django  # noqa: PLC0415
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.test_settings")
+    django.setup()
+    worker_cases.update({case.form: case for case in get_form_cases()})
+
+
+def validate_in_worker(payload: Payload) -> bool:
+    return validate_payload(worker_cases[payload.form], payload).ok
+
+
+def validate_in_thread(cases: dict[str, FormCase], payload: Payload) -> bool:
+    return validate_payload(cases[payload.form], payload).ok
+
+
+def get_payloads(number: int, seed: int, forms: list[str]) -> list[Payload]:
+    """Returns `number` rows of each form, interleaved."""
+    streams = [stream(form, stop=number, seed=seed) for form in forms]
+    return [payload for rows in zip(*streams, strict=True) for payload in rows]
+
+
+def run_threads(payloads: list[Payload], cases: dict, workers: int) -> list[bool]:
+    return thread_map(partial(validate_in_thread, cases), payloads, workers=workers)
+
+
+def run_processes(payloads: list[Payload], workers: int) -> list[bool]:
+    with ProcessPoolExecutor(workers, initializer=init_worker) as executor:
+        return list(
+            executor.map(
+                validate_in_worker, payloads, chunksize=max(1, len(payloads) // (workers * 4))
+            )
+        )
+
+
+def get_worker_counts() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def run(number: int = 1000, seed: int = 0) -> None:
+    cases = {case.form: case for case in get_form_cases()}
+    payloads = get_payloads(number, seed, list(cases))
+    expected = [payload.valid for payload in payloads]
+    build = "free-threaded, GIL disabled" if is_free_threaded() else "GIL enabled"
+    print(  # noqa: T201
+        f"\nBulk validation, {len(payloads)} rows, Python "
+        f"{sys.version.split()[0]} ({build}), {os.cpu_count()} CPUs"
+    )
+    print(  # noqa: T201
+        f"  {'executor':<8}  {'workers':>7}  {'seconds':>8}  {'rows/s':>9}  "
+        f"{'speedup':>7}  {'mismatched':>10}"
+    )
+    baseline = None
+    for executor in ["thread", "process"]:
+        for workers in get_worker_counts():
+            start = time.perf_counter()
+            if executor == "thread":
+                results = run_threads(payloads, cases, workers)
+            else:
+                results = run_processes(payloads, workers)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            mismatched = sum(a != b for a, b in zip(results, expected, strict=True))
+            print(  # noqa: T201
+                f"  {executor:<8}  {workers:>7}  {seconds:>8.2f}  "
+                f"{len(payloads) / seconds:>9.0f}  {baseline / seconds:>6.1f}x  "
+                f"{mismatched:>10}"
+            )
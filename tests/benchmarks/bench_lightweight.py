@@ -0,0 +1,135 @@
+"""Compares CrfFormValidator with the LightweightCrfFormValidator fast
+path for validators that only read their own cleaned_data.
+
+Both variants stub the window period check and the CrfFormValidator
+variants stub the consent lookup, so the real saving on a database,
+one consent query per save, is larger.
+"""
+
+from contextlib import suppress
+
+from clinicedc_constants import NO, NOT_APPLICABLE, YES
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django_mock_queries.query import MockModel
+from edc_crf.crf_form_validator import CrfFormValidator
+
+from effect_form_validators.effect_subject import (
+    AdherenceStageOneFormValidator,
+    ClinicalNoteFormValidator,
+    HistopathologyFormValidator,
+)
+from effect_form_validators.effect_subject.histopathology_form_validator import (
+    HistopathologyFormValidatorMixin,
+)
+from tests.tests.mixins import TestCaseMixin
+
+from .bench_outcome import get_test_case
+from .runner import measure, report
+
+
+class CrfMockModel(MockModel):
+    @classmethod
+    def related_visit_model_attr(cls) -> str:
+        return "subject_visit"
+
+
+class WindowPeriodStubMixin:
+    def validate_crf_datetime_in_window_period(self) -> None:
+        pass
+
+
+class ConsentStubMixin(WindowPeriodStubMixin):
+    def get_consent_datetime_or_raise(self):
+        return self.report_datetime
+
+
+class CrfClinicalNoteFormValidator(ConsentStubMixin, CrfFormValidator):
+    clean = ClinicalNoteFormValidator.clean
+
+
+class CrfHistopathologyFormValidator(
+    HistopathologyFormValidatorMixin, ConsentStubMixin, CrfFormValidator
+):
+    clean = HistopathologyFormValidator.clean
+
+
+class CrfAdherenceStageOneFormValidator(ConsentStubMixin, CrfFormValidator):
+    pass
+
+
+class LightweightClinicalNoteFormValidator(WindowPeriodStubMixin, ClinicalNoteFormValidator):
+    pass
+
+
+class LightweightHistopathologyFormValidator(
+    WindowPeriodStubMixin, HistopathologyFormValidator
+):
+    pass
+
+
+class LightweightAdherenceStageOneFormValidator(
+    WindowPeriodStubMixin, AdherenceStageOneFormValidator
+):
+    pass
+
+
+def get_cases() -> list[tuple[str, type, type, dict]]:
+    test_case = get_test_case(TestCaseMixin)
+    cleaned_data = test_case.get_cleaned_data(report_datetime=timezone.now())
+    clinical_note = {**cleaned_data, "has_comment": YES, "comments": "comments"}
+    histopathology = {
+        **cleaned_data,
+        "tissue_biopsy_performed": NO,
+        "tissue_biopsy_date": None,
+        "tissue_biopsy_result": NOT_APPLICABLE,
+        "tissue_biopsy_organism_text": "",
+    }
+    return [
+        (
+            "clinical_note",
+            CrfClinicalNoteFormValidator,
+            LightweightClinicalNoteFormValidator,
+            clinical_note,
+        ),
+        (
+            "histopathology",
+            CrfHistopathologyFormValidator,
+            LightweightHistopathologyFormValidator,
+            histopathology,
+        ),
+        (
+            "adherence_stage_one",
+            CrfAdherenceStageOneFormValidator,
+            LightweightAdherenceStageOneFormValidator,
+            cleaned_data,
+        ),
+    ]
+
+
+def validating(form_validator_cls, cleaned_data):
+    def func():
+        with suppress(ValidationError):
+            form_validator_cls(cleaned_data=cleaned_data, model=CrfMockModel).validate()
+
+    return func
+
+
+def run(number: int = 1000) -> None:
+    timings = []
+    for name, crf_form_validator_cls, form_validator_cls, cleaned_data in get_cases():
+        timings.extend(
+            [
+                measure(
+                    f"{name} CrfFormValidator",
+                    validating(crf_form_validator_cls, cleaned_data),
+                    number=number,
+                ),
+                measure(
+                    f"{name} LightweightCrfFormValidator",
+                    validating(form_validator_cls, cleaned_data),
+                    number=number,
+                ),
+            ]
+        )
+    report("CrfFormValidator vs LightweightCrfFormValidator", timings)
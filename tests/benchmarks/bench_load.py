@@ -0,0 +1,221 @@
+"""Replays a deadline-day mix of CRF saves through the validators from
+a pool of concurrent "clerks".
+
+Payloads and mock models are taken from the existing test cases, so
+no rows are read or written; this measures validator CPU time and
+contention between workers, not database load.
+
+Reports throughput and p50/p95/p99 latency for each validator. The
+subject visit validator is not included as there are no test fixtures
+for it.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from math import ceil
+
+from clinicedc_constants import IN_PERSON
+from edc_visit_schedule.constants import DAY14
+
+from effect_form_validators.effect_subject import (
+    FluconMissedDosesFormValidator,
+    FlucytMissedDosesFormValidator,
+)
+from effect_form_validators.outcome import validate
+from tests.tests.effect_subject.adherence.test_flucyt_missed_doses import (
+    TestFlucytMissedDosesFormValidators,
+)
+from tests.tests.effect_subject.adherence.test_missed_doses import (
+    MissedDosesMockModel,
+    TestConcreteMissedDosesFormValidators,
+)
+from tests.tests.effect_subject.test_arv_history import (
+    ArvHistoryFormValidator,
+    ArvHistoryMockModel,
+    TestArvHistoryFormValidator,
+)
+from tests.tests.effect_subject.test_signs_and_symptoms import (
+    SignsAndSymptomsFormValidator,
+    SignsAndSymptomsMockModel,
+    TestSignsAndSymptomsFormValidation,
+)
+from tests.tests.effect_subject.test_study_medication_followup import (
+    StudyMedicationFollowupFormValidator,
+    StudyMedicationMockModel,
+    TestStudyMedicationFollowupFormValidation,
+)
+from tests.tests.effect_subject.test_vital_signs import (
+    TestVitalSignsFormValidator,
+    VitalSignsFormValidator,
+    VitalSignsMockModel,
+)
+from tests.tests.mock_models import FlucytMissedDosesMockModel
+
+from .bench_outcome import get_test_case
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    weight: float
+    form_validator_cls: type
+    model_cls: type
+    cleaned_data: dict
+
+
+@dataclass(frozen=True)
+class SaveResult:
+    scenario: str
+    seconds: float
+    ok: bool
+
+
+def get_scenarios() -> list[Scenario]:
+    """Returns the save mix of a follow-up visit, weighted by how often
+    each form is saved. Adherence inlines are saved several per form.
+    """
+    signs_and_symptoms = get_test_case(TestSignsAndSymptomsFormValidation)
+    signs_and_symptoms.subject_visit.assessment_type = IN_PERSON
+    study_medication = get_test_case(TestStudyMedicationFollowupFormValidation)
+    study_medication.mock_is_baseline.return_value = False
+    flucon_missed_doses = get_test_case(TestConcreteMissedDosesFormValidators)
+    return [
+        Scenario(
+            "signs_and_symptoms",
+            1.0,
+            SignsAndSymptomsFormValidator,
+            SignsAndSymptomsMockModel,
+            signs_and_symptoms.get_cleaned_data(),
+        ),
+        Scenario(
+            "vital_signs",
+            1.0,
+            VitalSignsFormValidator,
+            VitalSignsMockModel,
+            get_test_case(TestVitalSignsFormValidator).get_cleaned_data(),
+        ),
+        Scenario(
+            "arv_history",
+            0.2,
+            ArvHistoryFormValidator,
+            ArvHistoryMockModel,
+            get_test_case(TestArvHistoryFormValidator).get_cleaned_data(),
+        ),
+        Scenario(
+            "study_medication_followup",
+            1.0,
+            StudyMedicationFollowupFormValidator,
+            StudyMedicationMockModel,
+            study_medication.get_cleaned_data(visit_code=DAY14),
+        ),
+        Scenario(
+            "flucyt_missed_doses",
+            2.0,
+            FlucytMissedDosesFormValidator,
+            FlucytMissedDosesMockModel,
+            get_test_case(TestFlucytMissedDosesFormValidators).get_cleaned_data(),
+        ),
+        Scenario(
+            "flucon_missed_doses",
+            2.0,
+            FluconMissedDosesFormValidator,
+            MissedDosesMockModel,
+            flucon_missed_doses.get_cleaned_data(
+                form_validator=FluconMissedDosesFormValidator
+            ),
+        ),
+    ]
+
+
+def get_mix(scenarios: list[Scenario], saves: int, seed: int = 0) -> list[int]:
+    """Returns scenario indexes for `saves` saves, drawn by weight.
+
+    Seeded, so a mix is reproducible; not used for security.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    return rng.choices(range(len(scenarios)), weights=[s.weight for s in scenarios], k=saves)
+
+
+def save(scenario: Scenario) -> SaveResult:
+    start = time.perf_counter()
+    outcome = validate(
+        scenario.form_validator_cls, scenario.cleaned_data, model=scenario.model_cls
+    )
+    return SaveResult(
+        scenario=scenario.name, seconds=time.perf_counter() - start, ok=outcome.ok
+    )
+
+
+# set in process pool workers by `init_worker`
+worker_scenarios: list[Scenario] = []
+
+
+def init_worker() -> None:
+    import django  # noqa: PLC0415
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.test_settings")
+    django.setup()
+    worker_scenarios.extend(get_scenarios())
+
+
+def save_in_worker(index: int) -> SaveResult:
+    return save(worker_scenarios[index])
+
+
+def replay(
+    scenarios: list[Scenario], mix: list[int], workers: int, executor: str = "thread"
+) -> tuple[list[SaveResult], float]:
+    """Returns the results of the saves in `mix` and the wall time.
+
+    Thread pool workers share the scenarios; process pool workers
+    build their own (payloads hold mock models that do not pickle).
+    """
+    start = time.perf_counter()
+    if executor == "process":
+        with ProcessPoolExecutor(workers, initializer=init_worker) as pool:
+            results = list(pool.map(save_in_worker, mix, chunksize=max(1, len(mix) // 100)))
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            results = list(pool.map(save, [scenarios[i] for i in mix]))
+    return results, time.perf_counter() - start
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Returns the nearest-rank percentile of sorted `values`."""
+    return values[max(0, ceil(p / 100 * len(values)) - 1)]
+
+
+def report(title: str, results: list[SaveResult], seconds: float) -> None:
+    by_scenario = defaultdict(list)
+    for result in results:
+        by_scenario[result.scenario].append(result)
+    by_scenario["all"] = results
+    width = max(len(name) for name in by_scenario)
+    print(f"\n{title}: {len(results)} saves in {seconds:.2f}s")  # noqa: T201
+    print(  # noqa: T201
+        f"  {'validator':<{width}}  {'saves':>6}  {'saves/s':>9}  {'p50 ms':>8}  "
+        f"{'p95 ms':>8}  {'p99 ms':>8}"
+    )
+    for name, scenario_results in by_scenario.items():
+        latencies = sorted(r.seconds * 1000 for r in scenario_results)
+        print(  # noqa: T201
+            f"  {name:<{width}}  {len(scenario_results):>6}  "
+            f"{len(scenario_results) / seconds:>9.0f}  "
+            f"{percentile(latencies, 50):>8.2f}  {percentile(latencies, 95):>8.2f}  "
+            f"{percentile(latencies, 99):>8.2f}"
+        )
+
+
+def run(
+    number: int = 1000, workers: int = 200, executor: str = "thread", seed: int = 0
+) -> None:
+    scenarios = get_scenarios()
+    mix = get_mix(scenarios, number, seed=seed)
+    results, seconds = replay(scenarios, mix, workers=workers, executor=executor)
+    report(f"Load test, {workers} {executor} workers", results, seconds)
@@ -0,0 +1,114 @@
+"""Compares the raising (form) and returning (bulk) validation modes.
+
+Rules raise in both modes, so this measures the overhead of converting
+the error to a ValidationOutcome, not a saving. Payloads are taken from
+the existing test cases.
+"""
+
+from contextlib import suppress
+
+from clinicedc_constants import IN_PERSON, YES
+from django.core.exceptions import ValidationError
+
+from effect_form_validators.outcome import validate
+from tests.tests.effect_subject.test_arv_history import (
+    ArvHistoryFormValidator,
+    ArvHistoryMockModel,
+    TestArvHistoryFormValidator,
+)
+from tests.tests.effect_subject.test_signs_and_symptoms import (
+    SignsAndSymptomsFormValidator,
+    SignsAndSymptomsMockModel,
+    TestSignsAndSymptomsFormValidation,
+)
+from tests.tests.effect_subject.test_vital_signs import (
+    TestVitalSignsFormValidator,
+    VitalSignsFormValidator,
+    VitalSignsMockModel,
+)
+
+from .runner import measure, report
+
+
+def get_test_case(test_case_cls):
+    """Returns a set up test case instance to borrow payloads from."""
+    test_case = test_case_cls()
+    test_case.setUp()
+    return test_case
+
+
+def get_cases() -> list[tuple[str, type, type, dict]]:
+    vital_signs = get_test_case(TestVitalSignsFormValidator)
+    arv_history = get_test_case(TestArvHistoryFormValidator)
+    signs_and_symptoms = get_test_case(TestSignsAndSymptomsFormValidation)
+    signs_and_symptoms.subject_visit.assessment_type = IN_PERSON
+    cases = [
+        (
+            "vital_signs",
+            VitalSignsFormValidator,
+            VitalSignsMockModel,
+            vital_signs.get_cleaned_data(),
+            {"temperature": 40.5},
+        ),
+        (
+            "arv_history",
+            ArvHistoryFormValidator,
+            ArvHistoryMockModel,
+            arv_history.get_cleaned_data(),
+            {"ever_on_art": YES},
+        ),
+        (
+            "signs_and_symptoms",
+            SignsAndSymptomsFormValidator,
+            SignsAndSymptomsMockModel,
+            signs_and_symptoms.get_cleaned_data(),
+            {"reportable_as_ae": YES},
+        ),
+    ]
+    payloads = []
+    for name, form_validator_cls, model_cls, cleaned_data, invalid in cases:
+        payloads.append((f"{name} (valid)", form_validator_cls, model_cls, cleaned_data))
+        payloads.append(
+            (
+                f"{name} (invalid)",
+                form_validator_cls,
+                model_cls,
+                {**cleaned_data, **invalid},
+            )
+        )
+    return payloads
+
+
+def raising(form_validator_cls, model_cls, cleaned_data):
+    def func():
+        with suppress(ValidationError):
+            form_validator_cls(cleaned_data=cleaned_data, model=model_cls).validate()
+
+    return func
+
+
+def returning(form_validator_cls, model_cls, cleaned_data):
+    def func():
+        validate(form_validator_cls, cleaned_data, model=model_cls)
+
+    return func
+
+
+def run(number: int = 1000) -> None:
+    timings = []
+    for name, form_validator_cls, model_cls, cleaned_data in get_cases():
+        timings.extend(
+            [
+                measure(
+                    f"{name} raising",
+                    raising(form_validator_cls, model_cls, cleaned_data),
+                    number=number,
+                ),
+                measure(
+                    f"{name} returning",
+                    returning(form_validator_cls, model_cls, cleaned_data),
+                    number=number,
+                ),
+            ]
+        )
+    report("Raising vs returning validation", timings)
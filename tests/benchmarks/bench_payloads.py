@@ -0,0 +1,261 @@
+"""Streams synthetic payloads (see `payloads.py`) through the form
+validators and the vectorized screening log.
+
+Reports the cost of generating a row, validation throughput per form
+and the number of rows whose outcome disagrees with the generator's
+valid/near-valid label, which should be zero.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from unittest.mock import patch
+
+from clinicedc_constants import IN_PERSON
+from clinicedc_tests.mixins import FormValidatorTestMixin
+from edc_visit_schedule.constants import DAY01
+
+from effect_form_validators.effect_screening.screening_log import evaluate_screening_log
+from effect_form_validators.effect_subject import (
+    BloodCultureFormValidator,
+    ChestXrayFormValidator,
+    FluconMissedDosesFormValidator,
+    FlucytMissedDosesFormValidator,
+    LpCsfFormValidator,
+    SubjectVisitFormValidator,
+)
+from effect_form_validators.outcome import ValidationOutcome, validate_instance
+from tests.tests.effect_ae.test_death_report import DeathReportFormValidator
+from tests.tests.effect_prn.test_hospitalisation import HospitalizationFormValidator
+from tests.tests.effect_subject.adherence.test_missed_doses import MissedDosesMockModel
+from tests.tests.effect_subject.test_arv_history import (
+    ArvHistoryMockModel,
+    ArvHistoryWithoutSubjectScreeningMockFormValidator,
+)
+from tests.tests.effect_subject.test_chest_xray import ChestXrayMockModel
+from tests.tests.effect_subject.test_diagnoses import (
+    DiagnosesFormValidator,
+    DiagnosesMockModel,
+)
+from tests.tests.effect_subject.test_mental_status import (
+    MentalStatusFormValidator,
+    MentalStatusMockModel,
+)
+from tests.tests.effect_subject.test_signs_and_symptoms import (
+    SignsAndSymptomsFormValidator,
+    SignsAndSymptomsMockModel,
+)
+from tests.tests.effect_subject.test_study_medication_baseline import (
+    StudyMedicationBaselineFormValidator,
+    StudyMedicationMockModel,
+    TestStudyMedicationBaselineFormValidation,
+)
+from tests.tests.effect_subject.test_study_medication_followup import (
+    StudyMedicationFollowupFormValidator,
+)
+from tests.tests.effect_subject.test_vital_signs import (
+    VitalSignsFormValidator,
+    VitalSignsMockModel,
+)
+from tests.tests.mixins import TestCaseMixin
+from tests.tests.mock_models import AdherenceMockModel, FlucytMissedDosesMockModel
+
+from .bench_lightweight import (
+    CrfMockModel,
+    LightweightClinicalNoteFormValidator,
+    LightweightHistopathologyFormValidator,
+)
+from .bench_outcome import get_test_case
+from .payloads import Payload, apply_lookups, generators, stream, to_cleaned_data
+from .runner import measure, report
+
+# modules whose validators check `is_baseline`, see `is_baseline_visit`
+BASELINE_MODULES = (
+    "mental_status_form_validator",
+    "study_medication_followup_form_validator",
+    "subject_visit_form_validator",
+)
+
+
+@dataclass(frozen=True)
+class FormCase:
+    form: str
+    form_validator_cls: type
+    # None for non-CRF forms
+    model_cls: type | None
+    # returns the cleaned_data the payload does not provide
+    get_base: Callable[[Payload], dict]
+
+
+class BenchSubjectVisitFormValidator(FormValidatorTestMixin, SubjectVisitFormValidator):
+    def _clean(self) -> None:
+        # the appointment, visit sequence and metadata checks query the
+        # database
+        self.clean()
+
+
+class BenchChestXrayFormValidator(FormValidatorTestMixin, ChestXrayFormValidator):
+    # from the payload's lookups
+    consent_datetime: datetime | None = None
+
+    def get_consent_datetime_or_raise(self, **kwargs) -> datetime:  # noqa: ARG002
+        return self.consent_datetime
+
+
+class BenchLpCsfFormValidator(FormValidatorTestMixin, LpCsfFormValidator):
+    pass
+
+
+class BenchBloodCultureFormValidator(FormValidatorTestMixin, BloodCultureFormValidator):
+    pass
+
+
+def is_baseline_visit(instance: Any = None, **kwargs) -> bool:
+    """Replaces `is_baseline`, which needs the visit schedule, for the
+    payloads' mock visits and appointments.
+    """
+    return instance.visit_code == DAY01 and instance.visit_code_sequence == 0
+
+
+def get_form_cases() -> list[FormCase]:
+    test_case = get_test_case(TestCaseMixin)
+    test_case.subject_visit.assessment_type = IN_PERSON
+    crf_base = {"subject_visit": test_case.subject_visit}
+    # patches is_baseline
+    study_medication = get_test_case(TestStudyMedicationBaselineFormValidation)
+    study_medication.mock_is_baseline.return_value = True
+
+    def get_crf_base(payload: Payload) -> dict:
+        return crf_base
+
+    def get_adherence_base(payload: Payload) -> dict:
+        return {"adherence": AdherenceMockModel(subject_identifier=payload.subject_identifier)}
+
+    def get_no_base(payload: Payload) -> dict:
+        return {}
+
+    for module in BASELINE_MODULES:
+        patch(
+            f"effect_form_validators.effect_subject.{module}.is_baseline", is_baseline_visit
+        ).start()
+
+    return [
+        FormCase("vital_signs", VitalSignsFormValidator, VitalSignsMockModel, get_crf_base),
+        FormCase(
+            "signs_and_symptoms",
+            SignsAndSymptomsFormValidator,
+            SignsAndSymptomsMockModel,
+            get_crf_base,
+        ),
+        FormCase(
+            "arv_history",
+            ArvHistoryWithoutSubjectScreeningMockFormValidator,
+            ArvHistoryMockModel,
+            get_crf_base,
+        ),
+        FormCase(
+            "study_medication_baseline",
+            StudyMedicationBaselineFormValidator,
+            StudyMedicationMockModel,
+            lambda payload: {"subject_visit": study_medication.subject_visit},  # noqa: ARG005
+        ),
+        FormCase(
+            "flucon_missed_doses",
+            FluconMissedDosesFormValidator,
+            MissedDosesMockModel,
+            get_no_base,
+        ),
+        FormCase(
+            "flucyt_missed_doses",
+            FlucytMissedDosesFormValidator,
+            FlucytMissedDosesMockModel,
+            get_adherence_base,
+        ),
+        FormCase(
+            "clinical_note", LightweightClinicalNoteFormValidator, CrfMockModel, get_crf_base
+        ),
+        FormCase(
+            "histopathology",
+            LightweightHistopathologyFormValidator,
+            CrfMockModel,
+            get_crf_base,
+        ),
+        FormCase("subject_visit", BenchSubjectVisitFormValidator, None, get_no_base),
+        FormCase("chest_xray", BenchChestXrayFormValidator, ChestXrayMockModel, get_no_base),
+        FormCase(
+            "mental_status", MentalStatusFormValidator, MentalStatusMockModel, get_no_base
+        ),
+        FormCase(
+            "study_medication_followup",
+            StudyMedicationFollowupFormValidator,
+            StudyMedicationMockModel,
+            get_no_base,
+        ),
+        FormCase("lp_csf", BenchLpCsfFormValidator, CrfMockModel, get_no_base),
+        FormCase("blood_culture", BenchBloodCultureFormValidator, CrfMockModel, get_no_base),
+        FormCase("diagnoses", DiagnosesFormValidator, DiagnosesMockModel, get_no_base),
+        FormCase("hospitalization", HospitalizationFormValidator, None, get_no_base),
+        FormCase("death_report", DeathReportFormValidator, None, get_no_base),
+    ]
+
+
+def validate_payload(case: FormCase, payload: Payload) -> ValidationOutcome:
+    form_validator = case.form_validator_cls(
+        cleaned_data=to_cleaned_data(payload, **case.get_base(payload)),
+        model=case.model_cls,
+    )
+    return validate_instance(apply_lookups(form_validator, payload))
+
+
+def run_forms(number: int, seed: int) -> None:
+    print(f"\nSynthetic payloads, {number} rows per form, seed {seed}")  # noqa: T201
+    print(f"  {'form':<26}  {'rows/s':>9}  {'invalid':>7}  {'mismatched':>10}")  # noqa: T201
+    for case in get_form_cases():
+        payloads = list(stream(case.form, stop=number, seed=seed))
+        start = time.perf_counter()
+        outcomes = [validate_payload(case, payload) for payload in payloads]
+        seconds = time.perf_counter() - start
+        mismatched = [
+            payload
+            for payload, outcome in zip(payloads, outcomes, strict=True)
+            if outcome.ok != payload.valid
+        ]
+        print(  # noqa: T201
+            f"  {case.form:<26}  {number / seconds:>9.0f}  "
+            f"{sum(not p.valid for p in payloads):>7}  {len(mismatched):>10}"
+        )
+        for payload in mismatched[:3]:
+            print(f"    row {payload.index}: rule={payload.rule}")  # noqa: T201
+
+
+def run_screening_log(number: int, seed: int) -> None:
+    payloads = list(stream("screening_log", stop=number, seed=seed))
+    start = time.perf_counter()
+    try:
+        result = evaluate_screening_log([payload.data for payload in payloads])
+    except ImportError as e:
+        print(f"\nScreening log skipped. {e}")  # noqa: T201
+        return
+    seconds = time.perf_counter() - start
+    mismatched = sum(
+        bool(valid) != payload.valid
+        for valid, payload in zip(result.valid, payloads, strict=True)
+    )
+    print(  # noqa: T201
+        f"\nScreening log (vectorized), {number} rows: {number / seconds:.0f} rows/s, "
+        f"{mismatched} mismatched"
+    )
+
+
+def run(number: int = 1000, seed: int = 0) -> None:
+    timings = []
+    for form in generators:
+        rows = stream(form, seed=seed)
+        timings.append(measure(f"{form} generate", rows.__next__, number=number))
+    report("Synthetic payload generation", timings)
+    run_forms(number, seed)
+    run_screening_log(number, seed)
@@ -0,0 +1,1883 @@
+"""Seeded synthetic payloads for bulk and vectorized throughput
+benchmarks.
+
+Each form has a generator for valid cleaned_data, which follows the
+branching in the form's validator (e.g. `has_switched_art_regimen`,
+`any_sx` and the grade 3 symptoms, the flucytosine slot doses), and a
+set of mutations that each break one rule to make a near-valid row.
+
+Rows are deterministic: row `index` of a form is generated from its own
+seeded `random.Random`, so any range of a stream can be generated on
+its own, e.g. by a worker or a shard, and always gives the same rows.
+
+Payload data holds plain values; m2m fields are tuples of choice
+names and the visit of forms whose rules depend on it is a `Visit`.
+Use `to_cleaned_data` and `apply_lookups` to run a payload through a
+form validator. For the other CRFs the visit (`subject_visit`) is left
+to the caller. Signs and symptoms rows are generated for in person
+visits. Baseline is the scheduled DAY01 visit, see `Visit.baseline`.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Iterator
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+from functools import cache
+from itertools import count
+from typing import Any, NamedTuple
+
+from clinicedc_constants import (
+    ALIVE,
+    BACTERAEMIA,
+    CN_PALSY_LEFT_OTHER,
+    CN_PALSY_RIGHT_OTHER,
+    CONTROL,
+    DEAD,
+    DEFAULTED,
+    EQ,
+    FEMALE,
+    FOCAL_NEUROLOGIC_DEFICIT_OTHER,
+    GT,
+    HEADACHE,
+    HOSPITAL_NOTES,
+    IN_PERSON,
+    INTERVENTION,
+    LT,
+    MALE,
+    NEG,
+    NEXT_OF_KIN,
+    NO,
+    NORMAL,
+    NOT_APPLICABLE,
+    NOT_DONE,
+    OTHER,
+    PATIENT,
+    PATIENT_REPRESENTATIVE,
+    PENDING,
+    PER_PROTOCOL,
+    POS,
+    REFUSED,
+    TELEPHONE,
+    TODAY,
+    TOMORROW,
+    UNKNOWN,
+    VISUAL_LOSS,
+    YES,
+)
+from django_mock_queries.query import MockModel, MockSet
+from edc_visit_schedule.constants import (
+    DAY01,
+    DAY03,
+    DAY09,
+    DAY14,
+    WEEK04,
+    WEEK10,
+    WEEK16,
+    WEEK24,
+)
+from edc_visit_tracking.constants import MISSED_VISIT, SCHEDULED, UNSCHEDULED
+
+from effect_form_validators.constants import ART_CONTINUED, ART_STOPPED
+from effect_form_validators.effect_screening.subject_screening_form_validator import (
+    MAX_AGE,
+    MIN_AGE,
+    THREE_DAYS,
+)
+from effect_form_validators.effect_subject.flucytosine_dosing import (
+    FLUCYT_DOSE_FIELDS,
+    get_expected_next_flucyt_dose,
+    get_flucyt_dose_table,
+)
+from effect_form_validators.effect_subject.mental_status_symptoms import (
+    GLASGOW_COMA_SCORE,
+    get_symptom_summary,
+)
+from effect_form_validators.effect_subject.vital_signs_grading import (
+    get_vital_sign_thresholds,
+)
+from effect_form_validators.subject_history import SubjectHistory
+
+BASE_DATE = date(2024, 1, 1)
+DEFAULT_SUBJECTS = 10_000
+DEFAULT_INVALID_RATE = 0.1
+
+SYMPTOMS = (
+    "fever",
+    "vomiting",
+    "confusion",
+    "seizures",
+    HEADACHE,
+    VISUAL_LOSS,
+    CN_PALSY_LEFT_OTHER,
+    CN_PALSY_RIGHT_OTHER,
+    FOCAL_NEUROLOGIC_DEFICIT_OTHER,
+    OTHER,
+)
+SYMPTOM_OTHER_FIELDS = {
+    OTHER: "current_sx_other",
+    CN_PALSY_LEFT_OTHER: "cn_palsy_left_other",
+    CN_PALSY_RIGHT_OTHER: "cn_palsy_right_other",
+    FOCAL_NEUROLOGIC_DEFICIT_OTHER: "focal_neurologic_deficit_other",
+    VISUAL_LOSS: "visual_field_loss",
+}
+ARV_REGIMENS = ("TDF_3TC/FTC_DTG", "ABC_3TC/FTC", "TDF_3TC/FTC_EFV", "AZT_3TC_NVP", OTHER)
+MISSED_REASONS = (REFUSED, "forgot", "toxicity", OTHER)
+ASSIGNMENT_DESCRIPTIONS = {
+    CONTROL: "2 weeks fluconazole",
+    INTERVENTION: "2 weeks fluconazole plus flucytosine",
+}
+# days from the baseline visit
+VISIT_DAYS = {
+    DAY01: 0,
+    DAY03: 2,
+    DAY09: 8,
+    DAY14: 13,
+    WEEK04: 27,
+    WEEK10: 69,
+    WEEK16: 111,
+    WEEK24: 167,
+}
+VISIT_CODES = tuple(VISIT_DAYS)
+# flucytosine is given on the intervention arm in the first two weeks
+FLUCYT_DAYS = 14
+XRAY_RESULTS = ("consolidation", "infiltrates", "effusion", "cavitation", OTHER)
+MODIFICATION_REASONS = (PER_PROTOCOL, "renal_adjustment", "toxicity", OTHER)
+DIAGNOSES = (BACTERAEMIA, "pneumonia", "tb", "kaposi_sarcoma", OTHER)
+NOK_SYMPTOMS = ("headache", "drowsy_confused_altered_behaviour", "seizures", "blurred_vision")
+CAUSES_OF_DEATH = ("cryptococcal_meningitis", "tb", "bacteraemia", OTHER, UNKNOWN)
+M2M_FIELDS = {
+    "signs_and_symptoms": ("current_sx", "current_sx_gte_g3"),
+    "arv_history": ("initial_art_regimen", "current_art_regimen"),
+    "chest_xray": ("chest_xray_results",),
+    "study_medication_followup": ("modifications_reason",),
+    "diagnoses": ("diagnoses",),
+}
+
+Generator = Callable[[random.Random, "Subject"], tuple[dict, dict]]
+Mutation = Callable[[random.Random, dict, dict], bool]
+
+generators: dict[str, Generator] = {}
+mutations: dict[str, dict[str, Mutation]] = {}
+
+
+class Subject(NamedTuple):
+    """Facts shared by all rows of a subject."""
+
+    subject_identifier: str
+    screening_date: date
+    cd4_date: date
+    cd4_value: int
+    weight: float
+    assignment: str
+
+
+class Visit(NamedTuple):
+    """A visit of the subject, converted to a mock subject visit (or
+    appointment) by `to_cleaned_data`.
+    """
+
+    subject_identifier: str
+    visit_code: str
+    visit_code_sequence: int
+    report_datetime: datetime
+    # `xray_performed` of the visit's signs and symptoms, None if not
+    # reported
+    xray_performed: str | None = None
+
+    @property
+    def baseline(self) -> bool:
+        return self.visit_code == DAY01 and self.visit_code_sequence == 0
+
+    @property
+    def timepoint(self) -> Decimal:
+        return Decimal(VISIT_CODES.index(self.visit_code))
+
+
+class Payload(NamedTuple):
+    form: str
+    index: int
+    subject_identifier: str
+    valid: bool
+    # the rule broken by the mutation, None if valid
+    rule: str | None
+    data: dict
+    # values of the validator's lookups, e.g. {"assignment": CONTROL}
+    lookups: dict
+
+
+def register_generator(form: str) -> Callable[[Generator], Generator]:
+    def wrapper(func: Generator) -> Generator:
+        generators[form] = func
+        mutations.setdefault(form, {})
+        return func
+
+    return wrapper
+
+
+def register_mutation(form: str, rule: str) -> Callable[[Mutation], Mutation]:
+    """Registers a mutation that breaks `rule`. A mutation returns
+    False, leaving the row as is, if the rule does not apply to the row.
+    """
+
+    def wrapper(func: Mutation) -> Mutation:
+        mutations.setdefault(form, {})[rule] = func
+        return func
+
+    return wrapper
+
+
+def get_subject(seed: int, subject_identifier: str) -> Subject:
+    rng = random.Random(f"{seed}:{subject_identifier}")  # noqa: S311
+    screening_date = BASE_DATE + timedelta(days=rng.randrange(365))
+    return Subject(
+        subject_identifier=subject_identifier,
+        screening_date=screening_date,
+        cd4_date=screening_date - timedelta(days=rng.randint(0, 7)),
+        cd4_value=rng.randint(5, 99),
+        weight=round(rng.uniform(35.0, 85.0), 1),
+        assignment=rng.choice((CONTROL, INTERVENTION)),
+    )
+
+
+def get_subject_identifier(index: int, subjects: int = DEFAULT_SUBJECTS) -> str:
+    return f"105-{index % subjects:06d}"
+
+
+def generate(
+    form: str,
+    index: int,
+    *,
+    seed: int = 0,
+    invalid_rate: float = DEFAULT_INVALID_RATE,
+    subjects: int = DEFAULT_SUBJECTS,
+) -> Payload:
+    """Returns row `index` of the form's stream."""
+    rng = random.Random(f"{seed}:{form}:{index}")  # noqa: S311
+    subject = get_subject(seed, get_subject_identifier(index, subjects))
+    data, lookups = generators[form](rng, subject)
+    rule = None
+    if rng.random() < invalid_rate:
+        form_mutations = mutations[form]
+        for name in rng.sample(list(form_mutations), len(form_mutations)):
+            if form_mutations[name](rng, data, lookups):
+                rule = name
+                break
+    return Payload(
+        form=form,
+        index=index,
+        subject_identifier=subject.subject_identifier,
+        valid=rule is None,
+        rule=rule,
+        data=data,
+        lookups=lookups,
+    )
+
+
+def stream(
+    form: str,
+    start: int = 0,
+    stop: int | None = None,
+    *,
+    seed: int = 0,
+    invalid_rate: float = DEFAULT_INVALID_RATE,
+    subjects: int = DEFAULT_SUBJECTS,
+) -> Iterator[Payload]:
+    """Yields rows `start` to `stop` of the form's stream, without end
+    if `stop` is None.
+
+    For example, one million rows in ten shards:
+
+        for shard in range(10):
+            for payload in stream("arv_history", shard * 100_000, (shard + 1) * 100_000):
+                ...
+    """
+    indexes = count(start) if stop is None else range(start, stop)
+    for index in indexes:
+        yield generate(form, index, seed=seed, invalid_rate=invalid_rate, subjects=subjects)
+
+
+@cache
+def get_choice(name: str) -> MockModel:
+    return MockModel(mock_name="Choice", name=name, display_name=name)
+
+
+def get_appointment(visit: Visit) -> MockModel:
+    return MockModel(
+        mock_name="Appointment",
+        subject_identifier=visit.subject_identifier,
+        appt_datetime=visit.report_datetime,
+        visit_code=visit.visit_code,
+        visit_code_sequence=visit.visit_code_sequence,
+        timepoint=visit.timepoint,
+    )
+
+
+def get_subject_visit(visit: Visit) -> MockModel:
+    subject_visit = MockModel(
+        mock_name="SubjectVisit",
+        subject_identifier=visit.subject_identifier,
+        report_datetime=visit.report_datetime,
+        visit_code=visit.visit_code,
+        visit_code_sequence=visit.visit_code_sequence,
+        appointment=get_appointment(visit),
+    )
+    if visit.xray_performed:
+        subject_visit.signsandsymptoms = MockModel(
+            mock_name="SignsAndSymptoms", xray_performed=visit.xray_performed
+        )
+    return subject_visit
+
+
+def to_cleaned_data(payload: Payload, **base: Any) -> dict:
+    """Returns cleaned_data for the payload with m2m choice names as
+    MockSets of choices and a `Visit` as a mock subject visit (or
+    appointment), updating `base` (e.g. subject_visit).
+    """
+    cleaned_data = {**base, **payload.data}
+    for fld in M2M_FIELDS.get(payload.form, ()):
+        cleaned_data[fld] = MockSet(*(get_choice(name) for name in cleaned_data[fld]))
+    if isinstance(visit := cleaned_data.get("subject_visit"), Visit):
+        cleaned_data["subject_visit"] = get_subject_visit(visit)
+    if isinstance(visit := cleaned_data.get("appointment"), Visit):
+        cleaned_data["appointment"] = get_appointment(visit)
+    return cleaned_data
+
+
+def apply_lookups(form_validator: Any, payload: Payload) -> Any:
+    """Stores the payload's lookups as the validator's cached
+    attributes, as `prefetch.apply_snapshot` does.
+    """
+    for name, value in payload.lookups.items():
+        form_validator.__dict__[name] = (
+            MockModel(mock_name=name, **value) if isinstance(value, dict) else value
+        )
+    return form_validator
+
+
+def get_report_datetime(rng: random.Random, report_date: date) -> datetime:
+    return datetime.combine(report_date, time(rng.randint(8, 17), rng.randrange(60)), UTC)
+
+
+def get_follow_up_date(rng: random.Random, subject: Subject) -> date:
+    """Returns a report date within 24 weeks of screening."""
+    return subject.screening_date + timedelta(days=rng.randrange(168))
+
+
+def get_visit(
+    rng: random.Random,
+    subject: Subject,
+    visit_codes: tuple[str, ...] = VISIT_CODES,
+    xray_performed: str | None = None,
+) -> Visit:
+    """Returns a scheduled or, by chance, unscheduled visit, reported
+    on the visit day (or a few days after, if unscheduled).
+    """
+    visit_code = rng.choice(visit_codes)
+    visit_code_sequence = 1 if chance(rng, 0.1) else 0
+    report_date = subject.screening_date + timedelta(
+        days=VISIT_DAYS[visit_code] + visit_code_sequence * rng.randint(1, 3)
+    )
+    return Visit(
+        subject_identifier=subject.subject_identifier,
+        visit_code=visit_code,
+        visit_code_sequence=visit_code_sequence,
+        report_datetime=get_report_datetime(rng, report_date),
+        xray_performed=xray_performed,
+    )
+
+
+def date_between(rng: random.Random, start: date, end: date) -> date:
+    return start + timedelta(days=rng.randint(0, (end - start).days))
+
+
+def chance(rng: random.Random, p: float) -> bool:
+    return rng.random() < p
+
+
+def estimated(rng: random.Random) -> str:
+    return YES if chance(rng, 0.2) else NO
+
+
+# Screening log, rows as read from a clinic CSV (ISO dates)
+
+
+@register_generator("screening_log")
+def screening_log(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_date = subject.screening_date
+    serum_crag_date = report_date - timedelta(days=rng.randint(0, 5))
+    gender = rng.choice((FEMALE, MALE))
+    age = rng.randint(MIN_AGE, min(MAX_AGE - 1, 75))
+    if chance(rng, 0.05):
+        age = rng.randint(12, MIN_AGE - 1)
+    hiv_pos = YES if chance(rng, 0.95) else NO
+    lp_done = YES if chance(rng, 0.7) else NO
+    row = {
+        "report_datetime": report_date.isoformat(),
+        "age_in_years": age,
+        "parent_guardian_consent": YES if age < MIN_AGE else NOT_APPLICABLE,
+        "gender": gender,
+        "hiv_pos": hiv_pos,
+        "hiv_confirmed_date": "",
+        "hiv_confirmed_method": NOT_APPLICABLE,
+        "cd4_date": subject.cd4_date.isoformat(),
+        "serum_crag_value": POS,
+        "serum_crag_date": serum_crag_date.isoformat(),
+        "lp_done": lp_done,
+        "lp_date": "",
+        "lp_declined": NOT_APPLICABLE,
+        "csf_crag_value": NOT_APPLICABLE,
+        "cm_in_csf": NOT_APPLICABLE,
+        "cm_in_csf_date": "",
+        "cm_in_csf_method": NOT_APPLICABLE,
+        "cm_in_csf_method_other": "",
+        "pregnant": NOT_APPLICABLE,
+        "preg_test_date": "",
+        "breast_feeding": NOT_APPLICABLE,
+    }
+    if hiv_pos == YES:
+        row.update(
+            hiv_confirmed_date=(
+                subject.cd4_date - timedelta(days=rng.randint(0, 365))
+            ).isoformat(),
+            hiv_confirmed_method="historical_lab_result",
+        )
+    if lp_done == YES:
+        lp_date = date_between(rng, serum_crag_date - timedelta(days=THREE_DAYS), report_date)
+        cm_in_csf = rng.choice((YES, NO, PENDING))
+        row.update(
+            lp_date=lp_date.isoformat(),
+            csf_crag_value=rng.choice((POS, NEG, NOT_DONE)),
+            cm_in_csf=cm_in_csf,
+        )
+        if cm_in_csf == PENDING:
+            row.update(
+                cm_in_csf_date=(report_date + timedelta(days=rng.randint(0, 3))).isoformat()
+            )
+        elif cm_in_csf == YES:
+            method = rng.choice(("india_ink", "culture", OTHER))
+            row.update(
+                cm_in_csf_method=method,
+                cm_in_csf_method_other="histology" if method == OTHER else "",
+            )
+    else:
+        row.update(lp_declined=rng.choice((YES, NO)))
+    if gender == FEMALE:
+        row.update(pregnant=NO, breast_feeding=rng.choice((YES, NO)))
+        if chance(rng, 0.5):
+            preg_test_date = date_between(rng, serum_crag_date, report_date)
+            row.update(preg_test_date=preg_test_date.isoformat())
+    return row, {}
+
+
+@register_mutation("screening_log", "serum_crag_value")
+def serum_crag_not_pos(rng: random.Random, row: dict, lookups: dict) -> bool:
+    row.update(serum_crag_value=rng.choice((NEG, NOT_DONE)))
+    return True
+
+
+@register_mutation("screening_log", "lp_date_before_serum_crag_date")
+def lp_too_early(rng: random.Random, row: dict, lookups: dict) -> bool:
+    if row["lp_done"] != YES:
+        return False
+    serum_crag_date = date.fromisoformat(row["serum_crag_date"])
+    lp_date = serum_crag_date - timedelta(days=THREE_DAYS + rng.randint(1, 7))
+    row.update(lp_date=lp_date.isoformat())
+    return True
+
+
+@register_mutation("screening_log", "pregnant_if_male")
+def pregnant_if_male(rng: random.Random, row: dict, lookups: dict) -> bool:
+    if row["gender"] != MALE:
+        return False
+    row.update(pregnant=NO)
+    return True
+
+
+@register_mutation("screening_log", "hiv_confirmed_date_after_report_date")
+def hiv_confirmed_after_report(rng: random.Random, row: dict, lookups: dict) -> bool:
+    if row["hiv_pos"] != YES:
+        return False
+    report_date = date.fromisoformat(row["report_datetime"])
+    row.update(
+        hiv_confirmed_date=(report_date + timedelta(days=rng.randint(1, 30))).isoformat()
+    )
+    return True
+
+
+# Vital signs
+
+
+@register_generator("vital_signs")
+def vital_signs(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    thresholds = get_vital_sign_thresholds()
+    sys_upper, dia_upper = int(thresholds.sys_upper), int(thresholds.dia_upper)
+    sys = rng.randint(95, sys_upper - 1)
+    data = {
+        "report_datetime": get_report_datetime(rng, get_follow_up_date(rng, subject)),
+        "weight": subject.weight,
+        "weight_measured_or_est": rng.choice(("measured", "estimated")),
+        "sys_blood_pressure": sys,
+        "dia_blood_pressure": rng.randint(50, min(dia_upper - 1, sys - 10)),
+        "heart_rate": rng.randint(50, 120),
+        "respiratory_rate": rng.randint(12, 28),
+        "temperature": round(
+            rng.uniform(35.5, min(38.5, float(thresholds.g3_fever_lower) - 0.1)), 1
+        ),
+        "reportable_as_ae": NO,
+        "patient_admitted": rng.choice((YES, NO)),
+    }
+    if chance(rng, 0.05):
+        data.update(sys_blood_pressure=sys_upper + rng.randint(0, 30), reportable_as_ae=YES)
+    return data, {}
+
+
+@register_mutation("vital_signs", "severe_htn_not_reportable")
+def severe_htn_not_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    thresholds = get_vital_sign_thresholds()
+    data.update(
+        sys_blood_pressure=int(thresholds.sys_upper) + rng.randint(0, 30),
+        reportable_as_ae=NO,
+    )
+    return True
+
+
+@register_mutation("vital_signs", "g3_fever_not_reportable")
+def g3_fever_not_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    thresholds = get_vital_sign_thresholds()
+    data.update(
+        temperature=round(float(thresholds.g3_fever_lower) + rng.uniform(0.0, 1.5), 1),
+        reportable_as_ae=NO,
+    )
+    return True
+
+
+@register_mutation("vital_signs", "sys_lt_dia_blood_pressure")
+def sys_lt_dia(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(dia_blood_pressure=data["sys_blood_pressure"] + rng.randint(1, 20))
+    return True
+
+
+@register_mutation("vital_signs", "sys_blood_pressure_required")
+def sys_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(sys_blood_pressure=None)
+    return True
+
+
+# Signs and symptoms
+
+
+@register_generator("signs_and_symptoms")
+def signs_and_symptoms(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    data = {
+        "report_datetime": get_report_datetime(rng, get_follow_up_date(rng, subject)),
+        "any_sx": NO,
+        "current_sx": (NOT_APPLICABLE,),
+        "current_sx_other": "",
+        "cm_sx": NOT_APPLICABLE,
+        "current_sx_gte_g3": (NOT_APPLICABLE,),
+        "current_sx_gte_g3_other": "",
+        "headache_duration": "",
+        "cn_palsy_left_other": "",
+        "cn_palsy_right_other": "",
+        "focal_neurologic_deficit_other": "",
+        "visual_field_loss": "",
+        "xray_performed": rng.choice((YES, NO)),
+        "lp_performed": rng.choice((YES, NO)),
+        "urinary_lam_performed": rng.choice((YES, NO)),
+        "reportable_as_ae": NOT_APPLICABLE,
+        "patient_admitted": NOT_APPLICABLE,
+    }
+    if chance(rng, 0.6):
+        current_sx = tuple(rng.sample(SYMPTOMS, rng.randint(1, 4)))
+        gte_g3 = (NOT_APPLICABLE,)
+        if chance(rng, 0.3):
+            gte_g3 = tuple(rng.sample(current_sx, rng.randint(1, len(current_sx))))
+        data.update(
+            any_sx=YES,
+            current_sx=current_sx,
+            cm_sx=rng.choice((YES, NO)),
+            current_sx_gte_g3=gte_g3,
+            current_sx_gte_g3_other="other symptom" if OTHER in gte_g3 else "",
+            reportable_as_ae=NO if gte_g3 == (NOT_APPLICABLE,) else YES,
+            patient_admitted=rng.choice((YES, NO)),
+        )
+        for sx in current_sx:
+            if sx == HEADACHE:
+                data.update(headache_duration=f"{rng.randint(0, 14)}d{rng.randint(1, 23)}h")
+            elif fld := SYMPTOM_OTHER_FIELDS.get(sx):
+                data[fld] = "details"
+    return data, {}
+
+
+@register_mutation("signs_and_symptoms", "current_sx_gte_g3_not_in_current_sx")
+def g3_not_in_current_sx(rng: random.Random, data: dict, lookups: dict) -> bool:
+    not_selected = [sx for sx in SYMPTOMS if sx not in data["current_sx"] and sx != OTHER]
+    if data["any_sx"] != YES or not not_selected:
+        return False
+    data.update(
+        current_sx_gte_g3=(rng.choice(not_selected),),
+        current_sx_gte_g3_other="",
+        reportable_as_ae=YES,
+    )
+    return True
+
+
+@register_mutation("signs_and_symptoms", "current_sx_if_no_symptoms")
+def current_sx_if_no_sx(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["any_sx"] != NO:
+        return False
+    data.update(current_sx=("fever",))
+    return True
+
+
+@register_mutation("signs_and_symptoms", "g3_not_reportable")
+def g3_not_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["current_sx_gte_g3"] == (NOT_APPLICABLE,):
+        return False
+    data.update(reportable_as_ae=NO)
+    return True
+
+
+@register_mutation("signs_and_symptoms", "headache_duration_zero")
+def headache_duration_zero(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if HEADACHE not in data["current_sx"]:
+        return False
+    data.update(headache_duration=rng.choice(("0d", "0h", "0d0h")))
+    return True
+
+
+# ARV history
+
+
+@register_generator("arv_history")
+def arv_history(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_date = get_follow_up_date(rng, subject)
+    hiv_dx_date = subject.cd4_date - timedelta(days=rng.randint(30, 3650))
+    data = {
+        "report_datetime": get_report_datetime(rng, report_date),
+        "hiv_dx_date": hiv_dx_date,
+        "hiv_dx_date_estimated": estimated(rng),
+        "on_art_at_crag": NO,
+        "ever_on_art": NO,
+        "initial_art_date": None,
+        "initial_art_date_estimated": NOT_APPLICABLE,
+        "initial_art_regimen": (NOT_APPLICABLE,),
+        "initial_art_regimen_other": "",
+        "has_switched_art_regimen": NOT_APPLICABLE,
+        "current_art_date": None,
+        "current_art_date_estimated": NOT_APPLICABLE,
+        "current_art_regimen": (NOT_APPLICABLE,),
+        "current_art_regimen_other": "",
+        "has_defaulted": NOT_APPLICABLE,
+        "defaulted_date": None,
+        "defaulted_date_estimated": NOT_APPLICABLE,
+        "is_adherent": NOT_APPLICABLE,
+        "art_doses_missed": None,
+        "art_decision": NOT_APPLICABLE,
+        "has_viral_load_result": NO,
+        "viral_load_result": None,
+        "viral_load_quantifier": NOT_APPLICABLE,
+        "viral_load_date": None,
+        "viral_load_date_estimated": NOT_APPLICABLE,
+        "cd4_value": subject.cd4_value,
+        "cd4_date": subject.cd4_date,
+        "cd4_date_estimated": NO,
+    }
+    if chance(rng, 0.6):
+        add_art_history(rng, data, report_date)
+    if chance(rng, 0.4):
+        quantifier = rng.choice((EQ, EQ, GT, LT))
+        data.update(
+            has_viral_load_result=YES,
+            viral_load_result=(
+                rng.choice((20, 50)) if quantifier == LT else rng.randint(20, 500_000)
+            ),
+            viral_load_quantifier=quantifier,
+            viral_load_date=date_between(rng, hiv_dx_date, report_date),
+            viral_load_date_estimated=estimated(rng),
+        )
+    if chance(rng, 0.3) and report_date > subject.cd4_date:
+        data.update(
+            cd4_value=rng.randint(5, 500),
+            cd4_date=date_between(rng, subject.cd4_date + timedelta(days=1), report_date),
+        )
+    lookups = {
+        "subject_screening": {
+            "subject_identifier": subject.subject_identifier,
+            "cd4_date": subject.cd4_date,
+            "cd4_value": subject.cd4_value,
+        }
+    }
+    return data, lookups
+
+
+def add_art_history(rng: random.Random, data: dict, report_date: date) -> None:
+    """Adds an ART start and, by chance, a regimen switch and/or
+    default, each on a later date than the one before.
+    """
+    on_art_at_crag = rng.choice((YES, NO))
+    initial_art_date = date_between(rng, data["hiv_dx_date"], report_date - timedelta(days=3))
+    initial_art_regimen = rng.choice(ARV_REGIMENS)
+    data.update(
+        on_art_at_crag=on_art_at_crag,
+        ever_on_art=YES,
+        initial_art_date=initial_art_date,
+        initial_art_date_estimated=estimated(rng),
+        initial_art_regimen=(initial_art_regimen,),
+        initial_art_regimen_other="AZT_3TC_LPV/r" if initial_art_regimen == OTHER else "",
+        has_switched_art_regimen=NO,
+        has_defaulted=NO,
+        is_adherent=rng.choice((YES, NO)),
+        art_decision=rng.choice((ART_CONTINUED, ART_STOPPED)),
+    )
+    last_date = initial_art_date
+    if chance(rng, 0.3):
+        current_art_date = date_between(
+            rng, initial_art_date + timedelta(days=1), report_date - timedelta(days=2)
+        )
+        current_art_regimen = rng.choice(ARV_REGIMENS)
+        data.update(
+            has_switched_art_regimen=YES,
+            current_art_date=current_art_date,
+            current_art_date_estimated=estimated(rng),
+            current_art_regimen=(current_art_regimen,),
+            current_art_regimen_other="TDF_3TC_ATV/r" if current_art_regimen == OTHER else "",
+        )
+        last_date = current_art_date
+    if chance(rng, 0.2):
+        defaulted_date = date_between(
+            rng, last_date + timedelta(days=1), report_date - timedelta(days=1)
+        )
+        data.update(
+            has_defaulted=YES,
+            defaulted_date=defaulted_date,
+            defaulted_date_estimated=estimated(rng),
+            is_adherent=DEFAULTED,
+            art_decision=NOT_APPLICABLE,
+        )
+    if data["is_adherent"] == NO:
+        data.update(art_doses_missed=rng.randint(1, 10))
+
+
+@register_mutation("arv_history", "hiv_dx_date_after_screening_cd4_date")
+def hiv_dx_after_cd4(rng: random.Random, data: dict, lookups: dict) -> bool:
+    hiv_dx_date = lookups["subject_screening"]["cd4_date"] + timedelta(days=1)
+    if hiv_dx_date > data["report_datetime"].date():
+        return False
+    data.update(hiv_dx_date=hiv_dx_date)
+    return True
+
+
+@register_mutation("arv_history", "initial_art_date_required")
+def initial_art_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(on_art_at_crag=YES, ever_on_art=YES, initial_art_date=None)
+    return True
+
+
+@register_mutation("arv_history", "current_art_date_required_if_switched")
+def switched_without_date(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["initial_art_date"]:
+        return False
+    data.update(
+        has_switched_art_regimen=YES,
+        current_art_date=None,
+        current_art_date_estimated=NOT_APPLICABLE,
+        current_art_regimen=(NOT_APPLICABLE,),
+        current_art_regimen_other="",
+    )
+    return True
+
+
+@register_mutation("arv_history", "is_adherent_not_defaulted")
+def defaulted_not_marked(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["has_defaulted"] != YES:
+        return False
+    data.update(is_adherent=rng.choice((YES, NO)))
+    return True
+
+
+@register_mutation("arv_history", "viral_load_lt_not_ldl")
+def lt_not_ldl(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(
+        has_viral_load_result=YES,
+        viral_load_result=rng.randint(51, 500_000),
+        viral_load_quantifier=LT,
+        viral_load_date=data["hiv_dx_date"],
+        viral_load_date_estimated=NO,
+    )
+    return True
+
+
+@register_mutation("arv_history", "cd4_value_differs_from_screening")
+def cd4_value_differs(rng: random.Random, data: dict, lookups: dict) -> bool:
+    subject_screening = lookups["subject_screening"]
+    data.update(
+        cd4_date=subject_screening["cd4_date"],
+        cd4_value=subject_screening["cd4_value"] + rng.randint(1, 50),
+    )
+    return True
+
+
+# Study medication at baseline
+
+
+@register_generator("study_medication_baseline")
+def study_medication_baseline(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_datetime = datetime.combine(
+        subject.screening_date, time(rng.randint(8, 20), rng.randrange(30)), UTC
+    )
+    data = {
+        "report_datetime": report_datetime,
+        "flucon_initiated": YES,
+        "flucon_not_initiated_reason": "",
+        "flucon_dose_datetime": report_datetime + timedelta(minutes=rng.randint(1, 29)),
+        "flucon_dose": 1200,
+        "flucon_next_dose": TODAY,
+        "flucon_notes": "",
+        "flucyt_initiated": NOT_APPLICABLE,
+        "flucyt_not_initiated_reason": "",
+        "flucyt_dose_datetime": None,
+        "flucyt_dose_expected": None,
+        "flucyt_dose": None,
+        **dict.fromkeys(FLUCYT_DOSE_FIELDS),
+        "flucyt_next_dose": NOT_APPLICABLE,
+        "flucyt_notes": "",
+    }
+    if chance(rng, 0.05):
+        data.update(
+            flucon_initiated=NO,
+            flucon_not_initiated_reason="not available",
+            flucon_dose_datetime=None,
+            flucon_dose=None,
+            flucon_next_dose=NOT_APPLICABLE,
+        )
+    elif chance(rng, 0.1):
+        data.update(flucon_dose=800, flucon_notes="dose reduced")
+    if subject.assignment == INTERVENTION:
+        if chance(rng, 0.9):
+            add_flucyt_doses(rng, data, subject.weight)
+        else:
+            data.update(flucyt_initiated=NO, flucyt_not_initiated_reason="not available")
+    return data, {"vital_signs_weight": subject.weight}
+
+
+def add_flucyt_doses(rng: random.Random, data: dict, weight: float) -> None:
+    """Adds a flucytosine prescription for the weight band, split
+    across the dose slots and, by chance, reduced by one tablet.
+    """
+    band = get_flucyt_dose_table().get_band(weight)
+    slots = list(band.slots)
+    dose = band.dose
+    notes = ""
+    if chance(rng, 0.1):
+        slots[slots.index(max(slots))] -= 500
+        dose -= 500
+        notes = "dose reduced"
+    dose_datetime = data["report_datetime"] + timedelta(minutes=rng.randint(1, 29))
+    data.update(
+        flucyt_initiated=YES,
+        flucyt_dose_datetime=dose_datetime,
+        flucyt_dose_expected=band.dose,
+        flucyt_dose=dose,
+        **dict(zip(FLUCYT_DOSE_FIELDS, slots, strict=True)),
+        flucyt_next_dose=get_expected_next_flucyt_dose(dose_datetime),
+        flucyt_notes=notes,
+    )
+
+
+@register_mutation("study_medication_baseline", "flucyt_doses_do_not_sum_to_dose")
+def flucyt_doses_do_not_sum(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucyt_initiated"] != YES:
+        return False
+    fld = rng.choice(FLUCYT_DOSE_FIELDS)
+    data[fld] += rng.choice((-500, 500))
+    return True
+
+
+@register_mutation("study_medication_baseline", "flucyt_dose_required")
+def flucyt_dose_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucyt_initiated"] != YES:
+        return False
+    data[rng.choice(FLUCYT_DOSE_FIELDS)] = None
+    return True
+
+
+@register_mutation("study_medication_baseline", "flucyt_next_dose")
+def flucyt_next_dose_wrong(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucyt_initiated"] != YES:
+        return False
+    data.update(flucyt_next_dose="1600" if data["flucyt_next_dose"] == "1000" else "1000")
+    return True
+
+
+@register_mutation("study_medication_baseline", "flucyt_dose_expected_for_weight")
+def flucyt_dose_expected_wrong(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucyt_initiated"] != YES:
+        return False
+    data.update(flucyt_dose_expected=data["flucyt_dose_expected"] + 500)
+    return True
+
+
+@register_mutation("study_medication_baseline", "flucon_next_dose_not_today")
+def flucon_next_dose_not_today(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucon_initiated"] != YES:
+        return False
+    data.update(flucon_next_dose=TOMORROW)
+    return True
+
+
+# Missed doses (adherence inlines)
+
+
+def get_missed_doses(rng: random.Random, missed: bool) -> dict:
+    data = {"day_missed": None, "missed_reason": "", "missed_reason_other": ""}
+    if missed:
+        reason = rng.choice(MISSED_REASONS)
+        data.update(
+            day_missed=rng.randint(1, 15),
+            missed_reason=reason,
+            missed_reason_other="travelling" if reason == OTHER else "",
+        )
+    return data
+
+
+@register_generator("flucon_missed_doses")
+def flucon_missed_doses(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    return get_missed_doses(rng, chance(rng, 0.7)), {}
+
+
+@register_generator("flucyt_missed_doses")
+def flucyt_missed_doses(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    data = get_missed_doses(rng, subject.assignment != CONTROL and chance(rng, 0.7))
+    data["doses_missed"] = rng.randint(1, 4) if data["day_missed"] else None
+    lookups = {
+        "assignment": subject.assignment,
+        "assignment_description": ASSIGNMENT_DESCRIPTIONS[subject.assignment],
+    }
+    return data, lookups
+
+
+def missed_reason_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["day_missed"]:
+        return False
+    data.update(missed_reason="", missed_reason_other="")
+    return True
+
+
+def missed_reason_other_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["day_missed"]:
+        return False
+    data.update(missed_reason=OTHER, missed_reason_other="")
+    return True
+
+
+for missed_doses_form in ("flucon_missed_doses", "flucyt_missed_doses"):
+    register_mutation(missed_doses_form, "missed_reason_required")(missed_reason_missing)
+    register_mutation(missed_doses_form, "missed_reason_other_required")(
+        missed_reason_other_missing
+    )
+
+
+@register_mutation("flucyt_missed_doses", "doses_missed_required")
+def doses_missed_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["day_missed"]:
+        return False
+    data.update(doses_missed=None)
+    return True
+
+
+@register_mutation("flucyt_missed_doses", "day_missed_on_control_arm")
+def missed_on_control_arm(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if lookups["assignment"] != CONTROL:
+        return False
+    data.update(get_missed_doses(rng, missed=True), doses_missed=rng.randint(1, 4))
+    return True
+
+
+# Lightweight CRFs
+
+
+@register_generator("clinical_note")
+def clinical_note(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    has_comment = rng.choice((YES, NO))
+    data = {
+        "report_datetime": get_report_datetime(rng, get_follow_up_date(rng, subject)),
+        "has_comment": has_comment,
+        "comments": "comments" if has_comment == YES else "",
+    }
+    return data, {}
+
+
+@register_mutation("clinical_note", "comments_required")
+def comments_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(has_comment=YES, comments="")
+    return True
+
+
+@register_generator("histopathology")
+def histopathology(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_date = get_follow_up_date(rng, subject)
+    data = {
+        "report_datetime": get_report_datetime(rng, report_date),
+        "tissue_biopsy_performed": NO,
+        "tissue_biopsy_date": None,
+        "tissue_biopsy_result": NOT_APPLICABLE,
+        "tissue_biopsy_organism_text": "",
+    }
+    if chance(rng, 0.3):
+        result = rng.choice((POS, NEG))
+        data.update(
+            tissue_biopsy_performed=YES,
+            tissue_biopsy_date=date_between(rng, subject.screening_date, report_date),
+            tissue_biopsy_result=result,
+            tissue_biopsy_organism_text="cryptococcus" if result == POS else "",
+        )
+    return data, {}
+
+
+@register_mutation("histopathology", "tissue_biopsy_date_required")
+def biopsy_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["tissue_biopsy_performed"] != YES:
+        return False
+    data.update(tissue_biopsy_date=None)
+    return True
+
+
+@register_mutation("histopathology", "tissue_biopsy_organism_text_required")
+def organism_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["tissue_biopsy_performed"] != YES:
+        return False
+    data.update(tissue_biopsy_result=POS, tissue_biopsy_organism_text="")
+    return True
+
+
+# Subject visit
+
+
+@register_generator("subject_visit")
+def subject_visit(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject)
+    data = {
+        "appointment": visit,
+        "report_datetime": visit.report_datetime,
+        "reason": UNSCHEDULED if visit.visit_code_sequence else SCHEDULED,
+        "assessment_type": IN_PERSON,
+        "assessment_type_other": "",
+        "assessment_who": PATIENT,
+        "assessment_who_other": "",
+        "info_source": PATIENT,
+        "info_source_other": "",
+        "survival_status": ALIVE,
+        "hospitalized": NO,
+    }
+    if visit.baseline:
+        return data, {}
+    if chance(rng, 0.05):
+        data.update(
+            reason=MISSED_VISIT,
+            **dict.fromkeys(
+                (
+                    "assessment_type",
+                    "assessment_who",
+                    "info_source",
+                    "survival_status",
+                    "hospitalized",
+                ),
+                NOT_APPLICABLE,
+            ),
+        )
+    elif chance(rng, 0.3):
+        who = rng.choice((PATIENT, NEXT_OF_KIN, OTHER))
+        data.update(
+            assessment_type=TELEPHONE,
+            assessment_who=who,
+            assessment_who_other="carer" if who == OTHER else "",
+            info_source=(
+                PATIENT
+                if who == PATIENT
+                else rng.choice((PATIENT_REPRESENTATIVE, HOSPITAL_NOTES))
+            ),
+            survival_status=ALIVE if who == PATIENT else rng.choice((ALIVE, DEAD, UNKNOWN)),
+            hospitalized=rng.choice((YES, NO) if who == PATIENT else (YES, NO, UNKNOWN)),
+        )
+    else:
+        data.update(hospitalized=YES if chance(rng, 0.1) else NO)
+    return data, {}
+
+
+@register_mutation("subject_visit", "assessment_type_in_person_at_baseline")
+def telephone_at_baseline(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["appointment"].baseline:
+        return False
+    data.update(assessment_type=TELEPHONE)
+    return True
+
+
+@register_mutation("subject_visit", "assessment_who_patient_if_in_person")
+def in_person_not_patient(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["assessment_type"] != IN_PERSON:
+        return False
+    data.update(assessment_who=NEXT_OF_KIN)
+    return True
+
+
+@register_mutation("subject_visit", "info_source_reconciles_with_assessment")
+def info_source_mismatch(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["assessment_who"] != PATIENT:
+        return False
+    data.update(info_source=PATIENT_REPRESENTATIVE)
+    return True
+
+
+@register_mutation("subject_visit", "survival_status_alive_if_patient")
+def dead_if_patient(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["assessment_who"] != PATIENT:
+        return False
+    data.update(survival_status=rng.choice((DEAD, UNKNOWN)))
+    return True
+
+
+@register_mutation("subject_visit", "hospitalized_unknown_if_patient")
+def hospitalized_unknown_if_patient(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["assessment_who"] != PATIENT:
+        return False
+    data.update(hospitalized=UNKNOWN)
+    return True
+
+
+@register_mutation("subject_visit", "assessment_type_not_applicable_if_missed")
+def assessed_if_missed(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["reason"] != MISSED_VISIT:
+        return False
+    data.update(assessment_type=TELEPHONE)
+    return True
+
+
+# Chest x-ray
+
+
+@register_generator("chest_xray")
+def chest_xray(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject, xray_performed=rng.choice((YES, NO)))
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "chest_xray": visit.xray_performed,
+        "chest_xray_date": None,
+        "chest_xray_results": (),
+        "chest_xray_results_other": "",
+    }
+    rows = []
+    if visit.xray_performed == YES:
+        lower = subject.screening_date - timedelta(days=7)
+        chest_xray_date = date_between(rng, lower, visit.report_datetime.date())
+        results = (NORMAL,)
+        if chance(rng, 0.5):
+            results = tuple(rng.sample(XRAY_RESULTS, rng.randint(1, 2)))
+        data.update(
+            chest_xray_date=chest_xray_date,
+            chest_xray_results=results,
+            chest_xray_results_other="pneumothorax" if OTHER in results else "",
+        )
+        if chance(rng, 0.2):
+            # an earlier report at this visit, now edited
+            rows.append(
+                (
+                    1,
+                    visit.timepoint,
+                    visit.visit_code_sequence,
+                    date_between(rng, lower, chest_xray_date),
+                )
+            )
+    lookups = {
+        "consent_datetime": datetime.combine(subject.screening_date, time(12), UTC),
+        "subject_history": SubjectHistory(
+            subject.subject_identifier, ("chest_xray_date",), rows
+        ),
+    }
+    return data, lookups
+
+
+@register_mutation("chest_xray", "chest_xray_matches_signs_and_symptoms")
+def chest_xray_not_ssx(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["chest_xray"] != NO:
+        return False
+    data.update(chest_xray=YES)
+    return True
+
+
+@register_mutation("chest_xray", "chest_xray_date_required")
+def chest_xray_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["chest_xray"] != YES:
+        return False
+    data.update(chest_xray_date=None)
+    return True
+
+
+@register_mutation("chest_xray", "chest_xray_date_before_episode")
+def chest_xray_before_episode(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["chest_xray"] != YES:
+        return False
+    consent_date = lookups["consent_datetime"].date()
+    data.update(chest_xray_date=consent_date - timedelta(days=rng.randint(8, 60)))
+    return True
+
+
+@register_mutation("chest_xray", "chest_xray_date_before_previous")
+def chest_xray_before_previous(rng: random.Random, data: dict, lookups: dict) -> bool:
+    visit = data["subject_visit"]
+    chest_xray_date = data["chest_xray_date"]
+    report_date = visit.report_datetime.date()
+    if data["chest_xray"] != YES or chest_xray_date >= report_date:
+        return False
+    previous = date_between(rng, chest_xray_date + timedelta(days=1), report_date)
+    lookups["subject_history"] = SubjectHistory(
+        visit.subject_identifier,
+        ("chest_xray_date",),
+        [(1, visit.timepoint, visit.visit_code_sequence, previous)],
+    )
+    return True
+
+
+@register_mutation("chest_xray", "chest_xray_results_normal_single_selection")
+def normal_not_single(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["chest_xray"] != YES:
+        return False
+    data.update(chest_xray_results=(NORMAL, "effusion"), chest_xray_results_other="")
+    return True
+
+
+@register_mutation("chest_xray", "chest_xray_results_other_required")
+def xray_results_other_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["chest_xray"] != YES:
+        return False
+    data.update(chest_xray_results=(OTHER,), chest_xray_results_other="")
+    return True
+
+
+# Mental status
+
+
+@register_generator("mental_status")
+def mental_status(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject)
+    # require_help and any_other_problems
+    visit_applicable = visit.visit_code in (WEEK10, WEEK24) and not visit.visit_code_sequence
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "recent_seizure": NO,
+        "behaviour_change": NO,
+        "confusion": NO,
+        "require_help": NO if visit_applicable else NOT_APPLICABLE,
+        "any_other_problems": NO if visit_applicable else NOT_APPLICABLE,
+        "modified_rankin_score": "0",
+        "ecog_score": "0",
+        "glasgow_coma_score": GLASGOW_COMA_SCORE,
+        "reportable_as_ae": NOT_APPLICABLE,
+        "patient_admitted": NOT_APPLICABLE,
+    }
+    if visit.baseline:
+        if chance(rng, 0.3):
+            data.update(
+                modified_rankin_score=str(rng.randint(0, 5)),
+                ecog_score=str(rng.randint(0, 4)),
+            )
+    elif chance(rng, 0.4):
+        for sx in ("recent_seizure", "behaviour_change", "confusion"):
+            data[sx] = YES if chance(rng, 0.3) else NO
+        if visit_applicable:
+            data.update(
+                require_help=rng.choice((YES, NO)), any_other_problems=rng.choice((YES, NO))
+            )
+        if YES in (data["require_help"], data["any_other_problems"]):
+            scores = rng.randint(1, 5), rng.randint(1, 4)
+        elif visit_applicable:
+            scores = rng.randint(0, 2), rng.randint(0, 2)
+        else:
+            scores = rng.randint(0, 5), rng.randint(0, 4)
+        data.update(
+            modified_rankin_score=str(scores[0]),
+            ecog_score=str(scores[1]),
+            glasgow_coma_score=rng.randint(9, GLASGOW_COMA_SCORE),
+        )
+    if get_symptom_summary(data).finding:
+        data.update(
+            reportable_as_ae=rng.choice((YES, NO)), patient_admitted=rng.choice((YES, NO))
+        )
+    return data, {}
+
+
+@register_mutation("mental_status", "positive_symptoms_at_baseline")
+def symptoms_at_baseline(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["subject_visit"].baseline:
+        return False
+    data.update(
+        **{rng.choice(("recent_seizure", "behaviour_change", "confusion")): YES},
+        reportable_as_ae=NO,
+        patient_admitted=NO,
+    )
+    return True
+
+
+@register_mutation("mental_status", "glasgow_coma_score_at_baseline")
+def low_gcs_at_baseline(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not data["subject_visit"].baseline:
+        return False
+    data.update(
+        glasgow_coma_score=rng.randint(3, GLASGOW_COMA_SCORE - 1),
+        reportable_as_ae=NO,
+        patient_admitted=NO,
+    )
+    return True
+
+
+@register_mutation("mental_status", "require_help_not_applicable")
+def require_help_not_visit_applicable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["require_help"] != NOT_APPLICABLE:
+        return False
+    data.update(require_help=NO)
+    return True
+
+
+@register_mutation("mental_status", "modified_rankin_score_if_require_help")
+def rankin_zero_if_require_help(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["require_help"] == NOT_APPLICABLE:
+        return False
+    data.update(
+        require_help=YES,
+        modified_rankin_score="0",
+        reportable_as_ae=NO,
+        patient_admitted=NO,
+    )
+    return True
+
+
+@register_mutation("mental_status", "reportable_applicable_if_symptoms")
+def symptoms_not_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not get_symptom_summary(data).finding:
+        return False
+    data.update(reportable_as_ae=NOT_APPLICABLE)
+    return True
+
+
+@register_mutation("mental_status", "reportable_not_applicable_if_no_symptoms")
+def no_symptoms_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if not get_symptom_summary(data).no_symptoms:
+        return False
+    data.update(patient_admitted=rng.choice((YES, NO)))
+    return True
+
+
+# Study medication at follow-up
+
+
+@register_generator("study_medication_followup")
+def study_medication_followup(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject, visit_codes=VISIT_CODES[1:])
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "modifications": NO,
+        "modifications_reason": (),
+        "modifications_reason_other": "",
+        **get_flucon_modification(rng, None),
+        **get_flucyt_modification(rng, None),
+    }
+    if chance(rng, 0.3):
+        reasons = (rng.choice(MODIFICATION_REASONS),)
+        if reasons != (PER_PROTOCOL,) and chance(rng, 0.2):
+            reasons = tuple(rng.sample(MODIFICATION_REASONS[1:], 2))
+        flucyt_modified = NOT_APPLICABLE
+        if subject.assignment == INTERVENTION and VISIT_DAYS[visit.visit_code] < FLUCYT_DAYS:
+            flucyt_modified = rng.choice((YES, NO))
+        flucon_modified = YES if flucyt_modified != YES or chance(rng, 0.5) else NO
+        data.update(
+            modifications=YES,
+            modifications_reason=reasons,
+            modifications_reason_other="drug interaction" if OTHER in reasons else "",
+            **get_flucon_modification(rng, visit.report_datetime, flucon_modified),
+            **get_flucyt_modification(
+                rng, visit.report_datetime, flucyt_modified, subject.weight
+            ),
+        )
+    return data, {"assignment": subject.assignment}
+
+
+def get_flucon_modification(
+    rng: random.Random, report_datetime: datetime | None, modified: str = NOT_APPLICABLE
+) -> dict:
+    data = {
+        "flucon_modified": modified,
+        "flucon_dose_datetime": None,
+        "flucon_dose": None,
+        "flucon_next_dose": NOT_APPLICABLE,
+        "flucon_notes": "",
+    }
+    if modified == YES:
+        data.update(
+            flucon_dose_datetime=report_datetime + timedelta(minutes=rng.randint(1, 120)),
+            flucon_dose=rng.choice((200, 800, 1200)),
+            flucon_next_dose=rng.choice((TODAY, TOMORROW)),
+            flucon_notes="dose modified",
+        )
+    return data
+
+
+def get_flucyt_modification(
+    rng: random.Random,
+    report_datetime: datetime | None,
+    modified: str = NOT_APPLICABLE,
+    weight: float | None = None,
+) -> dict:
+    data = {
+        "flucyt_modified": modified,
+        "flucyt_dose_datetime": None,
+        "flucyt_dose": None,
+        **dict.fromkeys(FLUCYT_DOSE_FIELDS),
+        "flucyt_next_dose": NOT_APPLICABLE,
+        "flucyt_notes": "",
+    }
+    if modified == YES:
+        band = get_flucyt_dose_table().get_band(weight)
+        slots = list(band.slots)
+        slots[slots.index(max(slots))] -= 500
+        dose_datetime = report_datetime + timedelta(minutes=rng.randint(1, 120))
+        data.update(
+            flucyt_dose_datetime=dose_datetime,
+            flucyt_dose=sum(slots),
+            **dict(zip(FLUCYT_DOSE_FIELDS, slots, strict=True)),
+            flucyt_next_dose=get_expected_next_flucyt_dose(dose_datetime),
+            flucyt_notes="dose reduced",
+        )
+    return data
+
+
+@register_mutation("study_medication_followup", "not_at_baseline")
+def followup_at_baseline(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(
+        subject_visit=data["subject_visit"]._replace(visit_code=DAY01, visit_code_sequence=0)
+    )
+    return True
+
+
+@register_mutation("study_medication_followup", "modifications_reason_required")
+def modifications_reason_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["modifications"] != YES:
+        return False
+    data.update(modifications_reason=(), modifications_reason_other="")
+    return True
+
+
+@register_mutation("study_medication_followup", "modifications_reason_per_protocol_single")
+def per_protocol_not_single(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["modifications"] != YES:
+        return False
+    data.update(modifications_reason=(PER_PROTOCOL, "toxicity"), modifications_reason_other="")
+    return True
+
+
+@register_mutation("study_medication_followup", "modification_expected")
+def no_modification(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["modifications"] != YES:
+        return False
+    data.update(**get_flucon_modification(rng, None, NO), **get_flucyt_modification(rng, None))
+    return True
+
+
+@register_mutation("study_medication_followup", "flucon_modified_not_applicable")
+def flucon_modified_without_modifications(
+    rng: random.Random, data: dict, lookups: dict
+) -> bool:
+    if data["modifications"] != NO:
+        return False
+    data.update(flucon_modified=NO)
+    return True
+
+
+@register_mutation("study_medication_followup", "flucon_dose_datetime_before_report")
+def flucon_dose_before_report(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucon_modified"] != YES:
+        return False
+    data.update(
+        flucon_dose_datetime=data["report_datetime"] - timedelta(minutes=rng.randint(1, 120))
+    )
+    return True
+
+
+@register_mutation("study_medication_followup", "flucyt_doses_sum_to_dose")
+def flucyt_followup_doses_do_not_sum(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["flucyt_modified"] != YES:
+        return False
+    data[rng.choice(FLUCYT_DOSE_FIELDS)] += 500
+    return True
+
+
+# LP/CSF and blood culture
+
+
+@register_generator("lp_csf")
+def lp_csf(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject)
+    csf_positive = rng.choice((YES, NO, NOT_DONE))
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "opening_pressure_measured": NO,
+        "opening_pressure": None,
+        "closing_pressure": None,
+        "csf_positive": csf_positive,
+        "india_ink": NOT_APPLICABLE,
+        "csf_crag_lfa": NOT_APPLICABLE,
+        "sq_crag": NOT_APPLICABLE,
+        "sq_crag_pos": NOT_APPLICABLE,
+        "crf_crag_titre_done": NOT_APPLICABLE,
+        "crf_crag_titre": None,
+        "csf_requisition": None,
+        "csf_culture_assay_datetime": None,
+    }
+    if chance(rng, 0.7):
+        opening_pressure = rng.randint(10, 60)
+        data.update(
+            opening_pressure_measured=YES,
+            opening_pressure=opening_pressure,
+            closing_pressure=rng.randint(5, opening_pressure - 1),
+        )
+    if csf_positive in (YES, NO):
+        titre_done = rng.choice((YES, NO))
+        data.update(
+            india_ink=rng.choice((POS, NEG, NOT_DONE)),
+            csf_crag_lfa=rng.choice((POS, NEG, NOT_DONE)),
+            sq_crag=rng.choice((POS, NEG, NOT_DONE)),
+            sq_crag_pos=rng.choice(("1+", "2+", "3+", "4+", "5+")),
+            crf_crag_titre_done=titre_done,
+            crf_crag_titre=2 ** rng.randint(1, 12) if titre_done == YES else None,
+        )
+    return data, {}
+
+
+@register_mutation("lp_csf", "opening_pressure_required")
+def opening_pressure_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["opening_pressure_measured"] != YES:
+        return False
+    data.update(opening_pressure=None)
+    return True
+
+
+@register_mutation("lp_csf", "closing_pressure_lt_opening_pressure")
+def closing_gte_opening(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["opening_pressure_measured"] != YES:
+        return False
+    data.update(closing_pressure=data["opening_pressure"] + rng.randint(0, 10))
+    return True
+
+
+@register_mutation("lp_csf", "india_ink_applicable_if_csf_result")
+def india_ink_applicable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(india_ink=NOT_APPLICABLE if data["csf_positive"] in (YES, NO) else POS)
+    return True
+
+
+@register_mutation("lp_csf", "crf_crag_titre_required")
+def crag_titre_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["crf_crag_titre_done"] != YES:
+        return False
+    data.update(crf_crag_titre=None)
+    return True
+
+
+@register_mutation("lp_csf", "csf_culture_assay_datetime_without_requisition")
+def assay_without_requisition(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(csf_culture_assay_datetime=data["report_datetime"])
+    return True
+
+
+@register_generator("blood_culture")
+def blood_culture(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject)
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "blood_culture_performed": NO,
+        "blood_culture_date": None,
+        "blood_culture_result": NOT_APPLICABLE,
+        "blood_culture_organism_text": "",
+    }
+    if chance(rng, 0.3):
+        result = rng.choice((POS, NEG))
+        data.update(
+            blood_culture_performed=YES,
+            blood_culture_date=date_between(
+                rng, subject.screening_date, visit.report_datetime.date()
+            ),
+            blood_culture_result=result,
+            blood_culture_organism_text="cryptococcus" if result == POS else "",
+        )
+    return data, {}
+
+
+@register_mutation("blood_culture", "blood_culture_date_required")
+def blood_culture_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["blood_culture_performed"] != YES:
+        return False
+    data.update(blood_culture_date=None)
+    return True
+
+
+@register_mutation("blood_culture", "blood_culture_result_applicable")
+def blood_culture_result_if_not_performed(
+    rng: random.Random, data: dict, lookups: dict
+) -> bool:
+    if data["blood_culture_performed"] != NO:
+        return False
+    data.update(blood_culture_result=NEG)
+    return True
+
+
+@register_mutation("blood_culture", "blood_culture_organism_text_required")
+def blood_culture_organism_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["blood_culture_performed"] != YES:
+        return False
+    data.update(blood_culture_result=POS, blood_culture_organism_text="")
+    return True
+
+
+# Diagnoses
+
+
+@register_generator("diagnoses")
+def diagnoses(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    visit = get_visit(rng, subject)
+    gi_side_effects = YES if chance(rng, 0.2) else NO
+    has_diagnoses = YES if chance(rng, 0.3) else NO
+    selected = (NOT_APPLICABLE,)
+    if has_diagnoses == YES:
+        selected = tuple(rng.sample(DIAGNOSES, rng.randint(1, 2)))
+    reportable = YES in (gi_side_effects, has_diagnoses)
+    data = {
+        "subject_visit": visit,
+        "report_datetime": visit.report_datetime,
+        "gi_side_effects": gi_side_effects,
+        "gi_side_effects_details": "nausea" if gi_side_effects == YES else "",
+        "has_diagnoses": has_diagnoses,
+        "diagnoses": selected,
+        "diagnoses_other": "pancreatitis" if OTHER in selected else "",
+        "reportable_as_ae": rng.choice((YES, NO)) if reportable else NOT_APPLICABLE,
+        "patient_admitted": rng.choice((YES, NO)) if reportable else NOT_APPLICABLE,
+    }
+    return data, {}
+
+
+@register_mutation("diagnoses", "gi_side_effects_details_required")
+def gi_side_effects_details_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["gi_side_effects"] != YES:
+        return False
+    data.update(gi_side_effects_details="")
+    return True
+
+
+@register_mutation("diagnoses", "diagnoses_not_applicable_if_none")
+def diagnoses_if_none(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["has_diagnoses"] != NO:
+        return False
+    data.update(diagnoses=("pneumonia",))
+    return True
+
+
+@register_mutation("diagnoses", "diagnoses_required")
+def diagnoses_not_applicable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["has_diagnoses"] != YES:
+        return False
+    data.update(diagnoses=(NOT_APPLICABLE,), diagnoses_other="")
+    return True
+
+
+@register_mutation("diagnoses", "diagnoses_other_required")
+def diagnoses_other_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["has_diagnoses"] != YES:
+        return False
+    data.update(diagnoses=(OTHER,), diagnoses_other="")
+    return True
+
+
+@register_mutation("diagnoses", "reportable_as_ae_applicable")
+def diagnoses_reportable(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(
+        reportable_as_ae=NOT_APPLICABLE if data["reportable_as_ae"] != NOT_APPLICABLE else NO
+    )
+    return True
+
+
+# Hospitalization (PRN)
+
+
+@register_generator("hospitalization")
+def hospitalization(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_date = get_follow_up_date(rng, subject)
+    admitted_date = report_date - timedelta(days=rng.randint(0, 30))
+    discharged = rng.choice((YES, YES, NO, UNKNOWN))
+    discharged_date = (
+        date_between(rng, admitted_date, report_date) if discharged == YES else None
+    )
+    lp_performed = YES if chance(rng, 0.4) else NO
+    csf_positive_cm = rng.choice((YES, NO)) if lp_performed == YES else NOT_APPLICABLE
+    have_details = YES if chance(rng, 0.7) else NO
+    data = {
+        "report_datetime": get_report_datetime(rng, report_date),
+        "have_details": have_details,
+        "admitted_date": admitted_date,
+        "admitted_date_estimated": estimated(rng),
+        "discharged": discharged,
+        "discharged_date": discharged_date,
+        "discharged_date_estimated": estimated(rng) if discharged == YES else NOT_APPLICABLE,
+        "lp_performed": lp_performed,
+        "lp_count": rng.randint(1, 4) if lp_performed == YES else None,
+        "csf_positive_cm": csf_positive_cm,
+        "csf_positive_cm_date": (
+            date_between(rng, admitted_date, discharged_date or report_date)
+            if csf_positive_cm == YES
+            else None
+        ),
+        "narrative": "Details of admission" if have_details == YES else "",
+    }
+    return data, {}
+
+
+@register_mutation("hospitalization", "discharged_date_required")
+def discharged_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["discharged"] != YES:
+        return False
+    data.update(discharged_date=None)
+    return True
+
+
+@register_mutation("hospitalization", "discharged_date_before_admitted_date")
+def discharged_before_admitted(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["discharged"] != YES:
+        return False
+    data.update(
+        discharged_date=data["admitted_date"] - timedelta(days=rng.randint(1, 10)),
+        csf_positive_cm_date=None,
+        csf_positive_cm=NO if data["csf_positive_cm"] == YES else data["csf_positive_cm"],
+    )
+    return True
+
+
+@register_mutation("hospitalization", "lp_count_required")
+def lp_count_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["lp_performed"] != YES:
+        return False
+    data.update(lp_count=None)
+    return True
+
+
+@register_mutation("hospitalization", "csf_positive_cm_date_before_admitted_date")
+def csf_positive_before_admitted(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["csf_positive_cm"] != YES:
+        return False
+    data.update(
+        csf_positive_cm_date=data["admitted_date"] - timedelta(days=rng.randint(1, 10))
+    )
+    return True
+
+
+@register_mutation("hospitalization", "narrative_required")
+def narrative_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["have_details"] != YES:
+        return False
+    data.update(narrative="")
+    return True
+
+
+# Death report (AE)
+
+
+@register_generator("death_report")
+def death_report(rng: random.Random, subject: Subject) -> tuple[dict, dict]:
+    report_date = get_follow_up_date(rng, subject)
+    death_date = max(subject.screening_date, report_date - timedelta(days=rng.randint(0, 7)))
+    cause_of_death = rng.choice(CAUSES_OF_DEATH)
+    data = {
+        "report_datetime": get_report_datetime(rng, report_date),
+        "death_datetime": datetime.combine(death_date, time(rng.randint(0, 7)), UTC),
+        "death_as_inpatient": NO,
+        "hospitalization_date": None,
+        "hospitalization_date_estimated": NOT_APPLICABLE,
+        "clinical_notes_available": NOT_APPLICABLE,
+        "cm_sx": NOT_APPLICABLE,
+        "speak_nok": NO,
+        "date_first_unwell": None,
+        "date_first_unwell_estimated": NOT_APPLICABLE,
+        **dict.fromkeys(NOK_SYMPTOMS, NOT_APPLICABLE),
+        "nok_narrative": "",
+        "cause_of_death": cause_of_death,
+        "cause_of_death_other": "sepsis" if cause_of_death == OTHER else "",
+        "narrative": "Details of death",
+    }
+    if chance(rng, 0.6):
+        clinical_notes_available = rng.choice((YES, NO))
+        data.update(
+            death_as_inpatient=YES,
+            hospitalization_date=death_date - timedelta(days=rng.randint(0, 21)),
+            hospitalization_date_estimated=estimated(rng),
+            clinical_notes_available=clinical_notes_available,
+            cm_sx=rng.choice((YES, NO)) if clinical_notes_available == YES else NOT_APPLICABLE,
+        )
+    if chance(rng, 0.5):
+        unwell_before = data["hospitalization_date"] or death_date
+        data.update(
+            speak_nok=YES,
+            date_first_unwell=unwell_before - timedelta(days=rng.randint(0, 14)),
+            date_first_unwell_estimated=estimated(rng),
+            **{sx: rng.choice((YES, NO)) for sx in NOK_SYMPTOMS},
+            nok_narrative="Spoke to next of kin",
+        )
+    return data, {}
+
+
+@register_mutation("death_report", "report_datetime_after_death_datetime")
+def death_after_report(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(death_datetime=data["report_datetime"] + timedelta(days=rng.randint(1, 7)))
+    return True
+
+
+@register_mutation("death_report", "cause_of_death_other_required")
+def cause_of_death_other_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    data.update(cause_of_death=OTHER, cause_of_death_other="")
+    return True
+
+
+@register_mutation("death_report", "hospitalization_date_required")
+def hospitalization_date_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["death_as_inpatient"] != YES:
+        return False
+    data.update(hospitalization_date=None)
+    return True
+
+
+@register_mutation("death_report", "hospitalization_date_after_death")
+def hospitalized_after_death(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["death_as_inpatient"] != YES:
+        return False
+    death_date = data["death_datetime"].date()
+    data.update(hospitalization_date=death_date + timedelta(days=rng.randint(1, 7)))
+    return True
+
+
+@register_mutation("death_report", "date_first_unwell_after_death")
+def unwell_after_death(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["speak_nok"] != YES:
+        return False
+    death_date = data["death_datetime"].date()
+    data.update(date_first_unwell=death_date + timedelta(days=rng.randint(1, 7)))
+    return True
+
+
+@register_mutation("death_report", "nok_narrative_required")
+def nok_narrative_missing(rng: random.Random, data: dict, lookups: dict) -> bool:
+    if data["speak_nok"] != YES:
+        return False
+    data.update(nok_narrative="")
+    return True
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import inspect
+import timeit
+from dataclasses import dataclass
+from importlib import import_module
+
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+BENCHMARKS = ["outcome", "lightweight", "load", "payloads", "bulk"]
+
+
+@dataclass(frozen=True)
+class Timing:
+    name: str
+    number: int
+    best: float
+
+    @property
+    def per_call_us(self) -> float:
+        return self.best / self.number * 1_000_000
+
+
+def measure(name: str, func, number: int = 1000, repeat: int = 5) -> Timing:
+    """Returns the best of `repeat` runs of `number` calls to `func`."""
+    return Timing(
+        name=name, number=number, best=min(timeit.repeat(func, number=number, repeat=repeat))
+    )
+
+
+def report(title: str, timings: list[Timing]) -> None:
+    print(f"\n{title}")  # noqa: T201
+    width = max(len(t.name) for t in timings)
+    for timing in timings:
+        print(f"  {timing.name:<{width}}  {timing.per_call_us:10.1f} us/call")  # noqa: T201
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Run effect-form-validators benchmarks")
+    parser.add_argument("benchmarks", nargs="*", default=BENCHMARKS, choices=BENCHMARKS)
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=200, help="load: concurrent clerks")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="payloads, bulk: synthetic data seed; load: save mix seed",
+    )
+    options = parser.parse_args(argv)
+    setup_test_environment()
+    try:
+        for name in options.benchmarks:
+            run = import_module(f"tests.benchmarks.bench_{name}").run
+            run(
+                **{
+                    k: v
+                    for k, v in vars(options).items()
+                    if k in inspect.signature(run).parameters
+                }
+            )
+    finally:
+        teardown_test_environment()
+    return 0
@@ -59,6 +59,22 @@ project_settings = DefaultTestSettings(
     EDC_PROTOCOL_STUDY_CLOSE_DATETIME=datetime(
         2026, 12, 31, tzinfo=ZoneInfo("Africa/Gaborone")
     ),
+    # 500 mg tablets at ~100 mg/kg/d, for tests and benchmarks only
+    EFFECT_FORM_VALIDATORS_FLUCYT_DOSE_BANDS=(
+        (20.0, 2000, (500, 500, 500, 500)),
+        (25.0, 2500, (1000, 500, 500, 500)),
+        (30.0, 3000, (1000, 500, 1000, 500)),
+        (35.0, 3500, (1000, 1000, 1000, 500)),
+        (40.0, 4000, (1000, 1000, 1000, 1000)),
+        (45.0, 4500, (1500, 1000, 1000, 1000)),
+        (50.0, 5000, (1500, 1000, 1500, 1000)),
+        (55.0, 5500, (1500, 1500, 1500, 1000)),
+        (60.0, 6000, (1500, 1500, 1500, 1500)),
+        (65.0, 6500, (2000, 1500, 1500, 1500)),
+        (70.0, 7000, (2000, 1500, 2000, 1500)),
+        (75.0, 7500, (2000, 2000, 2000, 1500)),
+        (80.0, 8000, (2000, 2000, 2000, 2000)),
+    ),
 ).settings
 
 
@@ -9,11 +9,12 @@ from django.utils import timezone
 from django_mock_queries.query import MockModel
 
 from effect_form_validators.effect_reports import SerumCragDateNoteFormValidator as Base
+from effect_form_validators.query_budget import QueryBudgetTestMixin
 
 from ..mixins import TestCaseMixin
 
 
-class SerumCragDateNoteFormValidator(FormValidatorTestMixin, Base):
+class SerumCragDateNoteFormValidator(QueryBudgetTestMixin, FormValidatorTestMixin, Base):
     pass
 
 
@@ -0,0 +1,176 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase
+from edc_consent.exceptions import ConsentDefinitionDoesNotExist, SiteConsentError
+from edc_consent.site_consents import site_consents
+
+from effect_form_validators.effect_screening import SubjectScreeningFormValidator
+from effect_form_validators.effect_screening.consent_definition_index import (
+    ConsentDefinitionIndex,
+    ConsentDefinitionIndexCache,
+    consent_definition_index,
+)
+
+tz = ZoneInfo("Africa/Gaborone")
+
+SCREENING_MODEL = "effect_screening.subjectscreening"
+
+
+def get_cdef(
+    version: str,
+    start: datetime,
+    end: datetime,
+    screening_model: str | list[str] = SCREENING_MODEL,
+    updates: SimpleNamespace | None = None,
+):
+    return SimpleNamespace(
+        name=f"consent-v{version}",
+        version=version,
+        start=start,
+        end=end,
+        screening_model=screening_model,
+        updates=updates,
+    )
+
+
+class TestConsentDefinitionIndex(TestCase):
+    def setUp(self) -> None:
+        self.v1 = get_cdef(
+            "1", datetime(2022, 5, 10, tzinfo=tz), datetime(2023, 12, 31, tzinfo=tz)
+        )
+        self.v2 = get_cdef(
+            "2",
+            datetime(2024, 1, 1, tzinfo=tz),
+            datetime(2026, 12, 31, tzinfo=tz),
+            screening_model=[SCREENING_MODEL, "effect_screening.otherscreening"],
+        )
+        self.addCleanup(consent_definition_index.clear)
+
+    def test_get(self):
+        index = ConsentDefinitionIndex([self.v2, self.v1])
+        self.assertIs(index.get(datetime(2022, 5, 10, tzinfo=tz), SCREENING_MODEL), self.v1)
+        self.assertIs(index.get(datetime(2023, 12, 31, tzinfo=tz), SCREENING_MODEL), self.v1)
+        self.assertIs(index.get(datetime(2024, 6, 1, tzinfo=tz), SCREENING_MODEL), self.v2)
+        self.assertIs(
+            index.get(datetime(2024, 6, 1, tzinfo=tz), "effect_screening.otherscreening"),
+            self.v2,
+        )
+        # outside of periods, or screening model not covered
+        self.assertIsNone(index.get(datetime(2022, 5, 9, tzinfo=tz), SCREENING_MODEL))
+        self.assertIsNone(index.get(datetime(2027, 1, 1, tzinfo=tz), SCREENING_MODEL))
+        self.assertIsNone(
+            index.get(datetime(2023, 6, 1, tzinfo=tz), "effect_screening.otherscreening")
+        )
+        self.assertIsNone(index.get(datetime(2024, 6, 1, tzinfo=tz), "blah.blah"))
+
+    def test_end_covers_the_minute(self):
+        index = ConsentDefinitionIndex([self.v1])
+        self.assertIs(index.get(self.v1.end + timedelta(seconds=59), SCREENING_MODEL), self.v1)
+        self.assertIsNone(index.get(self.v1.end + timedelta(minutes=1), SCREENING_MODEL))
+
+    def test_overlapping_definitions(self):
+        v1_1 = get_cdef(
+            "1.1", datetime(2023, 6, 1, tzinfo=tz), datetime(2024, 6, 1, tzinfo=tz)
+        )
+        index = ConsentDefinitionIndex([self.v1, v1_1, self.v2])
+        self.assertIs(index.get(datetime(2023, 1, 1, tzinfo=tz), SCREENING_MODEL), self.v1)
+        self.assertIsNone(index.get(datetime(2023, 7, 1, tzinfo=tz), SCREENING_MODEL))
+        self.assertIsNone(index.get(datetime(2024, 2, 1, tzinfo=tz), SCREENING_MODEL))
+        self.assertIs(index.get(datetime(2024, 7, 1, tzinfo=tz), SCREENING_MODEL), self.v2)
+
+        # resolved to the update
+        v1_1.updates = self.v1
+        index = ConsentDefinitionIndex([self.v1, v1_1, self.v2])
+        self.assertIs(index.get(datetime(2023, 7, 1, tzinfo=tz), SCREENING_MODEL), v1_1)
+
+    def test_parity_with_registry(self):
+        v1_1 = get_cdef(
+            "1.1",
+            datetime(2023, 6, 1, 8, 30, 15, tzinfo=tz),
+            datetime(2024, 6, 1, tzinfo=tz),
+            updates=self.v1,
+        )
+        v3 = get_cdef(
+            "3", datetime(2025, 1, 1, tzinfo=tz), datetime(2027, 1, 1, 23, 59, 30, tzinfo=tz)
+        )
+        other = get_cdef(
+            "9",
+            datetime(2023, 1, 1, tzinfo=tz),
+            datetime(2025, 1, 1, tzinfo=tz),
+            screening_model="effect_screening.otherscreening",
+        )
+        cdefs = [self.v1, v1_1, self.v2, v3, other]
+        index = ConsentDefinitionIndex(cdefs)
+        report_datetimes = [
+            report_datetime + delta
+            for cdef in cdefs
+            for report_datetime in (cdef.start, cdef.end)
+            for delta in (
+                timedelta(minutes=-1),
+                timedelta(seconds=-1),
+                timedelta(0),
+                timedelta(seconds=59),
+                timedelta(minutes=1),
+            )
+        ]
+        report_datetimes.extend(
+            datetime(2022, 1, 1, tzinfo=tz) + timedelta(days=d) for d in range(0, 2000, 7)
+        )
+        with (
+            patch.object(site_consents, "registry", {cdef.name: cdef for cdef in cdefs}),
+            patch.object(site_consents, "loaded", True),
+        ):
+            for screening_model in [SCREENING_MODEL, "effect_screening.otherscreening"]:
+                for report_datetime in report_datetimes:
+                    with self.subTest(
+                        screening_model=screening_model, report_datetime=report_datetime
+                    ):
+                        try:
+                            expected = site_consents.get_consent_definition(
+                                screening_model=screening_model,
+                                report_datetime=report_datetime,
+                            )
+                        except (ConsentDefinitionDoesNotExist, SiteConsentError):
+                            expected = None
+                        self.assertEqual(index.get(report_datetime, screening_model), expected)
+
+    def test_form_validator_uses_index_then_registry(self):
+        instance = SimpleNamespace(_meta=SimpleNamespace(label_lower=SCREENING_MODEL))
+        with (
+            patch.object(site_consents, "registry", {self.v1.name: self.v1}),
+            patch.object(site_consents, "loaded", True),
+            patch.object(
+                site_consents,
+                "get_consent_definition",
+                wraps=site_consents.get_consent_definition,
+            ) as mock_get_consent_definition,
+        ):
+            form_validator = SubjectScreeningFormValidator(
+                cleaned_data={"report_datetime": datetime(2023, 1, 1, tzinfo=tz)},
+                instance=instance,
+            )
+            self.assertIs(form_validator.get_consent_definition_or_raise(), self.v1)
+            mock_get_consent_definition.assert_not_called()
+
+            form_validator = SubjectScreeningFormValidator(
+                cleaned_data={"report_datetime": datetime(2024, 6, 1, tzinfo=tz)},
+                instance=instance,
+            )
+            with self.assertRaises(ConsentDefinitionDoesNotExist):
+                form_validator.get_consent_definition_or_raise()
+            mock_get_consent_definition.assert_called_once()
+
+    def test_cache_rebuilt_on_registry_change(self):
+        cache = ConsentDefinitionIndexCache()
+        with patch.object(site_consents, "registry", {self.v1.name: self.v1}):
+            index = cache.index
+            self.assertIs(cache.index, index)
+            self.assertIsNone(index.get(datetime(2024, 6, 1, tzinfo=tz), SCREENING_MODEL))
+            site_consents.registry[self.v2.name] = self.v2
+            self.assertIsNot(cache.index, index)
+            self.assertIs(
+                cache.index.get(datetime(2024, 6, 1, tzinfo=tz), SCREENING_MODEL), self.v2
+            )
@@ -0,0 +1,194 @@
+from datetime import date, datetime, time
+from unittest import skipIf
+from zoneinfo import ZoneInfo
+
+from clinicedc_constants import FEMALE, MALE, NO, NOT_APPLICABLE, NOT_DONE, PENDING, POS, YES
+from clinicedc_tests.mixins import FormValidatorTestMixin
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from effect_form_validators.effect_screening import SubjectScreeningFormValidator as Base
+from effect_form_validators.effect_screening.screening_log import (
+    DATE_FIELDS,
+    INVALID_DATE_MSG,
+    INVALID_NUMBER_MSG,
+    as_date,
+    evaluate_screening_log,
+    np,
+)
+
+
+class SubjectScreeningFormValidator(FormValidatorTestMixin, Base):
+    def validate_mg_ssx(self) -> None:
+        pass
+
+    def validate_suitability_for_study(self):
+        pass
+
+
+@skipIf(np is None, "numpy not installed")
+class TestScreeningLog(TestCase):
+    def get_row(self, **kwargs) -> dict:
+        row = {
+            "report_datetime": "2024-06-10",
+            "age_in_years": 25,
+            "parent_guardian_consent": NOT_APPLICABLE,
+            "gender": FEMALE,
+            "hiv_pos": YES,
+            "hiv_confirmed_date": "2024-06-01",
+            "hiv_confirmed_method": "historical_lab_result",
+            "cd4_date": "2024-06-05",
+            "serum_crag_value": POS,
+            "serum_crag_date": "2024-06-08",
+            "lp_done": YES,
+            "lp_date": "2024-06-07",
+            "lp_declined": NOT_APPLICABLE,
+            "csf_crag_value": NOT_DONE,
+            "cm_in_csf": NO,
+            "cm_in_csf_date": "",
+            "cm_in_csf_method": NOT_APPLICABLE,
+            "pregnant": NO,
+            "preg_test_date": "2024-06-09",
+            "breast_feeding": NO,
+        }
+        row.update(**kwargs)
+        return row
+
+    def test_valid_log(self):
+        result = evaluate_screening_log([self.get_row(), self.get_row(age_in_years=60)])
+        self.assertEqual(result.valid.tolist(), [True, True])
+        self.assertEqual(result.errors, [{}, {}])
+
+    def test_empty_log(self):
+        result = evaluate_screening_log([])
+        self.assertEqual(result.valid.tolist(), [])
+        self.assertEqual(result.errors, [])
+
+    def test_field_errors(self):
+        rows = [
+            self.get_row(age_in_years=121),
+            self.get_row(age_in_years=16, parent_guardian_consent=NO),
+            self.get_row(age_in_years=16),
+            self.get_row(hiv_confirmed_date=""),
+            self.get_row(cd4_date="2024-06-11"),
+            self.get_row(serum_crag_value="NEG"),
+            self.get_row(lp_date="2024-06-01"),
+            self.get_row(cm_in_csf_date="2024-06-12"),
+            self.get_row(gender=MALE, breast_feeding=NOT_APPLICABLE),
+            self.get_row(),
+        ]
+        result = evaluate_screening_log(rows)
+        self.assertEqual(result.valid.tolist(), [False] * 9 + [True])
+        self.assertEqual(
+            result.errors[0],
+            {"age_in_years": "Invalid. Please enter a valid age in years."},
+        )
+        self.assertIn("STOP.", result.errors[1]["parent_guardian_consent"])
+        self.assertEqual(
+            result.errors[2], {"parent_guardian_consent": "This field is applicable."}
+        )
+        self.assertEqual(result.errors[3], {"hiv_confirmed_date": "This field is required."})
+        self.assertIn(
+            "Invalid. Must be on or before report date/time. Got",
+            result.errors[4]["cd4_date"],
+        )
+        self.assertIn("positive serum/plasma CrAg", result.errors[5]["serum_crag_value"])
+        self.assertIn("more than 3 days before", result.errors[6]["lp_date"])
+        self.assertEqual(result.errors[7], {"cm_in_csf_date": "This field is not required."})
+        self.assertEqual(
+            result.errors[8],
+            {
+                "pregnant": "Invalid. Subject is male",
+                "preg_test_date": "Invalid. Subject is male",
+            },
+        )
+
+    def test_dates_as_date_objects(self):
+        result = evaluate_screening_log(
+            [self.get_row(report_datetime=date(2024, 6, 10), lp_date=date(2024, 6, 7))]
+        )
+        self.assertEqual(result.valid.tolist(), [True])
+
+    def test_malformed_values_are_row_errors(self):
+        rows = [
+            self.get_row(cd4_date="2024-13-45"),
+            self.get_row(report_datetime="10/06/2024"),
+            self.get_row(age_in_years="twenty"),
+            self.get_row(),
+        ]
+        result = evaluate_screening_log(rows)
+        self.assertEqual(result.valid.tolist(), [False, False, False, True])
+        self.assertEqual(result.errors[0], {"cd4_date": INVALID_DATE_MSG})
+        self.assertEqual(result.errors[1], {"report_datetime": INVALID_DATE_MSG})
+        self.assertEqual(result.errors[2], {"age_in_years": INVALID_NUMBER_MSG})
+
+    def test_parity_with_form_validator(self):
+        """Asserts each row is valid if the form is and, if not, that the
+        form's error is the first error reported for the row.
+        """
+        rows = [
+            self.get_row(),
+            self.get_row(age_in_years=60),
+            self.get_row(age_in_years=121),
+            self.get_row(age_in_years=16, parent_guardian_consent=NO),
+            self.get_row(age_in_years=16, parent_guardian_consent=YES),
+            self.get_row(age_in_years=16),
+            self.get_row(hiv_confirmed_date=""),
+            self.get_row(hiv_pos=NO, hiv_confirmed_method=NOT_APPLICABLE),
+            self.get_row(hiv_confirmed_method=NOT_APPLICABLE),
+            self.get_row(hiv_confirmed_date="2024-06-11"),
+            self.get_row(cd4_date="2024-06-11"),
+            self.get_row(serum_crag_value="NEG"),
+            self.get_row(serum_crag_date="2024-06-11"),
+            self.get_row(lp_date="2024-06-01"),
+            self.get_row(lp_date="2024-06-05"),
+            self.get_row(lp_date="2024-06-11"),
+            self.get_row(
+                lp_done=NO, lp_date="", lp_declined=YES, csf_crag_value=NOT_APPLICABLE
+            ),
+            self.get_row(lp_done=NO, lp_date="", csf_crag_value=NOT_APPLICABLE),
+            self.get_row(lp_declined=YES),
+            self.get_row(cm_in_csf=PENDING),
+            self.get_row(cm_in_csf=PENDING, cm_in_csf_date="2024-06-12"),
+            self.get_row(cm_in_csf=PENDING, cm_in_csf_date="2024-06-06"),
+            self.get_row(cm_in_csf_date="2024-06-12"),
+            self.get_row(cm_in_csf=YES),
+            self.get_row(gender=MALE, breast_feeding=NOT_APPLICABLE),
+            self.get_row(gender=MALE, pregnant=NOT_APPLICABLE, breast_feeding=NOT_APPLICABLE),
+            self.get_row(
+                gender=MALE, pregnant=NOT_APPLICABLE, preg_test_date="", breast_feeding=NO
+            ),
+            self.get_row(preg_test_date="2024-06-11"),
+            self.get_row(breast_feeding=NOT_APPLICABLE),
+        ]
+        result = evaluate_screening_log(rows)
+        self.assertGreater(result.valid.sum(), 2)
+        self.assertGreater((~result.valid).sum(), 20)
+        for row, valid, errors in zip(rows, result.valid, result.errors, strict=True):
+            with self.subTest(row=row, errors=errors):
+                form_validator = SubjectScreeningFormValidator(
+                    cleaned_data=self.get_cleaned_data(row)
+                )
+                try:
+                    form_validator.validate()
+                except ValidationError as e:
+                    self.assertFalse(valid)
+                    (field, messages), *_ = e.message_dict.items()
+                    self.assertEqual(field, next(iter(errors)))
+                    # date messages differ after "Got"
+                    self.assertEqual(
+                        messages[0].split(" Got ")[0], errors[field].split(" Got ")[0]
+                    )
+                else:
+                    self.assertTrue(valid)
+
+    @staticmethod
+    def get_cleaned_data(row: dict) -> dict:
+        cleaned_data = {
+            fld: (as_date(value) if fld in DATE_FIELDS else value) or None
+            for fld, value in row.items()
+        }
+        cleaned_data["report_datetime"] = datetime.combine(
+            cleaned_data["report_datetime"], time(12), ZoneInfo("Africa/Gaborone")
+        )
+        return cleaned_data
@@ -173,3 +173,23 @@ class TestFlucytMissedDosesFormValidators(TestCaseMixin, TestCase):
             "This field is not required",
             str(cm.exception.error_dict.get("doses_missed")),
         )
+
+    async def test_aclean_prefetches_assignment(self):
+        self.mock_get_assignment_for_subject.return_value = CONTROL
+        cleaned_data = self.get_cleaned_data()
+        cleaned_data.update(
+            {
+                "day_missed": 1,
+                "doses_missed": 1,
+                "missed_reason": REFUSED,
+                "missed_reason_other": "",
+            }
+        )
+        form_validator = FlucytMissedDosesFormValidator(
+            cleaned_data=cleaned_data, model=FlucytMissedDosesMockModel
+        )
+        with self.assertRaises(ValidationError) as cm:
+            await form_validator.aclean()
+        self.assertIn("day_missed", cm.exception.error_dict)
+        self.assertEqual(form_validator.__dict__["assignment"], CONTROL)
+        self.assertEqual(self.mock_get_assignment_for_subject.call_count, 1)
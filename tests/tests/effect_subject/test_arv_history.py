@@ -18,6 +18,7 @@ from edc_constants.choices import DATE_ESTIMATED_NA
 
 from effect_form_validators.constants import ART_CONTINUED, ART_STOPPED
 from effect_form_validators.effect_subject import ArvHistoryFormValidator as Base
+from effect_form_validators.query_budget import QueryBudgetTestMixin
 
 from ..mixins import TestCaseMixin
 
@@ -28,7 +29,7 @@ class ArvHistoryMockModel(MockModel):
         return "subject_visit"
 
 
-class ArvHistoryFormValidator(FormValidatorTestMixin, Base):
+class ArvHistoryFormValidator(QueryBudgetTestMixin, FormValidatorTestMixin, Base):
     @property
     def subject_screening(self):
         screening_date = timezone.now().date() - relativedelta(years=1)
@@ -1,18 +1,22 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 
 from clinicedc_constants import NO, NORMAL, OTHER, YES
 from clinicedc_tests.mixins import FormValidatorTestMixin
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ValidationError
+from django.db import models
 from django.test import TestCase
 from django.utils import timezone
 from django_mock_queries.query import MockModel, MockSet
 
 from effect_form_validators.effect_subject import ChestXrayFormValidator as Base
+from effect_form_validators.query_budget import QueryBudgetTestMixin
+from effect_form_validators.subject_history import subject_histories
 
-from ..mixins import TestCaseMixin
+from ..mixins import IsolatedModelsTestCase, TestCaseMixin, get_visit_models
 
 
 class ChestXrayMockModel(MockModel):
@@ -21,7 +25,7 @@ class ChestXrayMockModel(MockModel):
         return "subject_visit"
 
 
-class ChestXrayFormValidator(FormValidatorTestMixin, Base):
+class ChestXrayFormValidator(QueryBudgetTestMixin, FormValidatorTestMixin, Base):
     @property
     def consent_datetime(self) -> datetime:
         return timezone.now() - relativedelta(years=1)
@@ -329,3 +333,113 @@ class TestChestXrayFormValidation(TestCaseMixin, TestCase):
                     form_validator.validate()
                 except ValidationError as e:
                     self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+
+class TestChestXrayHistory(IsolatedModelsTestCase):
+    """Tests the chest x-ray history lookups against the database."""
+
+    @classmethod
+    def get_models(cls) -> list[type[models.Model]]:
+        cls.appointment_model, cls.subject_visit_model = get_visit_models()
+
+        class ChestXray(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+            chest_xray_date = models.DateField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+            @classmethod
+            def related_visit_model_attr(cls) -> str:
+                return "subject_visit"
+
+        cls.chest_xray_model = ChestXray
+        return [cls.appointment_model, cls.subject_visit_model, ChestXray]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.report_datetime = timezone.now() - relativedelta(months=6)
+        self.visits = [
+            self.get_subject_visit(visit_code, timepoint)
+            for visit_code, timepoint in [("1000", "0.0"), ("1014", "14.0")]
+        ]
+        self.addCleanup(subject_histories.clear)
+
+    def get_subject_visit(self, visit_code: str, timepoint: str) -> models.Model:
+        appointment = self.appointment_model.objects.create(
+            subject_identifier="12345", visit_code=visit_code, timepoint=Decimal(timepoint)
+        )
+        return self.subject_visit_model.objects.create(
+            appointment=appointment,
+            subject_identifier="12345",
+            visit_code=visit_code,
+            report_datetime=self.report_datetime,
+        )
+
+    def get_form_validator(
+        self, subject_visit: models.Model, chest_xray_date: date | None = None
+    ) -> Base:
+        class ChestXrayFormValidator(Base):
+            def get_consent_datetime_or_raise(self, **kwargs) -> datetime:  # noqa: ARG002
+                return self.report_datetime
+
+        try:
+            instance = self.chest_xray_model.objects.get(subject_visit=subject_visit)
+        except self.chest_xray_model.DoesNotExist:
+            instance = self.chest_xray_model(subject_visit=subject_visit)
+        return ChestXrayFormValidator(
+            cleaned_data=dict(
+                subject_visit=subject_visit,
+                report_datetime=self.report_datetime,
+                chest_xray_date=chest_xray_date,
+            ),
+            instance=instance,
+            model=self.chest_xray_model,
+        )
+
+    def test_previous_chest_xray_date_is_date_saved_for_visit(self):
+        chest_xray_date = self.report_datetime.date()
+        self.chest_xray_model.objects.create(
+            subject_visit=self.visits[0], chest_xray_date=chest_xray_date
+        )
+        self.assertEqual(
+            self.get_form_validator(self.visits[0]).previous_chest_xray_date,
+            chest_xray_date,
+        )
+        # x-rays of earlier visits are not considered
+        self.assertIsNone(self.get_form_validator(self.visits[1]).previous_chest_xray_date)
+
+    def test_chest_xray_date_before_saved_date_raises(self):
+        chest_xray_date = self.report_datetime.date()
+        self.chest_xray_model.objects.create(
+            subject_visit=self.visits[0], chest_xray_date=chest_xray_date
+        )
+        form_validator = self.get_form_validator(
+            self.visits[0], chest_xray_date=chest_xray_date - relativedelta(days=1)
+        )
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate_chest_xray_date()
+        self.assertIn("chest_xray_date", cm.exception.error_dict)
+
+        form_validator = self.get_form_validator(
+            self.visits[0], chest_xray_date=chest_xray_date
+        )
+        form_validator.validate_chest_xray_date()
+
+    def test_history_shared_until_chest_xray_saved(self):
+        form_validator = self.get_form_validator(self.visits[0])
+        with self.assertNumQueries(1):
+            self.assertIsNone(form_validator.previous_chest_xray_date)
+        form_validator = self.get_form_validator(self.visits[1])
+        with self.assertNumQueries(0):
+            self.assertEqual(len(form_validator.subject_history), 0)
+
+        chest_xray_date = self.report_datetime.date()
+        self.chest_xray_model.objects.create(
+            subject_visit=self.visits[0], chest_xray_date=chest_xray_date
+        )
+        form_validator = self.get_form_validator(self.visits[0])
+        with self.assertNumQueries(1):
+            self.assertEqual(form_validator.previous_chest_xray_date, chest_xray_date)
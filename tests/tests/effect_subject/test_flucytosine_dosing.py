@@ -0,0 +1,120 @@
+from datetime import datetime
+from unittest import skipIf
+from zoneinfo import ZoneInfo
+
+from django.test import TestCase, override_settings
+
+from effect_form_validators.effect_subject.flucytosine_dosing import (
+    FLUCYT_DOSE_FIELDS,
+    FlucytDoses,
+    FlucytDoseTable,
+    check_flucyt_doses,
+    get_expected_next_flucyt_dose,
+    get_flucyt_dose_table,
+    np,
+)
+
+
+class TestFlucytosineDosing(TestCase):
+    def test_dose_fields(self):
+        self.assertEqual(
+            FLUCYT_DOSE_FIELDS,
+            ("flucyt_dose_0400", "flucyt_dose_1000", "flucyt_dose_1600", "flucyt_dose_2200"),
+        )
+
+    def test_from_cleaned_data(self):
+        doses = FlucytDoses.from_cleaned_data(
+            {
+                "flucyt_dose": 4000,
+                "flucyt_dose_0400": 1000,
+                "flucyt_dose_1000": 1000,
+                "flucyt_dose_1600": 1000,
+                "flucyt_dose_2200": 1000,
+            }
+        )
+        self.assertEqual(doses.slots_total, 4000)
+        self.assertTrue(doses.slots_match_total)
+        self.assertEqual(doses.get_required_candidates(required=True), [])
+        self.assertEqual(
+            doses.get_required_candidates(required=False), list(FLUCYT_DOSE_FIELDS)
+        )
+
+    def test_partial_doses(self):
+        doses = FlucytDoses.from_cleaned_data(
+            {"flucyt_dose": 4000, "flucyt_dose_0400": 0, "flucyt_dose_1600": 2000}
+        )
+        self.assertEqual(doses.slots_total, 2000)
+        self.assertFalse(doses.slots_match_total)
+        self.assertEqual(
+            doses.get_required_candidates(required=True),
+            ["flucyt_dose_1000", "flucyt_dose_2200"],
+        )
+        self.assertTrue(FlucytDoses.from_cleaned_data({}).slots_match_total)
+
+    def test_expected_next_dose(self):
+        tz = ZoneInfo("Africa/Gaborone")
+        self.assertEqual(
+            get_expected_next_flucyt_dose(datetime(2026, 1, 1, 0, 0, tzinfo=tz)), "1000"
+        )
+        self.assertEqual(
+            get_expected_next_flucyt_dose(datetime(2026, 1, 1, 12, 59, tzinfo=tz)), "1000"
+        )
+        self.assertEqual(
+            get_expected_next_flucyt_dose(datetime(2026, 1, 1, 13, 0, tzinfo=tz)), "1600"
+        )
+        self.assertEqual(
+            get_expected_next_flucyt_dose(datetime(2026, 1, 1, 23, 0, tzinfo=tz)), "1600"
+        )
+
+    @skipIf(np is None, "numpy not installed")
+    def test_check_flucyt_doses(self):
+        sum_mismatch, missing_slot = check_flucyt_doses(
+            totals=[4000, 4000, np.nan, 3000],
+            slots=[
+                [1000, 1000, 1000, 1000],
+                [1000, np.nan, 1000, 1000],
+                [np.nan, np.nan, np.nan, np.nan],
+                [1000, 1000, 1000, 1000],
+            ],
+            required=[True, True, False, True],
+        )
+        self.assertEqual(sum_mismatch.tolist(), [False, True, False, True])
+        self.assertEqual(missing_slot.tolist(), [False, True, False, False])
+
+    def test_dose_table_lookup(self):
+        table = get_flucyt_dose_table()
+        self.assertIsNone(table.get_band(None))
+        self.assertIsNone(table.get_band(19.9))
+        self.assertEqual(table.get_band(20.0).dose, 2000)
+        self.assertEqual(table.get_band(44.9).dose, 4000)
+        self.assertEqual(table.get_band(45.0).slots, (1500, 1000, 1000, 1000))
+        self.assertEqual(table.get_band(120.0).dose, 8000)
+        for band in table.bands:
+            with self.subTest(band=band):
+                self.assertEqual(sum(band.slots), band.dose)
+
+    def test_dose_table_invalid_band(self):
+        with self.assertRaises(ValueError):
+            FlucytDoseTable([(40.0, 4000, (1000, 1000, 1000))])
+        with self.assertRaises(ValueError):
+            FlucytDoseTable([(40.0, 4000, (1000, 1000, 1000, 500))])
+
+    def test_dose_table_from_settings(self):
+        table = get_flucyt_dose_table()
+        with override_settings(
+            EFFECT_FORM_VALIDATORS_FLUCYT_DOSE_BANDS=[(50.0, 4000, (1000, 1000, 1000, 1000))]
+        ):
+            self.assertIsNone(get_flucyt_dose_table().get_band(45.0))
+            self.assertEqual(get_flucyt_dose_table().get_band(90.0).dose, 4000)
+        self.assertIsNot(get_flucyt_dose_table(), table)
+        self.assertEqual(get_flucyt_dose_table().get_band(45.0).dose, 4500)
+
+    @override_settings(EFFECT_FORM_VALIDATORS_FLUCYT_DOSE_BANDS=None)
+    def test_dose_table_not_set(self):
+        self.assertIsNone(get_flucyt_dose_table())
+
+    @skipIf(np is None, "numpy not installed")
+    def test_dose_table_vectorized(self):
+        doses = get_flucyt_dose_table().get_doses([np.nan, 10.0, 20.0, 47.5, 200.0])
+        self.assertTrue(np.isnan(doses[:2]).all())
+        self.assertEqual(doses[2:].tolist(), [2000.0, 4500.0, 8000.0])
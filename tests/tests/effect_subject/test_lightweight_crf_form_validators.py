@@ -0,0 +1,121 @@
+from unittest.mock import patch
+
+from clinicedc_constants import NO, NOT_APPLICABLE, POS, YES
+from dateutil.relativedelta import relativedelta
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+from django_mock_queries.query import MockModel
+
+from effect_form_validators.effect_subject import (
+    AdherenceStageFourFormValidator,
+    AdherenceStageOneFormValidator,
+    AdherenceStageThreeFormValidator,
+    AdherenceStageTwoFormValidator,
+    ClinicalNoteFormValidator,
+    HistopathologyFormValidator,
+    LightweightCrfFormValidator,
+)
+
+
+class CrfMockModel(MockModel):
+    @classmethod
+    def related_visit_model_attr(cls) -> str:
+        return "subject_visit"
+
+
+class TestLightweightCrfFormValidators(TestCase):
+    """Validators on the fast path check the window period but do not
+    look up the consent.
+    """
+
+    def setUp(self) -> None:
+        self.report_datetime = timezone.now()
+        patcher = patch.object(
+            LightweightCrfFormValidator, "validate_crf_datetime_in_window_period"
+        )
+        self.mock_window_period = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch.object(LightweightCrfFormValidator, "get_consent_datetime_or_raise")
+    def test_window_period_checked_consent_not(self, mock_get_consent_datetime):
+        for form_validator_cls in [
+            AdherenceStageOneFormValidator,
+            AdherenceStageTwoFormValidator,
+            AdherenceStageThreeFormValidator,
+            AdherenceStageFourFormValidator,
+            ClinicalNoteFormValidator,
+            HistopathologyFormValidator,
+        ]:
+            with self.subTest(form_validator_cls=form_validator_cls):
+                self.mock_window_period.reset_mock()
+                self.mock_window_period.side_effect = ValidationError(
+                    {"report_datetime": "Invalid. Outside of window period."}
+                )
+                form_validator = form_validator_cls(
+                    cleaned_data={"report_datetime": self.report_datetime},
+                    model=CrfMockModel,
+                )
+                with self.assertRaises(ValidationError) as cm:
+                    form_validator.validate()
+                self.assertIn("report_datetime", cm.exception.error_dict)
+                self.mock_window_period.assert_called_once_with()
+        mock_get_consent_datetime.assert_not_called()
+
+        # no report datetime, nothing to check
+        self.mock_window_period.reset_mock()
+        form_validator = AdherenceStageOneFormValidator(cleaned_data={}, model=CrfMockModel)
+        form_validator.validate()
+        self.mock_window_period.assert_not_called()
+
+    @staticmethod
+    def validate_histopathology(cleaned_data: dict) -> None:
+        HistopathologyFormValidator(cleaned_data=cleaned_data, model=CrfMockModel).validate()
+
+    def test_adherence_stage_ok(self):
+        form_validator = AdherenceStageOneFormValidator(
+            cleaned_data={"report_datetime": self.report_datetime}, model=CrfMockModel
+        )
+        try:
+            form_validator.validate()
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_clinical_note(self):
+        form_validator = ClinicalNoteFormValidator(
+            cleaned_data={"report_datetime": self.report_datetime, "has_comment": YES},
+            model=CrfMockModel,
+        )
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertIn("comments", cm.exception.error_dict)
+
+    def test_histopathology(self):
+        cleaned_data = {
+            "report_datetime": self.report_datetime,
+            "tissue_biopsy_performed": YES,
+            "tissue_biopsy_date": self.report_datetime.date(),
+            "tissue_biopsy_result": POS,
+            "tissue_biopsy_organism_text": "Cryptococcus",
+        }
+        try:
+            self.validate_histopathology(cleaned_data)
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+        tomorrow = (self.report_datetime + relativedelta(days=1)).date()
+        cleaned_data.update(tissue_biopsy_date=tomorrow)
+        with self.assertRaises(ValidationError) as cm:
+            self.validate_histopathology(cleaned_data)
+        self.assertIn("tissue_biopsy_date", cm.exception.error_dict)
+
+        cleaned_data.update(
+            tissue_biopsy_performed=NO,
+            tissue_biopsy_date=None,
+            tissue_biopsy_result=NOT_APPLICABLE,
+            tissue_biopsy_organism_text="",
+        )
+        try:
+            self.validate_histopathology(cleaned_data)
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
@@ -0,0 +1,93 @@
+from unittest import skipIf
+
+from clinicedc_constants import NO, NOT_APPLICABLE, YES
+from django.test import TestCase
+
+from effect_form_validators.effect_subject.mental_status_symptoms import (
+    SymptomSummary,
+    check_reporting_fieldset,
+    get_symptom_summaries,
+    get_symptom_summary,
+    np,
+)
+
+
+class TestMentalStatusSymptoms(TestCase):
+    def get_cleaned_data(self, **kwargs) -> dict:
+        cleaned_data = {
+            "recent_seizure": NO,
+            "behaviour_change": NO,
+            "confusion": NO,
+            "require_help": NOT_APPLICABLE,
+            "any_other_problems": NOT_APPLICABLE,
+            "modified_rankin_score": "0",
+            "ecog_score": "0",
+            "glasgow_coma_score": 15,
+        }
+        cleaned_data.update(**kwargs)
+        return cleaned_data
+
+    def test_no_symptoms(self):
+        self.assertEqual(
+            get_symptom_summary(self.get_cleaned_data()),
+            SymptomSummary(no_symptoms=True, finding=None),
+        )
+        self.assertEqual(
+            get_symptom_summary(self.get_cleaned_data(require_help=NO)),
+            SymptomSummary(no_symptoms=True, finding=None),
+        )
+
+    def test_first_finding(self):
+        for kwargs, finding in [
+            ({"recent_seizure": YES}, "A recent seizure was reported."),
+            ({"behaviour_change": YES, "confusion": YES}, "Behaviour change was reported."),
+            ({"confusion": YES, "ecog_score": "1"}, "Confusion reported."),
+            ({"require_help": YES}, "Reported help required for activities."),
+            ({"any_other_problems": YES}, "Other problems reported."),
+            ({"modified_rankin_score": "1"}, "Modified Rankin Score > 0."),
+            ({"ecog_score": "2"}, "ECOG score > 0."),
+            ({"glasgow_coma_score": 14}, "GCS < 15."),
+        ]:
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    get_symptom_summary(self.get_cleaned_data(**kwargs)),
+                    SymptomSummary(no_symptoms=False, finding=finding),
+                )
+
+    def test_incomplete_data_neither_no_symptoms_nor_finding(self):
+        self.assertEqual(
+            get_symptom_summary(self.get_cleaned_data(recent_seizure=None)),
+            SymptomSummary(no_symptoms=False, finding=None),
+        )
+
+    @skipIf(np is None, "numpy not installed")
+    def test_bulk(self):
+        rows = [
+            self.get_cleaned_data(reportable_as_ae=NO),
+            self.get_cleaned_data(reportable_as_ae=NOT_APPLICABLE),
+            self.get_cleaned_data(reportable_as_ae=NOT_APPLICABLE, confusion=YES),
+            self.get_cleaned_data(
+                reportable_as_ae=NOT_APPLICABLE, ecog_score="1", glasgow_coma_score=14
+            ),
+            self.get_cleaned_data(reportable_as_ae=YES, glasgow_coma_score=None),
+        ]
+        columns = {fld: np.array([row[fld] for row in rows], dtype=object) for fld in rows[0]}
+        no_symptoms, finding = get_symptom_summaries(columns)
+        self.assertEqual(no_symptoms.tolist(), [True, True, False, False, False])
+        self.assertEqual(
+            finding.tolist(), [None, None, "Confusion reported.", "ECOG score > 0.", None]
+        )
+        for row, expected in zip(rows, no_symptoms.tolist(), strict=True):
+            self.assertEqual(get_symptom_summary(row).no_symptoms, expected)
+
+        errors = check_reporting_fieldset(columns, ("reportable_as_ae",))
+        self.assertEqual(
+            errors["reportable_as_ae"].tolist(),
+            [
+                "This field is not applicable. No symptoms were reported.",
+                None,
+                "This field is applicable. Confusion reported.",
+                "This field is applicable. ECOG score > 0.",
+                None,
+            ],
+        )
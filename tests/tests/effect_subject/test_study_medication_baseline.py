@@ -1,10 +1,10 @@
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
 from clinicedc_constants import NO, NOT_APPLICABLE, TODAY, TOMORROW, YES
 from clinicedc_tests.mixins import FormValidatorTestMixin
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ValidationError
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 from django_mock_queries.query import MockModel
 from edc_utils.text import formatted_date
@@ -1132,6 +1132,66 @@ class TestStudyMedicationBaselineFormValidation(TestCaseMixin, TestCase):
             str(cm.exception.error_dict.get("flucyt_notes")),
         )
 
+    def test_flucyt_dose_expected_validated_against_weight(self):
+        self.mock_is_baseline.return_value = True
+        # weight, dose expected, dose in error message (if invalid)
+        for weight, dose_expected, band_dose in [
+            (None, 4000, None),
+            (45.0, 4500, None),
+            (47.9, 4500, None),
+            (44.9, 4500, 4000),
+            (50.0, 4500, 5000),
+        ]:
+            with (
+                self.subTest(weight=weight, dose_expected=dose_expected),
+                patch.object(
+                    StudyMedicationBaselineFormValidator,
+                    "vital_signs_weight",
+                    new_callable=PropertyMock,
+                    return_value=weight,
+                ),
+            ):
+                cleaned_data = self.get_cleaned_data(visit_code=DAY01, visit_code_sequence=0)
+                cleaned_data.update(
+                    {"flucyt_dose_expected": dose_expected, "flucyt_notes": "notes"}
+                )
+                form_validator = StudyMedicationBaselineFormValidator(
+                    cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                )
+                if band_dose is None:
+                    try:
+                        form_validator.validate()
+                    except ValidationError as e:
+                        self.fail(f"ValidationError unexpectedly raised. Got {e}")
+                else:
+                    with self.assertRaises(ValidationError) as cm:
+                        form_validator.validate()
+                    self.assertIn("flucyt_dose_expected", cm.exception.error_dict)
+                    self.assertIn(
+                        f"Invalid. Expected {band_dose} mg/d",
+                        str(cm.exception.error_dict.get("flucyt_dose_expected")),
+                    )
+
+    @override_settings(EFFECT_FORM_VALIDATORS_FLUCYT_DOSE_BANDS=None)
+    def test_flucyt_dose_expected_not_checked_without_dose_bands(self):
+        self.mock_is_baseline.return_value = True
+        cleaned_data = self.get_cleaned_data(visit_code=DAY01, visit_code_sequence=0)
+        cleaned_data.update({"flucyt_dose_expected": 4500, "flucyt_notes": "notes"})
+        with patch.object(
+            StudyMedicationBaselineFormValidator,
+            "vital_signs_weight",
+            new_callable=PropertyMock,
+            return_value=50.0,
+        ) as mock_weight:
+            form_validator = StudyMedicationBaselineFormValidator(
+                cleaned_data=cleaned_data, model=StudyMedicationMockModel
+            )
+            try:
+                form_validator.validate()
+            except ValidationError as e:
+                self.fail(f"ValidationError unexpectedly raised. Got {e}")
+        mock_weight.assert_not_called()
+
     def test_flucyt_notes_with_flucyt_expected_and_rx_identical_ok(self):
         self.mock_is_baseline.return_value = True
         cleaned_data = self.get_cleaned_data(visit_code=DAY01, visit_code_sequence=0)
@@ -1,6 +1,9 @@
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import PropertyMock, patch
 
 from clinicedc_constants import (
+    CONTROL,
+    INTERVENTION,
     NO,
     NOT_APPLICABLE,
     OTHER,
@@ -12,15 +15,23 @@ from clinicedc_constants import (
 from clinicedc_tests.mixins import FormValidatorTestMixin
 from dateutil.relativedelta import relativedelta
 from django.core.exceptions import ValidationError
-from django.test import TestCase, tag
+from django.test import TestCase, override_settings, tag
 from django.utils import timezone
 from django_mock_queries.query import MockModel, MockSet
-from edc_visit_schedule.constants import DAY01, DAY03, DAY14, WEEK10
+from edc_visit_schedule.constants import DAY01, DAY03, DAY09, DAY14, WEEK04, WEEK10, WEEK24
 
 from effect_form_validators.effect_subject import StudyMedicationFollowupFormValidator as Base
+from effect_form_validators.effect_subject.study_medication_schedule import (
+    StudyMedicationScheduleCache,
+    build_schedule_index,
+)
 
 from ..mixins import TestCaseMixin
 
+VISIT_DAYS = {DAY01: 1, DAY03: 3, DAY09: 9, DAY14: 14, WEEK04: 28, WEEK10: 70, WEEK24: 168}
+FLUCON_DOSE_SCHEDULE = ((1, 1200), (14, 800), (70, 200))
+FLUCYT_LAST_DAY = 15
+
 
 class StudyMedicationMockModel(MockModel):
     @classmethod
@@ -1115,3 +1126,246 @@ class TestStudyMedicationFollowupFormValidation(TestCaseMixin, TestCase):
             form_validator.validate()
         except ValidationError as e:
             self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+
+@tag("debug")
+@override_settings(
+    EFFECT_FORM_VALIDATORS_FLUCON_DOSE_SCHEDULE=FLUCON_DOSE_SCHEDULE,
+    EFFECT_FORM_VALIDATORS_FLUCYT_LAST_DAY=FLUCYT_LAST_DAY,
+)
+class TestStudyMedicationFollowupProtocolSchedule(TestCaseMixin, TestCase):
+    flucyt_individual_dose_fields = (
+        TestStudyMedicationFollowupFormValidation.flucyt_individual_dose_fields
+    )
+
+    def setUp(self) -> None:
+        super().setUp()
+        sm_baseline_patcher = patch(
+            "effect_form_validators.effect_subject"
+            ".study_medication_followup_form_validator.is_baseline",
+            return_value=False,
+        )
+        self.addCleanup(sm_baseline_patcher.stop)
+        sm_baseline_patcher.start()
+        schedule_patcher = patch(
+            "effect_form_validators.effect_subject.study_medication_schedule"
+            ".get_study_medication_schedule",
+            return_value=build_schedule_index(
+                VISIT_DAYS, FLUCON_DOSE_SCHEDULE, FLUCYT_LAST_DAY
+            ),
+        )
+        self.mock_schedule = schedule_patcher.start()
+        self.addCleanup(schedule_patcher.stop)
+        assignment_patcher = patch.object(
+            StudyMedicationFollowupFormValidator,
+            "assignment",
+            new_callable=PropertyMock,
+            return_value=INTERVENTION,
+        )
+        self.addCleanup(assignment_patcher.stop)
+        self.mock_assignment = assignment_patcher.start()
+
+    def get_cleaned_data(self, visit_code: str | None = None) -> dict:
+        cleaned_data = super().get_cleaned_data(
+            visit_code=visit_code, report_datetime=timezone.now()
+        )
+        cleaned_data.update(
+            {
+                "modifications": YES,
+                "modifications_reason": MockSet(
+                    MockModel(
+                        mock_name="DoseModificationReasons",
+                        name=PER_PROTOCOL,
+                        display_name=PER_PROTOCOL,
+                    )
+                ),
+                "modifications_reason_other": "",
+                "flucon_modified": YES,
+                "flucon_dose_datetime": timezone.now() + relativedelta(minutes=1),
+                "flucon_dose": 800,
+                "flucon_notes": "Some flucon notes here",
+                "flucyt_modified": YES,
+                "flucyt_dose_datetime": timezone.now() + relativedelta(minutes=1),
+                "flucyt_dose": 0,
+                **{fld: 0 for fld in self.flucyt_individual_dose_fields},
+                "flucyt_notes": "",
+            }
+        )
+        return cleaned_data
+
+    def test_cleaned_data_after_baseline_ok(self):
+        for visit_code in [DAY03, DAY09, DAY14]:
+            with self.subTest(visit_code=visit_code):
+                cleaned_data = self.get_cleaned_data(visit_code=visit_code)
+                form_validator = StudyMedicationFollowupFormValidator(
+                    cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                )
+                try:
+                    form_validator.validate()
+                except ValidationError as e:
+                    self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_schedule_index(self):
+        index = build_schedule_index(VISIT_DAYS, FLUCON_DOSE_SCHEDULE, FLUCYT_LAST_DAY)
+        self.assertEqual(index[(INTERVENTION, DAY03)].flucon_dose, 1200)
+        self.assertEqual(index[(INTERVENTION, DAY14)].flucon_dose, 800)
+        self.assertEqual(index[(CONTROL, WEEK04)].flucon_dose, 800)
+        self.assertEqual(index[(CONTROL, WEEK10)].flucon_dose, 200)
+        self.assertTrue(index[(INTERVENTION, DAY14)].flucyt_applicable)
+        self.assertFalse(index[(INTERVENTION, WEEK04)].flucyt_applicable)
+        self.assertFalse(index[(CONTROL, DAY03)].flucyt_applicable)
+
+    def test_flucon_notes_required_if_flucon_dose_not_per_protocol(self):
+        for visit_code, flucon_dose, expected_dose in [
+            (DAY03, 800, 1200),
+            (DAY14, 1200, 800),
+            (WEEK10, 800, 200),
+        ]:
+            with self.subTest(visit_code=visit_code, flucon_dose=flucon_dose):
+                cleaned_data = self.get_cleaned_data(visit_code=visit_code)
+                cleaned_data.update(
+                    {
+                        "flucon_dose": flucon_dose,
+                        "flucon_notes": "",
+                        "flucyt_modified": NOT_APPLICABLE,
+                        "flucyt_dose_datetime": None,
+                        "flucyt_dose": None,
+                        **{fld: None for fld in self.flucyt_individual_dose_fields},
+                    }
+                )
+                form_validator = StudyMedicationFollowupFormValidator(
+                    cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                )
+                with self.assertRaises(ValidationError) as cm:
+                    form_validator.validate()
+                self.assertIn("flucon_notes", cm.exception.error_dict)
+                self.assertIn(
+                    f"This field is required. Fluconazole dose not {expected_dose} mg/d.",
+                    str(cm.exception.error_dict.get("flucon_notes")),
+                )
+
+    def test_flucyt_modified_not_applicable_on_control_arm(self):
+        self.mock_assignment.return_value = CONTROL
+        cleaned_data = self.get_cleaned_data(visit_code=DAY03)
+        form_validator = StudyMedicationFollowupFormValidator(
+            cleaned_data=cleaned_data, model=StudyMedicationMockModel
+        )
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertIn("flucyt_modified", cm.exception.error_dict)
+        self.assertIn(
+            f"Participant is on {CONTROL} arm.",
+            str(cm.exception.error_dict.get("flucyt_modified")),
+        )
+
+    def test_flucyt_modified_not_applicable_after_day_15_on_intervention_arm(self):
+        for visit_code in [WEEK04, WEEK24]:
+            with self.subTest(visit_code=visit_code):
+                cleaned_data = self.get_cleaned_data(visit_code=visit_code)
+                form_validator = StudyMedicationFollowupFormValidator(
+                    cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                )
+                with self.assertRaises(ValidationError) as cm:
+                    form_validator.validate()
+                self.assertIn("flucyt_modified", cm.exception.error_dict)
+                self.assertIn(
+                    "Flucytosine is not given after day 15.",
+                    str(cm.exception.error_dict.get("flucyt_modified")),
+                )
+
+    def get_flucyt_not_applicable_cleaned_data(self, visit_code: str) -> dict:
+        cleaned_data = self.get_cleaned_data(visit_code=visit_code)
+        cleaned_data.update(
+            {
+                "flucyt_modified": NOT_APPLICABLE,
+                "flucyt_dose_datetime": None,
+                "flucyt_dose": None,
+                **{fld: None for fld in self.flucyt_individual_dose_fields},
+            }
+        )
+        return cleaned_data
+
+    def test_flucyt_modified_not_applicable_on_control_arm_at_every_visit(self):
+        self.mock_assignment.return_value = CONTROL
+        for visit_code in [DAY03, DAY09, DAY14, WEEK04, WEEK10, WEEK24]:
+            for flucyt_modified in [YES, NO]:
+                with self.subTest(visit_code=visit_code, flucyt_modified=flucyt_modified):
+                    cleaned_data = self.get_cleaned_data(visit_code=visit_code)
+                    cleaned_data.update(flucyt_modified=flucyt_modified)
+                    form_validator = StudyMedicationFollowupFormValidator(
+                        cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                    )
+                    with self.assertRaises(ValidationError) as cm:
+                        form_validator.validate()
+                    self.assertIn(
+                        f"Participant is on {CONTROL} arm.",
+                        str(cm.exception.error_dict.get("flucyt_modified")),
+                    )
+
+    def test_flucyt_not_applicable_on_control_arm_ok(self):
+        self.mock_assignment.return_value = CONTROL
+        for visit_code in [DAY03, DAY09, DAY14, WEEK04, WEEK10, WEEK24]:
+            with self.subTest(visit_code=visit_code):
+                cleaned_data = self.get_flucyt_not_applicable_cleaned_data(visit_code)
+                form_validator = StudyMedicationFollowupFormValidator(
+                    cleaned_data=cleaned_data, model=StudyMedicationMockModel
+                )
+                try:
+                    form_validator.validate()
+                except ValidationError as e:
+                    self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_control_arm_not_checked_if_assignment_unknown(self):
+        self.mock_assignment.return_value = None
+        cleaned_data = self.get_cleaned_data(visit_code=WEEK04)
+        form_validator = StudyMedicationFollowupFormValidator(
+            cleaned_data=cleaned_data, model=StudyMedicationMockModel
+        )
+        try:
+            form_validator.validate()
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_schedule_index_without_settings(self):
+        index = build_schedule_index(VISIT_DAYS)
+        self.assertTrue(all(entry.flucon_dose is None for entry in index.values()))
+        self.assertTrue(index[(INTERVENTION, WEEK24)].flucyt_applicable)
+        self.assertFalse(index[(CONTROL, DAY03)].flucyt_applicable)
+
+    def test_flucon_dose_not_checked_without_setting(self):
+        self.mock_schedule.return_value = build_schedule_index(VISIT_DAYS)
+        cleaned_data = self.get_flucyt_not_applicable_cleaned_data(DAY03)
+        cleaned_data.update(flucon_dose=800, flucon_notes="")
+        form_validator = StudyMedicationFollowupFormValidator(
+            cleaned_data=cleaned_data, model=StudyMedicationMockModel
+        )
+        try:
+            form_validator.validate()
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+
+class TestStudyMedicationScheduleCache(TestCase):
+    @patch("effect_form_validators.effect_subject.study_medication_schedule.get_visit_days")
+    def test_not_kept_until_registry_loaded(self, mock_get_visit_days):
+        mock_get_visit_days.return_value = VISIT_DAYS
+        visit_schedules = SimpleNamespace(loaded=False, visit_schedules={})
+        cache = StudyMedicationScheduleCache()
+        with patch(
+            "effect_form_validators.effect_subject.study_medication_schedule"
+            ".site_visit_schedules",
+            visit_schedules,
+        ):
+            self.assertEqual(cache.index, {})
+            mock_get_visit_days.assert_not_called()
+
+            visit_schedules.loaded = True
+            visit_schedules.visit_schedules = {"visit_schedule": None}
+            self.assertEqual(len(cache.index), len(VISIT_DAYS) * 2)
+            self.assertEqual(len(cache.index), len(VISIT_DAYS) * 2)
+            mock_get_visit_days.assert_called_once()
+
+            # rebuilt once another visit schedule is registered
+            visit_schedules.visit_schedules = {"visit_schedule": None, "other": None}
+            _ = cache.index
+            self.assertEqual(mock_get_visit_days.call_count, 2)
@@ -0,0 +1,67 @@
+from unittest import skipIf
+
+from django.test import TestCase, override_settings
+
+from effect_form_validators.effect_subject.vital_signs_grading import (
+    VitalSignThresholds,
+    get_vital_sign_thresholds,
+    grade_vital_signs,
+    np,
+)
+
+
+class TestVitalSignsGrading(TestCase):
+    def setUp(self) -> None:
+        self.thresholds = VitalSignThresholds(
+            sys_upper=180, dia_upper=110, g3_fever_lower=39.3
+        )
+
+    def test_thresholds_snapshot(self):
+        thresholds = get_vital_sign_thresholds()
+        self.assertIs(get_vital_sign_thresholds(), thresholds)
+        self.assertEqual(thresholds.sys_upper, 180)
+        self.assertEqual(thresholds.dia_upper, 110)
+        self.assertEqual(thresholds.g3_fever_lower, 39.3)
+
+    def test_thresholds_snapshot_refreshed_on_setting_changed(self):
+        thresholds = get_vital_sign_thresholds()
+        with override_settings(EFFECT_FORM_VALIDATORS_WARM_UP=True):
+            self.assertIsNot(get_vital_sign_thresholds(), thresholds)
+
+    def test_grade_scalars(self):
+        for sys, dia, temperature, expected in [
+            (120, 80, 37.0, (False, False)),
+            (180, 80, 37.0, (True, False)),
+            (179, 110, 37.0, (True, False)),
+            (179, 109, 39.2, (False, False)),
+            (120, 80, 39.3, (False, True)),
+            (120, 80, 46, (False, True)),
+            (181, 111, 40.0, (True, True)),
+            (None, None, None, (False, False)),
+            # severe HTN needs both values
+            (181, None, 37.0, (False, False)),
+            (None, 111, 37.0, (False, False)),
+        ]:
+            with self.subTest(sys=sys, dia=dia, temperature=temperature):
+                self.assertEqual(
+                    tuple(
+                        grade_vital_signs(
+                            sys=sys,
+                            dia=dia,
+                            temperature=temperature,
+                            thresholds=self.thresholds,
+                        )
+                    ),
+                    expected,
+                )
+
+    @skipIf(np is None, "numpy not installed")
+    def test_grade_arrays(self):
+        grade = grade_vital_signs(
+            sys=np.array([120, 180, 179, np.nan, 181, np.nan]),
+            dia=np.array([80, 80, 110, np.nan, np.nan, 111]),
+            temperature=np.array([37.0, 39.3, np.nan, 40.1, 37.0, 37.0]),
+            thresholds=self.thresholds,
+        )
+        self.assertEqual(grade.severe_htn.tolist(), [False, True, True, False, False, False])
+        self.assertEqual(grade.gte_g3_fever.tolist(), [False, True, False, True, False, False])
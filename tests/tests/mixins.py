@@ -2,7 +2,9 @@ from datetime import datetime
 from decimal import Decimal
 
 from dateutil.relativedelta import relativedelta
-from django.test import TestCase
+from django.db import connection, models
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import isolate_apps
 from django.utils import timezone
 from django_mock_queries.query import MockModel
 from edc_visit_schedule.constants import (
@@ -88,3 +90,67 @@ class TestCaseMixin(TestCase):
             subject_visit=self.subject_visit,
             report_datetime=report_datetime,
         )
+
+
+class IsolatedModelsTestCase(TransactionTestCase):
+    """Creates tables for the models returned by `get_models` for
+    tests of the real queries.
+
+    The models are declared outside of INSTALLED_APPS, see
+    `get_visit_models`.
+    """
+
+    @classmethod
+    def get_models(cls) -> list[type[models.Model]]:
+        return []
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.isolated_apps = isolate_apps("tests")
+        cls.isolated_apps.enable()
+        cls.models = cls.get_models()
+        with connection.schema_editor() as editor:
+            for model in cls.models:
+                editor.create_model(model)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        with connection.schema_editor() as editor:
+            for model in reversed(cls.models):
+                editor.delete_model(model)
+        cls.isolated_apps.disable()
+        super().tearDownClass()
+
+    def tearDown(self) -> None:
+        for model in reversed(self.models):
+            model.objects.all().delete()
+        super().tearDown()
+
+
+def get_visit_models() -> tuple[type[models.Model], type[models.Model]]:
+    """Returns minimal Appointment and SubjectVisit models.
+
+    Call from `IsolatedModelsTestCase.get_models`.
+    """
+
+    class Appointment(models.Model):
+        subject_identifier = models.CharField(max_length=50)
+        visit_code = models.CharField(max_length=25)
+        visit_code_sequence = models.IntegerField(default=0)
+        timepoint = models.DecimalField(max_digits=6, decimal_places=1)
+
+        class Meta:
+            app_label = "tests"
+
+    class SubjectVisit(models.Model):
+        appointment = models.OneToOneField(Appointment, on_delete=models.PROTECT)
+        subject_identifier = models.CharField(max_length=50)
+        visit_code = models.CharField(max_length=25)
+        visit_code_sequence = models.IntegerField(default=0)
+        report_datetime = models.DateTimeField()
+
+        class Meta:
+            app_label = "tests"
+
+    return Appointment, SubjectVisit
@@ -0,0 +1,86 @@
+import threading
+from unittest.mock import patch
+
+from clinicedc_constants import NO
+from django.test import TestCase, override_settings
+from edc_visit_schedule.constants import DAY01
+
+from effect_form_validators.bulk_validation import (
+    get_bulk_workers,
+    thread_map,
+    validate_rows,
+)
+
+from .effect_subject.test_vital_signs import VitalSignsFormValidator, VitalSignsMockModel
+from .mixins import TestCaseMixin
+
+
+class TestBulkValidation(TestCaseMixin, TestCase):
+    def get_cleaned_data(self, **kwargs) -> dict:
+        cleaned_data = super().get_cleaned_data(**kwargs)
+        cleaned_data.update(
+            weight=60.0,
+            weight_measured_or_est="measured",
+            sys_blood_pressure=120,
+            dia_blood_pressure=80,
+            heart_rate=60,
+            respiratory_rate=14,
+            temperature=37.0,
+            reportable_as_ae=NO,
+            patient_admitted=NO,
+        )
+        return cleaned_data
+
+    def test_validate_rows_in_order(self):
+        rows = []
+        for i in range(25):
+            cleaned_data = self.get_cleaned_data(visit_code=DAY01)
+            if i % 3 == 0:
+                cleaned_data.update(temperature=40.5)
+            rows.append(cleaned_data)
+        serial = validate_rows(
+            VitalSignsFormValidator, rows, workers=1, model=VitalSignsMockModel
+        )
+        threaded = validate_rows(
+            VitalSignsFormValidator, rows, workers=4, chunk_size=3, model=VitalSignsMockModel
+        )
+        self.assertEqual([outcome.ok for outcome in serial], [i % 3 != 0 for i in range(25)])
+        self.assertEqual(
+            [outcome.issues for outcome in threaded], [outcome.issues for outcome in serial]
+        )
+
+    @patch("effect_form_validators.bulk_validation.connections")
+    def test_thread_map_closes_worker_connections(self, mock_connections):
+        thread_names = set()
+
+        def func(item):
+            thread_names.add(threading.current_thread().name)
+            return item * 2
+
+        results = thread_map(func, range(10), workers=2, chunk_size=4)
+        self.assertEqual(results, [i * 2 for i in range(10)])
+        self.assertTrue(all(name.startswith("effect-bulk") for name in thread_names))
+        # one call per chunk
+        self.assertEqual(mock_connections.close_all.call_count, 3)
+
+    @patch("effect_form_validators.bulk_validation.connections")
+    def test_thread_map_single_worker_runs_in_calling_thread(self, mock_connections):
+        thread_names = set()
+
+        def func(item):
+            thread_names.add(threading.current_thread().name)
+            return item
+
+        self.assertEqual(thread_map(func, range(5), workers=1), list(range(5)))
+        self.assertEqual(thread_names, {threading.current_thread().name})
+        mock_connections.close_all.assert_not_called()
+
+    def test_get_bulk_workers(self):
+        with patch("effect_form_validators.bulk_validation.is_free_threaded") as mock:
+            mock.return_value = False
+            self.assertEqual(get_bulk_workers(), 1)
+            mock.return_value = True
+            with patch("effect_form_validators.bulk_validation.os.cpu_count", return_value=8):
+                self.assertEqual(get_bulk_workers(), 8)
+        with override_settings(EFFECT_FORM_VALIDATORS_BULK_WORKERS=3):
+            self.assertEqual(get_bulk_workers(), 3)
@@ -0,0 +1,179 @@
+from io import StringIO
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from edc_form_validators import INVALID_ERROR, REQUIRED_ERROR
+
+from effect_form_validators.findings_store import FindingsStore, StoredIssue
+from effect_form_validators.revalidation_store import Finding
+
+
+class TestFindingsStore(TestCase):
+    def setUp(self) -> None:
+        self.path = Path(mkdtemp())
+        self.addCleanup(rmtree, self.path)
+        self.store = FindingsStore(self.path)
+        self.temperature = Finding(
+            "effect_subject.vitalsigns",
+            "1",
+            "105-000001",
+            "VitalSignsFormValidator",
+            [("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES.")],
+        )
+        self.weight = Finding(
+            "effect_subject.vitalsigns",
+            "2",
+            "105-000002",
+            "VitalSignsFormValidator",
+            [("weight", REQUIRED_ERROR, "This field is required.")],
+        )
+        self.symptoms = Finding(
+            "effect_subject.signsandsymptoms",
+            "3",
+            "105-000001",
+            "SignsAndSymptomsFormValidator",
+            [
+                ("current_sx_other", REQUIRED_ERROR, "This field is required."),
+                ("cm_sx", None, "Invalid."),
+            ],
+        )
+
+    def test_diff(self):
+        self.assertEqual(self.store.write_run("run1", [self.temperature, self.weight]), 2)
+        self.assertEqual(self.store.write_run("run2", [self.weight, self.symptoms]), 3)
+        diff = self.store.diff("run1", "run2")
+        self.assertEqual(
+            list(self.store.iter_issues(diff.new)),
+            [
+                StoredIssue(
+                    "effect_subject.signsandsymptoms",
+                    "3",
+                    "105-000001",
+                    "SignsAndSymptomsFormValidator",
+                    "cm_sx",
+                    None,
+                    "Invalid.",
+                ),
+                StoredIssue(
+                    "effect_subject.signsandsymptoms",
+                    "3",
+                    "105-000001",
+                    "SignsAndSymptomsFormValidator",
+                    "current_sx_other",
+                    REQUIRED_ERROR,
+                    "This field is required.",
+                ),
+            ],
+        )
+        self.assertEqual([i.pk for i in self.store.iter_issues(diff.resolved)], ["1"])
+        self.assertEqual([i.pk for i in self.store.iter_issues(diff.unchanged)], ["2"])
+
+    def test_reworded_message_unchanged(self):
+        self.store.write_run("run1", [self.temperature, self.weight])
+        reworded = self.weight._replace(
+            issues=[("weight", REQUIRED_ERROR, "Required. Weigh the participant.")]
+        )
+        self.store.write_run("run2", [self.temperature, reworded])
+        diff = self.store.diff("run1", "run2")
+        self.assertEqual([len(diff.new), len(diff.resolved), len(diff.unchanged)], [0, 0, 2])
+        # the message of the new run
+        self.assertEqual(
+            [i.message for i in self.store.iter_issues(diff.unchanged)],
+            ["Invalid. Expected YES.", "Required. Weigh the participant."],
+        )
+
+    def test_iter_issues_limit(self):
+        findings = [
+            self.weight._replace(pk=str(pk), subject_identifier=f"105-{pk % 7:06d}")
+            for pk in range(50)
+        ]
+        self.store.write_run("run1", findings)
+        keys = self.store.read_keys("run1")
+        issues = list(self.store.iter_issues(keys))
+        self.assertEqual(
+            [(i.subject_identifier, i.pk) for i in issues],
+            sorted((i.subject_identifier, i.pk) for i in issues),
+        )
+        self.assertEqual(list(self.store.iter_issues(keys, limit=10)), issues[:10])
+
+    def test_dictionaries_shared_by_runs(self):
+        self.store.write_run("run1", [self.temperature, self.weight])
+        # reopened, as for a later run
+        store = FindingsStore(self.path)
+        store.append("run2", [self.weight])
+        store.append("run2", [self.temperature])
+        # no values appended for run2
+        self.assertEqual(
+            (self.path / "message.dict").read_text().splitlines(),
+            ['"Invalid. Expected YES."', '"This field is required."'],
+        )
+        self.assertEqual(len(store.dictionaries["row"].values), 2)
+        self.assertEqual(store.read_keys("run1"), store.read_keys("run2"))
+        self.assertEqual(store.runs, ["run1", "run2"])
+
+    def test_torn_record_ignored(self):
+        self.store.write_run("run1", [self.temperature, self.weight])
+        with self.store.get_run_path("run1").open("ab") as f:
+            f.write(b"\x01\x02")
+        self.assertEqual(len(self.store.read_keys("run1")), 2)
+
+    def test_torn_dictionary_line_ignored(self):
+        self.store.write_run("run1", [self.temperature])
+        with (self.path / "message.dict").open("a", encoding="utf-8") as f:
+            f.write('"This field')
+        store = FindingsStore(self.path)
+        self.assertEqual(store.dictionaries["message"].values, ["Invalid. Expected YES."])
+        # overwritten by the next flush
+        store.write_run("run2", [self.weight])
+        self.assertEqual(
+            (self.path / "message.dict").read_text().splitlines(),
+            ['"Invalid. Expected YES."', '"This field is required."'],
+        )
+        store = FindingsStore(self.path)
+        self.assertEqual(
+            [i.message for i in store.iter_issues(store.read_keys("run2"))],
+            ["This field is required."],
+        )
+
+    def test_diff_matches_set_difference(self):
+        findings = [
+            self.weight._replace(pk=str(pk), subject_identifier=f"105-{pk % 7:06d}")
+            for pk in range(300)
+        ]
+        self.store.write_run("run1", findings[:200][::-1])
+        self.store.write_run("run2", findings[100:])
+        old, new = self.store.read_keys("run1"), self.store.read_keys("run2")
+        self.assertEqual(old, sorted(old))
+        diff = self.store.diff("run1", "run2")
+        self.assertEqual(set(diff.new), set(new) - set(old))
+        self.assertEqual(set(diff.resolved), set(old) - set(new))
+        self.assertEqual(set(diff.unchanged), set(old) & set(new))
+        self.assertEqual(
+            [len(diff.new), len(diff.resolved), len(diff.unchanged)], [100, 100, 100]
+        )
+
+    def test_invalid_run(self):
+        with self.assertRaises(ValueError):
+            self.store.get_run_path("../run1")
+        with self.assertRaises(FileNotFoundError):
+            self.store.read_keys("run1")
+
+    def test_diff_findings_command(self):
+        self.store.write_run("run1", [self.temperature, self.weight])
+        self.store.write_run("run2", [self.weight, self.symptoms])
+        out = StringIO()
+        call_command(
+            "diff_findings", str(self.path), "run1", "run2", "--show", "resolved", stdout=out
+        )
+        self.assertIn("run1 -> run2: 2 new, 1 resolved, 1 unchanged", out.getvalue())
+        self.assertIn(
+            "effect_subject.vitalsigns 1 105-000001 VitalSignsFormValidator "
+            f"reportable_as_ae {INVALID_ERROR}: Invalid. Expected YES.",
+            out.getvalue(),
+        )
+        self.assertNotIn("This field is required.", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("diff_findings", str(self.path), "run1", "run3", stdout=out)
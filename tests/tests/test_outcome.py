@@ -0,0 +1,94 @@
+from clinicedc_constants import NO, YES
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from edc_form_validators import INVALID_ERROR
+from edc_visit_schedule.constants import DAY01
+
+from effect_form_validators.outcome import ValidationIssue, ValidationOutcome, validate
+
+from .effect_subject.test_vital_signs import VitalSignsFormValidator, VitalSignsMockModel
+from .mixins import TestCaseMixin
+
+
+class TestValidationOutcome(TestCaseMixin, TestCase):
+    def get_cleaned_data(self, **kwargs) -> dict:
+        cleaned_data = super().get_cleaned_data(**kwargs)
+        cleaned_data.update(
+            weight=60.0,
+            weight_measured_or_est="measured",
+            sys_blood_pressure=120,
+            dia_blood_pressure=80,
+            heart_rate=60,
+            respiratory_rate=14,
+            temperature=37.0,
+            reportable_as_ae=NO,
+            patient_admitted=NO,
+        )
+        return cleaned_data
+
+    def test_ok_outcome(self):
+        outcome = validate(
+            VitalSignsFormValidator,
+            self.get_cleaned_data(visit_code=DAY01),
+            model=VitalSignsMockModel,
+        )
+        self.assertTrue(outcome.ok)
+        self.assertTrue(outcome)
+        self.assertEqual(outcome.issues, ())
+        self.assertEqual(outcome.validator, "VitalSignsFormValidator")
+
+    def test_invalid_outcome_does_not_raise(self):
+        cleaned_data = self.get_cleaned_data(visit_code=DAY01)
+        cleaned_data.update(temperature=40.5, reportable_as_ae=NO)
+        try:
+            outcome = validate(
+                VitalSignsFormValidator, cleaned_data, model=VitalSignsMockModel
+            )
+        except ValidationError as e:
+            self.fail(f"ValidationError unexpectedly raised. Got {e}")
+        self.assertFalse(outcome.ok)
+        self.assertEqual(len(outcome.issues), 1)
+        issue = outcome.issues[0]
+        self.assertEqual(issue.field, "reportable_as_ae")
+        self.assertEqual(issue.code, INVALID_ERROR)
+        self.assertIn("Participant has G3 or higher fever", issue.message)
+
+    def test_outcome_matches_form_path(self):
+        cleaned_data = self.get_cleaned_data(visit_code=DAY01)
+        cleaned_data.update(sys_blood_pressure=None)
+        outcome = validate(VitalSignsFormValidator, cleaned_data, model=VitalSignsMockModel)
+        form_validator = VitalSignsFormValidator(
+            cleaned_data=cleaned_data, model=VitalSignsMockModel
+        )
+        with self.assertRaises(ValidationError) as cm:
+            form_validator.validate()
+        self.assertEqual(
+            [issue.field for issue in outcome.issues], list(cm.exception.error_dict)
+        )
+        with self.assertRaises(ValidationError) as cm:
+            outcome.raise_if_invalid()
+        self.assertIn("sys_blood_pressure", cm.exception.error_dict)
+
+    def test_issue_is_compact(self):
+        issue = ValidationIssue("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES.")
+        self.assertFalse(hasattr(issue, "__dict__"))
+        self.assertEqual(
+            issue, ValidationIssue("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES.")
+        )
+        self.assertEqual(
+            issue.as_tuple(), ("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES.")
+        )
+
+    def test_non_field_error(self):
+        outcome = ValidationOutcome.from_validation_error(
+            "MyFormValidator", ValidationError("Bad form", code=INVALID_ERROR)
+        )
+        self.assertEqual(outcome.issues[0].field, "__all__")
+        self.assertEqual(outcome.issues[0].code, INVALID_ERROR)
+        self.assertEqual(outcome.issues[0].message, "Bad form")
+
+    def test_reportable_yes_ok(self):
+        cleaned_data = self.get_cleaned_data(visit_code=DAY01)
+        cleaned_data.update(temperature=40.5, reportable_as_ae=YES)
+        outcome = validate(VitalSignsFormValidator, cleaned_data, model=VitalSignsMockModel)
+        self.assertTrue(outcome.ok)
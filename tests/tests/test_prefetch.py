@@ -0,0 +1,356 @@
+from datetime import date
+from decimal import Decimal
+from functools import cached_property
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from clinicedc_constants import CONTROL, INTERVENTION
+from django.db import models
+from django.test import TestCase
+from django.utils import timezone
+from edc_randomization.exceptions import NotRegistered
+
+from effect_form_validators.effect_reports import SerumCragDateNoteFormValidator
+from effect_form_validators.effect_subject import (
+    ArvHistoryFormValidator,
+    ChestXrayFormValidator,
+    FlucytMissedDosesFormValidator,
+    StudyMedicationBaselineFormValidator,
+    StudyMedicationFollowupFormValidator,
+    VitalSignsFormValidator,
+)
+from effect_form_validators.prefetch import (
+    ASSIGNMENT,
+    ASSIGNMENT_DESCRIPTION,
+    REGISTERED_SUBJECT_SCREENING,
+    SUBJECT_HISTORY,
+    SUBJECT_SCREENING,
+    VITAL_SIGNS_WEIGHT,
+    apply_snapshot,
+    get_assignments,
+    get_data_requirements,
+    loaders,
+    prefetch,
+)
+
+from .mixins import IsolatedModelsTestCase, get_visit_models
+
+
+class DummyFormValidator:
+    data_requirements = {"subject_screening": "dummy"}  # noqa: RUF012
+
+    def __init__(self):
+        self.lookups = 0
+
+    @cached_property
+    def subject_screening(self):
+        self.lookups += 1
+        return "looked up"
+
+
+class TestPrefetch(TestCase):
+    def setUp(self) -> None:
+        self.loader = MagicMock(side_effect=lambda ids, *_: {s: f"screening {s}" for s in ids})
+        patcher = patch.dict(loaders, {"dummy": self.loader})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_declared_requirements(self):
+        self.assertEqual(
+            get_data_requirements(ArvHistoryFormValidator),
+            {"subject_screening": SUBJECT_SCREENING},
+        )
+        self.assertEqual(
+            get_data_requirements(SerumCragDateNoteFormValidator),
+            {"subject_screening": REGISTERED_SUBJECT_SCREENING},
+        )
+        self.assertEqual(
+            get_data_requirements(FlucytMissedDosesFormValidator),
+            {"assignment": ASSIGNMENT, "assignment_description": ASSIGNMENT_DESCRIPTION},
+        )
+        self.assertEqual(
+            get_data_requirements(StudyMedicationFollowupFormValidator),
+            {"assignment": ASSIGNMENT},
+        )
+        self.assertEqual(
+            get_data_requirements(ChestXrayFormValidator), {"subject_history": SUBJECT_HISTORY}
+        )
+        self.assertEqual(
+            get_data_requirements(StudyMedicationBaselineFormValidator),
+            {"vital_signs_weight": VITAL_SIGNS_WEIGHT},
+        )
+        self.assertEqual(get_data_requirements(VitalSignsFormValidator), {})
+        for form_validator_cls in [
+            ArvHistoryFormValidator,
+            SerumCragDateNoteFormValidator,
+            FlucytMissedDosesFormValidator,
+            StudyMedicationBaselineFormValidator,
+            StudyMedicationFollowupFormValidator,
+            ChestXrayFormValidator,
+        ]:
+            with self.subTest(form_validator_cls=form_validator_cls):
+                for loader_name in get_data_requirements(form_validator_cls).values():
+                    self.assertIn(loader_name, loaders)
+
+    def test_one_load_per_batch(self):
+        subject_identifiers = [f"subject-{i}" for i in range(100)]
+        snapshot = prefetch(DummyFormValidator, [*subject_identifiers, None, "subject-0"])
+        self.loader.assert_called_once()
+        self.assertEqual(self.loader.call_args.args[0], sorted(subject_identifiers))
+        self.assertEqual(len(snapshot["subject_screening"]), 100)
+        self.assertEqual(prefetch(DummyFormValidator, [None]), {})
+
+    def test_apply_snapshot(self):
+        snapshot = prefetch(DummyFormValidator, ["subject-1"])
+
+        form_validator = apply_snapshot(DummyFormValidator(), snapshot, "subject-1")
+        self.assertEqual(form_validator.subject_screening, "screening subject-1")
+        self.assertEqual(form_validator.lookups, 0)
+
+        # not in the snapshot, falls back to the validator's own lookup
+        form_validator = apply_snapshot(DummyFormValidator(), snapshot, "subject-2")
+        self.assertEqual(form_validator.subject_screening, "looked up")
+        self.assertEqual(form_validator.lookups, 1)
+
+
+class TestLoaders(IsolatedModelsTestCase):
+    """Tests the registered loaders against the database."""
+
+    @classmethod
+    def get_models(cls) -> list[type[models.Model]]:
+        cls.appointment_model, cls.subject_visit_model = get_visit_models()
+
+        class StudyMedication(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+
+            class Meta:
+                app_label = "tests"
+
+            @classmethod
+            def related_visit_model_attr(cls) -> str:
+                return "subject_visit"
+
+        class VitalSigns(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+            weight = models.DecimalField(max_digits=5, decimal_places=1, null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class ChestXray(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+            chest_xray_date = models.DateField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+            @classmethod
+            def related_visit_model_attr(cls) -> str:
+                return "subject_visit"
+
+        class SubjectScreening(models.Model):
+            screening_identifier = models.CharField(max_length=50, unique=True)
+            subject_identifier = models.CharField(max_length=50, blank=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class RegisteredSubject(models.Model):
+            subject_identifier = models.CharField(max_length=50, unique=True)
+            screening_identifier = models.CharField(max_length=50)
+
+            class Meta:
+                app_label = "tests"
+
+        class RandomizationList(models.Model):
+            subject_identifier = models.CharField(max_length=50, blank=True)
+            assignment = models.CharField(max_length=25)
+
+            class Meta:
+                app_label = "tests"
+
+        cls.study_medication_model = StudyMedication
+        cls.vital_signs_model = VitalSigns
+        cls.chest_xray_model = ChestXray
+        cls.subject_screening_model = SubjectScreening
+        cls.registered_subject_model = RegisteredSubject
+        cls.randomization_list_model = RandomizationList
+        return [
+            cls.appointment_model,
+            cls.subject_visit_model,
+            StudyMedication,
+            VitalSigns,
+            ChestXray,
+            SubjectScreening,
+            RegisteredSubject,
+            RandomizationList,
+        ]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.randomizer = SimpleNamespace(
+            model_cls=lambda: self.randomization_list_model,
+            assignment_description_map={
+                CONTROL: "Fluconazole alone",
+                INTERVENTION: "Fluconazole and flucytosine",
+            },
+        )
+        for target, return_value in [
+            (
+                "edc_screening.utils.get_subject_screening_model_cls",
+                self.subject_screening_model,
+            ),
+            (
+                "edc_registration.get_registered_subject_model_cls",
+                self.registered_subject_model,
+            ),
+        ]:
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_subject_visit(
+        self, subject_identifier: str, visit_code: str = "1000", timepoint: int = 0
+    ) -> models.Model:
+        appointment = self.appointment_model.objects.create(
+            subject_identifier=subject_identifier, visit_code=visit_code, timepoint=timepoint
+        )
+        return self.subject_visit_model.objects.create(
+            appointment=appointment,
+            subject_identifier=subject_identifier,
+            visit_code=visit_code,
+            report_datetime=timezone.now(),
+        )
+
+    def test_vital_signs_weights(self):
+        baseline = self.get_subject_visit("subject-1")
+        followup = self.get_subject_visit("subject-1", "1014", 14)
+        self.study_medication_model.objects.create(subject_visit=baseline)
+        self.vital_signs_model.objects.create(subject_visit=baseline, weight=Decimal("45.5"))
+        self.vital_signs_model.objects.create(subject_visit=followup, weight=Decimal("48.0"))
+        # study medication reported, vital signs not
+        self.study_medication_model.objects.create(
+            subject_visit=self.get_subject_visit("subject-2")
+        )
+        with (
+            patch(
+                "effect_form_validators.prefetch.django_apps.get_model",
+                return_value=self.vital_signs_model,
+            ),
+            self.assertNumQueries(1),
+        ):
+            weights = loaders[VITAL_SIGNS_WEIGHT](
+                ["subject-1", "subject-2", "subject-3"],
+                StudyMedicationBaselineFormValidator,
+                self.study_medication_model,
+            )
+        self.assertEqual(
+            weights, {"subject-1": Decimal("45.5"), "subject-2": None, "subject-3": None}
+        )
+
+    def test_subject_screenings(self):
+        screening = self.subject_screening_model.objects.create(
+            screening_identifier="S1", subject_identifier="subject-1"
+        )
+        # screened, not consented
+        self.subject_screening_model.objects.create(screening_identifier="S2")
+        with self.assertNumQueries(1):
+            screenings = loaders[SUBJECT_SCREENING](
+                ["subject-1", "subject-2"], ArvHistoryFormValidator, None
+            )
+        self.assertEqual(screenings, {"subject-1": screening})
+
+    def test_registered_subject_screenings(self):
+        screening = self.subject_screening_model.objects.create(
+            screening_identifier="S1", subject_identifier="subject-1"
+        )
+        self.registered_subject_model.objects.create(
+            subject_identifier="subject-1", screening_identifier="S1"
+        )
+        # registered, screening not found
+        self.registered_subject_model.objects.create(
+            subject_identifier="subject-2", screening_identifier="S2"
+        )
+        with self.assertNumQueries(2):
+            screenings = loaders[REGISTERED_SUBJECT_SCREENING](
+                ["subject-1", "subject-2", "subject-3"], SerumCragDateNoteFormValidator, None
+            )
+        self.assertEqual(screenings, {"subject-1": screening})
+
+    def test_assignments(self):
+        self.randomization_list_model.objects.create(
+            subject_identifier="subject-1", assignment=INTERVENTION
+        )
+        self.randomization_list_model.objects.create(
+            subject_identifier="subject-2", assignment=CONTROL
+        )
+        self.randomization_list_model.objects.create(assignment=CONTROL)
+        subject_identifiers = ["subject-1", "subject-2", "subject-3"]
+        with (
+            patch(
+                "edc_randomization.site_randomizers.site_randomizers.get",
+                return_value=self.randomizer,
+            ) as mock_get,
+            self.assertNumQueries(2),
+        ):
+            assignments = loaders[ASSIGNMENT](
+                subject_identifiers, FlucytMissedDosesFormValidator, None
+            )
+            descriptions = loaders[ASSIGNMENT_DESCRIPTION](
+                subject_identifiers, FlucytMissedDosesFormValidator, None
+            )
+        mock_get.assert_called_with(FlucytMissedDosesFormValidator.randomizer_name)
+        self.assertEqual(assignments, {"subject-1": INTERVENTION, "subject-2": CONTROL})
+        self.assertEqual(
+            descriptions,
+            {"subject-1": "Fluconazole and flucytosine", "subject-2": "Fluconazole alone"},
+        )
+
+    def test_assignments_randomizer_not_registered(self):
+        self.randomization_list_model.objects.create(
+            subject_identifier="subject-1", assignment=INTERVENTION
+        )
+        with (
+            patch(
+                "edc_randomization.site_randomizers.site_randomizers.get",
+                side_effect=NotRegistered("Randomizer not registered."),
+            ),
+            self.assertNumQueries(0),
+        ):
+            self.assertEqual(get_assignments(["subject-1"], "default"), {})
+            self.assertEqual(
+                loaders[ASSIGNMENT_DESCRIPTION](
+                    ["subject-1"], FlucytMissedDosesFormValidator, None
+                ),
+                {},
+            )
+
+    def test_subject_histories(self):
+        baseline = self.get_subject_visit("subject-1")
+        followup = self.get_subject_visit("subject-1", "1014", 14)
+        self.chest_xray_model.objects.create(
+            subject_visit=followup, chest_xray_date=date(2024, 6, 14)
+        )
+        self.chest_xray_model.objects.create(
+            subject_visit=baseline, chest_xray_date=date(2024, 6, 1)
+        )
+        self.chest_xray_model.objects.create(subject_visit=self.get_subject_visit("subject-2"))
+        with self.assertNumQueries(1):
+            histories = loaders[SUBJECT_HISTORY](
+                ["subject-1", "subject-2", "subject-3"],
+                ChestXrayFormValidator,
+                self.chest_xray_model,
+            )
+        self.assertEqual(list(histories), ["subject-1", "subject-2", "subject-3"])
+        self.assertEqual(
+            histories["subject-1"].values["chest_xray_date"],
+            [date(2024, 6, 1), date(2024, 6, 14)],
+        )
+        self.assertEqual(histories["subject-2"].values["chest_xray_date"], [None])
+        self.assertEqual(len(histories["subject-3"]), 0)
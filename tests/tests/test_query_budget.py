@@ -0,0 +1,357 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from clinicedc_constants import CONFIRMED, CONTROL, INTERVENTION, NORMAL, REFUSED, YES
+from clinicedc_tests.mixins import FormValidatorTestMixin
+from dateutil.relativedelta import relativedelta
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_mock_queries.query import MockModel, MockSet
+from edc_randomization.site_randomizers import site_randomizers
+
+from effect_form_validators.effect_reports import SerumCragDateNoteFormValidator
+from effect_form_validators.effect_subject import (
+    ArvHistoryFormValidator,
+    ChestXrayFormValidator,
+    ClinicalNoteFormValidator,
+    FlucytMissedDosesFormValidator,
+    VitalSignsFormValidator,
+)
+from effect_form_validators.query_budget import QueryBudgetTestMixin, get_query_budget
+from effect_form_validators.subject_history import subject_histories
+
+from .effect_subject.test_arv_history import ArvHistoryMockModel, TestArvHistoryFormValidator
+from .mixins import IsolatedModelsTestCase, get_visit_models
+from .mock_models import AdherenceMockModel, FlucytMissedDosesMockModel
+
+
+class TestClinicalNoteFormValidator(FormValidatorTestMixin, ClinicalNoteFormValidator):
+    pass
+
+
+class QueryingFormValidator(TestClinicalNoteFormValidator):
+    def clean(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        super().clean()
+
+
+class QueryingTestFormValidator(QueryBudgetTestMixin, QueryingFormValidator):
+    pass
+
+
+class BaseCheckQueryingFormValidator(ClinicalNoteFormValidator):
+    def validate_crf_report_datetime(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+
+class TestQueryBudget(TestCase):
+    logger_name = "effect_form_validators.query_budget"
+
+    def get_form_validator(self, form_validator_cls, **cleaned_data):
+        return form_validator_cls(
+            cleaned_data={"report_datetime": timezone.now(), **cleaned_data},
+            model=MockModel,
+        )
+
+    def test_declared_budgets(self):
+        self.assertEqual(get_query_budget(ClinicalNoteFormValidator), 0)
+        self.assertEqual(get_query_budget(ArvHistoryFormValidator), 1)
+        self.assertEqual(get_query_budget(FlucytMissedDosesFormValidator), 2)
+        self.assertEqual(get_query_budget(ChestXrayFormValidator), 3)
+        self.assertIsNone(get_query_budget(VitalSignsFormValidator))
+
+    def test_test_mixin_fails_over_budget(self):
+        form_validator = self.get_form_validator(QueryingTestFormValidator)
+        with self.assertRaises(AssertionError) as cm:
+            form_validator.validate()
+        self.assertIn("ran 1 queries, budget is 0", str(cm.exception))
+        self.assertIn("SELECT 1", str(cm.exception))
+
+        # also if the validation itself fails
+        form_validator = self.get_form_validator(QueryingTestFormValidator, has_comment=YES)
+        with self.assertRaises(AssertionError):
+            form_validator.validate()
+
+    def test_test_mixin_within_budget(self):
+        class TestFormValidator(QueryBudgetTestMixin, TestClinicalNoteFormValidator):
+            pass
+
+        try:
+            self.get_form_validator(TestFormValidator).validate()
+        except (AssertionError, ValidationError) as e:
+            self.fail(f"Exception unexpectedly raised. Got {e}")
+
+    def test_no_warning_by_default(self):
+        with self.assertNoLogs(self.logger_name):
+            self.get_form_validator(QueryingFormValidator).validate()
+
+    @override_settings(EFFECT_FORM_VALIDATORS_QUERY_BUDGET_WARN=True)
+    def test_warns_over_budget(self):
+        with self.assertLogs(self.logger_name, "WARNING") as cm:
+            self.get_form_validator(QueryingFormValidator).validate()
+        record = cm.records[0]
+        self.assertEqual(record.form_validator, "QueryingFormValidator")
+        self.assertEqual(record.queries, 1)
+        self.assertEqual(record.query_budget, 0)
+
+        with self.assertNoLogs(self.logger_name):
+            self.get_form_validator(TestClinicalNoteFormValidator).validate()
+
+    @override_settings(EFFECT_FORM_VALIDATORS_QUERY_BUDGET_WARN=True)
+    def test_base_checks_not_counted(self):
+        class TestFormValidator(QueryBudgetTestMixin, BaseCheckQueryingFormValidator):
+            pass
+
+        with self.assertNoLogs(self.logger_name):
+            self.get_form_validator(TestFormValidator).validate()
+
+        # both the test mixin and the warning count the rules
+        with self.assertLogs(self.logger_name, "WARNING"), self.assertRaises(AssertionError):
+            self.get_form_validator(QueryingTestFormValidator).validate()
+
+
+class TestQueryBudgetsOnDatabase(IsolatedModelsTestCase):
+    """Asserts the declared budgets are the queries the validators'
+    rules run against database rows.
+
+    The base checks are stubbed; they are not counted.
+    """
+
+    @classmethod
+    def get_models(cls) -> list[type[models.Model]]:
+        cls.appointment_model, cls.subject_visit_model = get_visit_models()
+
+        class SignsAndSymptoms(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+            xray_performed = models.CharField(max_length=15)
+
+            class Meta:
+                app_label = "tests"
+
+        class ChestXray(models.Model):
+            subject_visit = models.OneToOneField(
+                cls.subject_visit_model, on_delete=models.PROTECT
+            )
+            chest_xray_date = models.DateField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+            @classmethod
+            def related_visit_model_attr(cls) -> str:
+                return "subject_visit"
+
+        class SubjectScreening(models.Model):
+            screening_identifier = models.CharField(max_length=50, unique=True)
+            subject_identifier = models.CharField(max_length=50)
+            cd4_value = models.IntegerField(null=True)
+            cd4_date = models.DateField(null=True)
+            eligibility_datetime = models.DateTimeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class RegisteredSubject(models.Model):
+            subject_identifier = models.CharField(max_length=50, unique=True)
+            screening_identifier = models.CharField(max_length=50)
+
+            class Meta:
+                app_label = "tests"
+
+        class SubjectConsent(models.Model):
+            subject_identifier = models.CharField(max_length=50, unique=True)
+            consent_datetime = models.DateTimeField()
+
+            class Meta:
+                app_label = "tests"
+
+        class RandomizationList(models.Model):
+            subject_identifier = models.CharField(max_length=50)
+            assignment = models.CharField(max_length=25)
+            randomizer_name = models.CharField(max_length=50)
+            allocated = models.BooleanField(default=False)
+            allocated_datetime = models.DateTimeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        cls.signs_and_symptoms_model = SignsAndSymptoms
+        cls.chest_xray_model = ChestXray
+        cls.subject_screening_model = SubjectScreening
+        cls.registered_subject_model = RegisteredSubject
+        cls.subject_consent_model = SubjectConsent
+        cls.randomization_list_model = RandomizationList
+        return [
+            cls.appointment_model,
+            cls.subject_visit_model,
+            SignsAndSymptoms,
+            ChestXray,
+            SubjectScreening,
+            RegisteredSubject,
+            SubjectConsent,
+            RandomizationList,
+        ]
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.subject_identifier = "12345"
+        self.consent_datetime = timezone.now() - relativedelta(years=1)
+        self.subject_screening = self.subject_screening_model.objects.create(
+            screening_identifier="S12345",
+            subject_identifier=self.subject_identifier,
+            cd4_value=80,
+            cd4_date=(self.consent_datetime - relativedelta(days=7)).date(),
+            eligibility_datetime=self.consent_datetime,
+        )
+        self.registered_subject_model.objects.create(
+            subject_identifier=self.subject_identifier, screening_identifier="S12345"
+        )
+        self.subject_consent_model.objects.create(
+            subject_identifier=self.subject_identifier, consent_datetime=self.consent_datetime
+        )
+        appointment = self.appointment_model.objects.create(
+            subject_identifier=self.subject_identifier, visit_code="1000", timepoint=Decimal(0)
+        )
+        self.subject_visit = self.subject_visit_model.objects.create(
+            appointment=appointment,
+            subject_identifier=self.subject_identifier,
+            visit_code="1000",
+            report_datetime=self.consent_datetime,
+        )
+
+    def assert_budget_spent(self, form_validator) -> None:
+        """Asserts the validation passes using exactly its budget."""
+        with self.assertNumQueries(get_query_budget(form_validator.__class__)):
+            try:
+                form_validator.validate()
+            except ValidationError as e:
+                self.fail(f"ValidationError unexpectedly raised. Got {e}")
+
+    def test_arv_history(self):
+        class TestFormValidator(
+            QueryBudgetTestMixin, FormValidatorTestMixin, ArvHistoryFormValidator
+        ):
+            pass
+
+        test_case = TestArvHistoryFormValidator()
+        test_case.setUp()
+        cleaned_data = test_case.get_cleaned_data()
+        cleaned_data.update(subject_visit=self.subject_visit)
+        with patch(
+            "effect_form_validators.effect_subject.arv_history_form_validator."
+            "get_subject_screening_model_cls",
+            return_value=self.subject_screening_model,
+        ):
+            self.assert_budget_spent(
+                TestFormValidator(cleaned_data=cleaned_data, model=ArvHistoryMockModel)
+            )
+
+    def test_serum_crag_date_note(self):
+        class TestFormValidator(
+            QueryBudgetTestMixin, FormValidatorTestMixin, SerumCragDateNoteFormValidator
+        ):
+            pass
+
+        module = "effect_form_validators.effect_reports.serum_crag_date_note_form_validator"
+        with (
+            patch(
+                f"{module}.get_subject_screening_model_cls",
+                return_value=self.subject_screening_model,
+            ),
+            patch(
+                f"{module}.get_registered_subject_model_cls",
+                return_value=self.registered_subject_model,
+            ),
+        ):
+            self.assert_budget_spent(
+                TestFormValidator(
+                    cleaned_data=dict(
+                        serum_crag_date=(
+                            self.consent_datetime - relativedelta(days=14)
+                        ).date(),
+                        note="",
+                        status=CONFIRMED,
+                        subject_identifier=self.subject_identifier,
+                        report_datetime=timezone.now(),
+                    )
+                )
+            )
+
+    def test_flucyt_missed_doses(self):
+        class TestFormValidator(QueryBudgetTestMixin, FlucytMissedDosesFormValidator):
+            pass
+
+        self.randomization_list_model.objects.create(
+            subject_identifier=self.subject_identifier,
+            assignment=INTERVENTION,
+            randomizer_name=TestFormValidator.randomizer_name,
+            allocated=True,
+            allocated_datetime=self.consent_datetime,
+        )
+        randomizer = SimpleNamespace(
+            model_cls=lambda: self.randomization_list_model,
+            assignment_description_map={
+                CONTROL: "Fluconazole alone",
+                INTERVENTION: "Fluconazole and flucytosine",
+            },
+        )
+        with patch.object(site_randomizers, "get", return_value=randomizer):
+            self.assert_budget_spent(
+                TestFormValidator(
+                    cleaned_data=dict(
+                        adherence=AdherenceMockModel(
+                            subject_identifier=self.subject_identifier
+                        ),
+                        day_missed=1,
+                        doses_missed=1,
+                        missed_reason=REFUSED,
+                        missed_reason_other="",
+                    ),
+                    model=FlucytMissedDosesMockModel,
+                )
+            )
+
+    def test_chest_xray(self):
+        subject_consent_model = self.subject_consent_model
+
+        class TestFormValidator(
+            QueryBudgetTestMixin, FormValidatorTestMixin, ChestXrayFormValidator
+        ):
+            def get_consent_datetime_or_raise(self, **kwargs) -> datetime:  # noqa: ARG002
+                return subject_consent_model.objects.get(
+                    subject_identifier=self.subject_identifier
+                ).consent_datetime
+
+        self.addCleanup(subject_histories.clear)
+        self.signs_and_symptoms_model.objects.create(
+            subject_visit=self.subject_visit, xray_performed=YES
+        )
+        # not the instance cached on create; the appointment is loaded
+        # by the window period check, before the rules run
+        self.subject_visit = self.subject_visit_model.objects.select_related(
+            "appointment"
+        ).get(pk=self.subject_visit.pk)
+        self.assert_budget_spent(
+            TestFormValidator(
+                cleaned_data=dict(
+                    subject_visit=self.subject_visit,
+                    report_datetime=self.consent_datetime,
+                    chest_xray=YES,
+                    chest_xray_date=self.consent_datetime.date(),
+                    chest_xray_results=MockSet(
+                        MockModel(mock_name="XrayResults", name=NORMAL, display_name=NORMAL)
+                    ),
+                    chest_xray_results_other=None,
+                ),
+                instance=self.chest_xray_model(subject_visit=self.subject_visit),
+                model=self.chest_xray_model,
+            )
+        )
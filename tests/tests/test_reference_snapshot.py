@@ -0,0 +1,319 @@
+from datetime import UTC, date, datetime
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp, mkstemp
+from types import SimpleNamespace
+from unittest import skipIf
+from unittest.mock import patch
+
+from clinicedc_constants import CONTROL, INTERVENTION
+from django.db import models
+from django.test import TestCase, override_settings
+
+from effect_form_validators.prefetch import (
+    ASSIGNMENT,
+    REGISTERED_SUBJECT_SCREENING,
+    SUBJECT_SCREENING,
+    loaders,
+    prefetch,
+    snapshot_loaders,
+)
+from effect_form_validators.reference_snapshot import (
+    ReferenceRow,
+    ReferenceSnapshot,
+    get_reference_rows,
+    get_reference_snapshot,
+    np,
+    write_reference_snapshot,
+)
+
+from .mixins import IsolatedModelsTestCase
+
+
+@skipIf(np is None, "numpy not installed")
+class TestReferenceSnapshot(TestCase):
+    def setUp(self) -> None:
+        tmpdir = mkdtemp()
+        self.addCleanup(rmtree, tmpdir, ignore_errors=True)
+        self.path = Path(tmpdir) / "reference.npy"
+        self.rows = [
+            ReferenceRow(
+                "105-10-0002-3",
+                date(2024, 5, 2),
+                85,
+                datetime(2024, 5, 3, 8, 30, tzinfo=UTC),
+                datetime(2024, 5, 3, 9, 15, tzinfo=UTC),
+                CONTROL,
+            ),
+            ReferenceRow(
+                "105-10-0001-5",
+                date(2024, 5, 1),
+                None,
+                datetime(2024, 5, 1, 10, 0, tzinfo=UTC),
+                None,
+                INTERVENTION,
+            ),
+            ReferenceRow("105-20-0001-1", None, 40, None, None, None),
+        ]
+        write_reference_snapshot(self.path, self.rows)
+
+    def test_lookup(self):
+        snapshot = ReferenceSnapshot(self.path)
+        self.assertEqual(len(snapshot), 3)
+        self.assertIsInstance(snapshot.data, np.memmap)
+        for row in self.rows:
+            with self.subTest(subject_identifier=row.subject_identifier):
+                self.assertIn(row.subject_identifier, snapshot)
+                self.assertEqual(snapshot.get(row.subject_identifier), row)
+        self.assertNotIn("105-10-0003-1", snapshot)
+        self.assertIsNone(snapshot.get("105-10-0003-1"))
+        self.assertIsNone(snapshot.get("999"))
+
+    def test_indices(self):
+        snapshot = ReferenceSnapshot(self.path)
+        indices = snapshot.get_indices(
+            ["105-20-0001-1", "105-10-0001-5", "105-10-0003-1", "999"]
+        )
+        self.assertEqual(indices.tolist(), [2, 0, -1, -1])
+        self.assertEqual(snapshot.data["cd4_value"][indices[:2]].tolist(), [40, -1])
+
+    def test_rewrite_keeps_open_mapping(self):
+        snapshot = ReferenceSnapshot(self.path)
+        write_reference_snapshot(self.path, self.rows[:1])
+        self.assertEqual(len(snapshot), 3)
+        self.assertEqual(len(ReferenceSnapshot(self.path)), 1)
+
+    def test_long_identifier_not_truncated(self):
+        subject_identifier = "105-10-0001-5-0123456789"
+        self.assertEqual(len(subject_identifier), 24)
+        write_reference_snapshot(
+            self.path, [ReferenceRow(subject_identifier, None, 40, None, None, None)]
+        )
+        snapshot = ReferenceSnapshot(self.path)
+        self.assertIn(subject_identifier, snapshot)
+        self.assertNotIn(f"{subject_identifier}9", snapshot)
+        self.assertEqual(
+            snapshot.get_indices([f"{subject_identifier}9", subject_identifier]).tolist(),
+            [-1, 0],
+        )
+
+    def test_values_too_long_rejected(self):
+        for row in [
+            ReferenceRow("105-10-0001-5-01234567890", None, None, None, None, None),
+            ReferenceRow("105-10-0001-5", None, None, None, None, "intervention-arm-2"),
+        ]:
+            with self.subTest(row=row), self.assertRaises(ValueError):
+                write_reference_snapshot(self.path, [row])
+        # nothing written
+        self.assertEqual(len(ReferenceSnapshot(self.path)), 3)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_unique_temporary_files(self):
+        tmp_names = []
+
+        def wrapped_mkstemp(**kwargs):
+            fd, tmp_name = mkstemp(**kwargs)
+            tmp_names.append(tmp_name)
+            return fd, tmp_name
+
+        with patch("effect_form_validators.reference_snapshot.mkstemp", wrapped_mkstemp):
+            write_reference_snapshot(self.path, self.rows)
+            write_reference_snapshot(self.path, self.rows)
+            with (
+                patch(
+                    "effect_form_validators.reference_snapshot.np.save", side_effect=OSError
+                ),
+                self.assertRaises(OSError),
+            ):
+                write_reference_snapshot(self.path, self.rows)
+        self.assertEqual(len(set(tmp_names)), 3)
+        for tmp_name in tmp_names:
+            self.assertEqual(Path(tmp_name).parent, self.path.parent)
+        # moved into place or removed
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_from_settings(self):
+        self.assertIsNone(get_reference_snapshot())
+        with override_settings(EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT=str(self.path)):
+            snapshot = get_reference_snapshot()
+            self.assertEqual(len(snapshot), 3)
+            self.assertIs(get_reference_snapshot(), snapshot)
+            # replaced by another process
+            write_reference_snapshot(self.path, self.rows[:1])
+            self.assertEqual(len(get_reference_snapshot()), 1)
+            self.assertEqual(len(snapshot), 3)
+        self.assertIsNone(get_reference_snapshot())
+
+
+@skipIf(np is None, "numpy not installed")
+class TestReferenceRows(IsolatedModelsTestCase):
+    """Tests the export of reference rows from the database."""
+
+    @classmethod
+    def get_models(cls) -> list[type[models.Model]]:
+        class SubjectScreening(models.Model):
+            screening_identifier = models.CharField(max_length=50, blank=True)
+            subject_identifier = models.CharField(max_length=50, null=True)  # noqa: DJ001
+            cd4_date = models.DateField(null=True)
+            cd4_value = models.IntegerField(null=True)
+            eligibility_datetime = models.DateTimeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class RegisteredSubject(models.Model):
+            screening_identifier = models.CharField(max_length=50, blank=True)
+            subject_identifier = models.CharField(max_length=50, unique=True)
+            consent_datetime = models.DateTimeField(null=True)
+
+            class Meta:
+                app_label = "tests"
+
+        class RandomizationList(models.Model):
+            subject_identifier = models.CharField(max_length=50, blank=True)
+            assignment = models.CharField(max_length=25)
+
+            class Meta:
+                app_label = "tests"
+
+        cls.subject_screening_model = SubjectScreening
+        cls.registered_subject_model = RegisteredSubject
+        cls.randomization_list_model = RandomizationList
+        return [SubjectScreening, RegisteredSubject, RandomizationList]
+
+    def setUp(self) -> None:
+        super().setUp()
+        for target, return_value in [
+            (
+                "edc_screening.utils.get_subject_screening_model_cls",
+                self.subject_screening_model,
+            ),
+            (
+                "edc_registration.get_registered_subject_model_cls",
+                self.registered_subject_model,
+            ),
+        ]:
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch(
+            "edc_randomization.site_randomizers.site_randomizers.get",
+            return_value=SimpleNamespace(model_cls=lambda: self.randomization_list_model),
+        )
+        self.mock_get_randomizer = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_rows_round_trip(self):
+        eligibility_datetime = datetime(2024, 5, 1, 10, 0, tzinfo=UTC)
+        consent_datetime = datetime(2024, 5, 1, 11, 30, tzinfo=UTC)
+        self.subject_screening_model.objects.create(
+            subject_identifier="105-10-0001-5",
+            cd4_date=date(2024, 4, 28),
+            cd4_value=85,
+            eligibility_datetime=eligibility_datetime,
+        )
+        self.subject_screening_model.objects.create(
+            subject_identifier="105-10-0002-3", eligibility_datetime=eligibility_datetime
+        )
+        # screened, not consented
+        self.subject_screening_model.objects.create(eligibility_datetime=eligibility_datetime)
+        self.registered_subject_model.objects.create(
+            subject_identifier="105-10-0001-5", consent_datetime=consent_datetime
+        )
+        self.randomization_list_model.objects.create(
+            subject_identifier="105-10-0001-5", assignment=INTERVENTION
+        )
+        self.randomization_list_model.objects.create(assignment=CONTROL)
+
+        with self.assertNumQueries(3):
+            rows = get_reference_rows(randomizer_name="effect")
+        self.mock_get_randomizer.assert_called_once_with("effect")
+        expected = [
+            ReferenceRow(
+                "105-10-0001-5",
+                date(2024, 4, 28),
+                85,
+                eligibility_datetime,
+                consent_datetime,
+                INTERVENTION,
+            ),
+            ReferenceRow("105-10-0002-3", None, None, eligibility_datetime, None, None),
+        ]
+        self.assertEqual(sorted(rows), expected)
+        self.assertEqual(get_reference_rows(["105-10-0002-3"]), expected[1:])
+
+        tmpdir = mkdtemp()
+        self.addCleanup(rmtree, tmpdir, ignore_errors=True)
+        path = write_reference_snapshot(Path(tmpdir) / "reference.npy", rows)
+        snapshot = ReferenceSnapshot(path)
+        self.assertEqual([snapshot.get(row.subject_identifier) for row in expected], expected)
+
+    def test_snapshot_loaders_match_orm_loaders(self):
+        for i, (cd4_value, assignment) in enumerate(
+            [(85, INTERVENTION), (None, CONTROL), (40, None)], start=1
+        ):
+            subject_identifier = f"105-10-000{i}-5"
+            self.subject_screening_model.objects.create(
+                screening_identifier=f"S{i}",
+                subject_identifier=subject_identifier,
+                cd4_date=date(2024, 4, i) if cd4_value else None,
+                cd4_value=cd4_value,
+                eligibility_datetime=datetime(2024, 5, i, 10, 0, tzinfo=UTC),
+            )
+            self.registered_subject_model.objects.create(
+                screening_identifier=f"S{i}", subject_identifier=subject_identifier
+            )
+            if assignment:
+                self.randomization_list_model.objects.create(
+                    subject_identifier=subject_identifier, assignment=assignment
+                )
+        tmpdir = mkdtemp()
+        self.addCleanup(rmtree, tmpdir, ignore_errors=True)
+        path = write_reference_snapshot(Path(tmpdir) / "reference.npy", get_reference_rows())
+
+        subject_identifiers = ["105-10-0001-5", "105-10-0002-5", "105-10-0003-5"]
+        form_validator_cls = type(
+            "FormValidator",
+            (),
+            {
+                "randomizer_name": "default",
+                "data_requirements": {
+                    "subject_screening": SUBJECT_SCREENING,
+                    "registered_subject_screening": REGISTERED_SUBJECT_SCREENING,
+                    "assignment": ASSIGNMENT,
+                },
+            },
+        )
+        with override_settings(EFFECT_FORM_VALIDATORS_REFERENCE_SNAPSHOT=str(path)):
+            for name in [SUBJECT_SCREENING, REGISTERED_SUBJECT_SCREENING]:
+                orm_values = loaders[name](subject_identifiers, form_validator_cls, None)
+                snapshot_values = snapshot_loaders[name](
+                    subject_identifiers, form_validator_cls, None
+                )
+                for field in ["cd4_date", "cd4_value", "eligibility_datetime"]:
+                    with self.subTest(name=name, field=field):
+                        self.assertEqual(
+                            {s: getattr(v, field) for s, v in snapshot_values.items()},
+                            {s: getattr(v, field) for s, v in orm_values.items()},
+                        )
+            self.assertEqual(
+                snapshot_loaders[ASSIGNMENT](subject_identifiers, form_validator_cls, None),
+                loaders[ASSIGNMENT](subject_identifiers, form_validator_cls, None),
+            )
+
+            # read from the snapshot, except the assignment of the subject
+            # not randomized when the snapshot was written
+            with self.assertNumQueries(1):
+                snapshot = prefetch(
+                    form_validator_cls, subject_identifiers, use_reference_snapshot=True
+                )
+            self.assertEqual(
+                snapshot["assignment"],
+                {"105-10-0001-5": INTERVENTION, "105-10-0002-5": CONTROL},
+            )
+            # a subject missing from the snapshot is loaded from the database
+            with self.assertNumQueries(3):
+                snapshot = prefetch(
+                    form_validator_cls, ["105-10-0004-5"], use_reference_snapshot=True
+                )
+            self.assertEqual(snapshot, {name: {} for name in snapshot})
@@ -0,0 +1,329 @@
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+from django.utils import timezone
+from edc_form_validators import INVALID_ERROR
+
+from effect_form_validators.effect_reports import SerumCragDateNoteFormValidator
+from effect_form_validators.effect_subject import ArvHistoryFormValidator
+from effect_form_validators.outcome import ValidationIssue, ValidationOutcome
+from effect_form_validators.registry import (
+    AlreadyRegistered,
+    FormValidatorRegistry,
+    NotRegistered,
+    site_form_validators,
+)
+from effect_form_validators.revalidation import (
+    RevalidationResult,
+    get_modified_lookups,
+    get_screening_dependency_index,
+    revalidate_for_screening_change,
+    revalidate_sharded,
+    store_changed_results,
+)
+from effect_form_validators.revalidation_store import (
+    Finding,
+    RevalidationStore,
+    Shard,
+    get_outcome_hash,
+)
+from effect_form_validators.signals import (
+    screening_change_revalidated,
+    subject_screening_post_save,
+)
+
+
+class TestScreeningDependencyIndex(TestCase):
+    def test_default_registry(self):
+        self.assertIn("effect_subject.arvhistory", site_form_validators)
+        self.assertIs(
+            site_form_validators.get("effect_subject.arvhistory").form_validator_cls,
+            ArvHistoryFormValidator,
+        )
+        with self.assertRaises(NotRegistered):
+            site_form_validators.get("effect_subject.blah")
+        with self.assertRaises(AlreadyRegistered):
+            site_form_validators.register(
+                "effect_subject.arvhistory",
+                "effect_form_validators.effect_subject.ArvHistoryFormValidator",
+            )
+
+    def test_index(self):
+        index = get_screening_dependency_index()
+        self.assertEqual(
+            [r.form_validator_cls for r in index["cd4_date"]], [ArvHistoryFormValidator]
+        )
+        self.assertEqual(
+            [r.form_validator_cls for r in index["cd4_value"]], [ArvHistoryFormValidator]
+        )
+        self.assertEqual(
+            [r.form_validator_cls for r in index["eligibility_datetime"]],
+            [SerumCragDateNoteFormValidator],
+        )
+
+    @patch("effect_form_validators.revalidation.revalidate_subject")
+    def test_revalidates_dependents_only(self, mock_revalidate_subject):
+        mock_revalidate_subject.return_value = iter([])
+        registry = FormValidatorRegistry()
+        registry.register(
+            "effect_subject.arvhistory",
+            "effect_form_validators.effect_subject.ArvHistoryFormValidator",
+        )
+        registry.register(
+            "effect_subject.vitalsigns",
+            "effect_form_validators.effect_subject.VitalSignsFormValidator",
+        )
+        registry.register(
+            "effect_reports.serumcragdatenote",
+            "effect_form_validators.effect_reports.SerumCragDateNoteFormValidator",
+            "subject_identifier",
+        )
+
+        revalidate_for_screening_change("12345", ["cd4_value"], registry=registry)
+        subject_identifier, registrations = mock_revalidate_subject.call_args.args
+        self.assertEqual(subject_identifier, "12345")
+        self.assertEqual([r.label_lower for r in registrations], ["effect_subject.arvhistory"])
+
+        revalidate_for_screening_change(
+            "12345", ["cd4_date", "eligibility_datetime", "age_in_years"], registry=registry
+        )
+        _, registrations = mock_revalidate_subject.call_args.args
+        self.assertEqual(
+            sorted(r.label_lower for r in registrations),
+            ["effect_reports.serumcragdatenote", "effect_subject.arvhistory"],
+        )
+
+        revalidate_for_screening_change("12345", ["age_in_years"], registry=registry)
+        _, registrations = mock_revalidate_subject.call_args.args
+        self.assertEqual(list(registrations), [])
+
+    @patch("effect_form_validators.signals.revalidate_for_screening_change")
+    def test_post_save_revalidates_on_commit(self, mock_revalidate):
+        results = [
+            RevalidationResult(
+                "effect_subject.arvhistory", 1, "12345", ValidationOutcome("ArvHistory")
+            )
+        ]
+        mock_revalidate.return_value = results
+        receiver = MagicMock()
+        screening_change_revalidated.connect(receiver)
+        self.addCleanup(screening_change_revalidated.disconnect, receiver)
+        instance = SimpleNamespace(
+            subject_identifier="12345", _effect_changed_screening_fields=["cd4_value"]
+        )
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            subject_screening_post_save(None, instance, raw=False, created=False)
+            mock_revalidate.assert_not_called()
+        self.assertEqual(len(callbacks), 1)
+        mock_revalidate.assert_called_once_with("12345", ["cd4_value"])
+        receiver.assert_called_once()
+        self.assertEqual(receiver.call_args.kwargs["subject_identifier"], "12345")
+        self.assertEqual(receiver.call_args.kwargs["results"], results)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            subject_screening_post_save(None, instance, raw=False, created=True)
+            instance._effect_changed_screening_fields = []
+            subject_screening_post_save(None, instance, raw=False, created=False)
+        self.assertEqual(callbacks, [])
+
+
+class TestIncrementalRevalidation(TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = mkdtemp()
+        self.addCleanup(rmtree, self.tmpdir)
+        self.store = RevalidationStore(Path(self.tmpdir) / "revalidation.sqlite3")
+
+    def test_modified_lookups(self):
+        self.assertEqual(
+            get_modified_lookups(site_form_validators.get("effect_subject.vitalsigns")),
+            ["modified", "subject_visit__modified"],
+        )
+        self.assertEqual(
+            get_modified_lookups(site_form_validators.get("effect_subject.flucytmisseddoses")),
+            ["modified", "adherence__modified", "adherence__subject_visit__modified"],
+        )
+        self.assertEqual(
+            get_modified_lookups(site_form_validators.get("effect_prn.hospitalization")),
+            ["modified"],
+        )
+
+    def test_checkpoint(self):
+        self.assertIsNone(self.store.get_checkpoint("effect_subject.vitalsigns"))
+        now = timezone.now()
+        self.store.set_checkpoint("effect_subject.vitalsigns", now)
+        self.assertEqual(self.store.get_checkpoint("effect_subject.vitalsigns"), now)
+
+    def test_outcome_hash(self):
+        ok = ValidationOutcome("VitalSignsFormValidator")
+        invalid = ValidationOutcome(
+            "VitalSignsFormValidator",
+            (ValidationIssue("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES."),),
+        )
+        self.assertEqual(get_outcome_hash(ok), "")
+        self.assertNotEqual(get_outcome_hash(invalid), "")
+        self.assertEqual(
+            get_outcome_hash(invalid),
+            get_outcome_hash(ValidationOutcome("VitalSignsFormValidator", invalid.issues)),
+        )
+
+    def test_only_changed_outcomes_yielded(self):
+        invalid = ValidationOutcome(
+            "VitalSignsFormValidator",
+            (ValidationIssue("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES."),),
+        )
+        results = [
+            RevalidationResult("effect_subject.vitalsigns", 1, "12345", invalid),
+            RevalidationResult(
+                "effect_subject.vitalsigns", 2, "12345", ValidationOutcome("Vitals")
+            ),
+        ]
+        label_lower = "effect_subject.vitalsigns"
+        changed = store_changed_results(self.store, label_lower, results)
+        self.assertEqual([r.pk for r in changed], [1])
+        # unchanged on rerun
+        self.assertEqual(store_changed_results(self.store, label_lower, results), [])
+        # resolved
+        resolved = [
+            RevalidationResult(
+                "effect_subject.vitalsigns", 1, "12345", ValidationOutcome("Vitals")
+            )
+        ]
+        self.assertEqual(
+            [r.pk for r in store_changed_results(self.store, label_lower, resolved)],
+            [1],
+        )
+
+
+class TestShardedRevalidation(TestCase):
+    label_lower = "effect_subject.vitalsigns"
+
+    def setUp(self) -> None:
+        self.tmpdir = mkdtemp()
+        self.addCleanup(rmtree, self.tmpdir)
+        self.store = RevalidationStore(Path(self.tmpdir) / "revalidation.sqlite3")
+        self.shards = [
+            Shard(self.label_lower, "", "105-000100"),
+            Shard(self.label_lower, "105-000100", "105-000200"),
+            Shard(self.label_lower, "105-000200", None),
+        ]
+        self.registry = FormValidatorRegistry()
+        self.registry.register(
+            self.label_lower, "effect_form_validators.effect_subject.VitalSignsFormValidator"
+        )
+
+    def get_finding(self, pk: int, subject_identifier: str) -> Finding:
+        return Finding(
+            self.label_lower,
+            str(pk),
+            subject_identifier,
+            "VitalSignsFormValidator",
+            [("reportable_as_ae", INVALID_ERROR, "Invalid. Expected YES.")],
+        )
+
+    def test_shard_findings_replaced_on_rerun(self):
+        self.store.set_shards(self.shards)
+        self.assertEqual(self.store.get_shards(self.label_lower), self.shards)
+        self.assertIsNone(self.store.get_shard_completed(self.shards[1]))
+        self.store.set_shard_findings(
+            self.shards[1],
+            [self.get_finding(1, "105-000100"), self.get_finding(2, "105-000150")],
+            timezone.now(),
+        )
+        self.store.set_shard_findings(
+            self.shards[2], [self.get_finding(3, "105-000250")], timezone.now()
+        )
+        self.assertIsNotNone(self.store.get_shard_completed(self.shards[1]))
+        # rerun resolves pk 1
+        self.store.set_shard_findings(
+            self.shards[1], [self.get_finding(2, "105-000150")], timezone.now()
+        )
+        self.assertEqual([f.pk for f in self.store.iter_findings()], ["2", "3"])
+        self.assertEqual(
+            list(self.store.iter_findings()),
+            [self.get_finding(2, "105-000150"), self.get_finding(3, "105-000250")],
+        )
+        self.store.reset_shards(self.label_lower)
+        self.assertEqual(self.store.get_shards(self.label_lower), [])
+        self.assertEqual(list(self.store.iter_findings()), [])
+
+    def test_reset_shards(self):
+        other_label_lower = "effect_subject.signsandsymptoms"
+        other_shard = Shard(other_label_lower, "", None)
+        self.store.set_shards([*self.shards, other_shard])
+        self.store.set_shard_findings(
+            self.shards[0], [self.get_finding(1, "105-000001")], timezone.now()
+        )
+        self.store.set_shard_findings(
+            other_shard,
+            [self.get_finding(2, "105-000001")._replace(label_lower=other_label_lower)],
+            timezone.now(),
+        )
+        self.store.reset_shards(self.label_lower)
+        self.assertEqual(self.store.get_shards(self.label_lower), [])
+        self.assertEqual(self.store.get_shards(other_label_lower), [other_shard])
+        self.assertEqual([f.pk for f in self.store.iter_findings()], ["2"])
+
+        self.store.reset_shards()
+        self.assertEqual(self.store.get_shards(other_label_lower), [])
+        self.assertEqual(list(self.store.iter_findings()), [])
+
+    def test_merge(self):
+        self.store.set_shards(self.shards)
+        other = RevalidationStore(Path(self.tmpdir) / "other.sqlite3")
+        other.set_shards(self.shards)
+        self.store.set_shard_findings(
+            self.shards[0], [self.get_finding(1, "105-000001")], timezone.now()
+        )
+        self.store.set_shard_findings(self.shards[1], [], timezone.now())
+        # completed later on the other machine
+        other.set_shard_findings(
+            self.shards[1], [self.get_finding(2, "105-000101")], timezone.now()
+        )
+        other.set_shard_findings(
+            self.shards[2], [self.get_finding(3, "105-000201")], timezone.now()
+        )
+        self.store.merge(other.path)
+        self.assertEqual([f.pk for f in self.store.iter_findings()], ["1", "2", "3"])
+        self.assertTrue(all(self.store.get_shard_completed(s) for s in self.shards))
+
+    @patch("effect_form_validators.revalidation.get_shards")
+    @patch("effect_form_validators.revalidation.revalidate_shard")
+    def test_resumes_after_last_completed_shard(self, mock_revalidate_shard, mock_get_shards):
+        mock_get_shards.return_value = self.shards
+
+        def revalidate_shard(store, shard, *args, **kwargs):
+            if shard == self.shards[2]:
+                raise RuntimeError("Interrupted")
+            store.set_shard_findings(shard, [], timezone.now())
+            return []
+
+        mock_revalidate_shard.side_effect = revalidate_shard
+        with self.assertRaises(RuntimeError):
+            list(revalidate_sharded(self.store, registry=self.registry))
+        self.assertEqual(
+            [c.args[1] for c in mock_revalidate_shard.call_args_list], self.shards
+        )
+
+        mock_revalidate_shard.reset_mock()
+        mock_revalidate_shard.side_effect = None
+        mock_revalidate_shard.return_value = []
+        list(revalidate_sharded(self.store, registry=self.registry))
+        self.assertEqual(
+            [c.args[1] for c in mock_revalidate_shard.call_args_list], [self.shards[2]]
+        )
+        # planned once
+        mock_get_shards.assert_called_once()
+
+    @patch("effect_form_validators.revalidation.get_shards")
+    @patch("effect_form_validators.revalidation.revalidate_shard")
+    def test_parts(self, mock_revalidate_shard, mock_get_shards):
+        mock_get_shards.return_value = self.shards
+        mock_revalidate_shard.return_value = []
+        list(revalidate_sharded(self.store, registry=self.registry, part=1, parts=2))
+        self.assertEqual(
+            [c.args[1] for c in mock_revalidate_shard.call_args_list], [self.shards[1]]
+        )
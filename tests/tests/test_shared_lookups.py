@@ -0,0 +1,305 @@
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Timer
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from asgiref.sync import async_to_sync
+from django.apps import apps as django_apps
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase, override_settings
+from edc_randomization.exceptions import NotRegistered
+
+from effect_form_validators.effect_subject import ArvHistoryFormValidator
+from effect_form_validators.prefetch import (
+    ASSIGNMENT,
+    ASSIGNMENT_DESCRIPTION,
+    REGISTERED_SUBJECT_SCREENING,
+    SUBJECT_SCREENING,
+)
+from effect_form_validators.registry import site_form_validators
+from effect_form_validators.shared_lookups import (
+    KEY_VERSION,
+    SharedLookupCache,
+    shared_lookups,
+    subject_screening_changed,
+)
+
+from .effect_subject.test_arv_history import ArvHistoryMockModel
+
+
+def get_model_cls(label_lower: str) -> type:
+    return type(label_lower, (), {"_meta": SimpleNamespace(label_lower=label_lower)})
+
+
+class TestSharedLookupCache(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = mkdtemp()
+        self.addCleanup(rmtree, self.cache_dir, ignore_errors=True)
+
+    def get_backends(self) -> dict[str, dict]:
+        return {
+            "locmem": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "effect-form-validators-tests",
+            },
+            "file": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": self.cache_dir,
+            },
+        }
+
+    def run_on_backends(self, test):
+        for alias in ["locmem", "file"]:
+            with (
+                self.subTest(backend=alias),
+                override_settings(
+                    CACHES={"default": self.get_backends()["locmem"], **self.get_backends()},
+                    EFFECT_FORM_VALIDATORS_LOOKUP_CACHE=alias,
+                ),
+            ):
+                caches[alias].clear()
+                test()
+
+    def test_disabled_by_default(self):
+        loader = MagicMock(return_value="screening")
+        lookups = SharedLookupCache()
+        self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "screening")
+        self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "screening")
+        self.assertEqual(loader.call_count, 2)
+
+    def test_shared_across_workers(self):
+        def test():
+            loader = MagicMock(return_value="screening")
+            worker_one, worker_two = SharedLookupCache(), SharedLookupCache()
+            self.assertEqual(
+                worker_one.get_or_load(SUBJECT_SCREENING, "12345", loader), "screening"
+            )
+            self.assertEqual(
+                worker_two.get_or_load(SUBJECT_SCREENING, "12345", loader), "screening"
+            )
+            self.assertEqual(loader.call_count, 1)
+
+            # keyed by lookup name and subject
+            worker_two.get_or_load(ASSIGNMENT, "12345", loader)
+            worker_two.get_or_load(SUBJECT_SCREENING, "67890", loader)
+            self.assertEqual(loader.call_count, 3)
+
+            # no subject, nothing to key on
+            worker_two.get_or_load(SUBJECT_SCREENING, None, loader)
+            self.assertEqual(loader.call_count, 4)
+
+        self.run_on_backends(test)
+
+    def test_loader_errors_not_cached(self):
+        def test():
+            loader = MagicMock(side_effect=[LookupError, "screening"])
+            lookups = SharedLookupCache()
+            with self.assertRaises(LookupError):
+                lookups.get_or_load(SUBJECT_SCREENING, "12345", loader)
+            self.assertEqual(
+                lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "screening"
+            )
+
+        self.run_on_backends(test)
+
+    def test_invalidate(self):
+        def test():
+            loader = MagicMock(side_effect=["before", "after"])
+            lookups = SharedLookupCache()
+            self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "before")
+            with self.captureOnCommitCallbacks(execute=True):
+                subject_screening_changed(
+                    sender=None, instance=MagicMock(subject_identifier="12345")
+                )
+            self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "after")
+            self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "after")
+
+        self.run_on_backends(test)
+
+    def test_invalidated_on_commit(self):
+        def test():
+            loader = MagicMock(side_effect=["before", "after"])
+            lookups = SharedLookupCache()
+            lookups.get_or_load(SUBJECT_SCREENING, "12345", loader)
+            key = lookups.get_key(SUBJECT_SCREENING, "12345")
+            with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+                subject_screening_changed(
+                    sender=None, instance=MagicMock(subject_identifier="12345")
+                )
+                # another worker reloading before the commit reads the
+                # old row; it must not be cached under the new key
+                self.assertEqual(lookups.get_key(SUBJECT_SCREENING, "12345"), key)
+                self.assertEqual(
+                    lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "before"
+                )
+            self.assertNotEqual(lookups.get_key(SUBJECT_SCREENING, "12345"), key)
+            self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "after")
+            self.assertEqual(loader.call_count, 2)
+
+        self.run_on_backends(test)
+
+    def test_single_flight(self):
+        def test():
+            loader = MagicMock(return_value="loaded here")
+            lookups = SharedLookupCache(lock_timeout=2, wait=0.01)
+            key = lookups.get_key(SUBJECT_SCREENING, "12345")
+            # another worker holds the lock and fills the entry shortly
+            lookups.cache.add(f"{key}:lock", 1, 2, version=KEY_VERSION)
+            timer = Timer(
+                0.1,
+                lookups.cache.set,
+                args=(key, "loaded elsewhere", 30),
+                kwargs={"version": KEY_VERSION},
+            )
+            timer.start()
+            self.addCleanup(timer.cancel)
+            self.assertEqual(
+                lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "loaded elsewhere"
+            )
+            loader.assert_not_called()
+
+        self.run_on_backends(test)
+
+    def test_single_flight_gives_up_after_lock_timeout(self):
+        def test():
+            loader = MagicMock(return_value="loaded here")
+            lookups = SharedLookupCache(lock_timeout=1, wait=0.01)
+            key = lookups.get_key(SUBJECT_SCREENING, "12345")
+            lookups.cache.add(f"{key}:lock", 1, 5, version=KEY_VERSION)
+            self.assertEqual(
+                lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "loaded here"
+            )
+
+        self.run_on_backends(test)
+
+    def test_async_shared_with_sync(self):
+        def test():
+            aloader = AsyncMock(side_effect=["before", "after"])
+            loader = MagicMock(return_value="loaded sync")
+            lookups = SharedLookupCache()
+            aget_or_load = async_to_sync(lookups.aget_or_load)
+            self.assertEqual(aget_or_load(SUBJECT_SCREENING, "12345", aloader), "before")
+            self.assertEqual(aget_or_load(SUBJECT_SCREENING, "12345", aloader), "before")
+            self.assertEqual(lookups.get_or_load(SUBJECT_SCREENING, "12345", loader), "before")
+            self.assertEqual(aloader.await_count, 1)
+            loader.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                subject_screening_changed(
+                    sender=None, instance=MagicMock(subject_identifier="12345")
+                )
+            self.assertEqual(aget_or_load(SUBJECT_SCREENING, "12345", aloader), "after")
+
+            # no subject, nothing to key on
+            aloader = AsyncMock(return_value="screening")
+            self.assertEqual(aget_or_load(SUBJECT_SCREENING, None, aloader), "screening")
+            self.assertEqual(aget_or_load(SUBJECT_SCREENING, None, aloader), "screening")
+            self.assertEqual(aloader.await_count, 2)
+
+        self.run_on_backends(test)
+
+    def test_async_validator_lookup_shared(self):
+        def test():
+            model_cls = MagicMock()
+            model_cls.objects.aget = AsyncMock(return_value="screening")
+            with patch(
+                "effect_form_validators.effect_subject.arv_history_form_validator."
+                "get_subject_screening_model_cls",
+                return_value=model_cls,
+            ):
+                for _ in range(2):
+                    form_validator = ArvHistoryFormValidator(
+                        cleaned_data={"subject_visit": MagicMock(subject_identifier="12345")},
+                        model=ArvHistoryMockModel,
+                    )
+                    self.assertEqual(
+                        async_to_sync(form_validator.aget_subject_screening)(), "screening"
+                    )
+            model_cls.objects.aget.assert_awaited_once_with(subject_identifier="12345")
+
+        self.run_on_backends(test)
+
+
+class TestLookupCacheInvalidation(TestCase):
+    def setUp(self) -> None:
+        self.subject_screening_model = get_model_cls("tests.subjectscreening")
+        self.registered_subject_model = get_model_cls("tests.registeredsubject")
+        self.randomization_list_model = get_model_cls("tests.randomizationlist")
+        self.app_config = django_apps.get_app_config("effect_form_validators")
+        for target, return_value in [
+            (
+                "edc_screening.utils.get_subject_screening_model_cls",
+                self.subject_screening_model,
+            ),
+            (
+                "edc_registration.get_registered_subject_model_cls",
+                self.registered_subject_model,
+            ),
+        ]:
+            patcher = patch(target, return_value=return_value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # restore the receivers connected by `ready`
+        for signal in (post_save, post_delete):
+            self.addCleanup(setattr, signal, "receivers", list(signal.receivers))
+            self.addCleanup(signal.sender_receivers_cache.clear)
+
+    def get_randomizer(self, randomizer_name: str) -> SimpleNamespace:
+        if randomizer_name != "default":
+            raise NotRegistered(f"Randomizer not registered. Got {randomizer_name}.")
+        return SimpleNamespace(model_cls=lambda: self.randomization_list_model)
+
+    @override_settings(EFFECT_FORM_VALIDATORS_LOOKUP_CACHE="default")
+    def test_ready_connects_invalidation(self):
+        randomizer_names = {
+            getattr(registration.form_validator_cls, "randomizer_name", None)
+            for registration in site_form_validators
+        }
+        self.assertEqual(randomizer_names - {None}, {"default"})
+        with (
+            patch(
+                "edc_randomization.site_randomizers.site_randomizers.get",
+                side_effect=self.get_randomizer,
+            ) as mock_get,
+            patch.object(shared_lookups, "invalidate") as mock_invalidate,
+        ):
+            self.app_config.ready()
+            mock_get.assert_called_once_with("default")
+
+            instance = MagicMock(subject_identifier="12345")
+            with self.captureOnCommitCallbacks(execute=True):
+                post_save.send(sender=self.subject_screening_model, instance=instance)
+                mock_invalidate.assert_not_called()
+            self.assertEqual(
+                mock_invalidate.call_args_list,
+                [
+                    call(SUBJECT_SCREENING, "12345"),
+                    call(REGISTERED_SUBJECT_SCREENING, "12345"),
+                ],
+            )
+            mock_invalidate.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True):
+                post_delete.send(sender=self.registered_subject_model, instance=instance)
+            mock_invalidate.assert_called_once_with(REGISTERED_SUBJECT_SCREENING, "12345")
+            mock_invalidate.reset_mock()
+            with self.captureOnCommitCallbacks(execute=True):
+                post_save.send(sender=self.randomization_list_model, instance=instance)
+            self.assertEqual(
+                mock_invalidate.call_args_list,
+                [call(ASSIGNMENT, "12345"), call(ASSIGNMENT_DESCRIPTION, "12345")],
+            )
+
+    @override_settings(EFFECT_FORM_VALIDATORS_LOOKUP_CACHE="default")
+    def test_ready_skips_unregistered_randomizer(self):
+        with (
+            patch(
+                "edc_randomization.site_randomizers.site_randomizers.get",
+                side_effect=NotRegistered,
+            ),
+            self.assertLogs("effect_form_validators.apps", "WARNING") as cm,
+        ):
+            self.app_config.ready()
+        self.assertIn("'default' not registered", cm.output[0])
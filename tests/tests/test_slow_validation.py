@@ -0,0 +1,122 @@
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest import skipIf
+
+from clinicedc_constants import YES
+from clinicedc_tests.mixins import FormValidatorTestMixin
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django_mock_queries.query import MockModel
+
+from effect_form_validators.async_validation import AsyncFormValidatorMixin
+from effect_form_validators.effect_subject import (
+    ClinicalNoteFormValidator,
+    FlucytMissedDosesFormValidator,
+    MentalStatusFormValidator,
+)
+from effect_form_validators.query_budget import QueryBudgetFormValidatorMixin
+from effect_form_validators.slow_validation import (
+    SlowValidationLogMixin,
+    monitoring,
+    validation_monitor,
+)
+from effect_form_validators.visit_applicability import VisitApplicabilityFormValidatorMixin
+
+
+class SlowClinicalNoteFormValidator(
+    SlowValidationLogMixin, FormValidatorTestMixin, ClinicalNoteFormValidator
+):
+    pass
+
+
+class TestSlowValidationLog(TestCase):
+    logger_name = "effect_form_validators.slow_validation"
+
+    def setUp(self) -> None:
+        self.profile_dir = mkdtemp()
+        self.addCleanup(rmtree, self.profile_dir, ignore_errors=True)
+
+    def validate(self, **cleaned_data) -> None:
+        SlowClinicalNoteFormValidator(
+            cleaned_data={"report_datetime": timezone.now(), **cleaned_data},
+            model=MockModel,
+        ).validate()
+
+    def test_off_by_default(self):
+        with self.assertNoLogs(self.logger_name):
+            self.validate()
+
+    @override_settings(EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS=60_000)
+    def test_fast_validation_not_logged(self):
+        with self.assertNoLogs(self.logger_name):
+            self.validate()
+
+    @override_settings(EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS=0)
+    def test_slow_validation_logged(self):
+        with self.assertLogs(self.logger_name, "WARNING") as cm:
+            self.validate()
+        record = cm.records[0]
+        self.assertEqual(record.form_validator, "SlowClinicalNoteFormValidator")
+        self.assertEqual(record.queries, 0)
+        self.assertIsNone(record.profile)
+
+        # logged also if the validation fails
+        with (
+            self.assertLogs(self.logger_name, "WARNING"),
+            self.assertRaises(ValidationError),
+        ):
+            self.validate(has_comment=YES)
+
+    @skipIf(monitoring is None, "sys.monitoring not available")
+    @override_settings(EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS=0)
+    def test_rules_run(self):
+        with self.assertLogs(self.logger_name, "WARNING") as cm:
+            self.validate()
+        self.assertIn("clean", cm.records[0].rules)
+        self.assertNotIn("validate", cm.records[0].rules)
+
+    @skipIf(monitoring is None, "sys.monitoring not available")
+    def test_mixins_not_rules(self):
+        self.assertTrue(validation_monitor.available)
+        for form_validator_cls in [
+            SlowClinicalNoteFormValidator,
+            FlucytMissedDosesFormValidator,
+            MentalStatusFormValidator,
+        ]:
+            validation_monitor.watch(form_validator_cls)
+        rules = set(validation_monitor._rule_codes.values())
+        self.assertIn("clean", rules)
+        self.assertIn("validate_against_study_arm", rules)
+        for mixin in [
+            SlowValidationLogMixin,
+            QueryBudgetFormValidatorMixin,
+            AsyncFormValidatorMixin,
+            VisitApplicabilityFormValidatorMixin,
+        ]:
+            with self.subTest(mixin=mixin):
+                for func in vars(mixin).values():
+                    self.assertNotIn(
+                        getattr(func, "__code__", None), validation_monitor._rule_codes
+                    )
+
+    @skipIf(monitoring is None, "sys.monitoring not available")
+    def test_sampled_profile_written(self):
+        with (
+            override_settings(
+                EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_MS=0,
+                EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_RATE=1.0,
+                EFFECT_FORM_VALIDATORS_SLOW_VALIDATION_PROFILE_DIR=self.profile_dir,
+            ),
+            self.assertLogs(self.logger_name, "WARNING") as cm,
+        ):
+            self.validate()
+        path = Path(cm.records[0].profile)
+        self.assertEqual(path.parent, Path(self.profile_dir))
+        lines = path.read_text().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            _stack, us = line.rsplit(" ", 1)
+            self.assertGreater(int(us), 0)
+        self.assertTrue(any("ClinicalNoteFormValidator.clean" in line for line in lines))
@@ -0,0 +1,217 @@
+import threading
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase, override_settings
+
+from effect_form_validators.subject_history import SubjectHistory, SubjectHistoryCache
+
+
+class TestSubjectHistory(TestCase):
+    def setUp(self) -> None:
+        # (pk, timepoint, visit_code_sequence, chest_xray_date, chest_xray)
+        rows = [
+            (3, Decimal("5.0"), 0, date(2023, 2, 1), "Yes"),
+            (1, Decimal("0.0"), 0, date(2023, 1, 1), "Yes"),
+            (2, Decimal("0.0"), 1, None, "No"),
+            (4, Decimal("7.0"), 0, date(2023, 3, 1), "Yes"),
+        ]
+        self.subject_history = SubjectHistory(
+            "12345", fields=["chest_xray_date", "chest_xray"], rows=rows
+        )
+
+    def test_rows_sorted_by_timepoint(self):
+        self.assertEqual(len(self.subject_history), 4)
+        self.assertEqual(self.subject_history.pks, [1, 2, 3, 4])
+
+    def test_previous(self):
+        self.assertIsNone(
+            self.subject_history.previous("chest_xray_date", timepoint=Decimal("0.0"))
+        )
+        self.assertEqual(
+            self.subject_history.previous("chest_xray_date", timepoint=Decimal("5.0")),
+            date(2023, 1, 1),
+        )
+        self.assertEqual(
+            self.subject_history.previous(
+                "chest_xray", timepoint=Decimal("5.0"), visit_code_sequence=0
+            ),
+            "No",
+        )
+        self.assertEqual(
+            self.subject_history.previous("chest_xray_date", timepoint=Decimal("99.0")),
+            date(2023, 3, 1),
+        )
+
+    def test_previous_excludes_pk(self):
+        self.assertEqual(
+            self.subject_history.previous(
+                "chest_xray_date", timepoint=Decimal("99.0"), exclude_pk=4
+            ),
+            date(2023, 2, 1),
+        )
+
+    def test_next(self):
+        self.assertEqual(
+            self.subject_history.next("chest_xray_date", timepoint=Decimal("0.0")),
+            date(2023, 2, 1),
+        )
+        self.assertEqual(
+            self.subject_history.next(
+                "chest_xray", timepoint=Decimal("0.0"), visit_code_sequence=0
+            ),
+            "No",
+        )
+        self.assertIsNone(
+            self.subject_history.next("chest_xray_date", timepoint=Decimal("7.0"))
+        )
+
+    def test_at(self):
+        self.assertEqual(
+            self.subject_history.at("chest_xray_date", timepoint=Decimal("5.0")),
+            date(2023, 2, 1),
+        )
+        self.assertIsNone(
+            self.subject_history.at(
+                "chest_xray_date", timepoint=Decimal("0.0"), visit_code_sequence=1
+            )
+        )
+        self.assertEqual(
+            self.subject_history.at(
+                "chest_xray", timepoint=Decimal("0.0"), visit_code_sequence=1
+            ),
+            "No",
+        )
+        self.assertIsNone(self.subject_history.at("chest_xray", timepoint=Decimal("14.0")))
+
+
+@patch.object(SubjectHistoryCache, "_connect")
+class TestSubjectHistoryCache(TestCase):
+    def setUp(self) -> None:
+        self.model_cls = MagicMock()
+        self.model_cls._meta.label_lower = "effect_subject.chestxray"
+
+    def get_in_threads(self, cache: SubjectHistoryCache, subject_identifiers: list[str]):
+        results = {}
+
+        def get(subject_identifier):
+            results[subject_identifier] = cache.get(
+                self.model_cls, subject_identifier, ["chest_xray_date"]
+            )
+
+        threads = [threading.Thread(target=get, args=(s,)) for s in subject_identifiers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_loads_different_subjects_concurrently(self, mock_connect):  # noqa: ARG002
+        # each load waits for the other; a load under the cache lock would time out
+        barrier = threading.Barrier(2, timeout=2)
+
+        def load(model_cls, subject_identifier, fields, related_visit_model_attr):
+            barrier.wait()
+            return SubjectHistory(subject_identifier, fields, [])
+
+        with patch("effect_form_validators.subject_history.load_subject_history", load):
+            results = self.get_in_threads(SubjectHistoryCache(), ["12345", "67890"])
+        self.assertEqual(
+            {k: v.subject_identifier for k, v in results.items()},
+            {"12345": "12345", "67890": "67890"},
+        )
+
+    def test_loads_subject_once(self, mock_connect):  # noqa: ARG002
+        cache = SubjectHistoryCache()
+        with patch(
+            "effect_form_validators.subject_history.load_subject_history",
+            return_value=SubjectHistory("12345", ["chest_xray_date"], []),
+        ) as mock_load:
+            self.get_in_threads(cache, ["12345"] * 8)
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+        mock_load.assert_called_once()
+
+    def test_clear_during_load_not_cached(self, mock_connect):  # noqa: ARG002
+        cache = SubjectHistoryCache()
+
+        def load(model_cls, subject_identifier, fields, related_visit_model_attr):
+            # a CRF row is saved while the history loads
+            cache.clear(subject_identifier=subject_identifier)
+            return SubjectHistory(subject_identifier, fields, [])
+
+        with patch(
+            "effect_form_validators.subject_history.load_subject_history", side_effect=load
+        ) as mock_load:
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+        self.assertEqual(mock_load.call_count, 2)
+
+    @override_settings(EFFECT_FORM_VALIDATORS_SUBJECT_HISTORY_CACHE_TIMEOUT=60)
+    def test_entries_expire(self, mock_connect):  # noqa: ARG002
+        cache = SubjectHistoryCache()
+        with (
+            patch(
+                "effect_form_validators.subject_history.load_subject_history",
+                return_value=SubjectHistory("12345", ["chest_xray_date"], []),
+            ) as mock_load,
+            patch("effect_form_validators.subject_history.time.monotonic") as mock_monotonic,
+        ):
+            mock_monotonic.return_value = 1000.0
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            mock_monotonic.return_value = 1059.0
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            self.assertEqual(mock_load.call_count, 1)
+            mock_monotonic.return_value = 1060.0
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            self.assertEqual(mock_load.call_count, 2)
+
+    @override_settings(EFFECT_FORM_VALIDATORS_SUBJECT_HISTORY_CACHE_SIZE=2)
+    def test_least_recently_used_evicted(self, mock_connect):  # noqa: ARG002
+        cache = SubjectHistoryCache()
+
+        def load(model_cls, subject_identifier, fields, related_visit_model_attr):
+            return SubjectHistory(subject_identifier, fields, [])
+
+        with patch(
+            "effect_form_validators.subject_history.load_subject_history", side_effect=load
+        ) as mock_load:
+            for subject_identifier in ["12345", "67890", "12345", "24680"]:
+                cache.get(self.model_cls, subject_identifier, ["chest_xray_date"])
+            self.assertEqual(mock_load.call_count, 3)
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            self.assertEqual(mock_load.call_count, 3)
+            cache.get(self.model_cls, "67890", ["chest_xray_date"])
+            self.assertEqual(mock_load.call_count, 4)
+
+
+class TestSubjectHistoryCacheInvalidation(TestCase):
+    def setUp(self) -> None:
+        for signal in (post_save, post_delete):
+            self.addCleanup(setattr, signal, "receivers", list(signal.receivers))
+            self.addCleanup(signal.sender_receivers_cache.clear)
+        self.model_cls = MagicMock()
+        self.model_cls._meta.label_lower = "effect_subject.chestxray"
+        self.instance = SimpleNamespace(
+            subject_visit=SimpleNamespace(subject_identifier="12345")
+        )
+
+    def test_cleared_again_on_commit(self):
+        cache = SubjectHistoryCache()
+
+        def load(model_cls, subject_identifier, fields, related_visit_model_attr):
+            return SubjectHistory(subject_identifier, fields, [])
+
+        with patch(
+            "effect_form_validators.subject_history.load_subject_history", side_effect=load
+        ) as mock_load:
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+            with self.captureOnCommitCallbacks(execute=True):
+                post_save.send(sender=self.model_cls, instance=self.instance, created=False)
+                # reloaded before commit, e.g. by another thread
+                cache.get(self.model_cls, "12345", ["chest_xray_date"])
+                self.assertEqual(mock_load.call_count, 2)
+            cache.get(self.model_cls, "12345", ["chest_xray_date"])
+        self.assertEqual(mock_load.call_count, 3)
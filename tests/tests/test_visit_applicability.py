@@ -0,0 +1,36 @@
+from django.test import TestCase
+from edc_visit_schedule.constants import DAY01, WEEK10, WEEK24
+
+from effect_form_validators.effect_subject import MentalStatusFormValidator
+from effect_form_validators.visit_applicability import (
+    get_visit_applicability,
+    get_visit_filter,
+)
+
+
+class TestVisitApplicability(TestCase):
+    def test_mental_status(self):
+        applicability = get_visit_applicability(MentalStatusFormValidator)
+        self.assertEqual(
+            applicability,
+            {
+                (WEEK10, 0): frozenset({"require_help", "any_other_problems"}),
+                (WEEK24, 0): frozenset({"require_help", "any_other_problems"}),
+            },
+        )
+        self.assertIs(get_visit_applicability(MentalStatusFormValidator), applicability)
+        self.assertNotIn((WEEK10, 1), applicability)
+        self.assertNotIn((DAY01, 0), applicability)
+
+    def test_no_declarations(self):
+        self.assertEqual(get_visit_applicability(object), {})
+
+    def test_visit_filter(self):
+        q = get_visit_filter(MentalStatusFormValidator, "require_help")
+        self.assertIn(("subject_visit__visit_code", WEEK10), q.children[1].children)
+        self.assertIn(("subject_visit__visit_code_sequence", 0), q.children[1].children)
+        self.assertEqual(len(q.children), 3)
+        self.assertEqual(
+            get_visit_filter(MentalStatusFormValidator, "ecog_score").children,
+            [("pk__in", [])],
+        )
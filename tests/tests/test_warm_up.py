@@ -0,0 +1,50 @@
+from django.test import TestCase
+from edc_visit_tracking.choices import ASSESSMENT_TYPES
+
+from effect_form_validators.utils import choices_indexes, get_choices_index, get_display
+from effect_form_validators.warm_up import register_warmer, warm_up, warmers
+
+
+class TestWarmUp(TestCase):
+    def test_warm_up(self):
+        timings = warm_up()
+        self.assertEqual(list(timings), list(warmers))
+        for seconds in timings.values():
+            self.assertGreaterEqual(seconds, 0)
+
+    def test_register_warmer(self):
+        called = []
+
+        @register_warmer("test warmer")
+        def func():
+            called.append(True)
+
+        self.addCleanup(warmers.pop, "test warmer")
+        self.assertIn("test warmer", warm_up())
+        self.assertEqual(called, [True])
+
+    def test_failing_warmer_skipped(self):
+        @register_warmer("failing warmer")
+        def func():
+            raise RuntimeError("registry not loaded")
+
+        self.addCleanup(warmers.pop, "failing warmer")
+        with self.assertLogs("effect_form_validators.warm_up", "ERROR") as cm:
+            timings = warm_up()
+        self.assertNotIn("failing warmer", timings)
+        self.assertEqual(len(timings), len(warmers) - 1)
+        self.assertIn("failing warmer", cm.output[0])
+
+    def test_choices_index(self):
+        choices_indexes.clear()
+        warm_up()
+        self.assertIn(id(ASSESSMENT_TYPES), choices_indexes)
+        self.assertIs(get_choices_index(ASSESSMENT_TYPES), get_choices_index(ASSESSMENT_TYPES))
+        for value, display in ASSESSMENT_TYPES:
+            self.assertEqual(get_display(ASSESSMENT_TYPES, value), display)
+
+    def test_choices_index_equal_tuples(self):
+        choices = tuple((value, display) for value, display in ASSESSMENT_TYPES)
+        self.assertIsNot(choices, ASSESSMENT_TYPES)
+        self.assertEqual(get_choices_index(choices), get_choices_index(ASSESSMENT_TYPES))
+        self.assertEqual(get_choices_index([("a", "A")]), {"a": "A"})